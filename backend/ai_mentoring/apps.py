@@ -5,3 +5,7 @@ class AiMentoringConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_mentoring'
     verbose_name = 'AI Mentoring Engine'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import ai_mentoring.signals  # noqa
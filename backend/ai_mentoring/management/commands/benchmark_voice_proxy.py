@@ -0,0 +1,192 @@
+"""
+Load-test the voice proxy against a fake Gemini Live upstream.
+
+Starts a local stand-in for the Gemini websocket (it completes setup, then
+answers every audio chunk with one 24 kHz audio frame), puts ``proxy_handler``
+in front of it and drives concurrent clients that each stream 50 ms PCM chunks
+in lock step. Nothing leaves the machine and no API key is needed:
+
+    python manage.py benchmark_voice_proxy --sessions 10 50 100 --frames 200
+    python manage.py benchmark_voice_proxy --sessions 50 --json-audio
+    python manage.py benchmark_voice_proxy --sessions 20 --connect-delay-ms 150 \
+        --arrival-ms 100 --pool-size 2
+
+``--connect-delay-ms`` stalls the fake upstream's handshake to stand in for
+TCP + TLS to Gemini; with ``--pool-size`` the proxy keeps that many sockets
+pre-connected, and ``ready`` (connect to the proxy until the session is set up)
+shows what the pool saves.
+
+``--json-audio`` makes clients send the legacy base64 JSON frames instead of
+binary PCM. A codec line compares the per-frame proxy work of the old full
+JSON round trip with the splice/scan fast path.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from ai_mentoring import voice_server
+
+PCM_CHUNK_BYTES = 1600  # 50 ms of 16 kHz PCM16, what the browser worklet emits
+SETUP_COMPLETE = b'{"setupComplete":{}}'
+
+
+def _gemini_audio_frame(reply_bytes):
+    return json.dumps({
+        'serverContent': {
+            'modelTurn': {
+                'parts': [{
+                    'inlineData': {
+                        'mimeType': 'audio/pcm;rate=24000',
+                        'data': base64.b64encode(os.urandom(reply_bytes)).decode('ascii'),
+                    },
+                }],
+            },
+        },
+    }, separators=(',', ':')).encode('utf-8')
+
+
+def _percentile(timings, fraction):
+    if not timings:
+        return 0.0
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+def _legacy_codec(client_frame, gemini_frame):
+    data = json.loads(client_frame)
+    json.dumps({'realtimeInput': {'mediaChunks': [
+        {'mimeType': 'audio/pcm;rate=16000', 'data': data['data']}]}})
+    parsed = json.loads(gemini_frame)
+    for part in parsed['serverContent']['modelTurn']['parts']:
+        inline = part['inlineData']
+        json.dumps({'type': 'audio', 'data': inline['data'], 'mimeType': inline['mimeType']})
+
+
+def _fast_codec(pcm, gemini_frame):
+    voice_server._audio_envelope(pcm=pcm)
+    parsed, blobs = voice_server._parse_gemini_frame(gemini_frame)
+    for part in parsed['serverContent']['modelTurn']['parts']:
+        inline = part['inlineData']
+        voice_server._client_audio_frame(
+            voice_server._inline_blob(inline['data'], blobs), inline['mimeType'])
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the voice WebSocket proxy with a fake Gemini upstream'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', nargs='+', type=int, default=[10, 50, 100])
+        parser.add_argument('--frames', type=int, default=100,
+                            help='Audio chunks sent per session')
+        parser.add_argument('--reply-bytes', type=int, default=9600,
+                            help='PCM bytes in each fake Gemini audio frame (200 ms at 24 kHz)')
+        parser.add_argument('--json-audio', action='store_true',
+                            help='Send legacy JSON/base64 audio frames instead of binary PCM')
+        parser.add_argument('--connect-delay-ms', type=int, default=0,
+                            help='Extra handshake delay of the fake upstream')
+        parser.add_argument('--pool-size', type=int, default=0,
+                            help='Pre-connected upstream sockets kept by the proxy')
+        parser.add_argument('--arrival-ms', type=int, default=0,
+                            help='Delay between session starts')
+
+    def handle(self, *args, **options):
+        for name in ('voice_proxy', 'websockets'):
+            logging.getLogger(name).setLevel(logging.WARNING)
+        self._codec(options['reply_bytes'])
+        for sessions in sorted(set(options['sessions'])):
+            asyncio.run(self._run(sessions, options))
+
+    def _codec(self, reply_bytes, rounds=2000):
+        pcm = os.urandom(PCM_CHUNK_BYTES)
+        client_frame = json.dumps({'type': 'audio', 'data': base64.b64encode(pcm).decode()})
+        gemini_frame = _gemini_audio_frame(reply_bytes)
+        results = []
+        for codec, frame in ((_legacy_codec, client_frame), (_fast_codec, pcm)):
+            started = time.perf_counter()
+            for _ in range(rounds):
+                codec(frame, gemini_frame)
+            results.append((time.perf_counter() - started) * 1e6 / rounds)
+        self.stdout.write(
+            f'codec  legacy={results[0]:.1f}us/frame  fast={results[1]:.1f}us/frame'
+        )
+
+    async def _run(self, sessions, options):
+        import websockets
+
+        frames = options['frames']
+        reply = _gemini_audio_frame(options['reply_bytes'])
+
+        async def slow_handshake(connection, request):
+            await asyncio.sleep(options['connect_delay_ms'] / 1000)
+
+        async def fake_gemini(ws):
+            try:
+                await ws.recv()
+            except websockets.exceptions.ConnectionClosed:
+                return  # pooled socket closed before any session used it
+            await ws.send(SETUP_COMPLETE)
+            async for message in ws:
+                if b'mediaChunks' in (message if isinstance(message, bytes) else message.encode()):
+                    await ws.send(reply)
+
+        pcm = os.urandom(PCM_CHUNK_BYTES)
+        outgoing = pcm
+        if options['json_audio']:
+            outgoing = json.dumps({'type': 'audio', 'data': base64.b64encode(pcm).decode()})
+        setup = json.dumps({'contextSource': 'benchmark'})
+        timings = []
+        ready_timings = []
+
+        async def client(url, index):
+            await asyncio.sleep(index * options['arrival_ms'] / 1000)
+            started = time.perf_counter()
+            async with websockets.connect(url, max_size=None, compression=None) as ws:
+                await ws.send(setup)
+                await ws.recv()  # ready
+                ready_timings.append((time.perf_counter() - started) * 1000)
+                for _ in range(frames):
+                    started = time.perf_counter()
+                    await ws.send(outgoing)
+                    await ws.recv()
+                    timings.append((time.perf_counter() - started) * 1000)
+                await ws.send(json.dumps({'type': 'end'}))
+
+        async with websockets.serve(
+            fake_gemini, '127.0.0.1', 0, compression=None, process_request=slow_handshake,
+        ) as upstream:
+            upstream_port = upstream.sockets[0].getsockname()[1]
+            voice_server.GEMINI_API_KEY = 'benchmark'
+            voice_server.GEMINI_WS_URL = f'ws://127.0.0.1:{upstream_port}'
+            voice_server.STATS = voice_server.ProxyStats()
+            pool = voice_server.GeminiUpstreamPool(options['pool_size'], 30)
+            voice_server.UPSTREAM_POOL = pool
+            pool.start()
+            await asyncio.sleep((options['connect_delay_ms'] + 100) / 1000)  # let the pool fill
+            async with websockets.serve(
+                voice_server.proxy_handler, '127.0.0.1', 0, max_size=16 * 1024 * 1024,
+            ) as proxy:
+                url = f'ws://127.0.0.1:{proxy.sockets[0].getsockname()[1]}'
+                cpu_started = time.process_time()
+                wall_started = time.perf_counter()
+                await asyncio.gather(*(client(url, index) for index in range(sessions)))
+                wall = time.perf_counter() - wall_started
+                cpu = time.process_time() - cpu_started
+            await pool.close()
+
+        total = sessions * frames
+        timings.sort()
+        ready_timings.sort()
+        stats = voice_server.STATS
+        self.stdout.write(
+            f'sessions={sessions:>4}  frames={total}  '
+            f'throughput={total / wall:.0f}/s  cpu={cpu * 1e6 / total:.0f}us/frame  '
+            f'p50={_percentile(timings, 0.5):.2f}ms  p95={_percentile(timings, 0.95):.2f}ms  '
+            f'ready_p50={_percentile(ready_timings, 0.5):.1f}ms  '
+            f'ready_p95={_percentile(ready_timings, 0.95):.1f}ms  '
+            f'pool_hits={stats.pool_hits}/{sessions}'
+        )
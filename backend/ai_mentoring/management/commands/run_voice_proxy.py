@@ -5,6 +5,10 @@ Usage:
     python manage.py run_voice_proxy
     python manage.py run_voice_proxy --port 8001
     python manage.py run_voice_proxy --host 0.0.0.0 --port 8001
+    python manage.py run_voice_proxy --workers 0 --max-sessions 150
+
+--workers 0 starts one worker per CPU core behind a supervisor; the workers
+share the port through SO_REUSEPORT. SIGTERM drains active sessions.
 """
 import asyncio
 from django.core.management.base import BaseCommand
@@ -26,11 +30,47 @@ class Command(BaseCommand):
             default=8001,
             help='Port for the WebSocket server (default: 8001)',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Worker processes; 0 means one per CPU core (default: VOICE_PROXY_WORKERS or 1)',
+        )
+        parser.add_argument(
+            '--max-sessions',
+            type=int,
+            default=None,
+            help='Concurrent sessions per worker before new ones get "busy, retry" '
+                 '(default: VOICE_PROXY_MAX_SESSIONS or 200)',
+        )
+        parser.add_argument(
+            '--stats-port',
+            type=int,
+            default=None,
+            help='Port for the JSON /stats endpoint, 0 to disable '
+                 '(default: VOICE_PROXY_STATS_PORT or 8002)',
+        )
+        parser.add_argument(
+            '--drain-timeout',
+            type=int,
+            default=None,
+            help='Seconds active sessions get to finish after SIGTERM '
+                 '(default: VOICE_PROXY_DRAIN_TIMEOUT_SEC or 300)',
+        )
 
     def handle(self, *args, **options):
         import os
         os.environ['VOICE_PROXY_HOST'] = options['host']
         os.environ['VOICE_PROXY_PORT'] = str(options['port'])
+        overrides = {
+            'VOICE_PROXY_WORKERS': options['workers'],
+            'VOICE_PROXY_MAX_SESSIONS': options['max_sessions'],
+            'VOICE_PROXY_STATS_PORT': options['stats_port'],
+            'VOICE_PROXY_DRAIN_TIMEOUT_SEC': options['drain_timeout'],
+        }
+        for name, value in overrides.items():
+            if value is not None:
+                os.environ[name] = str(value)
 
         self.stdout.write(self.style.SUCCESS(
             f"Starting voice proxy on ws://{options['host']}:{options['port']}"
@@ -0,0 +1,178 @@
+"""
+Server-side screenshot stage for the voice proxy.
+
+Browsers send a JPEG of the app every few seconds; most of them show the same
+screen as the last one, and all of them are larger than Gemini needs. For each
+session ``ScreenFramePipeline``:
+
+  1. decides whether a frame may be sent at all: not while the user was just
+     speaking, and not sooner than an interval that stretches when upstream
+     sends are slow and shrinks back when they are fast;
+  2. downsizes the frame to fit VOICE_PROXY_SCREEN_MAX_SIDE (Gemini bills
+     images by 768 px tile, so one tile is the sweet spot) and computes a
+     64-bit difference hash on it;
+  3. drops the frame if the hash is within SCREEN_UNCHANGED_DISTANCE bits of the
+     last frame sent, otherwise re-encodes it as JPEG (unless it already was a
+     small enough JPEG), lowering quality until it fits
+     VOICE_PROXY_SCREEN_MAX_BYTES.
+
+Frames larger than VOICE_PROXY_SCREEN_MAX_PIXELS are rejected from their
+header, before any pixel data is decoded.
+
+Decoding and encoding run in a worker thread so audio relay never waits on it.
+"""
+
+import asyncio
+import base64
+import binascii
+import io
+import os
+
+from PIL import Image, UnidentifiedImageError
+
+SCREEN_MAX_SIDE = int(os.getenv('VOICE_PROXY_SCREEN_MAX_SIDE', '768'))
+SCREEN_MAX_BYTES = int(os.getenv('VOICE_PROXY_SCREEN_MAX_BYTES', str(60 * 1024)))
+# Larger than any real screen (8K); decoding a bigger frame could exhaust memory.
+SCREEN_MAX_PIXELS = int(os.getenv('VOICE_PROXY_SCREEN_MAX_PIXELS', str(7680 * 4320)))
+SCREEN_JPEG_QUALITIES = (70, 55, 40, 30)
+# Hamming distance (of 64 bits) below which two frames count as the same screen.
+SCREEN_UNCHANGED_DISTANCE = 4
+HASH_SIZE = 8
+
+SCREEN_MIN_INTERVAL_SEC = float(os.getenv('VOICE_PROXY_SCREEN_MIN_INTERVAL_SEC', '8'))
+SCREEN_MAX_INTERVAL_SEC = float(os.getenv('VOICE_PROXY_SCREEN_MAX_INTERVAL_SEC', '30'))
+# Screens are not sent this soon after the last audio chunk.
+AUDIO_PRIORITY_SEC = 2.0
+# Upstream send latency at which the interval starts to stretch.
+SLOW_SEND_SEC = 0.25
+LATENCY_SMOOTHING = 0.3
+
+# Gemini image token cost: one 258-token tile per started 768x768 block.
+TOKENS_PER_TILE = 258
+TILE_SIDE = 768
+
+
+def difference_hash(image):
+    """64-bit dHash: each bit says whether a pixel is brighter than its right neighbour."""
+    small = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(left, right):
+    return bin(left ^ right).count('1')
+
+
+def estimate_image_tokens(width, height):
+    if width <= 384 and height <= 384:
+        return TOKENS_PER_TILE
+    tiles = -(-width // TILE_SIDE) * -(-height // TILE_SIDE)
+    return tiles * TOKENS_PER_TILE
+
+
+def _encode_jpeg(image, max_bytes):
+    data = b''
+    for quality in SCREEN_JPEG_QUALITIES:
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=quality, optimize=True)
+        data = buffer.getvalue()
+        if len(data) <= max_bytes:
+            break
+    return data
+
+
+def prepare_frame(frame_b64, last_hash=None, max_side=SCREEN_MAX_SIDE, max_bytes=SCREEN_MAX_BYTES,
+                  max_pixels=SCREEN_MAX_PIXELS):
+    """
+    Decode, downsize and hash one base64 frame.
+
+    Returns (jpeg_bytes, frame_hash, tokens). An undecodable or oversized frame
+    gives (None, None, 0); one that matches ``last_hash`` gives (None, last_hash, 0).
+    """
+    try:
+        raw = base64.b64decode(frame_b64, validate=True)
+        image = Image.open(io.BytesIO(raw))
+        # Image.open only reads the header, so this is checked before decoding.
+        if image.size[0] * image.size[1] > max_pixels:
+            return None, None, 0
+        # Frames already small enough go out as they are; re-encoding would only grow them.
+        within_budget = (
+            image.format == 'JPEG' and max(image.size) <= max_side and len(raw) <= max_bytes)
+        image.draft('RGB', (max_side, max_side))  # cheap JPEG DCT downscale
+        image = image.convert('RGB')
+    except (binascii.Error, UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError):
+        return None, None, 0
+
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    frame_hash = difference_hash(image)
+    if last_hash is not None and hamming_distance(frame_hash, last_hash) <= SCREEN_UNCHANGED_DISTANCE:
+        return None, last_hash, 0
+    jpeg = raw if within_budget else _encode_jpeg(image, max_bytes)
+    return jpeg, frame_hash, estimate_image_tokens(*image.size)
+
+
+class ScreenFramePipeline:
+    """Per-session screenshot state; see the module docstring. Used from the event loop."""
+
+    def __init__(self):
+        self.last_hash = None
+        self.last_sent_at = None
+        self.send_latency = 0.0
+        self.busy = False
+        self.frames_in = 0
+        self.frames_sent = 0
+        self.frames_unchanged = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.image_tokens = 0
+        self._pending = None
+
+    @property
+    def interval(self):
+        """Minimum gap between sends, stretched by how slow upstream sends have been."""
+        factor = max(1.0, self.send_latency / SLOW_SEND_SEC)
+        return min(SCREEN_MAX_INTERVAL_SEC, SCREEN_MIN_INTERVAL_SEC * factor)
+
+    def accept(self, now, last_audio_at, size):
+        """Count an incoming frame; True if it may be processed and sent now."""
+        self.frames_in += 1
+        self.bytes_in += size
+        if self.busy or (now - last_audio_at) < AUDIO_PRIORITY_SEC:
+            return False
+        return self.last_sent_at is None or (now - self.last_sent_at) >= self.interval
+
+    async def prepare(self, frame_b64):
+        """The JPEG to send for this frame, or None to skip it."""
+        jpeg, frame_hash, tokens = await asyncio.to_thread(prepare_frame, frame_b64, self.last_hash)
+        if jpeg is None:
+            if frame_hash is not None:
+                self.frames_unchanged += 1
+            return None
+        self._pending = (frame_hash, tokens)
+        return jpeg
+
+    def record_send(self, now, size, latency):
+        """The prepared frame reached Gemini: it becomes the reference for dedup."""
+        if self._pending is not None:
+            self.last_hash, tokens = self._pending
+            self.image_tokens += tokens
+            self._pending = None
+        self.last_sent_at = now
+        self.frames_sent += 1
+        self.bytes_out += size
+        self.send_latency += LATENCY_SMOOTHING * (latency - self.send_latency)
+
+    def summary(self):
+        return {
+            'frames_in': self.frames_in,
+            'frames_sent': self.frames_sent,
+            'frames_unchanged': self.frames_unchanged,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'image_tokens': self.image_tokens,
+        }
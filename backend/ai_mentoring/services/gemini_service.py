@@ -5,14 +5,12 @@ Handles prompt construction, API calls, and strict JSON response parsing.
 import json
 import logging
 import requests
-from django.conf import settings
+
+from backend import gemini_client
 
 logger = logging.getLogger(__name__)
 
-GEMINI_API_URL = (
-    'https://generativelanguage.googleapis.com/v1beta/models/'
-    'gemini-2.5-flash-lite:generateContent'
-)
+GEMINI_MODEL = 'gemini-2.5-flash-lite'
 
 SYSTEM_PROMPT = """You are an empathetic, highly skilled AI mentor for students and professionals.
 Your role is to:
@@ -138,7 +136,7 @@ def get_mentor_response(transcript, context_source, student_goal, current_progre
     Main entry point. Builds prompt, calls Gemini, parses response.
     Returns a structured dict with mentoring data.
     """
-    api_key = getattr(settings, 'GEMINI_API_KEY', None)
+    api_key = gemini_client.get_api_key()
     if not api_key:
         logger.error("GEMINI_API_KEY not configured")
         fallback = get_fallback_response()
@@ -169,14 +167,8 @@ def get_mentor_response(transcript, context_source, student_goal, current_progre
     }
 
     try:
-        response = requests.post(
-            f'{GEMINI_API_URL}?key={api_key}',
-            json=payload,
-            timeout=30,
-        )
-        response.raise_for_status()
-
-        result = response.json()
+        result = gemini_client.generate_content(
+            GEMINI_MODEL, payload, timeout=30, api_key=api_key)
         ai_text = (
             result.get('candidates', [{}])[0]
             .get('content', {})
@@ -0,0 +1,18 @@
+"""
+Bump the user's ``users.user_cache`` version when a mentoring session is
+written, so the cached ``voice_config`` memory picks it up on the next call.
+Profile and user writes are already covered by ``assistant.signals``.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.user_cache import invalidate_user_cache
+
+from .models import StudentSession
+
+
+@receiver(post_save, sender=StudentSession, dispatch_uid='voice_config_session_save')
+@receiver(post_delete, sender=StudentSession, dispatch_uid='voice_config_session_delete')
+def invalidate_voice_config(sender, instance, **kwargs):
+    invalidate_user_cache(instance.user_id)
@@ -1,4 +1,17 @@
+import asyncio
+import base64
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import websockets
+from PIL import Image, ImageDraw
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from websockets.protocol import State
 from django.contrib.auth import get_user_model
 from typing import cast
 from rest_framework.test import APIClient
@@ -74,3 +87,341 @@ class MentoringAPITest(TestCase):
             'transcript': 'Hello',
         }))
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class VoiceProxyFramingTests(TestCase):
+    def setUp(self):
+        from ai_mentoring import voice_server
+        self.voice_server = voice_server
+
+    def test_binary_pcm_is_spliced_into_realtime_envelope(self):
+        envelope = self.voice_server._audio_envelope(pcm=b'\x01\x02\x03\x04')
+
+        self.assertEqual(json.loads(envelope), {
+            'realtimeInput': {'mediaChunks': [{
+                'mimeType': 'audio/pcm;rate=16000',
+                'data': base64.b64encode(b'\x01\x02\x03\x04').decode(),
+            }]},
+        })
+
+    def test_legacy_audio_must_be_base64_to_be_spliced(self):
+        self.assertIsNotNone(self.voice_server._audio_envelope(audio_b64='QUJD'))
+        self.assertIsNone(self.voice_server._audio_envelope(audio_b64='QU"}]}'))
+
+    def test_gemini_frame_parses_skeleton_and_keeps_audio_bytes(self):
+        frame = json.dumps({
+            'serverContent': {
+                'modelTurn': {'parts': [
+                    {'inlineData': {'mimeType': 'audio/pcm;rate=24000', 'data': 'QUJD'}},
+                    {'text': 'said "data":"x"'},
+                ]},
+                'turnComplete': True,
+            },
+        }, separators=(',', ':')).encode()
+
+        data, blobs = self.voice_server._parse_gemini_frame(frame)
+        parts = data['serverContent']['modelTurn']['parts']
+        audio = self.voice_server._inline_blob(parts[0]['inlineData']['data'], blobs)
+        client_frame = self.voice_server._client_audio_frame(audio, 'audio/pcm;rate=24000')
+
+        self.assertEqual(blobs, [b'QUJD'])
+        self.assertEqual(parts[1]['text'], 'said "data":"x"')
+        self.assertTrue(data['serverContent']['turnComplete'])
+        self.assertEqual(json.loads(client_frame), {
+            'type': 'audio', 'data': 'QUJD', 'mimeType': 'audio/pcm;rate=24000'})
+
+    def test_unusual_data_values_fall_back_to_full_parse(self):
+        frame = '{"error":{"data":"a\\"b","message":"bad"}}'
+
+        data, blobs = self.voice_server._parse_gemini_frame(frame)
+
+        self.assertEqual(blobs, [])
+        self.assertEqual(data['error']['data'], 'a"b')
+
+
+class VoiceProxyStatsTests(TestCase):
+    def setUp(self):
+        from ai_mentoring import voice_server
+        self.voice_server = voice_server
+        patcher = patch.object(voice_server, 'STATS', voice_server.ProxyStats())
+        self.stats = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _process_request(self):
+        connection = MagicMock()
+        connection.respond.return_value = SimpleNamespace(headers={})
+        return connection, self.voice_server._reject_when_busy(connection, None)
+
+    def test_full_worker_answers_busy_with_retry_after(self):
+        with patch.object(self.voice_server, 'MAX_SESSIONS_PER_WORKER', 2):
+            self.stats.active_sessions = 1
+            _, accepted = self._process_request()
+            self.stats.active_sessions = 2
+            connection, rejected = self._process_request()
+
+        self.assertIsNone(accepted)
+        self.assertEqual(connection.respond.call_args[0][0], 503)
+        self.assertEqual(rejected.headers['Retry-After'], '2')
+        self.assertEqual(self.stats.rejected_busy, 1)
+
+    def test_draining_worker_rejects_new_sessions(self):
+        self.stats.draining = True
+
+        _, response = self._process_request()
+
+        self.assertIsNotNone(response)
+
+    def test_snapshot_reports_bytes_and_p95_relay_lag(self):
+        for ms in range(1, 101):
+            self.stats.record_relay(ms % 2 == 0, 10, ms / 1000)
+
+        snapshot = self.stats.snapshot()
+
+        self.assertEqual(snapshot['bytes_to_gemini'], 500)
+        self.assertEqual(snapshot['bytes_to_client'], 500)
+        self.assertEqual(snapshot['relay_lag_p95_ms'], 96.0)
+
+    def test_aggregate_sums_workers_and_keeps_worst_p95(self):
+        first = dict(self.stats.snapshot(), active_sessions=3, relay_lag_p95_ms=4.0)
+        second = dict(self.stats.snapshot(), active_sessions=5, relay_lag_p95_ms=9.5)
+
+        totals = self.voice_server._aggregate_stats({1: second, 0: first})
+
+        self.assertEqual(totals['active_sessions'], 8)
+        self.assertEqual(totals['relay_lag_p95_ms'], 9.5)
+        self.assertEqual([w['worker'] for w in totals['workers']], [0, 1])
+
+
+class VoiceConfigCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='voiceuser',
+            email='voice@example.com',
+            password='testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _config(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = cast(Response, self.client.get('/api/ai-mentoring/voice/config/'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data, len(ctx)
+
+    def test_session_context_is_cached_until_a_session_is_saved(self):
+        first, cold_queries = self._config()
+        _, warm_queries = self._config()
+
+        StudentSession.objects.create(
+            user=self.user, context_source='roadmap', transcript='Hi',
+            mentor_message='Hello', session_summary='Talked about roadmap.')
+        refreshed, _ = self._config()
+
+        self.assertEqual(first['session_memory'], [])
+        self.assertLess(warm_queries, cold_queries)
+        self.assertEqual(
+            [m['session_summary'] for m in refreshed['session_memory']],
+            ['Talked about roadmap.'],
+        )
+        self.assertIn('ws_url', refreshed)
+
+
+class FakeUpstream:
+    def __init__(self):
+        self.state = State.OPEN
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+        self.state = State.CLOSED
+
+
+class VoiceProxyUpstreamTests(TestCase):
+    def setUp(self):
+        from ai_mentoring import voice_server
+        self.voice_server = voice_server
+        patcher = patch.object(voice_server, 'STATS', voice_server.ProxyStats())
+        self.stats = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_setup_template_matches_a_full_dump(self):
+        setup_data = {
+            'contextSource': 'roadmap',
+            'studentGoal': 'Ship "v1"',
+            'onboardingContext': {'full_name': 'Zoë'},
+            'sessionMemory': [{'session_summary': 'Planned week 1.'}],
+        }
+
+        message = json.loads(self.voice_server._setup_message(
+            'Kore\x00', self.voice_server._session_system_text(setup_data)))
+
+        setup = message['setup']
+        text = setup['systemInstruction']['parts'][0]['text']
+        self.assertEqual(
+            setup['generationConfig']['speechConfig']['voiceConfig']
+            ['prebuiltVoiceConfig']['voiceName'], 'Kore\x00')
+        self.assertTrue(text.startswith(self.voice_server.VOICE_SYSTEM_PROMPT))
+        self.assertIn("'roadmap' section", text)
+        self.assertIn('Ship "v1"', text)
+        self.assertIn('- Name: Zoë', text)
+        self.assertTrue(text.endswith('Session 1: Planned week 1.\n[End of memory]'))
+
+    def test_pool_hands_out_warm_sockets_and_replaces_stale_ones(self):
+        opened = []
+
+        async def connect():
+            upstream = FakeUpstream()
+            opened.append(upstream)
+            return upstream
+
+        async def scenario():
+            pool = self.voice_server.GeminiUpstreamPool(size=2, max_idle_sec=30)
+            pool.start()
+            await asyncio.sleep(0.01)
+            first, first_pooled = await pool.acquire()
+            await asyncio.sleep(0.01)
+            pool._idle[0][1].state = State.CLOSED
+            second, second_pooled = await pool.acquire()
+            await asyncio.sleep(0.01)
+            idle = len(pool._idle)
+            await pool.close()
+            return first, first_pooled, second, second_pooled, idle
+
+        with patch.object(self.voice_server, '_connect_gemini', side_effect=connect):
+            first, first_pooled, second, second_pooled, idle = asyncio.run(scenario())
+
+        self.assertTrue(first_pooled)
+        self.assertTrue(second_pooled)
+        self.assertIs(second.state, State.OPEN)
+        self.assertEqual(idle, 2)
+        self.assertEqual(self.stats.pool_hits, 2)
+        self.assertEqual(len(opened), 5)
+        # Everything the pool still owned (the stale socket, the idle ones) is closed.
+        self.assertTrue(all(u.closed for u in opened if u not in (first, second)))
+
+    def test_closed_pooled_socket_is_retried_on_a_fresh_connection(self):
+        stale, fresh = MagicMock(), MagicMock()
+        stale.send.side_effect = websockets.exceptions.ConnectionClosed(None, None)
+        fresh.send = AsyncMock()
+        fresh.recv = AsyncMock(return_value='{"setupComplete": {}}')
+        pool = MagicMock()
+        pool.acquire = AsyncMock(return_value=(stale, True))
+
+        with patch.object(self.voice_server, 'UPSTREAM_POOL', pool), \
+                patch.object(self.voice_server, '_connect_gemini', AsyncMock(return_value=fresh)):
+            upstream, response = asyncio.run(self.voice_server._start_upstream(b'{}'))
+
+        self.assertIs(upstream, fresh)
+        self.assertEqual(response, '{"setupComplete": {}}')
+        self.assertEqual(self.stats.upstream_setup_ms.snapshot()['count'], 1)
+
+    def test_histograms_merge_across_workers(self):
+        self.stats.upstream_connect_ms.observe(30)
+        self.stats.upstream_connect_ms.observe(5000)
+        other = self.voice_server.ProxyStats()
+        other.upstream_connect_ms.observe(10)
+
+        totals = self.voice_server._aggregate_stats(
+            {0: self.stats.snapshot(), 1: other.snapshot()})
+
+        merged = totals['upstream_connect_ms']
+        self.assertEqual(merged['count'], 3)
+        self.assertEqual(merged['buckets']['le_25'], 1)
+        self.assertEqual(merged['buckets']['le_50'], 1)
+        self.assertEqual(merged['buckets']['le_6400'], 1)
+
+
+def _screen_b64(size=(1920, 1080), caption='Roadmap', columns=12, quality=90):
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    for index in range(columns):
+        left = index * size[0] // columns
+        draw.rectangle(
+            [left, size[1] // 4, left + size[0] // (2 * columns), size[1] - 40], fill=(index * 20,) * 3)
+    draw.text((40, 40), caption, fill='black')
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=quality)
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+class ScreenFramePipelineTests(TestCase):
+    def setUp(self):
+        from ai_mentoring import screen_frames
+        self.screen_frames = screen_frames
+
+    def test_large_frame_is_downsized_to_one_tile_within_budget(self):
+        jpeg, frame_hash, tokens = self.screen_frames.prepare_frame(_screen_b64())
+
+        image = Image.open(io.BytesIO(jpeg))
+        self.assertEqual(image.size, (768, 432))
+        self.assertLessEqual(len(jpeg), self.screen_frames.SCREEN_MAX_BYTES)
+        self.assertEqual(tokens, 258)
+        self.assertIsNotNone(frame_hash)
+
+    def test_small_browser_frame_is_passed_through(self):
+        frame = _screen_b64(size=(672, 378), quality=45)
+
+        jpeg, _, _ = self.screen_frames.prepare_frame(frame)
+
+        self.assertEqual(jpeg, base64.b64decode(frame))
+
+    def test_unchanged_screen_is_dropped_and_a_new_one_is_sent(self):
+        _, frame_hash, _ = self.screen_frames.prepare_frame(_screen_b64())
+
+        same = self.screen_frames.prepare_frame(_screen_b64(caption='Roadmap.'), frame_hash)
+        other = self.screen_frames.prepare_frame(_screen_b64(columns=5), frame_hash)
+
+        self.assertEqual(same, (None, frame_hash, 0))
+        self.assertIsNotNone(other[0])
+        self.assertNotEqual(other[1], frame_hash)
+
+    def test_undecodable_frame_is_skipped(self):
+        self.assertEqual(self.screen_frames.prepare_frame('not base64!'), (None, None, 0))
+        self.assertEqual(
+            self.screen_frames.prepare_frame(base64.b64encode(b'plain text').decode()), (None, None, 0))
+
+    def test_oversized_frame_is_rejected_before_decoding(self):
+        frame = _screen_b64(size=(1920, 1080))
+        with patch.object(Image.Image, 'convert') as convert:
+            result = self.screen_frames.prepare_frame(frame, max_pixels=1920 * 1080 - 1)
+        self.assertEqual(result, (None, None, 0))
+        convert.assert_not_called()
+
+        with patch.object(Image, 'MAX_IMAGE_PIXELS', 1000):
+            self.assertEqual(self.screen_frames.prepare_frame(frame), (None, None, 0))
+
+    def test_interval_stretches_with_slow_sends_and_yields_to_audio(self):
+        pipeline = self.screen_frames.ScreenFramePipeline()
+        minimum = self.screen_frames.SCREEN_MIN_INTERVAL_SEC
+
+        self.assertFalse(pipeline.accept(100.0, last_audio_at=99.5, size=10))
+        self.assertTrue(pipeline.accept(100.0, last_audio_at=90.0, size=10))
+        pipeline.record_send(100.0, 5, latency=2.0)
+        self.assertGreater(pipeline.interval, minimum)
+        self.assertFalse(pipeline.accept(100.0 + minimum, last_audio_at=0.0, size=10))
+        for _ in range(30):
+            pipeline.record_send(100.0, 5, latency=0.01)
+        self.assertEqual(pipeline.interval, minimum)
+        pipeline.busy = True
+        self.assertFalse(pipeline.accept(1000.0, last_audio_at=0.0, size=10))
+
+    def test_session_totals_are_folded_into_proxy_stats(self):
+        from ai_mentoring import voice_server
+        pipeline = self.screen_frames.ScreenFramePipeline()
+        frame = _screen_b64()
+        for _ in range(2):
+            pipeline.accept(0.0, last_audio_at=-10.0, size=len(frame))
+            jpeg = asyncio.run(pipeline.prepare(frame))
+            if jpeg is not None:
+                pipeline.record_send(0.0, len(jpeg), latency=0.05)
+        stats = voice_server.ProxyStats()
+
+        stats.record_screens(pipeline)
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['screen_frames_in'], 2)
+        self.assertEqual(snapshot['screen_frames_sent'], 1)
+        self.assertEqual(snapshot['screen_frames_unchanged'], 1)
+        self.assertEqual(snapshot['screen_image_tokens'], 258)
+        self.assertLess(snapshot['screen_bytes_out'], snapshot['screen_bytes_in'])
@@ -6,6 +6,8 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from users.user_cache import get_or_compute
+
 from .models import StudentSession
 from .serializers import SessionRequestSerializer, StudentSessionSerializer
 from .services.memory_service import get_recent_sessions
@@ -13,6 +15,8 @@ from .services.gemini_service import get_mentor_response
 
 logger = logging.getLogger(__name__)
 
+VOICE_CONFIG_CACHE_TTL_SEC = int(os.getenv('VOICE_CONFIG_CACHE_TTL_SEC', '600'))
+
 ONBOARDING_HIGHLIGHT_KEYS = {
     'life_stage': 'Life stage',
     'school_class': 'School class',
@@ -227,6 +231,15 @@ def list_sessions(request):
     return Response(serializer.data)
 
 
+def _compute_voice_session_context(user: Any) -> Dict[str, Any]:
+    onboarding_context = _build_onboarding_context(user)
+    return {
+        'session_memory': get_recent_sessions(user, limit=3),
+        'onboarding_context': onboarding_context,
+        'auto_intro_prompt': _build_auto_intro_prompt(onboarding_context),
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def voice_config(request):
@@ -256,16 +269,18 @@ def voice_config(request):
                 scheme = 'wss' if request.is_secure() else 'ws'
                 public_url = f'{scheme}://{req_host}/ws/voice'
 
-    # Fetch recent sessions for memory context
-    session_memory = get_recent_sessions(request.user, limit=3)
-    onboarding_context = _build_onboarding_context(request.user)
-    auto_intro_prompt = _build_auto_intro_prompt(onboarding_context)
+    # Memory and onboarding context, cached per user; StudentSession and profile
+    # writes bump the user's cache version (see ai_mentoring.signals).
+    session_context = get_or_compute(
+        'voice_config',
+        request.user,
+        lambda: _compute_voice_session_context(request.user),
+        timeout=VOICE_CONFIG_CACHE_TTL_SEC,
+    )
 
     return Response({
         'ws_url': public_url,
-        'session_memory': session_memory,
-        'onboarding_context': onboarding_context,
-        'auto_intro_prompt': auto_intro_prompt,
+        **session_context,
         'available_voices': [
             {'id': 'Aoede', 'name': 'Aoede', 'description': 'Warm and bright'},
             {'id': 'Charon', 'name': 'Charon',
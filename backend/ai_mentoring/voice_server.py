@@ -7,17 +7,47 @@ Keeps the GEMINI_API_KEY server-side — the frontend never sees it.
 Protocol:
   1. Client connects to ws://localhost:8001/ws/voice
   2. Client sends a JSON setup message with system instructions & config
-  3. Client streams audio chunks (base64 PCM16 @ 16kHz) and optional screenshots
+  3. Client streams audio chunks (binary frames of raw PCM16 @ 16kHz, or the
+     legacy JSON {"type": "audio", "data": <base64>}) and optional screenshots
   4. Server proxies everything to Gemini Live API and relays responses back
   5. Client receives audio chunks (base64 PCM16 @ 24kHz) and text transcripts
+
+Audio is the hot path, so it skips the JSON round trips: browser PCM is
+base64-encoded straight into a pre-serialized realtimeInput envelope, and
+Gemini frames have their base64 "data" strings cut out before parsing, so only
+the small skeleton goes through json.loads and the payload bytes are spliced
+unchanged into the frame sent to the browser.
+
+Scaling: with VOICE_PROXY_WORKERS > 1 (or 0 for one per core) ``main`` becomes
+a supervisor that spawns worker processes sharing the port via SO_REUSEPORT,
+restarts any that die and aggregates their stats. Each worker turns away new
+connections with HTTP 503 + Retry-After once it holds VOICE_PROXY_MAX_SESSIONS
+sessions. SIGTERM drains: listeners close, active sessions get up to
+VOICE_PROXY_DRAIN_TIMEOUT_SEC to finish. SIGINT stops immediately. Counters
+(active sessions, bytes relayed, p95 relay lag) are served as JSON on
+VOICE_PROXY_STATS_HOST:VOICE_PROXY_STATS_PORT (0 disables), along with
+histograms of upstream connect and setup latency.
+
+Session start: each worker keeps VOICE_PROXY_POOL_SIZE Gemini sockets that
+have already done the TCP/TLS/WebSocket handshakes, so a session only pays
+for the setup round trip. The setup message is built from a template in which
+the static VOICE_SYSTEM_PROMPT is already serialized.
 """
 
 import asyncio
+import base64
+import bisect
+import collections
+import functools
 import json
 import logging
+import multiprocessing
 import os
+import re
 import signal
 import sys
+import time
+from http import HTTPStatus
 from pathlib import Path
 
 # Load Django .env so we can read GEMINI_API_KEY
@@ -28,11 +58,17 @@ if ENV_PATH.exists():
 
 try:
     import websockets
+    from websockets.protocol import State
 except ImportError:
     sys.stderr.write(
         "ERROR: 'websockets' package is required. Install it with: pip install websockets\n")
     sys.exit(1)
 
+try:
+    from ai_mentoring.screen_frames import ScreenFramePipeline
+except ImportError:  # run as a script: python ai_mentoring/voice_server.py
+    from screen_frames import ScreenFramePipeline
+
 logger = logging.getLogger('voice_proxy')
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s [%(levelname)s] %(message)s')
@@ -133,9 +169,32 @@ ASSISTANT (Text Chat)
 You are their co-pilot inside Planora. Be helpful, be precise, be natural."""
 
 DEFAULT_VOICE = 'Aoede'  # Gemini built-in voice
+GEMINI_LIVE_MODEL = 'models/gemini-live-2.5-flash-native-audio'
+# Placeholder where the per-session system text is spliced into the setup template.
+SETUP_TEXT_SLOT = '\x00'
+GEMINI_CONNECT_KWARGS = {
+    'additional_headers': {'Content-Type': 'application/json'},
+    'max_size': 16 * 1024 * 1024,  # 16 MB
+    'max_queue': 2,  # Keep small queue for faster response
+    'ping_interval': 20,  # More frequent heartbeat for stability
+    'ping_timeout': 5,  # Faster timeout detection
+    'compression': None,  # Disable compression for lower latency
+}
 
 PROXY_HOST = os.getenv('VOICE_PROXY_HOST', 'localhost')
 PROXY_PORT = int(os.getenv('VOICE_PROXY_PORT', '8001'))
+PROXY_WORKERS = int(os.getenv('VOICE_PROXY_WORKERS', '1'))
+MAX_SESSIONS_PER_WORKER = int(os.getenv('VOICE_PROXY_MAX_SESSIONS', '200'))
+BUSY_RETRY_AFTER_SEC = 2
+DRAIN_TIMEOUT_SEC = int(os.getenv('VOICE_PROXY_DRAIN_TIMEOUT_SEC', '300'))
+STATS_HOST = os.getenv('VOICE_PROXY_STATS_HOST', '127.0.0.1')
+STATS_PORT = int(os.getenv('VOICE_PROXY_STATS_PORT', '8002'))
+STATS_PUSH_INTERVAL_SEC = 1.0
+WORKER_RESTART_BACKOFF_SEC = 5.0
+# Pre-connected Gemini sockets kept per worker (0 disables the pool).
+POOL_SIZE = int(os.getenv('VOICE_PROXY_POOL_SIZE', '2'))
+POOL_MAX_IDLE_SEC = float(os.getenv('VOICE_PROXY_POOL_MAX_IDLE_SEC', '30'))
+POOL_RETRY_SEC = 5.0
 
 # Allowed WebSocket origins (comma-separated). Leave empty to allow all (dev only).
 _ALLOWED_ORIGINS_RAW = os.getenv('VOICE_PROXY_ALLOWED_ORIGINS', '')
@@ -148,6 +207,114 @@ CLIENT_IDLE_TIMEOUT_SEC = 75
 CLIENT_SETUP_TIMEOUT_SEC = int(os.getenv('VOICE_PROXY_CLIENT_SETUP_TIMEOUT_SEC', '10'))
 GEMINI_SETUP_TIMEOUT_SEC = int(os.getenv('VOICE_PROXY_GEMINI_SETUP_TIMEOUT_SEC', '20'))
 MAX_INITIAL_PROMPT_CHARS = 3000
+MAX_AUDIO_BYTES = MAX_AUDIO_BASE64_CHARS * 3 // 4
+
+AUDIO_ENVELOPE_PREFIX = (
+    b'{"realtimeInput":{"mediaChunks":[{"mimeType":"audio/pcm;rate=16000","data":"')
+AUDIO_ENVELOPE_SUFFIX = b'"}]}}'
+CLIENT_AUDIO_PREFIX = b'{"type":"audio","data":"'
+INLINE_DATA_MARKER = '"data":"'
+INLINE_DATA_PLACEHOLDER = '#'
+_BASE64_RE = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+
+
+SCREEN_STATS = (
+    'screen_frames_in', 'screen_frames_sent', 'screen_frames_unchanged',
+    'screen_bytes_in', 'screen_bytes_out', 'screen_image_tokens',
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; buckets of several workers can simply be added."""
+
+    BUCKETS_MS = (25, 50, 100, 200, 400, 800, 1600, 3200, 6400)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.sum_ms = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+        self.sum_ms += ms
+
+    def snapshot(self):
+        labels = [f'le_{bound}' for bound in self.BUCKETS_MS] + ['inf']
+        return {
+            'count': sum(self.counts),
+            'sum_ms': round(self.sum_ms, 1),
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+def _merge_histograms(snapshots):
+    merged = {'count': 0, 'sum_ms': 0.0, 'buckets': {}}
+    for snapshot in snapshots:
+        merged['count'] += snapshot['count']
+        merged['sum_ms'] = round(merged['sum_ms'] + snapshot['sum_ms'], 1)
+        for label, count in snapshot['buckets'].items():
+            merged['buckets'][label] = merged['buckets'].get(label, 0) + count
+    return merged
+
+
+class ProxyStats:
+    """Per-process relay counters. Only touched from the event loop thread."""
+
+    LAG_SAMPLES = 2048
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.rejected_busy = 0
+        self.bytes_to_gemini = 0
+        self.bytes_to_client = 0
+        self.draining = False
+        self.pool_hits = 0
+        self.pool_misses = 0
+        self.upstream_connect_ms = LatencyHistogram()
+        self.upstream_setup_ms = LatencyHistogram()
+        self.screens = dict.fromkeys(SCREEN_STATS, 0)
+        self._relay_lag_ms = collections.deque(maxlen=self.LAG_SAMPLES)
+
+    def record_relay(self, to_gemini, size, lag_sec):
+        if to_gemini:
+            self.bytes_to_gemini += size
+        else:
+            self.bytes_to_client += size
+        self._relay_lag_ms.append(lag_sec * 1000)
+
+    def record_screens(self, pipeline):
+        for key, value in pipeline.summary().items():
+            self.screens[f'screen_{key}'] += value
+
+    def snapshot(self):
+        lags = sorted(self._relay_lag_ms)
+        p95 = lags[min(len(lags) - 1, int(len(lags) * 0.95))] if lags else 0.0
+        return {
+            'pid': os.getpid(),
+            'uptime_sec': round(time.time() - self.started_at),
+            'active_sessions': self.active_sessions,
+            'max_sessions': MAX_SESSIONS_PER_WORKER,
+            'total_sessions': self.total_sessions,
+            'rejected_busy': self.rejected_busy,
+            'bytes_to_gemini': self.bytes_to_gemini,
+            'bytes_to_client': self.bytes_to_client,
+            'relay_lag_p95_ms': round(p95, 2),
+            'draining': self.draining,
+            'pool_hits': self.pool_hits,
+            'pool_misses': self.pool_misses,
+            'upstream_connect_ms': self.upstream_connect_ms.snapshot(),
+            'upstream_setup_ms': self.upstream_setup_ms.snapshot(),
+            **self.screens,
+        }
+
+
+STATS = ProxyStats()
+SUMMED_STATS = (
+    'active_sessions', 'max_sessions', 'total_sessions', 'rejected_busy',
+    'bytes_to_gemini', 'bytes_to_client', 'pool_hits', 'pool_misses', *SCREEN_STATS,
+)
+HISTOGRAM_STATS = ('upstream_connect_ms', 'upstream_setup_ms')
 
 
 def _safe_json_loads(raw):
@@ -159,6 +326,79 @@ def _safe_json_loads(raw):
         return None
 
 
+def _audio_envelope(pcm=None, audio_b64=None):
+    """Gemini realtimeInput message for one 16 kHz PCM chunk, without json.dumps."""
+    if pcm is not None:
+        payload = base64.b64encode(pcm)
+    elif isinstance(audio_b64, str) and _BASE64_RE.fullmatch(audio_b64):
+        payload = audio_b64.encode('ascii')
+    else:
+        return None
+    return b''.join((AUDIO_ENVELOPE_PREFIX, payload, AUDIO_ENVELOPE_SUFFIX))
+
+
+def _split_inline_data(raw):
+    """
+    Cut every "data" string value out of a Gemini frame.
+
+    Returns (skeleton, blobs): the frame with each value replaced by a numbered
+    placeholder, and the original values in order. Base64 never contains a
+    quote or backslash, so the value ends at the next quote; anything else
+    aborts and the caller parses the whole frame.
+    """
+    binary = isinstance(raw, bytes)
+    marker = INLINE_DATA_MARKER.encode() if binary else INLINE_DATA_MARKER
+    quote, backslash = (b'"', b'\\') if binary else ('"', '\\')
+    pieces = []
+    blobs = []
+    cursor = 0
+    while True:
+        start = raw.find(marker, cursor)
+        if start == -1:
+            break
+        start += len(marker)
+        end = raw.find(quote, start)
+        if end == -1 or raw.find(backslash, start, end) != -1:
+            return raw, []
+        pieces.append(raw[cursor:start])
+        placeholder = f'{INLINE_DATA_PLACEHOLDER}{len(blobs)}'
+        pieces.append(placeholder.encode() if binary else placeholder)
+        blobs.append(raw[start:end])
+        cursor = end
+    if not blobs:
+        return raw, []
+    pieces.append(raw[cursor:])
+    return raw[:0].join(pieces), blobs
+
+
+def _parse_gemini_frame(raw):
+    """Parse a Gemini frame with inline data values left out; see _split_inline_data."""
+    try:
+        skeleton, blobs = _split_inline_data(raw)
+        return json.loads(skeleton), blobs
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None, []
+
+
+def _inline_blob(value, blobs):
+    if (isinstance(value, str) and value.startswith(INLINE_DATA_PLACEHOLDER)
+            and value[1:].isdigit() and int(value[1:]) < len(blobs)):
+        return blobs[int(value[1:])]
+    return value
+
+
+def _client_audio_frame(data, mime_type):
+    if isinstance(data, str) and not _BASE64_RE.fullmatch(data):
+        return json.dumps({'type': 'audio', 'data': data, 'mimeType': mime_type})
+    return b''.join((
+        CLIENT_AUDIO_PREFIX,
+        data.encode('ascii') if isinstance(data, str) else data,
+        b'","mimeType":',
+        json.dumps(mime_type).encode('utf-8'),
+        b'}',
+    ))
+
+
 def _sanitize_text(value):
     if not isinstance(value, str):
         return ''
@@ -204,8 +444,197 @@ def _append_onboarding_context(system_text, onboarding_context):
     )
 
 
+def _session_system_text(setup_data):
+    """The per-session tail of the system instruction, appended to VOICE_SYSTEM_PROMPT."""
+    context_source = setup_data.get('contextSource', 'general')
+    student_goal = setup_data.get('studentGoal', '')
+    onboarding_context = setup_data.get('onboardingContext', {})
+
+    system_text = ''
+    if context_source:
+        system_text += f"\n\nThe student is currently in the '{context_source}' section of the platform."
+    if student_goal:
+        system_text += f"\nTheir current goal: {student_goal}"
+    system_text = _append_onboarding_context(system_text, onboarding_context)
+
+    # Include session memory if provided
+    memory = setup_data.get('sessionMemory', [])
+    if isinstance(memory, list) and memory:
+        system_text += "\n\n[Previous session memory]"
+        for i, m in enumerate(memory, 1):
+            summary = m.get('session_summary', 'N/A') if isinstance(m, dict) else 'N/A'
+            system_text += f"\nSession {i}: {summary}"
+        system_text += "\n[End of memory]"
+    return system_text
+
+
+@functools.lru_cache(maxsize=16)
+def _setup_template(voice_name):
+    """
+    Serialized setup message cut where the session text goes, so the large
+    static VOICE_SYSTEM_PROMPT is JSON-escaped once per voice, not per session.
+    """
+    message = json.dumps({
+        'setup': {
+            'model': GEMINI_LIVE_MODEL,
+            'generationConfig': {
+                'responseModalities': ['AUDIO'],
+                'speechConfig': {
+                    'voiceConfig': {
+                        'prebuiltVoiceConfig': {
+                            'voiceName': voice_name,
+                        }
+                    },
+                }
+            },
+            'systemInstruction': {
+                'parts': [{'text': VOICE_SYSTEM_PROMPT + SETUP_TEXT_SLOT}]
+            },
+        }
+    })
+    prefix, suffix = message.rsplit(json.dumps(SETUP_TEXT_SLOT)[1:-1], 1)
+    return prefix.encode('ascii'), suffix.encode('ascii')
+
+
+def _setup_message(voice_name, session_text):
+    prefix, suffix = _setup_template(voice_name)
+    return b''.join((prefix, json.dumps(session_text)[1:-1].encode('ascii'), suffix))
+
+
+async def _connect_gemini():
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    gemini_ws = await websockets.connect(GEMINI_WS_URL, **GEMINI_CONNECT_KWARGS)
+    STATS.upstream_connect_ms.observe((loop.time() - started) * 1000)
+    return gemini_ws
+
+
+class GeminiUpstreamPool:
+    """
+    Per-worker pool of Gemini Live sockets that have finished the TCP, TLS and
+    WebSocket handshakes but not setup: the setup message carries the session's
+    system instruction, so it can only be sent once a client arrives. Sockets
+    idle longer than ``max_idle_sec`` are closed and replaced.
+    """
+
+    def __init__(self, size, max_idle_sec):
+        self.size = size
+        self.max_idle_sec = max_idle_sec
+        self._idle = collections.deque()  # (opened_at, websocket), oldest first
+        self._wanted = None
+        self._task = None
+
+    def start(self):
+        if self.size > 0 and self._task is None:
+            self._wanted = asyncio.Event()
+            self._task = asyncio.ensure_future(self._maintain())
+
+    async def acquire(self):
+        """Return (websocket, pooled)."""
+        self._expire(asyncio.get_running_loop().time())
+        if self._wanted is not None:
+            self._wanted.set()
+        if self._idle:
+            STATS.pool_hits += 1
+            return self._idle.popleft()[1], True
+        if self._task is not None:
+            STATS.pool_misses += 1
+        return await _connect_gemini(), False
+
+    def _expire(self, now):
+        fresh = collections.deque()
+        for opened_at, gemini_ws in self._idle:
+            if now - opened_at < self.max_idle_sec and gemini_ws.state is State.OPEN:
+                fresh.append((opened_at, gemini_ws))
+            else:
+                asyncio.ensure_future(gemini_ws.close())
+        self._idle = fresh
+
+    async def _maintain(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._expire(loop.time())
+            missing = self.size - len(self._idle)
+            results = await asyncio.gather(
+                *(_connect_gemini() for _ in range(missing)), return_exceptions=True)
+            errors = []
+            for result in results:
+                if isinstance(result, BaseException):
+                    errors.append(result)
+                else:
+                    self._idle.append((loop.time(), result))
+            if errors:
+                logger.warning(f"Gemini pool connect failed: {errors[0]}")
+                await asyncio.sleep(POOL_RETRY_SEC)
+                continue
+
+            # Sleep until a socket is taken or the oldest one is due to expire.
+            self._wanted.clear()
+            timeout = self._idle[0][0] + self.max_idle_sec - loop.time() if self._idle else None
+            try:
+                await asyncio.wait_for(self._wanted.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        idle, self._idle = self._idle, collections.deque()
+        await asyncio.gather(*(ws.close() for _, ws in idle), return_exceptions=True)
+
+
+UPSTREAM_POOL = GeminiUpstreamPool(POOL_SIZE, POOL_MAX_IDLE_SEC)
+
+
+async def _start_upstream(setup_message):
+    """
+    Send setup on a pooled (or new) Gemini socket and return (socket, setup
+    response). A pooled socket that turns out to be closed is replaced once.
+    """
+    loop = asyncio.get_running_loop()
+    gemini_ws, pooled = await UPSTREAM_POOL.acquire()
+    while True:
+        started = loop.time()
+        try:
+            await gemini_ws.send(setup_message, text=True)
+            response = await asyncio.wait_for(gemini_ws.recv(), timeout=GEMINI_SETUP_TIMEOUT_SEC)
+        except websockets.exceptions.ConnectionClosed:
+            if not pooled:
+                raise
+            logger.info("Pooled Gemini socket was closed; connecting a fresh one")
+            gemini_ws, pooled = await _connect_gemini(), False
+            continue
+        except BaseException:
+            await gemini_ws.close()
+            raise
+        STATS.upstream_setup_ms.observe((loop.time() - started) * 1000)
+        return gemini_ws, response
+
+
+def _reject_when_busy(connection, request):
+    """websockets process_request hook: answer 503 before the handshake when full."""
+    if STATS.draining or STATS.active_sessions >= MAX_SESSIONS_PER_WORKER:
+        STATS.rejected_busy += 1
+        response = connection.respond(
+            HTTPStatus.SERVICE_UNAVAILABLE, 'Voice proxy is busy, retry shortly.\n')
+        response.headers['Retry-After'] = str(BUSY_RETRY_AFTER_SEC)
+        return response
+    return None
+
+
 async def proxy_handler(client_ws):
     """Handle one client WebSocket connection."""
+    STATS.active_sessions += 1
+    STATS.total_sessions += 1
+    try:
+        await _relay_session(client_ws)
+    finally:
+        STATS.active_sessions -= 1
+
+
+async def _relay_session(client_ws):
     client_addr = client_ws.remote_address
     logger.info(f"Client connected: {client_addr}")
 
@@ -230,7 +659,8 @@ async def proxy_handler(client_ws):
 
     gemini_ws = None
     last_audio_at = 0.0
-    last_screenshot_at = 0.0
+    screen = ScreenFramePipeline()
+    screen_task = None
     last_client_activity_at = asyncio.get_running_loop().time()
 
     try:
@@ -257,63 +687,15 @@ async def proxy_handler(client_ws):
 
         # Build Gemini setup message
         voice_name = setup_data.get('voiceName', DEFAULT_VOICE)
-        context_source = setup_data.get('contextSource', 'general')
-        student_goal = setup_data.get('studentGoal', '')
-        onboarding_context = setup_data.get('onboardingContext', {})
         initial_prompt = _sanitize_text(setup_data.get('initialPrompt', ''))
+        if not isinstance(voice_name, str):
+            voice_name = DEFAULT_VOICE
+        gemini_setup = _setup_message(voice_name, _session_system_text(setup_data))
 
-        system_text = VOICE_SYSTEM_PROMPT
-        if context_source:
-            system_text += f"\n\nThe student is currently in the '{context_source}' section of the platform."
-        if student_goal:
-            system_text += f"\nTheir current goal: {student_goal}"
-        system_text = _append_onboarding_context(system_text, onboarding_context)
-
-        # Include session memory if provided
-        memory = setup_data.get('sessionMemory', [])
-        if memory:
-            system_text += "\n\n[Previous session memory]"
-            for i, m in enumerate(memory, 1):
-                system_text += f"\nSession {i}: {m.get('session_summary', 'N/A')}"
-            system_text += "\n[End of memory]"
-
-        gemini_setup = {
-            'setup': {
-                'model': 'models/gemini-live-2.5-flash-native-audio',
-                'generationConfig': {
-                    'responseModalities': ['AUDIO'],
-                    'speechConfig': {
-                        'voiceConfig': {
-                            'prebuiltVoiceConfig': {
-                                'voiceName': voice_name,
-                            }
-                        },
-                    }
-                },
-                'systemInstruction': {
-                    'parts': [{'text': system_text}]
-                },
-            }
-        }
-
-        # Connect to Gemini with optimized settings for low-latency voice
-        logger.info(f"Connecting to Gemini Live API for {client_addr}...")
-        gemini_ws = await websockets.connect(
-            GEMINI_WS_URL,
-            additional_headers={'Content-Type': 'application/json'},
-            max_size=16 * 1024 * 1024,  # 16 MB
-            max_queue=2,  # Keep small queue for faster response
-            ping_interval=20,  # More frequent heartbeat for stability
-            ping_timeout=5,  # Faster timeout detection
-            compression=None,  # Disable compression for lower latency
-        )
-
-        # Send setup
-        await gemini_ws.send(json.dumps(gemini_setup))
-
-        # Wait for setup completion from Gemini
+        # Take a pre-connected Gemini socket (or connect) and send setup
+        logger.info(f"Starting Gemini Live session for {client_addr}...")
         try:
-            setup_response = await asyncio.wait_for(gemini_ws.recv(), timeout=GEMINI_SETUP_TIMEOUT_SEC)
+            gemini_ws, setup_response = await _start_upstream(gemini_setup)
             setup_resp_data = json.loads(setup_response)
         except asyncio.TimeoutError:
             logger.error(f"Timeout waiting for Gemini setup completion for {client_addr}")
@@ -347,12 +729,79 @@ async def proxy_handler(client_ws):
             }))
             return
 
+        async def forward_screenshot(screenshot_b64):
+            """Shrink, dedupe and send one screen frame without holding up the audio relay."""
+            loop = asyncio.get_running_loop()
+            try:
+                jpeg = await screen.prepare(screenshot_b64)
+                if jpeg is None:
+                    return
+                jpeg_b64 = base64.b64encode(jpeg).decode('ascii')
+
+                # Forward screen capture as inline image content
+                logger.info(f"Forwarding screenshot for {client_addr} "
+                            f"({len(screenshot_b64)//1024}KB -> {len(jpeg_b64)//1024}KB base64)")
+                started = loop.time()
+                try:
+                    # Use realtimeInput for image frames (same as audio)
+                    gemini_msg = {
+                        'realtimeInput': {
+                            'mediaChunks': [{
+                                'mimeType': 'image/jpeg',
+                                'data': jpeg_b64,
+                            }]
+                        }
+                    }
+                    await asyncio.wait_for(gemini_ws.send(json.dumps(gemini_msg)), timeout=2.5)
+                except Exception as img_err:
+                    logger.warning(f"realtimeInput image failed: {img_err}, "
+                                   f"trying clientContent fallback")
+                    # Fallback: send as clientContent with inline data
+                    try:
+                        gemini_msg = {
+                            'clientContent': {
+                                'turns': [{
+                                    'role': 'user',
+                                    'parts': [{
+                                        'inlineData': {
+                                            'mimeType': 'image/jpeg',
+                                            'data': jpeg_b64,
+                                        }
+                                    }, {
+                                        'text': 'Here is my current screen. '
+                                                'Please acknowledge what you see briefly.'
+                                    }]
+                                }],
+                                'turnComplete': True,
+                            }
+                        }
+                        await asyncio.wait_for(gemini_ws.send(json.dumps(gemini_msg)), timeout=2.5)
+                    except Exception as fallback_err:
+                        logger.error(f"clientContent image fallback also failed: "
+                                     f"{fallback_err}")
+                        return
+                screen.record_send(loop.time(), len(jpeg_b64), loop.time() - started)
+            finally:
+                screen.busy = False
+
         # Bidirectional relay
         async def client_to_gemini():
             """Forward messages from the browser to Gemini."""
-            nonlocal last_audio_at, last_screenshot_at, last_client_activity_at
+            nonlocal last_audio_at, last_client_activity_at, screen_task
             try:
                 async for message in client_ws:
+                    if isinstance(message, bytes):
+                        # Binary frames are raw PCM16 audio; no JSON involved.
+                        last_client_activity_at = asyncio.get_running_loop().time()
+                        if not message or len(message) > MAX_AUDIO_BYTES:
+                            continue
+                        last_audio_at = last_client_activity_at
+                        envelope = _audio_envelope(pcm=message)
+                        await asyncio.wait_for(gemini_ws.send(envelope, text=True), timeout=2.5)
+                        STATS.record_relay(
+                            True, len(envelope), asyncio.get_running_loop().time() - last_audio_at)
+                        continue
+
                     data = _safe_json_loads(message)
                     if not isinstance(data, dict):
                         continue
@@ -363,70 +812,25 @@ async def proxy_handler(client_ws):
                         audio_b64 = data.get('data', '')
                         if not isinstance(audio_b64, str) or len(audio_b64) > MAX_AUDIO_BASE64_CHARS:
                             continue
+                        envelope = _audio_envelope(audio_b64=audio_b64)
+                        if envelope is None:
+                            continue
                         last_audio_at = asyncio.get_running_loop().time()
                         # Forward audio chunk via realtimeInput
-                        gemini_msg = {
-                            'realtimeInput': {
-                                'mediaChunks': [{
-                                    'mimeType': 'audio/pcm;rate=16000',
-                                    'data': audio_b64,
-                                }]
-                            }
-                        }
-                        await asyncio.wait_for(gemini_ws.send(json.dumps(gemini_msg)), timeout=2.5)
+                        await asyncio.wait_for(gemini_ws.send(envelope, text=True), timeout=2.5)
+                        STATS.record_relay(
+                            True, len(envelope), asyncio.get_running_loop().time() - last_audio_at)
 
                     elif msg_type == 'screenshot':
                         screenshot_b64 = data.get('data', '')
                         if not isinstance(screenshot_b64, str) or len(screenshot_b64) > MAX_SCREENSHOT_BASE64_CHARS:
                             continue
                         now = asyncio.get_running_loop().time()
-                        # Throttle screenshots and prioritize audio turn quality.
-                        if (now - last_screenshot_at) < 12.0:
+                        # Adaptive throttle; screenshots never compete with an active audio turn.
+                        if not screen.accept(now, last_audio_at, len(screenshot_b64)):
                             continue
-                        if (now - last_audio_at) < 2.0:
-                            continue
-                        last_screenshot_at = now
-
-                        # Forward screen capture as inline image content
-                        logger.info(f"Forwarding screenshot for {client_addr} "
-                                    f"({len(data.get('data', ''))//1024}KB base64)")
-                        try:
-                            # Use realtimeInput for image frames (same as audio)
-                            gemini_msg = {
-                                'realtimeInput': {
-                                    'mediaChunks': [{
-                                        'mimeType': data.get('mimeType', 'image/jpeg'),
-                                        'data': screenshot_b64,
-                                    }]
-                                }
-                            }
-                            await asyncio.wait_for(gemini_ws.send(json.dumps(gemini_msg)), timeout=2.5)
-                        except Exception as img_err:
-                            logger.warning(f"realtimeInput image failed: {img_err}, "
-                                           f"trying clientContent fallback")
-                            # Fallback: send as clientContent with inline data
-                            try:
-                                gemini_msg = {
-                                    'clientContent': {
-                                        'turns': [{
-                                            'role': 'user',
-                                            'parts': [{
-                                                'inlineData': {
-                                                    'mimeType': data.get('mimeType', 'image/jpeg'),
-                                                    'data': screenshot_b64,
-                                                }
-                                            }, {
-                                                'text': 'Here is my current screen. '
-                                                        'Please acknowledge what you see briefly.'
-                                            }]
-                                        }],
-                                        'turnComplete': True,
-                                    }
-                                }
-                                await asyncio.wait_for(gemini_ws.send(json.dumps(gemini_msg)), timeout=2.5)
-                            except Exception as fallback_err:
-                                logger.error(f"clientContent image fallback also failed: "
-                                             f"{fallback_err}")
+                        screen.busy = True
+                        screen_task = asyncio.ensure_future(forward_screenshot(screenshot_b64))
 
                     elif msg_type == 'end':
                         logger.info(f"Client {client_addr} ended session")
@@ -485,7 +889,8 @@ async def proxy_handler(client_ws):
             """Forward messages from Gemini to the browser."""
             try:
                 async for message in gemini_ws:
-                    data = _safe_json_loads(message)
+                    received_at = asyncio.get_running_loop().time()
+                    data, blobs = _parse_gemini_frame(message)
                     if not isinstance(data, dict):
                         continue
 
@@ -508,11 +913,10 @@ async def proxy_handler(client_ws):
                     for part in parts:
                         inline = part.get('inlineData', {})
                         if inline.get('mimeType', '').startswith('audio/'):
-                            await client_ws.send(json.dumps({
-                                'type': 'audio',
-                                'data': inline['data'],
-                                'mimeType': inline['mimeType'],
-                            }))
+                            await client_ws.send(_client_audio_frame(
+                                _inline_blob(inline.get('data', ''), blobs),
+                                inline['mimeType'],
+                            ), text=True)
                         elif 'text' in part:
                             await client_ws.send(json.dumps({
                                 'type': 'transcript',
@@ -525,15 +929,28 @@ async def proxy_handler(client_ws):
                             'type': 'turnComplete',
                         }))
 
+                    STATS.record_relay(
+                        False, len(message), asyncio.get_running_loop().time() - received_at)
+
             except websockets.exceptions.ConnectionClosed:
                 logger.info(f"Gemini connection closed for {client_addr}")
 
-        # Run both relay directions concurrently
-        await asyncio.gather(
-            client_to_gemini(),
-            gemini_to_client(),
-            client_idle_watchdog(),
-        )
+        # Run both relay directions concurrently; the session ends as soon as
+        # either side goes away, instead of idling until the watchdog fires.
+        relays = [
+            asyncio.ensure_future(client_to_gemini()),
+            asyncio.ensure_future(gemini_to_client()),
+            asyncio.ensure_future(client_idle_watchdog()),
+        ]
+        try:
+            done, _ = await asyncio.wait(relays, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for relay in relays:
+                relay.cancel()
+            await asyncio.gather(*relays, return_exceptions=True)
+        for relay in done:
+            if not relay.cancelled():
+                relay.result()
 
     except Exception as e:
         logger.error(f"Error for {client_addr}: {e}")
@@ -545,38 +962,211 @@ async def proxy_handler(client_ws):
         except Exception:
             pass
     finally:
+        if screen_task is not None:
+            screen_task.cancel()
         if gemini_ws:
             try:
                 await gemini_ws.close()
             except Exception:
                 pass
-        logger.info(f"Session ended for {client_addr}")
+        STATS.record_screens(screen)
+        logger.info(f"Session ended for {client_addr} (screens: {screen.summary()})")
 
 
-async def main():
-    """Start the WebSocket proxy server."""
-    logger.info(f"Starting voice proxy on ws://{PROXY_HOST}:{PROXY_PORT}")
+async def _serve_stats(snapshot):
+    """Minimal HTTP/1.0 endpoint: GET /stats returns ``snapshot()`` as JSON."""
+    async def handle(reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=2)
+            parts = request_line.decode('latin-1').split()
+            if len(parts) >= 2 and parts[1].split('?')[0] == '/stats':
+                status, body = '200 OK', json.dumps(snapshot()).encode('utf-8')
+            else:
+                status, body = '404 Not Found', b'{"error": "not found"}'
+            writer.write(
+                f'HTTP/1.0 {status}\r\nContent-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode('latin-1')
+                + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, STATS_HOST, STATS_PORT)
+    logger.info(f"Voice proxy stats at http://{STATS_HOST}:{STATS_PORT}/stats")
+    return server
 
-    stop = asyncio.get_event_loop().create_future()
 
-    # Graceful shutdown on SIGINT/SIGTERM
+def _shutdown_signals():
+    """Future resolved with 'drain' on SIGTERM or 'stop' on SIGINT."""
+    loop = asyncio.get_running_loop()
+    shutdown = loop.create_future()
+
+    def request(mode):
+        if not shutdown.done():
+            shutdown.set_result(mode)
+
     if sys.platform != 'win32':
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            asyncio.get_event_loop().add_signal_handler(sig, stop.set_result, None)
+        loop.add_signal_handler(signal.SIGTERM, request, 'drain')
+        loop.add_signal_handler(signal.SIGINT, request, 'stop')
+    return shutdown
+
+
+async def _drain(server):
+    """Stop accepting, then give active sessions DRAIN_TIMEOUT_SEC to finish."""
+    STATS.draining = True
+    logger.info(f"Draining {STATS.active_sessions} active session(s) "
+                f"(up to {DRAIN_TIMEOUT_SEC}s)")
+    server.close(close_connections=False)
+    try:
+        await asyncio.wait_for(asyncio.shield(server.wait_closed()), timeout=DRAIN_TIMEOUT_SEC)
+        return
+    except asyncio.TimeoutError:
+        logger.warning(f"Drain timed out with {STATS.active_sessions} session(s); closing them")
+    await asyncio.gather(
+        *(connection.close(1001, 'Server restarting') for connection in server.connections),
+        return_exceptions=True,
+    )
+    await server.wait_closed()
 
-    async with websockets.serve(
+
+async def _push_stats(stats_conn):
+    while True:
+        try:
+            stats_conn.send(STATS.snapshot())
+        except (OSError, ValueError):
+            return
+        await asyncio.sleep(STATS_PUSH_INTERVAL_SEC)
+
+
+async def serve(reuse_port=False, stats_conn=None, worker_id=0):
+    """Run one proxy process until SIGINT (stop) or SIGTERM (drain)."""
+    shutdown = _shutdown_signals()
+    server = await websockets.serve(
         proxy_handler,
         PROXY_HOST,
         PROXY_PORT,
         max_size=16 * 1024 * 1024,
-    ) as server:
-        logger.info(f"Voice proxy ready at ws://{PROXY_HOST}:{PROXY_PORT}")
+        reuse_port=reuse_port,
+        process_request=_reject_when_busy,
+    )
+    logger.info(f"Voice proxy ready at ws://{PROXY_HOST}:{PROXY_PORT} "
+                f"(worker {worker_id}, pid {os.getpid()})")
+    if GEMINI_API_KEY:
+        UPSTREAM_POOL.start()
+
+    reporter = stats_server = None
+    if stats_conn is not None:
+        reporter = asyncio.ensure_future(_push_stats(stats_conn))
+    elif STATS_PORT:
+        stats_server = await _serve_stats(STATS.snapshot)
 
+    try:
         if sys.platform == 'win32':
             # On Windows, just run forever (Ctrl+C to stop)
             await asyncio.Future()
+        elif await shutdown == 'drain':
+            await _drain(server)
         else:
-            await stop
+            server.close()
+            await server.wait_closed()
+    finally:
+        await UPSTREAM_POOL.close()
+        if reporter is not None:
+            reporter.cancel()
+        if stats_server is not None:
+            stats_server.close()
+
+
+def _worker_entry(worker_id, stats_conn):
+    asyncio.run(serve(reuse_port=True, stats_conn=stats_conn, worker_id=worker_id))
+
+
+def _aggregate_stats(snapshots):
+    workers = [dict(snapshots[worker_id], worker=worker_id) for worker_id in sorted(snapshots)]
+    totals = {key: sum(worker[key] for worker in workers) for key in SUMMED_STATS}
+    # Percentiles do not add up; the slowest worker's p95 is the useful signal.
+    totals['relay_lag_p95_ms'] = max((w['relay_lag_p95_ms'] for w in workers), default=0.0)
+    for key in HISTOGRAM_STATS:
+        totals[key] = _merge_histograms(worker[key] for worker in workers)
+    totals['workers'] = workers
+    return totals
+
+
+async def supervise(workers):
+    """Spawn ``workers`` SO_REUSEPORT processes, restart them if they die, aggregate stats."""
+    ctx = multiprocessing.get_context('spawn')
+    snapshots = {}
+    processes = {}
+    stats_conns = {}
+    next_start = {}
+
+    def start(worker_id):
+        # One pipe per worker: a worker killed mid-write cannot wedge the others.
+        reader, writer = ctx.Pipe(duplex=False)
+        process = ctx.Process(
+            target=_worker_entry, args=(worker_id, writer), name=f'voice-proxy-{worker_id}')
+        process.start()
+        writer.close()
+        processes[worker_id] = process
+        stats_conns[worker_id] = reader
+        next_start[worker_id] = time.monotonic() + WORKER_RESTART_BACKOFF_SEC
+
+    def collect():
+        for worker_id, reader in stats_conns.items():
+            try:
+                while reader.poll():
+                    snapshots[worker_id] = reader.recv()
+            except (EOFError, OSError):
+                continue
+
+    shutdown = _shutdown_signals()
+    for worker_id in range(workers):
+        start(worker_id)
+    stats_server = await _serve_stats(lambda: _aggregate_stats(snapshots)) if STATS_PORT else None
+    logger.info(f"Voice proxy supervisor started {workers} workers on port {PROXY_PORT}")
+
+    while not shutdown.done():
+        collect()
+        for worker_id, process in list(processes.items()):
+            if process.is_alive() or time.monotonic() < next_start[worker_id]:
+                continue
+            logger.warning(f"Voice proxy worker {worker_id} exited "
+                           f"(code {process.exitcode}); restarting")
+            snapshots.pop(worker_id, None)
+            stats_conns.pop(worker_id).close()
+            start(worker_id)
+        await asyncio.wait([shutdown], timeout=STATS_PUSH_INTERVAL_SEC)
+
+    mode = shutdown.result()
+    stop_signal = signal.SIGTERM if mode == 'drain' else signal.SIGINT
+    for process in processes.values():
+        if process.is_alive():
+            os.kill(process.pid, stop_signal)
+
+    deadline = time.monotonic() + (DRAIN_TIMEOUT_SEC if mode == 'drain' else 0) + 10
+    while any(p.is_alive() for p in processes.values()) and time.monotonic() < deadline:
+        collect()
+        await asyncio.sleep(0.2)
+    for process in processes.values():
+        if process.is_alive():
+            process.kill()
+
+    if stats_server is not None:
+        stats_server.close()
+
+
+async def main():
+    """Start the WebSocket proxy, as a supervisor when more than one worker is configured."""
+    workers = PROXY_WORKERS if PROXY_WORKERS > 0 else (os.cpu_count() or 1)
+    logger.info(f"Starting voice proxy on ws://{PROXY_HOST}:{PROXY_PORT} with {workers} worker(s)")
+
+    if workers > 1 and sys.platform != 'win32':
+        await supervise(workers)
+    else:
+        await serve()
 
     logger.info("Voice proxy stopped.")
 
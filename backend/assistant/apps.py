@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AssistantConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'assistant'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import assistant.signals  # noqa
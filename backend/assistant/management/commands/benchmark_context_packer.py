@@ -0,0 +1,134 @@
+"""
+Measure assistant context packing against synthetic users of growing size.
+
+No database access: snapshots shaped like ``_compute_user_snapshot`` output are
+generated with longer and longer free-text fields (goals, titles), which is what
+pushes real users past the budget since every list is already capped.
+
+    python manage.py benchmark_context_packer --text-lengths 100 1000 10000
+"""
+
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from assistant.services.context_packer import (
+    SNAPSHOT_PACKING_STEPS,
+    encoded_size,
+    estimate_tokens,
+    pack_json_payload,
+)
+from assistant.services.pipeline_config import (
+    AI_PIPELINE_MAX_BACKEND_CONTEXT_BYTES,
+    AI_PIPELINE_MAX_CONTEXT_TOKENS,
+)
+
+
+def _text(rng, length):
+    words = []
+    size = 0
+    while size < length:
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def synthetic_snapshot(rng, text_length):
+    return {
+        "profile": {
+            "name": "Bench User",
+            "username": "bench_user",
+            "goal_statement": _text(rng, text_length),
+            "target_role": "Backend Engineer",
+            "weekly_hours": 12,
+            "domain": "tech",
+            "streak": 9,
+            "xp_points": 1200,
+        },
+        "roadmaps": {
+            "count": 9,
+            "items": [
+                {
+                    "id": idx,
+                    "title": _text(rng, min(text_length, 200)),
+                    "goal": _text(rng, text_length),
+                    "category": "tech",
+                    "difficulty": "intermediate",
+                    "total_milestones": 6,
+                    "completed_milestones": 2,
+                }
+                for idx in range(5)
+            ],
+        },
+        "tasks": {
+            "summary": {"total": 180, "completed": 40, "pending": 140, "in_progress": 3, "not_started": 137},
+            "pending_items": [
+                {
+                    "task_id": f"task-{idx}",
+                    "title": _text(rng, min(text_length, 300)),
+                    "status": "not_started",
+                    "due_date": "2026-03-01",
+                    "day": idx + 1,
+                }
+                for idx in range(12)
+            ],
+        },
+        "execution": {
+            "total": 30, "completed": 12, "pending": 18, "weekly_completed": 4,
+            "current_streak": 9, "longest_streak": 21, "xp_points": 1200,
+        },
+        "scheduler": {
+            "upcoming_count": 40,
+            "next_events": [
+                {"id": idx, "title": _text(rng, min(text_length, 200)),
+                 "start_time": "2026-03-01T09:00:00Z", "end_time": "2026-03-01T10:00:00Z"}
+                for idx in range(5)
+            ],
+        },
+        "planora": {
+            "subjects_count": 6,
+            "topics_count": 48,
+            "subjects": [
+                {"id": idx, "name": _text(rng, min(text_length, 120)), "updated_at": "2026-02-01T00:00:00Z"}
+                for idx in range(6)
+            ],
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the assistant context packer on synthetic oversized users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--text-lengths', nargs='+', type=int,
+                            default=[100, 1000, 5000, 20000])
+        parser.add_argument('--samples', type=int, default=50)
+        parser.add_argument('--max-bytes', type=int, default=AI_PIPELINE_MAX_BACKEND_CONTEXT_BYTES)
+        parser.add_argument('--max-tokens', type=int, default=AI_PIPELINE_MAX_CONTEXT_TOKENS)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        for length in sorted(set(options['text_lengths'])):
+            snapshots = [synthetic_snapshot(rng, length) for _ in range(options['samples'])]
+            timings = []
+            packed = None
+            for snapshot in snapshots:
+                started = time.perf_counter()
+                packed = pack_json_payload(
+                    snapshot, options['max_bytes'], SNAPSHOT_PACKING_STEPS,
+                    max_tokens=options['max_tokens'])
+                timings.append((time.perf_counter() - started) * 1000)
+
+            timings.sort()
+            p50 = timings[len(timings) // 2]
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            kept = sorted(key for key in packed if not key.startswith('_'))
+            self.stdout.write(
+                f'text={length:>6}  in={encoded_size(snapshots[-1]):>7}B  '
+                f'out={encoded_size(packed):>6}B  tokens~{estimate_tokens(packed):>5}  '
+                f'p50={p50:.2f}ms  p95={p95:.2f}ms  '
+                f'trimmed={",".join(packed.get("_trimmed", [])) or "-"}  kept={",".join(kept)}'
+            )
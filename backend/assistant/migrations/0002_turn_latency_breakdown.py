@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assistantturn',
+            name='context_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='assistantturn',
+            name='llm_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='assistantturn',
+            name='stt_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='assistantturn',
+            name='tts_first_chunk_ms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
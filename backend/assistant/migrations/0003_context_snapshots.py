@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:34
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant', '0002_turn_latency_breakdown'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssistantContextSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assistant_context_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='assistantconversation',
+            name='context_snapshot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='anchored_conversations', to='assistant.assistantcontextsnapshot'),
+        ),
+        migrations.AddField(
+            model_name='assistantturn',
+            name='context_snapshot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='turns', to='assistant.assistantcontextsnapshot'),
+        ),
+        migrations.AddConstraint(
+            model_name='assistantcontextsnapshot',
+            constraint=models.UniqueConstraint(fields=('user', 'content_hash'), name='assistant_snapshot_user_hash_uniq'),
+        ),
+    ]
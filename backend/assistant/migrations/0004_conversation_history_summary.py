@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant', '0003_context_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assistantconversation',
+            name='history_summary',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='assistantconversation',
+            name='summarized_through',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -4,6 +4,30 @@ from django.conf import settings
 from django.db import models
 
 
+class AssistantContextSnapshot(models.Model):
+    """Deduplicated copy of the per-user backend context that turns point at."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="assistant_context_snapshots",
+    )
+    version = models.PositiveIntegerField(default=1)
+    content_hash = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "content_hash"], name="assistant_snapshot_user_hash_uniq"),
+        ]
+
+    def __str__(self):
+        return f"AssistantContextSnapshot({self.id}, user={self.user_id}, v{self.version})"
+
+
 class AssistantConversation(models.Model):
     CHANNEL_TEXT = "text"
     CHANNEL_VOICE = "voice"
@@ -21,6 +45,17 @@ class AssistantConversation(models.Model):
     channel = models.CharField(max_length=16, choices=CHANNEL_CHOICES, default=CHANNEL_TEXT)
     context_source = models.CharField(max_length=64, blank=True, default="assistant")
     language_preference = models.CharField(max_length=32, blank=True, default="hinglish")
+    # Snapshot the model sees in full; later turns only add the sections that changed since.
+    context_snapshot = models.ForeignKey(
+        AssistantContextSnapshot,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="anchored_conversations",
+    )
+    # Rolling summary of every turn created up to and including summarized_through.
+    history_summary = models.TextField(blank=True, default="")
+    summarized_through = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -54,7 +89,15 @@ class AssistantTurn(models.Model):
     user_input_text = models.TextField(blank=True, default="")
     transcript = models.TextField(blank=True, default="")
     frontend_context = models.JSONField(default=dict, blank=True)
+    # Per-turn context only; the user snapshot lives in context_snapshot.
     backend_context = models.JSONField(default=dict, blank=True)
+    context_snapshot = models.ForeignKey(
+        AssistantContextSnapshot,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="turns",
+    )
     llm_output = models.JSONField(default=dict, blank=True)
     assistant_text = models.TextField(blank=True, default="")
     language = models.CharField(max_length=32, blank=True, default="hinglish")
@@ -62,6 +105,11 @@ class AssistantTurn(models.Model):
     tts_mime_type = models.CharField(max_length=64, blank=True, default="")
     tts_voice = models.CharField(max_length=64, blank=True, default="")
     tts_duration_ms = models.IntegerField(default=0)
+    # Per-stage latency; tts_first_chunk_ms is measured from the start of the turn.
+    stt_ms = models.IntegerField(null=True, blank=True)
+    context_ms = models.IntegerField(null=True, blank=True)
+    llm_ms = models.IntegerField(null=True, blank=True)
+    tts_first_chunk_ms = models.IntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
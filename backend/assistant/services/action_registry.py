@@ -153,7 +153,7 @@ def _roadmap_generate_tasks(user, args: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _roadmap_generate(user, args: Dict[str, Any]) -> Dict[str, Any]:
-    from roadmap_ai import views as roadmap_views
+    from roadmap_ai.generation import RoadmapGenerationError, generate_roadmap_payload
 
     payload = {
         "goal": str(args.get("goal") or ""),
@@ -169,13 +169,11 @@ def _roadmap_generate(user, args: Dict[str, Any]) -> Dict[str, Any]:
     }
     if not payload["goal"]:
         raise ValueError("goal is required")
-    return _invoke_view(
-        user,
-        "post",
-        "/api/roadmap/generate/",
-        roadmap_views.generate_roadmap,
-        payload,
-    )
+    # This action already runs in a worker; generate inline instead of queueing a second job.
+    try:
+        return generate_roadmap_payload(user, payload)
+    except RoadmapGenerationError as exc:
+        raise ValueError(exc.error)
 
 
 def _planora_topic_progress(user, args: Dict[str, Any]) -> Dict[str, Any]:
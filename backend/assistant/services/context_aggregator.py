@@ -1,39 +1,48 @@
+"""
+Backend context for assistant turns.
+
+The per-user part (profile, roadmaps, tasks, execution, scheduler, planora) is a
+snapshot cached through ``users.user_cache``, so it is rebuilt only after the
+user's cache version is bumped (see ``assistant.signals``) or the TTL lapses.
+Each distinct snapshot is stored once as an ``AssistantContextSnapshot`` row
+that turns reference.
+
+Within a conversation the model always gets the conversation's anchor snapshot,
+byte-identical from turn to turn so Gemini can reuse the prompt prefix, plus only
+the sections that changed since. When that diff grows past half the snapshot
+the conversation is re-anchored on the current snapshot.
+"""
+
+import hashlib
 import json
 from typing import Any, Dict
-from datetime import timedelta
 
 from django.utils import timezone
 
-from dashboard.models import ExecutionTask, UserStats
+from assistant.models import AssistantContextSnapshot
+from dashboard.models import UserStats
 from planora.models import Subject, Topic
-from roadmap_ai.models import Milestone, Roadmap
+from roadmap_ai.models import Roadmap
 from scheduler.models import Event
 from tasks.models import Task
 from users.models import UserProfile
+from users.progress_summary import UserProgressSummary
+from users.user_cache import get_or_compute, get_user_cache_version
 
+from .context_packer import (
+    FRONTEND_PACKING_STEPS,
+    SNAPSHOT_PACKING_STEPS,
+    encoded_size,
+    pack_json_payload,
+)
 from .pipeline_config import (
+    AI_PIPELINE_CONTEXT_CACHE_TTL_SEC,
     AI_PIPELINE_MAX_BACKEND_CONTEXT_BYTES,
+    AI_PIPELINE_MAX_CONTEXT_TOKENS,
     AI_PIPELINE_MAX_FRONTEND_CONTEXT_BYTES,
 )
 
-
-def _truncate_json_payload(payload: Dict[str, Any], max_bytes: int) -> Dict[str, Any]:
-    if max_bytes <= 0:
-        return {}
-
-    encoded = json.dumps(payload, ensure_ascii=True, default=str).encode("utf-8")
-    if len(encoded) <= max_bytes:
-        return payload
-
-    compact = {
-        "truncated": True,
-        "message": "Context trimmed due to payload size limit.",
-    }
-    compact_encoded = json.dumps(compact).encode("utf-8")
-    if len(compact_encoded) > max_bytes:
-        return {"truncated": True}
-
-    return compact
+SNAPSHOT_CACHE_NAMESPACE = "assistant_context"
 
 
 def _safe_frontend_context(frontend_context: Any) -> Dict[str, Any]:
@@ -50,7 +59,7 @@ def _safe_frontend_context(frontend_context: Any) -> Dict[str, Any]:
         "metadata",
     }
     filtered = {key: frontend_context.get(key) for key in allowed if key in frontend_context}
-    return _truncate_json_payload(filtered, AI_PIPELINE_MAX_FRONTEND_CONTEXT_BYTES)
+    return pack_json_payload(filtered, AI_PIPELINE_MAX_FRONTEND_CONTEXT_BYTES, FRONTEND_PACKING_STEPS)
 
 
 def _build_writable_targets() -> Dict[str, Any]:
@@ -75,30 +84,33 @@ def _build_writable_targets() -> Dict[str, Any]:
     }
 
 
-def build_backend_context(user, context_source: str, frontend_context: Any = None) -> Dict[str, Any]:
+def _compute_user_snapshot(user) -> Dict[str, Any]:
     profile = UserProfile.objects.filter(user=user).first()
 
+    summary = UserProgressSummary(user)
+
     roadmaps_qs = Roadmap.objects.filter(user=user).order_by("-created_at")
     roadmap_items = []
     for roadmap in roadmaps_qs[:5]:
-        milestones = Milestone.objects.filter(roadmap=roadmap).order_by("order")
+        milestone_counts = summary.roadmap(roadmap.id)
         roadmap_items.append({
             "id": roadmap.id,
             "title": roadmap.title,
             "goal": roadmap.goal,
             "category": roadmap.category,
             "difficulty": roadmap.difficulty_level,
-            "total_milestones": milestones.count(),
-            "completed_milestones": milestones.filter(is_completed=True).count(),
+            "total_milestones": milestone_counts.total_milestones,
+            "completed_milestones": milestone_counts.completed_milestones,
         })
 
     task_qs = Task.objects.filter(user=user)
+    task_counts = summary.tasks
     task_summary = {
-        "total": task_qs.count(),
-        "completed": task_qs.filter(status="completed").count(),
-        "pending": task_qs.exclude(status="completed").count(),
-        "in_progress": task_qs.filter(status="in_progress").count(),
-        "not_started": task_qs.filter(status="not_started").count(),
+        "total": task_counts.total,
+        "completed": task_counts.completed,
+        "pending": task_counts.pending,
+        "in_progress": task_counts.in_progress,
+        "not_started": task_counts.not_started,
     }
     pending_tasks = list(
         task_qs.exclude(status="completed")
@@ -106,16 +118,13 @@ def build_backend_context(user, context_source: str, frontend_context: Any = Non
         .values("task_id", "title", "status", "due_date", "day")[:12]
     )
 
-    execution_qs = ExecutionTask.objects.filter(user=user)
+    execution_counts = summary.execution
     execution_stats = UserStats.objects.filter(user=user).first()
     execution_summary = {
-        "total": execution_qs.count(),
-        "completed": execution_qs.filter(status="completed").count(),
-        "pending": execution_qs.filter(status__in=["pending", "in_progress"]).count(),
-        "weekly_completed": execution_qs.filter(
-            status="completed",
-            completed_at__date__gte=timezone.localdate() - timedelta(days=6),
-        ).count(),
+        "total": execution_counts.total,
+        "completed": execution_counts.completed,
+        "pending": execution_counts.pending,
+        "weekly_completed": execution_counts.weekly_completed,
         "current_streak": getattr(execution_stats, "current_streak", 0),
         "longest_streak": getattr(execution_stats, "longest_streak", 0),
         "xp_points": getattr(execution_stats, "xp_points", 0),
@@ -142,8 +151,7 @@ def build_backend_context(user, context_source: str, frontend_context: Any = Non
         ),
     }
 
-    backend_context = {
-        "context_source": context_source or "assistant",
+    snapshot = {
         "profile": {
             "name": f"{(user.first_name or '').strip()} {(user.last_name or '').strip()}".strip() or user.username,
             "username": user.username,
@@ -155,7 +163,7 @@ def build_backend_context(user, context_source: str, frontend_context: Any = Non
             "xp_points": getattr(profile, "xp_points", 0),
         },
         "roadmaps": {
-            "count": roadmaps_qs.count(),
+            "count": summary.total_roadmaps,
             "items": roadmap_items,
         },
         "tasks": {
@@ -165,6 +173,45 @@ def build_backend_context(user, context_source: str, frontend_context: Any = Non
         "execution": execution_summary,
         "scheduler": scheduler_summary,
         "planora": planora_summary,
+    }
+    # Round-trip through JSON so dates match what JSONField and the cache hand back.
+    snapshot = json.loads(json.dumps(snapshot, default=str))
+    return pack_json_payload(
+        snapshot,
+        AI_PIPELINE_MAX_BACKEND_CONTEXT_BYTES,
+        SNAPSHOT_PACKING_STEPS,
+        max_tokens=AI_PIPELINE_MAX_CONTEXT_TOKENS,
+    )
+
+
+def get_context_snapshot(user) -> Dict[str, Any]:
+    """
+    Cached ``{"id", "version", "payload"}`` for the user's current snapshot.
+    A cache hit costs no queries; a miss rebuilds the payload and reuses the
+    stored row when the content is unchanged.
+    """
+    def compute():
+        version = get_user_cache_version(user)
+        payload = _compute_user_snapshot(user)
+        digest = hashlib.sha256(
+            json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()
+        snapshot, created = AssistantContextSnapshot.objects.get_or_create(
+            user=user,
+            content_hash=digest,
+            defaults={"version": version, "payload": payload},
+        )
+        if not created and snapshot.version != version:
+            AssistantContextSnapshot.objects.filter(id=snapshot.id).update(version=version)
+        return {"id": str(snapshot.id), "version": version, "payload": payload}
+
+    return get_or_compute(
+        SNAPSHOT_CACHE_NAMESPACE, user, compute, timeout=AI_PIPELINE_CONTEXT_CACHE_TTL_SEC)
+
+
+def _turn_context(context_source: str, frontend_context: Any) -> Dict[str, Any]:
+    return {
+        "context_source": context_source or "assistant",
         "writable_targets": _build_writable_targets(),
         "runtime": {
             "timezone": str(timezone.get_current_timezone_name()),
@@ -173,4 +220,54 @@ def build_backend_context(user, context_source: str, frontend_context: Any = Non
         "frontend_context": _safe_frontend_context(frontend_context),
     }
 
-    return _truncate_json_payload(backend_context, AI_PIPELINE_MAX_BACKEND_CONTEXT_BYTES)
+
+def snapshot_changes(base: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Top-level sections of ``current`` that differ from ``base`` (``None`` if dropped)."""
+    changes = {key: value for key, value in current.items() if base.get(key) != value}
+    changes.update({key: None for key in base if key not in current})
+    return changes
+
+
+def build_backend_context(user, context_source: str, frontend_context: Any = None) -> Dict[str, Any]:
+    """Full context (snapshot plus per-request fields) for callers outside a conversation."""
+    turn = _turn_context(context_source, frontend_context)
+    return {
+        "context_source": turn["context_source"],
+        **get_context_snapshot(user)["payload"],
+        "writable_targets": turn["writable_targets"],
+        "runtime": turn["runtime"],
+        "frontend_context": turn["frontend_context"],
+    }
+
+
+def build_conversation_context(user, conversation, context_source: str, frontend_context: Any = None) -> Dict[str, Any]:
+    """
+    Context for one turn of ``conversation``. Returns ``llm_context`` (what the
+    model sees), ``stored_context`` (the small per-turn part kept on the turn)
+    and ``snapshot_id``. May re-anchor the conversation on the current snapshot.
+    """
+    current = get_context_snapshot(user)
+    turn = _turn_context(context_source, frontend_context)
+
+    base = None
+    changes: Dict[str, Any] = {}
+    if conversation.context_snapshot_id and str(conversation.context_snapshot_id) == current["id"]:
+        base = current["payload"]
+    elif conversation.context_snapshot_id:
+        anchor = AssistantContextSnapshot.objects.filter(id=conversation.context_snapshot_id).first()
+        if anchor is not None:
+            changes = snapshot_changes(anchor.payload, current["payload"])
+            if encoded_size(changes) * 2 <= encoded_size(current["payload"]):
+                base = anchor.payload
+            else:
+                changes = {}
+    if base is None:
+        base = current["payload"]
+        conversation.context_snapshot_id = current["id"]
+        conversation.save(update_fields=["context_snapshot", "updated_at"])
+
+    return {
+        "llm_context": {"snapshot": base, "snapshot_changes": changes, **turn},
+        "stored_context": {**turn, "snapshot_changes": changes},
+        "snapshot_id": current["id"],
+    }
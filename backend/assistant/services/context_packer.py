@@ -0,0 +1,186 @@
+"""
+Size-budgeted packing of JSON context payloads.
+
+Instead of replacing an oversized payload with a bare ``{"truncated": true}``,
+``pack_json_payload`` applies a list of steps, lowest priority first, until the
+payload fits: drop a section, keep only the first N items of a list, or shorten
+every long string. The payload is serialized once up front; after that each
+step only measures what it removes, so the size is tracked incrementally and
+checked with one final dump. Anything removed is listed under ``_trimmed`` so
+the model knows the context is partial.
+
+Sizes are JSON bytes with ``ensure_ascii``; token counts are estimated from
+them at ``BYTES_PER_TOKEN``, which is close enough for Gemini on this mostly
+ASCII JSON and avoids a countTokens round trip.
+"""
+
+import copy
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+BYTES_PER_TOKEN = 4
+ELLIPSIS = "..."
+# Room kept for the ``_trimmed`` marker and rounding in the incremental sizes.
+MARKER_RESERVE_BYTES = 256
+
+Step = Tuple[Any, ...]
+
+# Assistant snapshot sections, least useful first. Lists are ordered newest/most
+# urgent first, so trimming keeps the head.
+SNAPSHOT_PACKING_STEPS: Sequence[Step] = (
+    ("drop", ("scheduler", "next_events")),
+    ("drop", ("planora", "subjects")),
+    ("trim", ("roadmaps", "items"), 2),
+    ("strings", 2000),
+    ("trim", ("tasks", "pending_items"), 6),
+    ("strings", 600),
+    ("strings", 200),
+    ("trim", ("roadmaps", "items"), 1),
+    ("trim", ("tasks", "pending_items"), 3),
+    ("strings", 80),
+    ("drop", ("roadmaps", "items")),
+    ("drop", ("tasks", "pending_items")),
+)
+
+FRONTEND_PACKING_STEPS: Sequence[Step] = (
+    ("strings", 1000),
+    ("trim", ("selected_ids",), 20),
+    ("strings", 240),
+    ("drop", ("ui_state",)),
+    ("drop", ("metadata",)),
+    ("strings", 80),
+    ("drop", ("selected_ids",)),
+)
+
+
+def encoded_size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=True, default=str))
+
+
+def estimate_tokens(value: Any) -> int:
+    size = len(value.encode("utf-8")) if isinstance(value, str) else encoded_size(value)
+    return (size + BYTES_PER_TOKEN - 1) // BYTES_PER_TOKEN
+
+
+def byte_budget(max_bytes: int, max_tokens: Optional[int] = None) -> int:
+    if max_tokens:
+        return min(max_bytes, max_tokens * BYTES_PER_TOKEN)
+    return max_bytes
+
+
+def _member_size(key: str, value: Any) -> int:
+    # '"key": value' plus the ', ' separating it from a sibling.
+    return encoded_size(key) + 2 + encoded_size(value) + 2
+
+
+def _parent(payload: Dict[str, Any], path: Tuple[str, ...]):
+    node = payload
+    for key in path[:-1]:
+        node = node.get(key) if isinstance(node, dict) else None
+        if node is None:
+            return None
+    return node if isinstance(node, dict) else None
+
+
+class _Packer:
+    def __init__(self, payload: Dict[str, Any]):
+        self.payload = copy.deepcopy(payload)
+        self.size = encoded_size(self.payload)
+        self.trimmed: List[str] = []
+
+    def apply(self, step: Step) -> None:
+        kind = step[0]
+        if kind == "drop":
+            self._drop(step[1])
+        elif kind == "trim":
+            self._trim(step[1], step[2])
+        elif kind == "strings":
+            self._shorten_strings(step[1])
+
+    def _drop(self, path: Tuple[str, ...]) -> None:
+        parent = _parent(self.payload, path)
+        if parent is None or path[-1] not in parent:
+            return
+        self.size -= _member_size(path[-1], parent.pop(path[-1]))
+        self._note(".".join(path))
+
+    def _trim(self, path: Tuple[str, ...], keep: int) -> None:
+        parent = _parent(self.payload, path)
+        items = parent.get(path[-1]) if parent is not None else None
+        if not isinstance(items, list) or len(items) <= keep:
+            return
+        self.size -= sum(encoded_size(item) + 2 for item in items[keep:])
+        parent[path[-1]] = items[:keep]
+        self._note(".".join(path))
+
+    def _shorten_strings(self, limit: int) -> None:
+        shortened = False
+        stack = [self.payload]
+        while stack:
+            node = stack.pop()
+            entries: Iterable = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in list(entries):
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+                elif isinstance(value, str) and len(value) > limit:
+                    short = value[:max(limit - len(ELLIPSIS), 0)] + ELLIPSIS
+                    self.size -= encoded_size(value) - encoded_size(short)
+                    node[key] = short
+                    shortened = True
+        if shortened:
+            self._note("long_strings")
+
+    def _note(self, label: str) -> None:
+        if label not in self.trimmed:
+            self.trimmed.append(label)
+
+    def result(self) -> Dict[str, Any]:
+        if self.trimmed:
+            self.payload["_trimmed"] = list(self.trimmed)
+        return self.payload
+
+
+def _keep_what_fits(payload: Dict[str, Any], budget: int) -> Dict[str, Any]:
+    """Last resort: keep whole top-level sections, in order, while they fit."""
+    packed: Dict[str, Any] = {
+        "truncated": True,
+        "message": "Context trimmed due to payload size limit.",
+    }
+    size = encoded_size(packed)
+    if size > budget:
+        return {"truncated": True}
+    for key, value in payload.items():
+        member = _member_size(key, value)
+        if size + member <= budget:
+            packed[key] = value
+            size += member
+    return packed
+
+
+def pack_json_payload(
+    payload: Dict[str, Any],
+    max_bytes: int,
+    steps: Sequence[Step] = (),
+    max_tokens: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Return ``payload`` unchanged if it fits ``max_bytes`` (and ``max_tokens``),
+    otherwise a copy reduced by ``steps`` in order until it does.
+    """
+    budget = byte_budget(max_bytes, max_tokens)
+    if budget <= 0:
+        return {}
+    if encoded_size(payload) <= budget:
+        return payload
+
+    packer = _Packer(payload)
+    target = max(budget - MARKER_RESERVE_BYTES, 0)
+    for step in steps:
+        if packer.size <= target:
+            break
+        packer.apply(step)
+
+    packed = packer.result()
+    if encoded_size(packed) <= budget:
+        return packed
+    return _keep_what_fits(packed, budget)
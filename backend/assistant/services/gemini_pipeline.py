@@ -1,13 +1,16 @@
 import json
-import os
-from typing import Any, Dict, List
+import logging
+import re
+from typing import Any, Dict, Iterator, List, Tuple
 import base64
 
-import requests
-from django.conf import settings
+from backend import gemini_client
 
 from .action_registry import ACTION_REGISTRY
+from .context_packer import estimate_tokens
 from .pipeline_config import (
+    AI_PIPELINE_HISTORY_SUMMARY_MAX_TOKENS,
+    AI_PIPELINE_HISTORY_TOKEN_BUDGET,
     AI_PIPELINE_LLM_TIMEOUT_SEC,
     AI_PIPELINE_STT_TIMEOUT_SEC,
     AI_PIPELINE_TTS_TIMEOUT_SEC,
@@ -17,9 +20,7 @@ from .pipeline_config import (
     GEMINI_TTS_MODEL,
 )
 
-
-def _get_api_key() -> str:
-    return str(os.getenv("GEMINI_API_KEY") or getattr(settings, "GEMINI_API_KEY", "")).strip()
+logger = logging.getLogger(__name__)
 
 
 def _extract_text(payload: Dict[str, Any]) -> str:
@@ -31,6 +32,15 @@ def _extract_text(payload: Dict[str, Any]) -> str:
     return "\n".join(text_chunks).strip()
 
 
+def _extract_text_raw(payload: Dict[str, Any]) -> str:
+    """Concatenate text parts as-is; streamed chunks must not be stripped or re-joined."""
+    candidates = payload.get("candidates") or []
+    if not candidates:
+        return ""
+    parts = candidates[0].get("content", {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts if isinstance(part, dict))
+
+
 def _extract_audio_inline(payload: Dict[str, Any]) -> Dict[str, Any]:
     candidates = payload.get("candidates") or []
     if not candidates:
@@ -47,13 +57,7 @@ def _extract_audio_inline(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _post_generate_content(model: str, payload: Dict[str, Any], timeout: int) -> Dict[str, Any]:
-    api_key = _get_api_key()
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY is not configured")
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
-    response = requests.post(url, json=payload, timeout=timeout)
-    response.raise_for_status()
-    return response.json()
+    return gemini_client.generate_content(model, payload, timeout=timeout)
 
 
 def transcribe_audio(audio_bytes: bytes, mime_type: str, language_hint: str = "hinglish") -> str:
@@ -102,14 +106,33 @@ def _supported_actions_text() -> str:
     return ", ".join(sorted(ACTION_REGISTRY.keys()))
 
 
-def generate_assistant_json(
+def fit_history(turns: List[Dict[str, Any]], budget_tokens: int) -> List[Dict[str, Any]]:
+    """Newest turns that fit ``budget_tokens``; the latest one is always kept."""
+    kept: List[Dict[str, Any]] = []
+    used = 0
+    for turn in reversed(turns):
+        cost = estimate_tokens(turn)
+        if kept and used + cost > budget_tokens:
+            break
+        kept.append(turn)
+        used += cost
+    kept.reverse()
+    return kept
+
+
+def _assistant_request(
     user_message: str,
     context_payload: Dict[str, Any],
-    channel: str = "text",
-    language_preference: str = "hinglish",
-    session_turns: List[Dict[str, Any]] | None = None,
+    channel: str,
+    language_preference: str,
+    session_turns: List[Dict[str, Any]] | None,
+    history_summary: str = "",
 ) -> Dict[str, Any]:
-    turns = session_turns or []
+    summary_budget = estimate_tokens(history_summary) if history_summary else 0
+    turns = fit_history(session_turns or [], max(AI_PIPELINE_HISTORY_TOKEN_BUDGET - summary_budget, 0))
+    context_json = json.dumps(context_payload, default=str)
+    turns_json = json.dumps(turns, default=str)
+    summary_line = f"Earlier in this session (summary): {history_summary}\n" if history_summary else ""
     prompt = (
         "You are Planorah Assistant v2.\n"
         "Respond in concise Hinglish by default unless user clearly asks otherwise.\n"
@@ -127,11 +150,25 @@ def generate_assistant_json(
         "All write actions must keep requires_confirmation=true.\n"
         f"Channel: {channel}\n"
         f"Language preference: {language_preference}\n"
-        f"Session turns (same session only): {json.dumps(turns[-6:], default=str)}\n"
-        f"User context JSON: {json.dumps(context_payload, default=str)}\n"
+        "In the user context, any top-level section present in `snapshot_changes` "
+        "replaces the same section of `snapshot`.\n"
+        # Keep the context ahead of per-turn text: it is usually identical across
+        # a conversation's turns, which lets Gemini reuse the cached prompt prefix.
+        f"User context JSON: {context_json}\n"
+        f"{summary_line}"
+        f"Session turns (same session only): {turns_json}\n"
         f"User message: {user_message}"
     )
-    payload = {
+    logger.info(
+        "assistant_prompt tokens~%s context~%s summary~%s history~%s turns=%s/%s",
+        estimate_tokens(prompt),
+        estimate_tokens(context_json),
+        summary_budget,
+        estimate_tokens(turns_json),
+        len(turns),
+        len(session_turns or []),
+    )
+    return {
         "contents": [
             {
                 "role": "user",
@@ -144,8 +181,10 @@ def generate_assistant_json(
             "maxOutputTokens": 1200,
         },
     }
-    response_payload = _post_generate_content(GEMINI_LLM_MODEL, payload, AI_PIPELINE_LLM_TIMEOUT_SEC)
-    parsed = _safe_json(_extract_text(response_payload))
+
+
+def _finalize_assistant_output(text: str, language_preference: str) -> Dict[str, Any]:
+    parsed = _safe_json(text)
     if not parsed:
         return {
             "schema": "assistant_response_v1",
@@ -164,6 +203,131 @@ def generate_assistant_json(
     return parsed
 
 
+def generate_assistant_json(
+    user_message: str,
+    context_payload: Dict[str, Any],
+    channel: str = "text",
+    language_preference: str = "hinglish",
+    session_turns: List[Dict[str, Any]] | None = None,
+    history_summary: str = "",
+) -> Dict[str, Any]:
+    payload = _assistant_request(
+        user_message, context_payload, channel, language_preference, session_turns, history_summary)
+    response_payload = _post_generate_content(GEMINI_LLM_MODEL, payload, AI_PIPELINE_LLM_TIMEOUT_SEC)
+    return _finalize_assistant_output(_extract_text(response_payload), language_preference)
+
+
+class AssistantTextStream:
+    """
+    Incrementally decodes the ``assistant_text`` string value out of a JSON
+    document that arrives in arbitrary fragments. ``feed`` returns the newly
+    decoded characters (possibly ""); escape sequences split across fragments
+    are held back until complete.
+    """
+
+    KEY_PATTERN = re.compile(r'"assistant_text"\s*:\s*"')
+    ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = None
+        self.done = False
+
+    def feed(self, fragment: str) -> str:
+        if self.done or not fragment:
+            return ""
+        self.buffer += fragment
+        if self.position is None:
+            match = self.KEY_PATTERN.search(self.buffer)
+            if not match:
+                return ""
+            self.position = match.end()
+
+        out = []
+        buffer = self.buffer
+        index = self.position
+        while index < len(buffer):
+            char = buffer[index]
+            if char == '"':
+                self.done = True
+                index += 1
+                break
+            if char != "\\":
+                out.append(char)
+                index += 1
+                continue
+            if index + 1 >= len(buffer):
+                break
+            code = buffer[index + 1]
+            if code == "u":
+                if index + 6 > len(buffer):
+                    break
+                value = int(buffer[index + 2:index + 6], 16)
+                if 0xD800 <= value < 0xDC00:
+                    # High surrogate: wait for the low half so we emit one character.
+                    if index + 12 > len(buffer):
+                        break
+                    low = int(buffer[index + 8:index + 12], 16)
+                    out.append(chr(0x10000 + ((value - 0xD800) << 10) + (low - 0xDC00)))
+                    index += 12
+                else:
+                    out.append(chr(value))
+                    index += 6
+                continue
+            out.append(self.ESCAPES.get(code, code))
+            index += 2
+        self.position = index
+        return "".join(out)
+
+
+def stream_assistant_json(
+    user_message: str,
+    context_payload: Dict[str, Any],
+    channel: str = "text",
+    language_preference: str = "hinglish",
+    session_turns: List[Dict[str, Any]] | None = None,
+    history_summary: str = "",
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Streaming variant of ``generate_assistant_json``. Yields ``("delta", text)``
+    as ``assistant_text`` is generated, then one ``("final", parsed_output)``.
+    """
+    payload = _assistant_request(
+        user_message, context_payload, channel, language_preference, session_turns, history_summary)
+    extractor = AssistantTextStream()
+    chunks: List[str] = []
+    for response_chunk in gemini_client.stream_generate_content(
+        GEMINI_LLM_MODEL, payload, timeout=AI_PIPELINE_LLM_TIMEOUT_SEC,
+    ):
+        text = _extract_text_raw(response_chunk)
+        if not text:
+            continue
+        chunks.append(text)
+        delta = extractor.feed(text)
+        if delta:
+            yield "delta", delta
+    yield "final", _finalize_assistant_output("".join(chunks), language_preference)
+
+
+def summarize_history(previous_summary: str, turns: List[Dict[str, Any]], language: str = "hinglish") -> str:
+    """Fold ``turns`` into the running summary of a conversation."""
+    prompt = (
+        "You maintain a running summary of a conversation between a student and Planorah Assistant.\n"
+        "Update the summary with the new turns. Keep facts the assistant will need later: goals, "
+        "decisions, tasks or roadmaps mentioned, actions proposed or confirmed, open questions.\n"
+        f"Stay under {AI_PIPELINE_HISTORY_SUMMARY_MAX_TOKENS * 3} characters. Write in {language}. "
+        "Return only the summary text.\n"
+        f"Current summary: {previous_summary or '(none)'}\n"
+        f"New turns: {json.dumps(turns, default=str)}"
+    )
+    return gemini_client.generate_text(
+        prompt,
+        model=GEMINI_LLM_MODEL,
+        generation_config={"temperature": 0.1, "maxOutputTokens": AI_PIPELINE_HISTORY_SUMMARY_MAX_TOKENS},
+        timeout=AI_PIPELINE_LLM_TIMEOUT_SEC,
+    ).strip()
+
+
 def synthesize_speech(text: str, voice: str = "", language: str = "hinglish") -> Dict[str, Any]:
     if not text.strip():
         return {}
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
 
@@ -19,9 +24,12 @@ from .action_registry import (
     action_is_async,
     execute_action,
 )
-from .context_aggregator import build_backend_context
+from .context_aggregator import build_conversation_context
+from .context_packer import estimate_tokens
 from .gemini_pipeline import (
     generate_assistant_json,
+    stream_assistant_json,
+    summarize_history,
     synthesize_speech,
     transcribe_audio,
 )
@@ -31,24 +39,103 @@ from .pipeline_config import (
     AI_PIPELINE_CHANNELS,
     AI_PIPELINE_DEFAULT_LANGUAGE,
     AI_PIPELINE_FALLBACK_REALTIME_ENABLED,
+    AI_PIPELINE_HISTORY_RAW_TURNS,
+    AI_PIPELINE_HISTORY_TOKEN_BUDGET,
     AI_PIPELINE_MAX_AUDIO_MB,
     AI_PIPELINE_MAX_SESSION_TURNS,
+    AI_PIPELINE_TTS_MIN_SEGMENT_CHARS,
     AI_PIPELINE_TTS_TIMEOUT_SEC,
+    AI_PIPELINE_TTS_WORKERS,
     ASSISTANT_V2_AVAILABLE_VOICES,
 )
 
+logger = logging.getLogger(__name__)
+
+LATENCY_FIELDS = ("stt_ms", "context_ms", "llm_ms", "tts_first_chunk_ms")
+SUMMARY_LOCK_KEY = "assistant_history_summary:{conversation_id}"
+SUMMARY_LOCK_TIMEOUT = 300
+# Sentence ends: Latin punctuation or the Devanagari danda, followed by whitespace.
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?\u0964])\s+")
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.monotonic() - started) * 1000)
+
+
+def _timed(timings: Dict[str, int], field: str, fn, *args, **kwargs):
+    started = time.monotonic()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        timings[field] = _elapsed_ms(started)
+
+
+def _history_item(turn: AssistantTurn) -> Dict[str, Any]:
+    return {
+        "user_input": turn.user_input_text or turn.transcript,
+        "assistant_text": turn.assistant_text,
+        "status": turn.status,
+        "created_at": turn.created_at.isoformat(),
+    }
+
 
 def _conversation_turn_history(conversation: AssistantConversation) -> List[Dict[str, Any]]:
-    turns = conversation.turns.order_by("-created_at")[:AI_PIPELINE_MAX_SESSION_TURNS]
-    return [
-        {
-            "user_input": item.user_input_text or item.transcript,
-            "assistant_text": item.assistant_text,
-            "status": item.status,
-            "created_at": item.created_at.isoformat(),
-        }
-        for item in reversed(list(turns))
-    ]
+    """Raw turns not yet folded into ``conversation.history_summary``."""
+    turns = conversation.turns.all()
+    if conversation.summarized_through:
+        turns = turns.filter(created_at__gt=conversation.summarized_through)
+    turns = turns.order_by("-created_at")[:AI_PIPELINE_MAX_SESSION_TURNS]
+    return [_history_item(item) for item in reversed(list(turns))]
+
+
+def _maybe_summarize_history(conversation: AssistantConversation, history: List[Dict[str, Any]]) -> None:
+    """Queue a background summary once the unsummarized turns outgrow the history budget."""
+    if len(history) <= AI_PIPELINE_HISTORY_RAW_TURNS:
+        return
+    if estimate_tokens(history) <= AI_PIPELINE_HISTORY_TOKEN_BUDGET:
+        return
+    lock_key = SUMMARY_LOCK_KEY.format(conversation_id=conversation.id)
+    try:
+        if not cache.add(lock_key, 1, SUMMARY_LOCK_TIMEOUT):
+            return
+        from assistant.tasks import summarize_conversation_history
+
+        summarize_conversation_history.delay(str(conversation.id))
+    except Exception as exc:
+        # Summaries are an optimisation; the turn itself already succeeded.
+        logger.warning("Could not queue history summary for %s: %s", conversation.id, exc)
+        cache.delete(lock_key)
+
+
+def summarize_conversation(conversation_id: str) -> Dict[str, Any]:
+    """
+    Fold every unsummarized turn except the last ``AI_PIPELINE_HISTORY_RAW_TURNS``
+    into the conversation's rolling summary.
+    """
+    try:
+        conversation = AssistantConversation.objects.get(id=conversation_id)
+        turns = conversation.turns.all()
+        if conversation.summarized_through:
+            turns = turns.filter(created_at__gt=conversation.summarized_through)
+        turns = list(turns.order_by("created_at"))
+        older = turns[:-AI_PIPELINE_HISTORY_RAW_TURNS] if AI_PIPELINE_HISTORY_RAW_TURNS > 0 else turns
+        if not older:
+            return {"summarized_turns": 0}
+
+        summary = summarize_history(
+            conversation.history_summary,
+            [_history_item(turn) for turn in older],
+            language=conversation.language_preference,
+        )
+        if not summary:
+            return {"summarized_turns": 0}
+        AssistantConversation.objects.filter(id=conversation.id).update(
+            history_summary=summary,
+            summarized_through=older[-1].created_at,
+        )
+        return {"summarized_turns": len(older)}
+    finally:
+        cache.delete(SUMMARY_LOCK_KEY.format(conversation_id=conversation_id))
 
 
 def _normalize_channel(channel: str) -> str:
@@ -132,18 +219,17 @@ def _get_or_create_conversation(
     )
 
 
-def run_turn(
+def _prepare_turn(
     *,
     user,
     channel: str,
     context_source: str,
     frontend_context: Optional[Dict[str, Any]],
-    conversation_id: Optional[str] = None,
-    message: str = "",
-    audio_bytes: bytes = b"",
-    audio_mime_type: str = "",
-    language_preference: str = "",
-    voice_name: str = "",
+    conversation_id: Optional[str],
+    message: str,
+    audio_bytes: bytes,
+    audio_mime_type: str,
+    language_preference: str,
 ) -> Dict[str, Any]:
     normalized_channel = _normalize_channel(channel)
     _ensure_supported_channel(normalized_channel)
@@ -164,34 +250,69 @@ def run_turn(
         if len(audio_bytes) > max_bytes:
             raise ValueError(f"Audio payload exceeds {AI_PIPELINE_MAX_AUDIO_MB}MB")
 
+    started = time.monotonic()
+    timings: Dict[str, int] = {}
+    context_kwargs = {
+        "user": user,
+        "conversation": conversation,
+        "context_source": context_source or "assistant",
+        "frontend_context": frontend_context or {},
+    }
     transcript = message.strip()
     if normalized_channel == "voice":
-        transcript = transcribe_audio(
-            audio_bytes=audio_bytes,
-            mime_type=audio_mime_type or "audio/webm",
-            language_hint=preferred_language,
-        ).strip()
+        # The backend context does not depend on the transcript, so build it on
+        # this thread (it needs the request's DB connection) while STT runs.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            stt_future = pool.submit(
+                _timed, timings, "stt_ms", transcribe_audio,
+                audio_bytes=audio_bytes,
+                mime_type=audio_mime_type or "audio/webm",
+                language_hint=preferred_language,
+            )
+            context = _timed(timings, "context_ms", build_conversation_context, **context_kwargs)
+            transcript = stt_future.result().strip() or message.strip()
+        if not transcript:
+            raise ValueError("No user input provided")
+    else:
         if not transcript:
-            transcript = message.strip()
+            raise ValueError("No user input provided")
+        context = _timed(timings, "context_ms", build_conversation_context, **context_kwargs)
 
-    if not transcript:
-        raise ValueError("No user input provided")
+    return {
+        "started": started,
+        "timings": timings,
+        "conversation": conversation,
+        "channel": normalized_channel,
+        "language": preferred_language,
+        "message": message.strip(),
+        "transcript": transcript,
+        "frontend_context": frontend_context or {},
+        "backend_context": context["stored_context"],
+        "llm_context": context["llm_context"],
+        "snapshot_id": context["snapshot_id"],
+        "session_turns": _conversation_turn_history(conversation),
+    }
 
-    backend_context = build_backend_context(
-        user=user,
-        context_source=context_source or "assistant",
-        frontend_context=frontend_context or {},
-    )
-    session_turns = _conversation_turn_history(conversation)
 
-    llm_output = generate_assistant_json(
-        user_message=transcript,
-        context_payload=backend_context,
-        channel=normalized_channel,
-        language_preference=preferred_language,
-        session_turns=session_turns,
-    )
+def _latency_payload(prepared: Dict[str, Any]) -> Dict[str, Optional[int]]:
+    timings = prepared["timings"]
+    return {field: timings.get(field) for field in LATENCY_FIELDS}
+
 
+def _llm_kwargs(prepared: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "user_message": prepared["transcript"],
+        "context_payload": prepared["llm_context"],
+        "channel": prepared["channel"],
+        "language_preference": prepared["language"],
+        "session_turns": prepared["session_turns"],
+        "history_summary": prepared["conversation"].history_summary,
+    }
+
+
+def _persist_turn(prepared: Dict[str, Any], llm_output: Dict[str, Any]):
+    """Normalize the model output and store the turn with its action proposals."""
+    preferred_language = prepared["language"]
     assistant_text = str(llm_output.get("assistant_text") or "").strip()
     language = str(llm_output.get("language") or preferred_language).strip() or preferred_language
     status = str(llm_output.get("status") or "ok").strip().lower()
@@ -216,18 +337,21 @@ def run_turn(
             }
         ]
 
+    conversation = prepared["conversation"]
     with transaction.atomic():
         turn = AssistantTurn.objects.create(
             conversation=conversation,
-            channel=normalized_channel,
-            user_input_text=message.strip(),
-            transcript=transcript,
-            frontend_context=frontend_context or {},
-            backend_context=backend_context,
+            channel=prepared["channel"],
+            user_input_text=prepared["message"],
+            transcript=prepared["transcript"],
+            frontend_context=prepared["frontend_context"],
+            backend_context=prepared["backend_context"],
+            context_snapshot_id=prepared["snapshot_id"],
             llm_output=llm_output,
             assistant_text=assistant_text,
             language=language,
             status=status,
+            **_latency_payload(prepared),
         )
 
         saved_proposals: List[AssistantActionProposal] = []
@@ -244,38 +368,282 @@ def run_turn(
                     requires_confirmation=True,
                 )
             )
+    _maybe_summarize_history(conversation, prepared["session_turns"] + [_history_item(turn)])
+    return turn, saved_proposals
+
+
+def _turn_payload(prepared: Dict[str, Any], turn: AssistantTurn, llm_output: Dict[str, Any], saved_proposals) -> Dict[str, Any]:
+    return {
+        "conversation_id": str(prepared["conversation"].id),
+        "turn_id": str(turn.id),
+        "status": turn.status,
+        "transcript": turn.transcript or turn.user_input_text,
+        "assistant_text": turn.assistant_text,
+        "language": turn.language,
+        "ui_blocks": llm_output.get("ui_blocks", []) if isinstance(llm_output.get("ui_blocks"), list) else [],
+        "action_proposals": [_serialize_proposal(item) for item in saved_proposals],
+        "latency": _latency_payload(prepared),
+    }
+
+
+def run_turn(
+    *,
+    user,
+    channel: str,
+    context_source: str,
+    frontend_context: Optional[Dict[str, Any]],
+    conversation_id: Optional[str] = None,
+    message: str = "",
+    audio_bytes: bytes = b"",
+    audio_mime_type: str = "",
+    language_preference: str = "",
+    voice_name: str = "",
+) -> Dict[str, Any]:
+    prepared = _prepare_turn(
+        user=user,
+        channel=channel,
+        context_source=context_source,
+        frontend_context=frontend_context,
+        conversation_id=conversation_id,
+        message=message,
+        audio_bytes=audio_bytes,
+        audio_mime_type=audio_mime_type,
+        language_preference=language_preference,
+    )
+
+    llm_output = _timed(prepared["timings"], "llm_ms", generate_assistant_json, **_llm_kwargs(prepared))
+    turn, saved_proposals = _persist_turn(prepared, llm_output)
 
     tts_payload: Dict[str, Any] | None = None
-    if normalized_channel == "voice" and assistant_text:
+    if prepared["channel"] == "voice" and turn.assistant_text:
         try:
             tts_payload = synthesize_speech(
-                text=assistant_text,
+                text=turn.assistant_text,
                 voice=voice_name,
-                language=language,
+                language=turn.language,
             )
             if tts_payload:
+                prepared["timings"]["tts_first_chunk_ms"] = _elapsed_ms(prepared["started"])
                 turn.tts_mime_type = str(tts_payload.get("mime_type") or "")
                 turn.tts_voice = str(tts_payload.get("voice") or "")
                 turn.tts_duration_ms = int(tts_payload.get("duration_ms") or 0)
-                turn.save(update_fields=["tts_mime_type", "tts_voice", "tts_duration_ms"])
+                turn.tts_first_chunk_ms = prepared["timings"]["tts_first_chunk_ms"]
+                turn.save(update_fields=["tts_mime_type", "tts_voice", "tts_duration_ms", "tts_first_chunk_ms"])
         except Exception:
             tts_payload = None
 
-    response_payload = {
-        "conversation_id": str(conversation.id),
-        "turn_id": str(turn.id),
-        "status": turn.status,
-        "transcript": turn.transcript or turn.user_input_text,
-        "assistant_text": turn.assistant_text,
-        "language": turn.language,
-        "ui_blocks": llm_output.get("ui_blocks", []) if isinstance(llm_output.get("ui_blocks"), list) else [],
-        "action_proposals": [_serialize_proposal(item) for item in saved_proposals],
-    }
-    if normalized_channel == "voice":
+    response_payload = _turn_payload(prepared, turn, llm_output, saved_proposals)
+    if prepared["channel"] == "voice":
         response_payload["tts"] = tts_payload or None
     return response_payload
 
 
+def stream_text_turn(
+    *,
+    user,
+    context_source: str,
+    frontend_context: Optional[Dict[str, Any]],
+    conversation_id: Optional[str] = None,
+    message: str = "",
+    language_preference: str = "",
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Text turn that streams ``assistant_text`` as it is generated.
+
+    Validation, conversation lookup and context building happen before this
+    returns, so input errors still raise ``ValueError`` up front. The returned
+    iterator yields ``(event, data)`` pairs: ``start``, any number of ``delta``,
+    then ``final`` (the same payload as ``run_turn``) once the turn and its
+    proposals are saved, or ``error`` if generation or saving fails.
+    """
+    prepared = _prepare_turn(
+        user=user,
+        channel="text",
+        context_source=context_source,
+        frontend_context=frontend_context,
+        conversation_id=conversation_id,
+        message=message,
+        audio_bytes=b"",
+        audio_mime_type="",
+        language_preference=language_preference,
+    )
+    return _stream_turn_events(prepared)
+
+
+def _stream_error(conversation_id: str, exc: Exception) -> Dict[str, Any]:
+    return {
+        "conversation_id": conversation_id,
+        "status": AssistantTurn.STATUS_ERROR,
+        "assistant_text": "Turn processing failed. Please retry.",
+        "error": str(exc),
+    }
+
+
+def _stream_turn_events(prepared: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    conversation_id = str(prepared["conversation"].id)
+    yield "start", {"conversation_id": conversation_id}
+    llm_output: Dict[str, Any] = {}
+    llm_started = time.monotonic()
+    try:
+        for kind, data in stream_assistant_json(**_llm_kwargs(prepared)):
+            if kind == "delta":
+                yield "delta", {"text": data}
+            else:
+                llm_output = data
+    except Exception as exc:
+        logger.warning("Streaming assistant turn failed: %s", exc)
+        yield "error", _stream_error(conversation_id, exc)
+        return
+    prepared["timings"]["llm_ms"] = _elapsed_ms(llm_started)
+
+    try:
+        turn, saved_proposals = _persist_turn(prepared, llm_output)
+    except Exception as exc:
+        # The client already showed the deltas; tell it the turn was not saved.
+        logger.exception("Saving streamed assistant turn failed: %s", exc)
+        yield "error", _stream_error(conversation_id, exc)
+        return
+    yield "final", _turn_payload(prepared, turn, llm_output, saved_proposals)
+
+
+def stream_voice_turn(
+    *,
+    user,
+    context_source: str,
+    frontend_context: Optional[Dict[str, Any]],
+    conversation_id: Optional[str] = None,
+    message: str = "",
+    audio_bytes: bytes = b"",
+    audio_mime_type: str = "",
+    language_preference: str = "",
+    voice_name: str = "",
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Pipelined voice turn. STT overlaps the backend context build, the reply is
+    streamed as it is generated, and each sentence is sent to TTS as soon as it
+    is complete so the first audio chunk does not wait for the whole reply.
+
+    Events: ``start`` (with the transcript), ``delta``, ``audio`` (one per
+    spoken segment, in order), ``final`` once the turn is saved, and ``done``
+    with the latency breakdown after the last audio chunk. Input errors raise
+    ``ValueError`` before the iterator is returned.
+    """
+    prepared = _prepare_turn(
+        user=user,
+        channel="voice",
+        context_source=context_source,
+        frontend_context=frontend_context,
+        conversation_id=conversation_id,
+        message=message,
+        audio_bytes=audio_bytes,
+        audio_mime_type=audio_mime_type,
+        language_preference=language_preference,
+    )
+    return _stream_voice_events(prepared, voice_name)
+
+
+def _take_segments(buffer: str, min_chars: int, flush: bool = False) -> Tuple[List[str], str]:
+    """Split complete sentences off ``buffer``, merging short ones up to ``min_chars``."""
+    parts = SENTENCE_BOUNDARY.split(buffer)
+    rest = "" if flush else parts.pop()
+    segments: List[str] = []
+    pending = ""
+    for part in parts:
+        pending = f"{pending} {part}".strip() if pending else part.strip()
+        if len(pending) >= min_chars:
+            segments.append(pending)
+            pending = ""
+    if flush and pending:
+        segments.append(pending)
+    elif pending:
+        rest = f"{pending} {rest}"
+    return segments, rest
+
+
+def _stream_voice_events(prepared: Dict[str, Any], voice_name: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    conversation_id = str(prepared["conversation"].id)
+    timings = prepared["timings"]
+    yield "start", {
+        "conversation_id": conversation_id,
+        "transcript": prepared["transcript"],
+        "latency": _latency_payload(prepared),
+    }
+
+    language = prepared["language"]
+    pool = ThreadPoolExecutor(max_workers=max(1, AI_PIPELINE_TTS_WORKERS))
+    pending: List[Tuple[str, Any]] = []
+    spoken: List[Dict[str, Any]] = []
+
+    def _submit(segments: List[str]) -> None:
+        for segment in segments:
+            pending.append((segment, pool.submit(synthesize_speech, text=segment, voice=voice_name, language=language)))
+
+    def _drain(wait: bool) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        while pending and (wait or pending[0][1].done()):
+            segment, future = pending.pop(0)
+            try:
+                audio = future.result()
+            except Exception as exc:
+                logger.warning("Segment TTS failed: %s", exc)
+                continue
+            if not audio:
+                continue
+            if "tts_first_chunk_ms" not in timings:
+                timings["tts_first_chunk_ms"] = _elapsed_ms(prepared["started"])
+            spoken.append(audio)
+            yield "audio", {
+                "index": len(spoken) - 1,
+                "text": segment,
+                "audio_base64": audio.get("audio_base64"),
+                "mime_type": audio.get("mime_type", "audio/wav"),
+            }
+
+    try:
+        llm_output: Dict[str, Any] = {}
+        buffer = ""
+        streamed = False
+        llm_started = time.monotonic()
+        try:
+            for kind, data in stream_assistant_json(**_llm_kwargs(prepared)):
+                if kind == "delta":
+                    streamed = True
+                    yield "delta", {"text": data}
+                    segments, buffer = _take_segments(buffer + data, AI_PIPELINE_TTS_MIN_SEGMENT_CHARS)
+                    _submit(segments)
+                    yield from _drain(wait=False)
+                else:
+                    llm_output = data
+        except Exception as exc:
+            logger.warning("Streaming voice turn failed: %s", exc)
+            yield "error", _stream_error(conversation_id, exc)
+            return
+        timings["llm_ms"] = _elapsed_ms(llm_started)
+
+        try:
+            turn, saved_proposals = _persist_turn(prepared, llm_output)
+        except Exception as exc:
+            logger.exception("Saving streamed voice turn failed: %s", exc)
+            yield "error", _stream_error(conversation_id, exc)
+            return
+        if not streamed:
+            # Nothing was streamed (e.g. the reply came back as non-JSON text).
+            buffer = turn.assistant_text
+        segments, _ = _take_segments(buffer, AI_PIPELINE_TTS_MIN_SEGMENT_CHARS, flush=True)
+        _submit(segments)
+        yield "final", _turn_payload(prepared, turn, llm_output, saved_proposals)
+        yield from _drain(wait=True)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if spoken:
+        turn.tts_mime_type = str(spoken[0].get("mime_type") or "")
+        turn.tts_voice = str(spoken[0].get("voice") or "")
+        turn.tts_duration_ms = sum(int(item.get("duration_ms") or 0) for item in spoken)
+        turn.tts_first_chunk_ms = timings.get("tts_first_chunk_ms")
+        turn.save(update_fields=["tts_mime_type", "tts_voice", "tts_duration_ms", "tts_first_chunk_ms"])
+    yield "done", {"turn_id": str(turn.id), "audio_chunks": len(spoken), "latency": _latency_payload(prepared)}
+
+
 def _execution_payload(execution: AssistantActionExecution, proposal: AssistantActionProposal) -> Dict[str, Any]:
     return {
         "execution_id": str(execution.id),
@@ -25,11 +25,18 @@ AI_PIPELINE_CHANNELS = {
 AI_PIPELINE_DEFAULT_LANGUAGE = str(os.getenv("AI_PIPELINE_DEFAULT_LANGUAGE", "hinglish")).strip() or "hinglish"
 AI_PIPELINE_MAX_FRONTEND_CONTEXT_BYTES = _env_int("AI_PIPELINE_MAX_FRONTEND_CONTEXT_BYTES", 12000)
 AI_PIPELINE_MAX_BACKEND_CONTEXT_BYTES = _env_int("AI_PIPELINE_MAX_BACKEND_CONTEXT_BYTES", 32000)
+AI_PIPELINE_MAX_CONTEXT_TOKENS = _env_int("AI_PIPELINE_MAX_CONTEXT_TOKENS", 8000)
+AI_PIPELINE_CONTEXT_CACHE_TTL_SEC = _env_int("AI_PIPELINE_CONTEXT_CACHE_TTL_SEC", 300)
 AI_PIPELINE_MAX_SESSION_TURNS = _env_int("AI_PIPELINE_MAX_SESSION_TURNS", 12)
+AI_PIPELINE_HISTORY_TOKEN_BUDGET = _env_int("AI_PIPELINE_HISTORY_TOKEN_BUDGET", 1500)
+AI_PIPELINE_HISTORY_RAW_TURNS = _env_int("AI_PIPELINE_HISTORY_RAW_TURNS", 4)
+AI_PIPELINE_HISTORY_SUMMARY_MAX_TOKENS = _env_int("AI_PIPELINE_HISTORY_SUMMARY_MAX_TOKENS", 400)
 AI_PIPELINE_MAX_AUDIO_MB = _env_int("AI_PIPELINE_MAX_AUDIO_MB", 8)
 AI_PIPELINE_STT_TIMEOUT_SEC = _env_int("AI_PIPELINE_STT_TIMEOUT_SEC", 30)
 AI_PIPELINE_LLM_TIMEOUT_SEC = _env_int("AI_PIPELINE_LLM_TIMEOUT_SEC", 35)
 AI_PIPELINE_TTS_TIMEOUT_SEC = _env_int("AI_PIPELINE_TTS_TIMEOUT_SEC", 35)
+AI_PIPELINE_TTS_WORKERS = _env_int("AI_PIPELINE_TTS_WORKERS", 2)
+AI_PIPELINE_TTS_MIN_SEGMENT_CHARS = _env_int("AI_PIPELINE_TTS_MIN_SEGMENT_CHARS", 40)
 
 GEMINI_STT_MODEL = str(os.getenv("GEMINI_STT_MODEL", "gemini-2.5-flash")).strip()
 GEMINI_LLM_MODEL = str(os.getenv("GEMINI_LLM_MODEL", "gemini-2.5-flash")).strip()
@@ -0,0 +1,42 @@
+"""
+Bump the owner's ``users.user_cache`` version whenever a model that feeds the
+assistant context snapshot is written, so the next turn rebuilds it. Bulk
+writes skip these signals; their call sites invalidate explicitly.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.user_cache import invalidate_user_cache
+
+# sender label -> how to reach the owning user's id from an instance
+SNAPSHOT_SOURCES = {
+    "users.CustomUser": lambda instance: instance.pk,
+    "users.UserProfile": lambda instance: instance.user_id,
+    "roadmap_ai.Roadmap": lambda instance: instance.user_id,
+    "roadmap_ai.Milestone": lambda instance: instance.roadmap.user_id,
+    "tasks.Task": lambda instance: instance.user_id,
+    "dashboard.ExecutionTask": lambda instance: instance.user_id,
+    "dashboard.UserStats": lambda instance: instance.user_id,
+    "scheduler.Event": lambda instance: instance.user_id,
+    "planora.Subject": lambda instance: instance.user_id,
+    "planora.Topic": lambda instance: instance.subject.user_id,
+}
+
+
+def _invalidate_owner(owner_id):
+    def handler(sender, instance, **kwargs):
+        try:
+            user_id = owner_id(instance)
+        except Exception:
+            # Parent already gone (cascade delete); the parent's own signal covers it.
+            return
+        invalidate_user_cache(user_id)
+
+    return handler
+
+
+for _label, _owner_id in SNAPSHOT_SOURCES.items():
+    _handler = _invalidate_owner(_owner_id)
+    receiver(post_save, sender=_label, weak=False, dispatch_uid=f"assistant_snapshot_save:{_label}")(_handler)
+    receiver(post_delete, sender=_label, weak=False, dispatch_uid=f"assistant_snapshot_delete:{_label}")(_handler)
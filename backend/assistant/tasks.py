@@ -2,7 +2,7 @@ from celery import shared_task
 from django.utils import timezone
 
 from assistant.models import AssistantActionExecution, AssistantJob
-from assistant.services.orchestrator import execute_action_execution
+from assistant.services.orchestrator import execute_action_execution, summarize_conversation
 
 
 @shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={"max_retries": 2})
@@ -31,3 +31,7 @@ def run_assistant_action_job(self, execution_id: str, job_id: str):
     job.save(update_fields=["status", "result", "error", "completed_at", "updated_at"])
     return payload
 
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={"max_retries": 2})
+def summarize_conversation_history(self, conversation_id: str):
+    return summarize_conversation(conversation_id)
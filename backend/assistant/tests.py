@@ -1,16 +1,50 @@
-from unittest.mock import patch
+import json
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
 
-from django.test import TestCase
+import requests
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
 
+from backend import gemini_client
 from assistant.models import (
     AssistantActionExecution,
     AssistantActionProposal,
+    AssistantContextSnapshot,
     AssistantConversation,
     AssistantTurn,
 )
 from assistant.serializers import AssistantV2TurnSerializer
-from assistant.services.orchestrator import confirm_action, run_turn
+from assistant.services.context_aggregator import build_backend_context, build_conversation_context
+from assistant.services.context_packer import (
+    SNAPSHOT_PACKING_STEPS,
+    encoded_size,
+    estimate_tokens,
+    pack_json_payload,
+)
+from assistant.services.gemini_pipeline import AssistantTextStream, fit_history
+from assistant.services.orchestrator import (
+    _conversation_turn_history,
+    confirm_action,
+    run_turn,
+    summarize_conversation,
+)
+from dashboard.execution_mirror import sync_roadmap_tasks_into_execution
+from roadmap_ai.models import Milestone, Roadmap
+from tasks.models import Task
+from tasks.task_generator import auto_create_tasks_from_roadmap
+
+
+STUB_CONTEXT = {
+    "llm_context": {"context_source": "assistant"},
+    "stored_context": {"context_source": "assistant"},
+    "snapshot_id": None,
+}
 
 
 class AssistantV2TurnSerializerTests(TestCase):
@@ -110,7 +144,7 @@ class AssistantRunTurnTests(TestCase):
             password="testpass123",
         )
 
-    @patch("assistant.services.orchestrator.build_backend_context", return_value={"context_source": "assistant"})
+    @patch("assistant.services.orchestrator.build_conversation_context", return_value=STUB_CONTEXT)
     @patch("assistant.services.orchestrator.generate_assistant_json")
     def test_unsupported_action_proposals_do_not_crash_turn(self, mock_llm, _mock_context):
         mock_llm.return_value = {
@@ -144,7 +178,7 @@ class AssistantRunTurnTests(TestCase):
         self.assertIn("ui_blocks", payload)
         self.assertNotIn("tts", payload)
 
-    @patch("assistant.services.orchestrator.build_backend_context", return_value={"context_source": "assistant"})
+    @patch("assistant.services.orchestrator.build_conversation_context", return_value=STUB_CONTEXT)
     @patch("assistant.services.orchestrator.generate_assistant_json")
     def test_supported_action_creates_confirmable_proposal(self, mock_llm, _mock_context):
         mock_llm.return_value = {
@@ -177,3 +211,505 @@ class AssistantRunTurnTests(TestCase):
         self.assertEqual(len(payload["action_proposals"]), 1)
         self.assertEqual(payload["action_proposals"][0]["action_type"], "task.update_status")
         self.assertNotIn("tts", payload)
+
+
+class ContextPackerTests(TestCase):
+    def _snapshot(self, text_length):
+        text = "x" * text_length
+        return {
+            "profile": {"name": "Asha", "goal_statement": text},
+            "roadmaps": {"count": 5, "items": [{"id": idx, "goal": text} for idx in range(5)]},
+            "tasks": {
+                "summary": {"total": 12, "pending": 12},
+                "pending_items": [{"task_id": f"t{idx}", "title": text} for idx in range(12)],
+            },
+            "scheduler": {"upcoming_count": 5, "next_events": [{"id": idx, "title": text} for idx in range(5)]},
+            "planora": {"subjects_count": 6, "subjects": [{"id": idx, "name": text} for idx in range(6)]},
+        }
+
+    def test_payload_within_budget_is_returned_untouched(self):
+        snapshot = self._snapshot(10)
+        self.assertIs(pack_json_payload(snapshot, 100000, SNAPSHOT_PACKING_STEPS), snapshot)
+
+    def test_low_priority_sections_go_first(self):
+        snapshot = self._snapshot(200)
+        budget = encoded_size(snapshot) - 1000
+
+        packed = pack_json_payload(snapshot, budget, SNAPSHOT_PACKING_STEPS)
+
+        self.assertLessEqual(encoded_size(packed), budget)
+        self.assertEqual(packed["_trimmed"][0], "scheduler.next_events")
+        self.assertNotIn("next_events", packed["scheduler"])
+        self.assertEqual(packed["scheduler"]["upcoming_count"], 5)
+        self.assertEqual(len(packed["roadmaps"]["items"]), 5)
+        self.assertEqual(len(packed["tasks"]["pending_items"]), 12)
+        self.assertIn("next_events", snapshot["scheduler"])
+
+    def test_shortens_lists_and_strings_before_giving_up(self):
+        snapshot = self._snapshot(5000)
+
+        packed = pack_json_payload(snapshot, 8000, SNAPSHOT_PACKING_STEPS)
+
+        self.assertLessEqual(encoded_size(packed), 8000)
+        self.assertNotIn("truncated", packed)
+        self.assertEqual(packed["tasks"]["summary"], snapshot["tasks"]["summary"])
+        self.assertTrue(packed["tasks"]["pending_items"])
+        self.assertIn("long_strings", packed["_trimmed"])
+        self.assertTrue(packed["profile"]["goal_statement"].endswith("..."))
+
+    def test_token_budget_caps_byte_budget(self):
+        snapshot = self._snapshot(500)
+
+        packed = pack_json_payload(snapshot, 10 ** 6, SNAPSHOT_PACKING_STEPS, max_tokens=1000)
+
+        self.assertLessEqual(estimate_tokens(packed), 1000)
+        self.assertIn("profile", packed)
+
+    def test_tiny_budget_keeps_sections_that_fit(self):
+        packed = pack_json_payload(self._snapshot(5000), 300, SNAPSHOT_PACKING_STEPS)
+
+        self.assertTrue(packed["truncated"])
+        self.assertLessEqual(encoded_size(packed), 300)
+
+
+class ContextSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user(
+            email="assistant-snapshot@example.com",
+            username="assistant_snapshot_user",
+            password="testpass123",
+        )
+        self.conversation = AssistantConversation.objects.create(user=self.user)
+        self.roadmap = Roadmap.objects.create(user=self.user, title="Backend", goal="Ship APIs")
+
+    def _add_task(self, title):
+        Task.objects.create(
+            user=self.user, roadmap=self.roadmap, title=title, day=1, due_date=date(2026, 1, 1))
+
+    def test_snapshot_is_cached_until_a_source_model_changes(self):
+        first = build_backend_context(self.user, context_source="assistant")
+        with self.assertNumQueries(0):
+            build_backend_context(self.user, context_source="assistant")
+
+        self._add_task("Write tests")
+        refreshed = build_backend_context(self.user, context_source="assistant")
+
+        self.assertEqual(first["tasks"]["summary"]["total"], 0)
+        self.assertEqual(refreshed["tasks"]["summary"]["total"], 1)
+        self.assertEqual(AssistantContextSnapshot.objects.filter(user=self.user).count(), 2)
+
+    def test_bulk_generated_and_mirrored_tasks_refresh_the_snapshot(self):
+        Milestone.objects.create(roadmap=self.roadmap, title="APIs", duration="1 week", order=1)
+        build_backend_context(self.user, context_source="assistant")
+
+        created = auto_create_tasks_from_roadmap(self.roadmap)
+        after_generation = build_backend_context(self.user, context_source="assistant")
+        sync_roadmap_tasks_into_execution(self.user)
+        after_mirror = build_backend_context(self.user, context_source="assistant")
+
+        self.assertGreater(len(created), 0)
+        self.assertEqual(after_generation["tasks"]["summary"]["total"], len(created))
+        self.assertEqual(after_generation["execution"]["total"], 0)
+        self.assertEqual(after_mirror["execution"]["total"], len(created))
+
+    def test_conversation_keeps_anchor_and_sends_only_changed_sections(self):
+        for idx in range(5):
+            Roadmap.objects.create(
+                user=self.user, title=f"Track {idx}", goal="Become a backend engineer " * 4)
+        self._add_task("Existing")
+        first = build_conversation_context(self.user, self.conversation, "assistant")
+        second = build_conversation_context(self.user, self.conversation, "assistant")
+
+        self.conversation.refresh_from_db()
+        self.assertEqual(str(self.conversation.context_snapshot_id), first["snapshot_id"])
+        self.assertEqual(second["snapshot_id"], first["snapshot_id"])
+        self.assertEqual(second["llm_context"]["snapshot_changes"], {})
+        self.assertNotIn("profile", second["stored_context"])
+
+        self._add_task("New task")
+        third = build_conversation_context(self.user, self.conversation, "assistant")
+
+        self.assertNotEqual(third["snapshot_id"], first["snapshot_id"])
+        self.assertEqual(third["llm_context"]["snapshot"], first["llm_context"]["snapshot"])
+        self.assertEqual(set(third["llm_context"]["snapshot_changes"]), {"tasks"})
+        self.assertEqual(third["llm_context"]["snapshot_changes"]["tasks"]["summary"]["total"], 2)
+
+    def test_large_diff_reanchors_conversation(self):
+        first = build_conversation_context(self.user, self.conversation, "assistant")
+        for idx in range(10):
+            self._add_task(f"Task {idx}")
+
+        second = build_conversation_context(self.user, self.conversation, "assistant")
+
+        self.conversation.refresh_from_db()
+        self.assertNotEqual(second["snapshot_id"], first["snapshot_id"])
+        self.assertEqual(str(self.conversation.context_snapshot_id), second["snapshot_id"])
+        self.assertEqual(second["llm_context"]["snapshot_changes"], {})
+        self.assertEqual(second["llm_context"]["snapshot"]["tasks"]["summary"]["total"], 10)
+
+    @patch("assistant.services.orchestrator.generate_assistant_json")
+    def test_turns_reference_shared_snapshot_row(self, mock_llm):
+        mock_llm.return_value = {"status": "ok", "assistant_text": "Hi", "action_proposals": []}
+        for message in ("hello", "again"):
+            run_turn(
+                user=self.user,
+                channel="text",
+                context_source="assistant",
+                frontend_context={},
+                conversation_id=str(self.conversation.id),
+                message=message,
+            )
+
+        turns = list(AssistantTurn.objects.filter(conversation=self.conversation))
+        self.assertEqual(len(turns), 2)
+        self.assertEqual(turns[0].context_snapshot_id, turns[1].context_snapshot_id)
+        self.assertIsNotNone(turns[0].context_snapshot_id)
+        self.assertNotIn("tasks", turns[1].backend_context)
+
+
+@patch("assistant.services.orchestrator.build_conversation_context", return_value=STUB_CONTEXT)
+class HistorySummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user(
+            email="assistant-history@example.com",
+            username="assistant_history_user",
+            password="testpass123",
+        )
+        self.conversation = AssistantConversation.objects.create(user=self.user)
+        start = timezone.now() - timedelta(hours=1)
+        for idx in range(8):
+            turn = AssistantTurn.objects.create(
+                conversation=self.conversation,
+                channel="text",
+                user_input_text=f"question {idx} " + "detail " * 120,
+                assistant_text=f"answer {idx}",
+            )
+            AssistantTurn.objects.filter(id=turn.id).update(created_at=start + timedelta(minutes=idx))
+
+    def _turn(self, message="next"):
+        return run_turn(
+            user=self.user,
+            channel="text",
+            context_source="assistant",
+            frontend_context={},
+            conversation_id=str(self.conversation.id),
+            message=message,
+        )
+
+    @patch("assistant.services.orchestrator.generate_assistant_json", return_value={"assistant_text": "ok"})
+    def test_long_history_queues_one_summary(self, _mock_llm, _mock_context):
+        with patch("assistant.tasks.summarize_conversation_history.delay") as delay:
+            self._turn()
+            self._turn()
+
+        delay.assert_called_once_with(str(self.conversation.id))
+
+    @patch("assistant.services.orchestrator.generate_assistant_json", return_value={"assistant_text": "ok"})
+    @patch("assistant.services.orchestrator.summarize_history", return_value="Student is revising questions 0-3.")
+    def test_summary_replaces_older_turns_in_prompt(self, mock_summarize, mock_llm, _mock_context):
+        result = summarize_conversation(str(self.conversation.id))
+
+        self.assertEqual(result, {"summarized_turns": 4})
+        self.assertEqual(len(mock_summarize.call_args[0][1]), 4)
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.history_summary, "Student is revising questions 0-3.")
+        history = _conversation_turn_history(self.conversation)
+        self.assertEqual([item["assistant_text"] for item in history], [f"answer {idx}" for idx in range(4, 8)])
+
+        with patch("assistant.tasks.summarize_conversation_history.delay"):
+            self._turn()
+        kwargs = mock_llm.call_args.kwargs
+        self.assertEqual(kwargs["history_summary"], "Student is revising questions 0-3.")
+        self.assertEqual(len(kwargs["session_turns"]), 4)
+
+    def test_prompt_history_is_fitted_to_token_budget(self, _mock_context):
+        history = _conversation_turn_history(self.conversation)
+
+        fitted = fit_history(history, 500)
+
+        self.assertLess(len(fitted), len(history))
+        self.assertEqual(fitted[-1], history[-1])
+        self.assertEqual(fit_history(history, 1), history[-1:])
+
+
+class AssistantTextStreamTests(TestCase):
+    RAW = '{"status": "ok", "assistant_text": "Line \\"one\\"\\nNamaste \\u0905\\ud83d\\ude00 done", "ui_blocks": []}'
+
+    def test_extracts_text_across_any_chunk_split(self):
+        expected = json.loads(self.RAW)["assistant_text"]
+        for size in (1, 2, 3, 5, 7):
+            extractor = AssistantTextStream()
+            pieces = [
+                extractor.feed(self.RAW[idx:idx + size])
+                for idx in range(0, len(self.RAW), size)
+            ]
+            self.assertEqual("".join(pieces), expected, f"chunk size {size}")
+
+
+@patch("assistant.services.orchestrator.build_conversation_context", return_value=STUB_CONTEXT)
+@patch("assistant.views.AI_PIPELINE_ENABLED", True)
+class AssistantTurnStreamTests(TestCase):
+    LLM_OUTPUT = {
+        "status": "ok",
+        "assistant_text": "Task ko in progress mark karte hain.",
+        "language": "hinglish",
+        "ui_blocks": [],
+        "action_proposals": [
+            {
+                "action_type": "task.update_status",
+                "summary": "Mark task in progress",
+                "args": {"task_id": "abc", "status": "in_progress"},
+                "args_preview": {"task_id": "abc", "status": "in_progress"},
+            }
+        ],
+    }
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="assistant-stream@example.com",
+            username="assistant_stream_user",
+            password="testpass123",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _chunks(self, size=9):
+        raw = json.dumps(self.LLM_OUTPUT)
+        return [
+            {"candidates": [{"content": {"parts": [{"text": raw[idx:idx + size]}]}}]}
+            for idx in range(0, len(raw), size)
+        ]
+
+    def _events(self, response):
+        body = b"".join(response.streaming_content).decode()
+        events = []
+        for block in body.strip().split("\n\n"):
+            name, data = block.split("\n", 1)
+            events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+        return events
+
+    def test_streams_deltas_then_persists_turn(self, _mock_context):
+        with patch(
+            "assistant.services.gemini_pipeline.gemini_client.stream_generate_content",
+            return_value=iter(self._chunks()),
+        ):
+            response = self.client.post(
+                "/api/assistant/v2/turn/stream/", {"message": "mark it"}, format="json")
+            events = self._events(response)
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        names = [name for name, _ in events]
+        self.assertEqual(names[0], "start")
+        self.assertEqual(names[-1], "final")
+        self.assertGreater(names.count("delta"), 1)
+        streamed = "".join(data["text"] for name, data in events if name == "delta")
+        self.assertEqual(streamed, self.LLM_OUTPUT["assistant_text"])
+
+        final = events[-1][1]
+        self.assertEqual(final["status"], AssistantTurn.STATUS_NEEDS_CONFIRMATION)
+        turn = AssistantTurn.objects.get(id=final["turn_id"])
+        self.assertEqual(turn.assistant_text, self.LLM_OUTPUT["assistant_text"])
+        self.assertEqual(AssistantActionProposal.objects.filter(turn=turn).count(), 1)
+
+    def test_generation_failure_emits_error_without_saving(self, _mock_context):
+        with patch(
+            "assistant.services.gemini_pipeline.gemini_client.stream_generate_content",
+            side_effect=requests.exceptions.ConnectionError("reset"),
+        ):
+            response = self.client.post(
+                "/api/assistant/v2/turn/stream/", {"message": "hello"}, format="json")
+            events = self._events(response)
+
+        self.assertEqual([name for name, _ in events], ["start", "error"])
+        self.assertFalse(AssistantTurn.objects.exists())
+
+    @patch("assistant.services.orchestrator.transcribe_audio", return_value="task ko progress me daalo")
+    @patch("assistant.services.orchestrator.synthesize_speech")
+    def test_voice_stream_speaks_sentences_and_records_latency(self, mock_tts, _mock_stt, _mock_context):
+        mock_tts.side_effect = lambda text, voice, language: {
+            "audio_base64": text, "mime_type": "audio/wav", "voice": "Kore", "duration_ms": 100}
+        self.LLM_OUTPUT = dict(
+            self.LLM_OUTPUT,
+            assistant_text="Theek hai, main task update kar deta hoon. Bas ek baar confirm kar do!",
+        )
+        audio = SimpleUploadedFile("turn.webm", b"fake-audio", content_type="audio/webm")
+        with patch(
+            "assistant.services.gemini_pipeline.gemini_client.stream_generate_content",
+            return_value=iter(self._chunks(size=6)),
+        ):
+            response = self.client.post(
+                "/api/assistant/v2/turn/stream/", {"audio": audio}, format="multipart")
+            events = self._events(response)
+
+        names = [name for name, _ in events]
+        self.assertEqual(names[0], "start")
+        self.assertEqual(events[0][1]["transcript"], "task ko progress me daalo")
+        self.assertEqual(names[-1], "done")
+        self.assertLess(names.index("final"), names.index("done"))
+        spoken = [data["text"] for name, data in events if name == "audio"]
+        self.assertEqual(spoken, [
+            "Theek hai, main task update kar deta hoon.",
+            "Bas ek baar confirm kar do!",
+        ])
+        self.assertEqual(
+            [data["index"] for name, data in events if name == "audio"], [0, 1])
+
+        turn = AssistantTurn.objects.get(id=events[-1][1]["turn_id"])
+        self.assertEqual(turn.channel, "voice")
+        self.assertEqual(turn.tts_duration_ms, 200)
+        for field in ("stt_ms", "context_ms", "llm_ms", "tts_first_chunk_ms"):
+            self.assertIsNotNone(getattr(turn, field), field)
+        self.assertEqual(events[-1][1]["latency"]["tts_first_chunk_ms"], turn.tts_first_chunk_ms)
+
+    def test_save_failure_after_deltas_emits_error(self, _mock_context):
+        with patch(
+            "assistant.services.gemini_pipeline.gemini_client.stream_generate_content",
+            return_value=iter(self._chunks()),
+        ), patch("assistant.services.orchestrator._persist_turn", side_effect=DatabaseError("locked")):
+            response = self.client.post(
+                "/api/assistant/v2/turn/stream/", {"message": "mark it"}, format="json")
+            events = self._events(response)
+
+        names = [name for name, _ in events]
+        self.assertIn("delta", names)
+        self.assertEqual(names[-1], "error")
+        self.assertEqual(events[-1][1]["assistant_text"], "Turn processing failed. Please retry.")
+
+    @patch("assistant.services.orchestrator.transcribe_audio", side_effect=RuntimeError("stt down"))
+    def test_failure_before_streaming_returns_structured_error(self, _mock_stt, _mock_context):
+        audio = SimpleUploadedFile("turn.webm", b"fake-audio", content_type="audio/webm")
+        response = self.client.post("/api/assistant/v2/turn/stream/", {"audio": audio}, format="multipart")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.data["status"], "error")
+        self.assertEqual(response.data["assistant_text"], "Turn processing failed. Please retry.")
+
+    def test_empty_message_is_rejected_before_streaming(self, _mock_context):
+        response = self.client.post("/api/assistant/v2/turn/stream/", {"message": ""}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+
+
+def _gemini_response(status_code, payload=None):
+    response = MagicMock(status_code=status_code, ok=200 <= status_code < 300, headers={})
+    response.json.return_value = payload or {}
+    if not response.ok:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    return response
+
+
+@override_settings(
+    GEMINI_CLIENT_MAX_RETRIES=2,
+    GEMINI_CLIENT_BREAKER_THRESHOLD=2,
+    GEMINI_CLIENT_BREAKER_COOLDOWN_SEC=60,
+)
+@patch("backend.gemini_client.time.sleep")
+class GeminiClientTests(TestCase):
+    OK_PAYLOAD = {
+        "candidates": [{"content": {"parts": [{"text": "hello"}]}}],
+        "usageMetadata": {"promptTokenCount": 3, "candidatesTokenCount": 1},
+    }
+
+    def setUp(self):
+        gemini_client._reset_state()
+        self.addCleanup(gemini_client._reset_state)
+        self.session = MagicMock()
+        for patcher in (
+            patch("backend.gemini_client.get_session", return_value=self.session),
+            patch("backend.gemini_client.get_api_key", return_value="test-key"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_retries_server_errors_then_succeeds(self, _sleep):
+        self.session.post.side_effect = [
+            _gemini_response(503),
+            _gemini_response(200, self.OK_PAYLOAD),
+        ]
+
+        text = gemini_client.generate_text("hi", generation_config={"temperature": 0})
+
+        self.assertEqual(text, "hello")
+        self.assertEqual(self.session.post.call_count, 2)
+        _, kwargs = self.session.post.call_args
+        self.assertEqual(kwargs["headers"]["x-goog-api-key"], "test-key")
+        self.assertNotIn("key=", self.session.post.call_args[0][0])
+        counters = gemini_client.metrics_snapshot()[gemini_client.DEFAULT_MODEL]
+        self.assertEqual(counters["ok"], 1)
+        self.assertEqual(counters["retries"], 1)
+        self.assertEqual(counters["prompt_tokens"], 3)
+
+    def test_client_errors_are_not_retried(self, _sleep):
+        self.session.post.return_value = _gemini_response(400)
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            gemini_client.generate_text("hi")
+
+        self.assertEqual(self.session.post.call_count, 1)
+
+    def test_breaker_opens_after_repeated_failures(self, _sleep):
+        self.session.post.return_value = _gemini_response(503)
+
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                gemini_client.generate_text("hi")
+        calls = self.session.post.call_count
+
+        with self.assertRaises(gemini_client.GeminiUnavailable):
+            gemini_client.generate_text("hi")
+        self.assertEqual(self.session.post.call_count, calls)
+
+    def test_half_open_breaker_lets_one_probe_through(self, _sleep):
+        breaker = gemini_client.CircuitBreaker(threshold=1, cooldown=30)
+        with patch("backend.gemini_client.time.monotonic") as clock:
+            clock.return_value = 0
+            breaker.record_failure()
+            clock.return_value = 10
+            self.assertFalse(breaker.allow())
+
+            clock.return_value = 31
+            self.assertEqual([breaker.allow() for _ in range(3)], [True, False, False])
+            breaker.record_failure()
+            clock.return_value = 50
+            self.assertFalse(breaker.allow())
+
+            clock.return_value = 62
+            self.assertTrue(breaker.allow())
+            clock.return_value = 80
+            self.assertFalse(breaker.allow())
+            clock.return_value = 93  # the probe never reported back
+            self.assertTrue(breaker.allow())
+            breaker.record_success()
+            self.assertEqual([breaker.allow() for _ in range(3)], [True, True, True])
+
+    def test_stream_yields_chunks_and_records_first_chunk(self, _sleep):
+        response = _gemini_response(200)
+        response.iter_lines.return_value = [
+            'data: {"candidates": [{"content": {"parts": [{"text": "hel"}]}}]}',
+            "",
+            'data: {"candidates": [{"content": {"parts": [{"text": "lo"}]}}]}',
+        ]
+        self.session.post.return_value = response
+
+        chunks = list(gemini_client.stream_generate_content(gemini_client.DEFAULT_MODEL, {"contents": []}))
+
+        self.assertEqual("".join(gemini_client.extract_text(chunk) for chunk in chunks), "hello")
+        args, kwargs = self.session.post.call_args
+        self.assertTrue(args[0].endswith(":streamGenerateContent"))
+        self.assertEqual(kwargs["params"], {"alt": "sse"})
+        response.close.assert_called_once()
+        counters = gemini_client.metrics_snapshot()[gemini_client.DEFAULT_MODEL]
+        self.assertEqual(counters["streams"], 1)
+
+    def test_legacy_chat_helper_maps_rate_limits(self, _sleep):
+        from assistant.views import GeminiAPIError, call_gemini_api
+
+        self.session.post.return_value = _gemini_response(429)
+
+        with self.assertRaises(GeminiAPIError):
+            call_gemini_api("hi")
+        self.assertEqual(self.session.post.call_count, 3)
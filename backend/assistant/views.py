@@ -4,6 +4,7 @@ import os
 
 import requests
 from django.conf import settings
+from django.http import StreamingHttpResponse
 from dotenv import load_dotenv
 from rest_framework import status
 from rest_framework.decorators import api_view, parser_classes, permission_classes
@@ -11,6 +12,7 @@ from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from backend import gemini_client
 from roadmap_ai.models import Roadmap
 from tasks.models import Task
 
@@ -24,6 +26,8 @@ from .services.orchestrator import (
     get_job_payload,
     get_pipeline_config,
     run_turn,
+    stream_text_turn,
+    stream_voice_turn,
 )
 from .services.pipeline_config import AI_PIPELINE_ENABLED
 from .services.context_aggregator import build_backend_context
@@ -126,37 +130,19 @@ class GeminiAPIError(Exception):
     pass
 
 
-def call_gemini_api(prompt, max_retries=3):
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={GEMINI_API_KEY}"
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {"temperature": 0.7, "topP": 0.9, "maxOutputTokens": 1024},
-    }
-
-    last_error = None
-    for _ in range(max_retries):
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            if response.status_code == 429:
-                raise GeminiAPIError("I'm receiving too many requests right now. Please wait a minute and try again.")
-            if response.status_code in {400, 403}:
-                raise GeminiAPIError("The AI service is unavailable. Please try again later.")
-            if not response.ok:
-                raise GeminiAPIError(f"AI service returned an error (code {response.status_code}). Please try again.")
-
-            data = response.json()
-            candidates = data.get("candidates") or []
-            if candidates:
-                parts = candidates[0].get("content", {}).get("parts") or []
-                if parts and parts[0].get("text"):
-                    return parts[0]["text"]
-            return "I'm sorry, I couldn't generate a response. Please try again."
-        except (requests.exceptions.SSLError, requests.exceptions.ConnectionError) as exc:
-            last_error = exc
-            continue
-
-    raise requests.exceptions.RequestException(f"Failed after {max_retries} attempts: {last_error}")
+def call_gemini_api(prompt):
+    generation_config = {"temperature": 0.7, "topP": 0.9, "maxOutputTokens": 1024}
+    try:
+        # Retries, back-off and rate limiting are handled by the shared client.
+        text = gemini_client.generate_text(prompt, generation_config=generation_config)
+    except requests.exceptions.HTTPError as exc:
+        status_code = exc.response.status_code if exc.response is not None else None
+        if status_code == 429:
+            raise GeminiAPIError("I'm receiving too many requests right now. Please wait a minute and try again.")
+        if status_code in {400, 403}:
+            raise GeminiAPIError("The AI service is unavailable. Please try again later.")
+        raise GeminiAPIError(f"AI service returned an error (code {status_code}). Please try again.")
+    return text or "I'm sorry, I couldn't generate a response. Please try again."
 
 
 @api_view(["POST"])
@@ -285,6 +271,83 @@ def assistant_v2_turn(request):
         )
 
 
+def _sse_events(events):
+    for event, data in events:
+        yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser, JSONParser])
+def assistant_v2_turn_stream(request):
+    """
+    Streaming variant of ``assistant_v2_turn``. ``assistant_text`` arrives as
+    server-sent ``delta`` events and a ``final`` event carries the same payload
+    the non-streaming endpoint returns. Voice turns additionally send ``audio``
+    events sentence by sentence and end with ``done``.
+    """
+    if not AI_PIPELINE_ENABLED:
+        return Response(
+            {
+                "status": "error",
+                "assistant_text": "Assistant pipeline is disabled right now.",
+                "fallback": {"legacy_endpoint": "/api/assistant/chat/"},
+            },
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+    incoming = request.data.copy()
+    incoming["channel"] = "voice" if request.FILES.get("audio") else "text"
+    frontend_context = incoming.get("frontend_context")
+    if isinstance(frontend_context, str):
+        try:
+            incoming["frontend_context"] = json.loads(frontend_context)
+        except json.JSONDecodeError:
+            incoming["frontend_context"] = {}
+
+    serializer = AssistantV2TurnSerializer(data=incoming)
+    serializer.is_valid(raise_exception=True)
+    validated = serializer.validated_data
+    turn_kwargs = {
+        "user": request.user,
+        "context_source": validated.get("context_source", "assistant"),
+        "frontend_context": validated.get("frontend_context") or {},
+        "conversation_id": str(validated.get("conversation_id")) if validated.get("conversation_id") else None,
+        "message": validated.get("message", ""),
+        "language_preference": validated.get("language_preference", ""),
+    }
+
+    try:
+        if validated["channel"] == "voice":
+            audio_file = request.FILES["audio"]
+            events = stream_voice_turn(
+                audio_bytes=audio_file.read(),
+                audio_mime_type=getattr(audio_file, "content_type", "") or "audio/webm",
+                voice_name=validated.get("voice_name", ""),
+                **turn_kwargs,
+            )
+        else:
+            events = stream_text_turn(**turn_kwargs)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as exc:
+        # Speech-to-text and context building run before the stream starts.
+        logger.exception("assistant_v2_turn_stream failed: %s", exc)
+        return Response(
+            {
+                "status": "error",
+                "assistant_text": "Turn processing failed. Please retry.",
+                "error": str(exc),
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    response = StreamingHttpResponse(_sse_events(events), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def assistant_v2_action_confirm(request):
@@ -1,9 +1,9 @@
-import os
 import json
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from backend import gemini_client
 from .models import ATSAnalysis
 from .serializers import ATSAnalysisSerializer
 
@@ -14,12 +14,6 @@ def analyze_resume(request):
     """
     Analyze resume against a JD using Gemini.
     """
-    # Lazy import - only load when function is called
-    try:
-        import google.generativeai as genai
-    except (ImportError, TypeError):
-        return Response({"error": "AI Service unavailable"}, status=503)
-
     user = request.user
     resume_text = request.data.get('resume_text', '')
     job_description = request.data.get('job_description', '')
@@ -54,16 +48,15 @@ def analyze_resume(request):
     """
 
     try:
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if not api_key:
+        if not gemini_client.get_api_key():
              return Response({"error": "API Key missing"}, status=500)
-             
-        genai.configure(api_key=api_key)
+
         # Using flash for speed/cost
-        model = genai.GenerativeModel('gemini-2.5-flash', generation_config={"response_mime_type": "application/json"})
-        
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
+        result_text = gemini_client.generate_text(
+            prompt,
+            model='gemini-2.5-flash',
+            generation_config={"responseMimeType": "application/json"},
+        )
         
         # Clean markdown json blocks if present
         if "```json" in result_text:
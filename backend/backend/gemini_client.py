@@ -0,0 +1,425 @@
+"""
+Shared Gemini REST client.
+
+Every text/multimodal ``generateContent`` call in the backend goes through
+``generate_content`` (or ``stream_generate_content`` for token streaming) so
+all callers in a worker process share:
+
+* one keep-alive ``requests.Session`` (pooled TLS connections)
+* per-API-key back-pressure: a concurrency semaphore plus a token bucket;
+  callers queue for up to GEMINI_CLIENT_QUEUE_TIMEOUT_SEC, then fail fast
+* retries with jittered exponential backoff on connection errors, 429 and 5xx
+* a per-key circuit breaker that short-circuits calls while Gemini is failing
+* one structured log line per call with latency and token usage
+* an opt-in, content-addressed response cache (``backend.llm_cache``)
+
+Failures surface as ``requests`` exceptions (``HTTPError``, ``Timeout``,
+``ConnectionError``) so existing handlers keep working. ``GeminiUnavailable``
+(also a ``RequestException``) means the call was never sent: the breaker is
+open or the local queue is full.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from backend import llm_cache
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = 'https://generativelanguage.googleapis.com/v1beta/models'
+DEFAULT_MODEL = 'gemini-2.5-flash'
+DEFAULT_TIMEOUT = 30
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+BACKOFF_BASE_SEC = 0.5
+BACKOFF_MAX_SEC = 8.0
+
+
+class GeminiUnavailable(requests.exceptions.RequestException):
+    """The request was not sent (circuit open or local queue full)."""
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def get_api_key():
+    return str(os.getenv('GEMINI_API_KEY') or _setting('GEMINI_API_KEY', '') or '').strip()
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a token or the timeout."""
+
+    def __init__(self, rate_per_sec, capacity):
+        self.rate = max(rate_per_sec, 0.001)
+        self.capacity = max(capacity, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after ``threshold`` consecutive upstream failures. Once ``cooldown``
+    seconds pass it is half-open: a single probe call is let through and every
+    other call is still rejected until the probe succeeds (closing it) or fails
+    (re-opening it). A probe that never reports back is replaced after another
+    ``cooldown``.
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = max(threshold, 1)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.half_open_probe = False
+        self.probe_started_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.cooldown:
+                return False
+            if self.half_open_probe and now - self.probe_started_at < self.cooldown:
+                return False
+            self.half_open_probe = True
+            self.probe_started_at = now
+            return True
+
+    def release_probe(self):
+        """The call ended without saying anything about upstream health."""
+        with self.lock:
+            self.half_open_probe = False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.half_open_probe = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.half_open_probe = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class _KeyLimits:
+    def __init__(self):
+        self.semaphore = threading.BoundedSemaphore(
+            max(_setting('GEMINI_CLIENT_MAX_CONCURRENCY', 8), 1))
+        self.bucket = TokenBucket(
+            _setting('GEMINI_CLIENT_RATE_PER_MIN', 300) / 60.0,
+            _setting('GEMINI_CLIENT_RATE_BURST', 20),
+        )
+        self.breaker = CircuitBreaker(
+            _setting('GEMINI_CLIENT_BREAKER_THRESHOLD', 5),
+            _setting('GEMINI_CLIENT_BREAKER_COOLDOWN_SEC', 30),
+        )
+
+
+_state_lock = threading.Lock()
+_session = None
+_limits = {}
+_metrics = defaultdict(lambda: defaultdict(int))
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _state_lock:
+            if _session is None:
+                pool_size = _setting('GEMINI_CLIENT_POOL_SIZE', 16)
+                session = requests.Session()
+                # Retries are handled here, not by urllib3, so they respect the limiter.
+                session.mount('https://', HTTPAdapter(
+                    pool_connections=4, pool_maxsize=pool_size, max_retries=0))
+                _session = session
+    return _session
+
+
+def _limits_for(api_key):
+    limits = _limits.get(api_key)
+    if limits is None:
+        with _state_lock:
+            limits = _limits.setdefault(api_key, _KeyLimits())
+    return limits
+
+
+def _reset_state():
+    """Drop pooled connections, limiters and metrics (tests, settings changes)."""
+    global _session
+    with _state_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _limits.clear()
+        _metrics.clear()
+
+
+def metrics_snapshot():
+    """Per-model call counters for this process."""
+    with _state_lock:
+        return {model: dict(counters) for model, counters in _metrics.items()}
+
+
+def _record(model, outcome, attempts, started, usage=None, status_code=None, first_chunk_ms=None):
+    latency_ms = int((time.monotonic() - started) * 1000)
+    usage = usage or {}
+    prompt_tokens = int(usage.get('promptTokenCount') or 0)
+    output_tokens = int(usage.get('candidatesTokenCount') or 0)
+
+    with _state_lock:
+        counters = _metrics[model]
+        counters['calls'] += 1
+        counters[outcome] += 1
+        counters['retries'] += max(attempts - 1, 0)
+        counters['latency_ms_total'] += latency_ms
+        counters['prompt_tokens'] += prompt_tokens
+        counters['output_tokens'] += output_tokens
+        if first_chunk_ms is not None:
+            counters['streams'] += 1
+            counters['first_chunk_ms_total'] += first_chunk_ms
+
+    log = logger.info if outcome == 'ok' else logger.warning
+    log(
+        "gemini_call model=%s outcome=%s status=%s attempts=%d latency_ms=%d "
+        "first_chunk_ms=%s prompt_tokens=%d output_tokens=%d",
+        model, outcome, status_code, attempts, latency_ms, first_chunk_ms,
+        prompt_tokens, output_tokens,
+    )
+
+
+def _backoff_delay(attempt, retry_after=None):
+    try:
+        if retry_after is not None:
+            return min(float(retry_after), BACKOFF_MAX_SEC)
+    except (TypeError, ValueError):
+        pass
+    # Full jitter keeps concurrent retries from re-synchronising.
+    return random.uniform(0, min(BACKOFF_MAX_SEC, BACKOFF_BASE_SEC * (2 ** (attempt - 1))))
+
+
+def generate_content(model, payload, timeout=DEFAULT_TIMEOUT, api_key=None,
+                     cache_ttl=None, force_refresh=False, validate_text=None):
+    """
+    POST ``payload`` to ``models/<model>:generateContent`` and return the JSON body.
+
+    Pass ``cache_ttl`` (seconds) to serve identical requests from the shared
+    LLM cache; only use it where the answer does not depend on who asks.
+    ``force_refresh`` bypasses the cached entry and replaces it. Only complete
+    replies (``finishReason`` STOP) are cached, and with ``validate_text`` only
+    those whose text it accepts (returns truthy without raising), so a
+    malformed reply is not served to everyone until the TTL runs out.
+    """
+    if cache_ttl:
+        return llm_cache.get_or_generate(
+            model,
+            payload,
+            lambda: _generate_content(model, payload, timeout, api_key),
+            ttl=cache_ttl,
+            force_refresh=force_refresh,
+            cacheable=lambda data: is_cacheable(data, validate_text),
+        )
+    return _generate_content(model, payload, timeout, api_key)
+
+
+def is_cacheable(data, validate_text=None):
+    """Whether a generateContent body is a finished reply worth sharing."""
+    candidates = (data or {}).get('candidates') or []
+    if not candidates or candidates[0].get('finishReason') != 'STOP':
+        return False
+    text = extract_text(data)
+    if not text:
+        return False
+    if validate_text is None:
+        return True
+    try:
+        return bool(validate_text(text))
+    except Exception:
+        return False
+
+
+def _acquire(model, api_key, started):
+    """Check the breaker and take a concurrency slot; returns the key's limits."""
+    limits = _limits_for(api_key)
+    if not limits.breaker.allow():
+        _record(model, 'short_circuited', 0, started)
+        raise GeminiUnavailable('Gemini is temporarily unavailable (circuit open)')
+
+    if not limits.semaphore.acquire(timeout=_setting('GEMINI_CLIENT_QUEUE_TIMEOUT_SEC', 10)):
+        limits.breaker.release_probe()
+        _record(model, 'rejected', 0, started)
+        raise GeminiUnavailable('Gemini request queue is full')
+    return limits
+
+
+def _generate_content(model, payload, timeout, api_key):
+    api_key = api_key or get_api_key()
+    if not api_key:
+        raise ValueError('GEMINI_API_KEY is not configured')
+
+    started = time.monotonic()
+    limits = _acquire(model, api_key, started)
+    try:
+        response, attempts = _post_with_retries(
+            model, 'generateContent', payload, timeout, api_key, limits, started)
+        data = response.json()
+        _record(model, 'ok', attempts, started, data.get('usageMetadata'), response.status_code)
+        return data
+    finally:
+        limits.semaphore.release()
+
+
+def stream_generate_content(model, payload, timeout=DEFAULT_TIMEOUT, api_key=None):
+    """
+    POST ``payload`` to ``models/<model>:streamGenerateContent`` (SSE) and yield
+    each response chunk as it arrives. Limits and the breaker apply as for
+    ``generate_content``; retries only happen before the first byte.
+    """
+    api_key = api_key or get_api_key()
+    if not api_key:
+        raise ValueError('GEMINI_API_KEY is not configured')
+
+    started = time.monotonic()
+    limits = _acquire(model, api_key, started)
+    response = None
+    attempts = 0
+    usage = None
+    first_chunk_ms = None
+    try:
+        response, attempts = _post_with_retries(
+            model, 'streamGenerateContent', payload, timeout, api_key, limits, started,
+            stream=True)
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith('data:'):
+                continue
+            chunk = json.loads(line[len('data:'):].strip())
+            if first_chunk_ms is None:
+                first_chunk_ms = int((time.monotonic() - started) * 1000)
+            usage = chunk.get('usageMetadata') or usage
+            yield chunk
+    except (requests.exceptions.RequestException, ValueError):
+        if response is not None:
+            # Broke mid-stream; connection-level failures count against the breaker.
+            limits.breaker.record_failure()
+            _record(model, 'error', attempts, started, usage, response.status_code, first_chunk_ms)
+        raise
+    else:
+        _record(model, 'ok', attempts, started, usage, response.status_code, first_chunk_ms)
+    finally:
+        if response is not None:
+            response.close()
+        limits.semaphore.release()
+
+
+def _post_with_retries(model, action, payload, timeout, api_key, limits, started, stream=False):
+    """Send the request, retrying transient failures; returns ``(response, attempts)``."""
+    url = f'{API_BASE_URL}/{model}:{action}'
+    params = {'alt': 'sse'} if stream else None
+    headers = {'x-goog-api-key': api_key}
+    max_retries = max(_setting('GEMINI_CLIENT_MAX_RETRIES', 2), 0)
+    queue_timeout = _setting('GEMINI_CLIENT_QUEUE_TIMEOUT_SEC', 10)
+    session = get_session()
+    attempt = 0
+
+    while True:
+        attempt += 1
+        if not limits.bucket.acquire(queue_timeout):
+            limits.breaker.release_probe()
+            _record(model, 'rejected', attempt - 1, started)
+            raise GeminiUnavailable('Gemini rate limit reached, try again shortly')
+
+        retry_after = None
+        status_code = None
+        try:
+            response = session.post(
+                url, params=params, json=payload, headers=headers, timeout=timeout, stream=stream)
+        except requests.exceptions.ReadTimeout:
+            # The request may have been processed; do not resend it.
+            limits.breaker.record_failure()
+            _record(model, 'timeout', attempt, started)
+            raise
+        except requests.exceptions.ConnectionError as exc:
+            error = exc
+        else:
+            status_code = response.status_code
+            if response.ok:
+                limits.breaker.record_success()
+                return response, attempt
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as exc:
+                error = exc
+            if status_code not in RETRY_STATUS_CODES:
+                # Caller error (bad request, auth): not a sign Gemini is down.
+                limits.breaker.release_probe()
+                _record(model, 'error', attempt, started, status_code=status_code)
+                raise error
+            retry_after = response.headers.get('Retry-After')
+
+        if attempt > max_retries:
+            limits.breaker.record_failure()
+            _record(model, 'error', attempt, started, status_code=status_code)
+            raise error
+        time.sleep(_backoff_delay(attempt, retry_after))
+
+
+def extract_text(payload):
+    """Join the text parts of the first candidate."""
+    candidates = (payload or {}).get('candidates') or []
+    if not candidates:
+        return ''
+    parts = (candidates[0].get('content') or {}).get('parts') or []
+    return '\n'.join(
+        part['text'] for part in parts if isinstance(part, dict) and part.get('text')
+    ).strip()
+
+
+def generate_text(prompt, model=DEFAULT_MODEL, generation_config=None,
+                  timeout=DEFAULT_TIMEOUT, extra_parts=None, cache_ttl=None,
+                  force_refresh=False, validate_text=None):
+    """
+    Single-turn helper: send ``prompt`` (plus optional inline parts such as
+    ``{'inlineData': {...}}``) and return the response text. ``cache_ttl``,
+    ``force_refresh`` and ``validate_text`` are passed through to
+    ``generate_content``.
+    """
+    payload = {
+        'contents': [
+            {'role': 'user', 'parts': [{'text': prompt}, *(extra_parts or [])]},
+        ],
+    }
+    if generation_config:
+        payload['generationConfig'] = generation_config
+    return extract_text(generate_content(
+        model, payload, timeout=timeout, cache_ttl=cache_ttl, force_refresh=force_refresh,
+        validate_text=validate_text))
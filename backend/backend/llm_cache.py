@@ -0,0 +1,136 @@
+"""
+Content-addressed cache for LLM responses.
+
+Keys are a SHA-256 of (model, request payload), so any caller that sends the
+same prompt with the same generation config gets the same entry regardless of
+which user triggered it. Caching is opt-in per call site: pass ``cache_ttl`` to
+``gemini_client.generate_content`` / ``generate_text``. ``force_refresh=True``
+skips the lookup and overwrites the entry with a fresh response.
+
+Entries live in the ``llm`` cache alias (see settings). Values larger than
+LLM_CACHE_MAX_VALUE_BYTES are returned but not stored. As in
+``users.user_cache``, a short ``cache.add`` lock stops concurrent misses on a
+popular prompt from all calling the model, and cache errors never fail a call.
+"""
+
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'llm'
+# Bump to orphan every entry after a change to how responses are produced.
+KEY_VERSION = 1
+METRIC_KEY = 'llm_cache_metrics:{kind}'
+METRIC_KINDS = ('hits', 'misses', 'coalesced', 'refreshes', 'oversized')
+LOCK_SUFFIX = ':lock'
+
+LOCK_TIMEOUT = 60
+LOCK_WAIT_SECONDS = 20.0
+LOCK_POLL_SECONDS = 0.1
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def cache_key(model, payload):
+    canonical = json.dumps(
+        {'model': model, 'payload': payload},
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False,
+    )
+    digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    return f'llm:v{KEY_VERSION}:{digest}'
+
+
+def _record(kind):
+    key = METRIC_KEY.format(kind=kind)
+    try:
+        cache = _cache()
+        if cache.add(key, 1, None):
+            return
+        cache.incr(key)
+    except Exception:
+        pass
+
+
+def _store(key, value, ttl):
+    max_bytes = getattr(settings, 'LLM_CACHE_MAX_VALUE_BYTES', 256 * 1024)
+    size = len(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+    if size > max_bytes:
+        _record('oversized')
+        return
+    try:
+        _cache().set(key, value, ttl)
+    except Exception:
+        logger.warning('LLM cache unavailable while storing %s', key, exc_info=True)
+
+
+def get_or_generate(model, payload, generate, ttl=None, force_refresh=False, cacheable=bool):
+    """
+    Return the cached response for (model, payload) or call ``generate()``.
+    Results for which ``cacheable(result)`` is false are returned but not stored.
+    """
+    if ttl is None:
+        ttl = getattr(settings, 'LLM_CACHE_TTL_SEC', 60 * 60 * 24 * 7)
+    key = cache_key(model, payload)
+
+    try:
+        cache = _cache()
+        cached = None if force_refresh else cache.get(key)
+    except Exception:
+        logger.warning('LLM cache unavailable for %s', model, exc_info=True)
+        return generate()
+
+    if cached is not None:
+        _record('hits')
+        return cached
+
+    _record('refreshes' if force_refresh else 'misses')
+    lock_key = key + LOCK_SUFFIX
+    try:
+        have_lock = cache.add(lock_key, 1, LOCK_TIMEOUT)
+    except Exception:
+        have_lock = True
+
+    if not have_lock and not force_refresh:
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_SECONDS)
+            cached = cache.get(key)
+            if cached is not None:
+                _record('coalesced')
+                return cached
+        # The lock holder is slow or failed; generate ourselves.
+
+    try:
+        value = generate()
+        if value is not None and cacheable(value):
+            _store(key, value, ttl)
+        return value
+    finally:
+        if have_lock:
+            try:
+                cache.delete(lock_key)
+            except Exception:
+                pass
+
+
+def cache_metrics():
+    """Hit/miss counters for the shared LLM cache, aggregated across workers."""
+    keys = {kind: METRIC_KEY.format(kind=kind) for kind in METRIC_KINDS}
+    try:
+        raw = _cache().get_many(list(keys.values()))
+    except Exception:
+        raw = {}
+    counters = {kind: int(raw.get(key) or 0) for kind, key in keys.items()}
+    lookups = counters['hits'] + counters['misses']
+    counters['hit_rate'] = round(counters['hits'] / lookups, 4) if lookups else 0.0
+    return counters
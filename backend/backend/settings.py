@@ -371,6 +371,49 @@ GEMINI_LLM_MODEL = _env_str('GEMINI_LLM_MODEL', 'gemini-2.5-flash')
 GEMINI_TTS_MODEL = _env_str('GEMINI_TTS_MODEL', 'gemini-2.5-flash-preview-tts')
 GEMINI_DEFAULT_VOICE = _env_str('GEMINI_DEFAULT_VOICE', 'Kore')
 
+# Shared Gemini REST client (see backend.gemini_client). Limits apply per API
+# key and per worker process.
+GEMINI_CLIENT_POOL_SIZE = _env_int('GEMINI_CLIENT_POOL_SIZE', 16)
+GEMINI_CLIENT_MAX_CONCURRENCY = _env_int('GEMINI_CLIENT_MAX_CONCURRENCY', 8)
+GEMINI_CLIENT_RATE_PER_MIN = _env_int('GEMINI_CLIENT_RATE_PER_MIN', 300)
+GEMINI_CLIENT_RATE_BURST = _env_int('GEMINI_CLIENT_RATE_BURST', 20)
+GEMINI_CLIENT_QUEUE_TIMEOUT_SEC = _env_int('GEMINI_CLIENT_QUEUE_TIMEOUT_SEC', 10)
+GEMINI_CLIENT_MAX_RETRIES = _env_int('GEMINI_CLIENT_MAX_RETRIES', 2)
+GEMINI_CLIENT_BREAKER_THRESHOLD = _env_int('GEMINI_CLIENT_BREAKER_THRESHOLD', 5)
+GEMINI_CLIENT_BREAKER_COOLDOWN_SEC = _env_int('GEMINI_CLIENT_BREAKER_COOLDOWN_SEC', 30)
+
+# GitHub repo snapshots for task validators (see tasks.github_snapshot).
+GITHUB_API_TIMEOUT_SEC = _env_int('GITHUB_API_TIMEOUT_SEC', 10)
+GITHUB_CLIENT_POOL_SIZE = _env_int('GITHUB_CLIENT_POOL_SIZE', 10)
+GITHUB_SNAPSHOT_TTL_SEC = _env_int('GITHUB_SNAPSHOT_TTL_SEC', 60)
+GITHUB_ETAG_CACHE_TTL_SEC = _env_int('GITHUB_ETAG_CACHE_TTL_SEC', 60 * 60 * 24)
+# Commits fetched (100 per request) for the commit spread analysis.
+GITHUB_COMMIT_HISTORY_MAX = _env_int('GITHUB_COMMIT_HISTORY_MAX', 1000)
+# Caps on the tarball streamed for keyword checks (see tasks.github_archive).
+GITHUB_ARCHIVE_MAX_BYTES = _env_int('GITHUB_ARCHIVE_MAX_BYTES', 20 * 1024 * 1024)
+GITHUB_ARCHIVE_MAX_FILE_BYTES = _env_int('GITHUB_ARCHIVE_MAX_FILE_BYTES', 1024 * 1024)
+GITHUB_ARCHIVE_TIMEOUT_SEC = _env_int('GITHUB_ARCHIVE_TIMEOUT_SEC', 20)
+# Requests per hour the validation workers may spend per GitHub token (GitHub
+# allows 5000 with a token, 60 per IP without one).
+GITHUB_TOKEN_REQUESTS_PER_HOUR = _env_int('GITHUB_TOKEN_REQUESTS_PER_HOUR', 4000)
+GITHUB_ANON_REQUESTS_PER_HOUR = _env_int('GITHUB_ANON_REQUESTS_PER_HOUR', 50)
+
+# Background sync of published repo stats (see github_integration.stats_sync).
+GITHUB_STATS_SYNC_CONCURRENCY = _env_int('GITHUB_STATS_SYNC_CONCURRENCY', 8)
+GITHUB_STATS_SYNC_MIN_INTERVAL_SEC = _env_int('GITHUB_STATS_SYNC_MIN_INTERVAL_SEC', 60)
+# Secret of the push webhook at /api/github/webhook/, registered on every
+# published repo; empty disables it. GITHUB_WEBHOOK_URL overrides the public
+# URL of that endpoint (default: built from the publishing request).
+GITHUB_WEBHOOK_SECRET = _env_str('GITHUB_WEBHOOK_SECRET', '')
+GITHUB_WEBHOOK_URL = _env_str('GITHUB_WEBHOOK_URL', '')
+
+# Task attempt validation (see tasks.validation_queue).
+VALIDATION_QUEUE = _env_str('VALIDATION_QUEUE', 'validation')
+VALIDATION_MAX_RETRIES = _env_int('VALIDATION_MAX_RETRIES', 5)
+# Longest wait between rate-limit retries; keep it below the visibility timeout.
+VALIDATION_RETRY_MAX_DELAY_SEC = _env_int('VALIDATION_RETRY_MAX_DELAY_SEC', 900)
+VALIDATION_STATUS_RETRY_AFTER_SEC = _env_int('VALIDATION_STATUS_RETRY_AFTER_SEC', 2)
+
 # Celery + Redis for async assistant actions
 CELERY_BROKER_URL = _env_str('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = _env_str('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
@@ -378,6 +421,58 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Redis redelivers a task not acknowledged within this window, including
+# countdown/ETA tasks a worker is still holding.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'visibility_timeout': _env_int('CELERY_VISIBILITY_TIMEOUT_SEC', 60 * 60),
+}
+# GitHub validation waits on the network; its own queue keeps it from
+# delaying assistant and roadmap jobs.
+if VALIDATION_QUEUE:
+    CELERY_TASK_ROUTES = {'tasks.tasks.run_attempt_validation': {'queue': VALIDATION_QUEUE}}
+
+# Shared cache for per-user dashboard payloads (see users.user_cache).
+# Points at the same Redis as Celery on a separate DB; without it each worker
+# falls back to its own LocMem cache (fine for local dev and tests).
+REDIS_CACHE_URL = _env_str('REDIS_CACHE_URL', '')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'KEY_PREFIX': 'planorah',
+            'TIMEOUT': 300,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'planorah-default',
+        }
+    }
+
+# Content-addressed LLM response cache (see backend.llm_cache). Entries are
+# shared across users. Give it its own Redis (LLM_CACHE_REDIS_URL) with
+# maxmemory + allkeys-lru to bound its size; LocMem is capped by entry count.
+LLM_CACHE_TTL_SEC = _env_int('LLM_CACHE_TTL_SEC', 60 * 60 * 24 * 7)
+LLM_CACHE_MAX_ENTRIES = _env_int('LLM_CACHE_MAX_ENTRIES', 5000)
+LLM_CACHE_MAX_VALUE_BYTES = _env_int('LLM_CACHE_MAX_VALUE_BYTES', 256 * 1024)
+LLM_CACHE_REDIS_URL = _env_str('LLM_CACHE_REDIS_URL') or REDIS_CACHE_URL
+if LLM_CACHE_REDIS_URL:
+    CACHES['llm'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': LLM_CACHE_REDIS_URL,
+        'KEY_PREFIX': 'planorah-llm',
+        'TIMEOUT': LLM_CACHE_TTL_SEC,
+    }
+else:
+    CACHES['llm'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'planorah-llm',
+        'TIMEOUT': LLM_CACHE_TTL_SEC,
+        'OPTIONS': {'MAX_ENTRIES': LLM_CACHE_MAX_ENTRIES},
+    }
 
 # Logging Configuration
 LOGGING = {
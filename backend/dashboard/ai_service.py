@@ -2,13 +2,19 @@ import json
 import os
 from typing import Dict, List
 
-import requests
 from django.conf import settings
 
+from backend import gemini_client
+
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY') or getattr(settings, 'GEMINI_API_KEY', None)
 GEMINI_MODEL = os.getenv('GEMINI_LLM_MODEL', 'gemini-2.5-flash')
 
+# Identical payloads get the same answer, so both calls use the shared LLM cache.
+# Coach payloads carry live stats and go stale sooner than a syllabus plan.
+COACH_CACHE_TTL = 60 * 60 * 6
+EXAM_PLAN_CACHE_TTL = 60 * 60 * 24 * 7
+
 
 def _safe_json_from_text(text: str) -> Dict:
     raw = (text or '').strip()
@@ -34,19 +40,18 @@ def _normalize_coach_payload(payload: Dict) -> Dict:
     }
 
 
-def _gemini_structured_call(system_prompt: str, user_payload: Dict) -> Dict:
+def _gemini_structured_call(system_prompt: str, user_payload: Dict, cache_ttl: int = None) -> Dict:
     if not GEMINI_API_KEY:
         raise ValueError('GEMINI_API_KEY missing')
 
-    response = requests.post(
-        f'https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}',
-        headers={'Content-Type': 'application/json'},
-        json={
+    response_payload = gemini_client.generate_content(
+        GEMINI_MODEL,
+        {
             'contents': [
                 {
                     'parts': [
                         {
-                            'text': f"{system_prompt}\n\nInput:\n{json.dumps(user_payload)}\n\nReturn valid JSON only."
+                            'text': f"{system_prompt}\n\nInput:\n{json.dumps(user_payload, sort_keys=True)}\n\nReturn valid JSON only."
                         }
                     ]
                 }
@@ -58,10 +63,12 @@ def _gemini_structured_call(system_prompt: str, user_payload: Dict) -> Dict:
             },
         },
         timeout=30,
+        api_key=GEMINI_API_KEY,
+        cache_ttl=cache_ttl,
+        validate_text=_safe_json_from_text,
     )
-    response.raise_for_status()
 
-    candidates = response.json().get('candidates') or []
+    candidates = response_payload.get('candidates') or []
     if not candidates:
         raise ValueError('Gemini empty response')
 
@@ -84,7 +91,7 @@ def generate_coach_recommendation(payload: Dict) -> Dict:
     )
 
     try:
-        data = _gemini_structured_call(system_prompt, payload)
+        data = _gemini_structured_call(system_prompt, payload, cache_ttl=COACH_CACHE_TTL)
     except Exception:
         data = {
             'task': 'Start one 25-minute deep work sprint on your most important pending task',
@@ -110,7 +117,7 @@ def generate_exam_plan(payload: Dict) -> Dict:
     )
 
     try:
-        data = _gemini_structured_call(system_prompt, payload)
+        data = _gemini_structured_call(system_prompt, payload, cache_ttl=EXAM_PLAN_CACHE_TTL)
     except Exception:
         data = {
             'topics': [
@@ -0,0 +1,154 @@
+"""
+Change-driven mirror of roadmap tasks (tasks.Task) into ExecutionTask.
+
+Every tasks.Task write goes through ``save()``, so ``updated_at`` is a reliable
+change marker. The mirror keeps a per-user watermark (latest source
+``updated_at`` + source row count) in ``ExecutionMirrorState``:
+
+* nothing changed  -> two small queries (state row + one aggregate), no writes
+* rows changed     -> only rows at/after the watermark are re-mirrored, written
+                      back with a single ``bulk_create(update_conflicts=True)``
+* rows deleted     -> the count moves, and orphaned mirrors are removed
+
+``reconcile_execution_mirror`` runs the same code with ``full=True`` to repair
+any drift.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Max
+
+from users.user_cache import invalidate_user_cache
+
+from .models import ExecutionMirrorState, ExecutionTask
+
+MIRROR_SOURCE = 'roadmap_task'
+
+MIRROR_UPDATE_FIELDS = [
+    'title',
+    'task_type',
+    'status',
+    'priority',
+    'difficulty',
+    'estimated_time',
+    'estimated_minutes',
+    'reason',
+    'ai_generated',
+    'metadata',
+    'scheduled_for',
+    'completed_at',
+    'updated_at',
+]
+
+BULK_BATCH_SIZE = 500
+
+
+def roadmap_status_to_execution_status(status_value):
+    status_value = str(status_value or '').strip().lower()
+    mapping = {
+        'not_started': 'pending',
+        'in_progress': 'in_progress',
+        'pending_validation': 'in_progress',
+        'needs_revision': 'pending',
+        'completed': 'completed',
+    }
+    return mapping.get(status_value, 'pending')
+
+
+def _mirror_for(user, source_task):
+    estimated_minutes = max(1, int(source_task.estimated_minutes or 25))
+    status = roadmap_status_to_execution_status(source_task.status)
+    completed_at = source_task.completed_at if status == 'completed' else None
+
+    return ExecutionTask(
+        id=source_task.task_id,
+        user=user,
+        title=source_task.title,
+        task_type='learning',
+        status=status,
+        priority='medium',
+        difficulty='medium',
+        estimated_time=f'{estimated_minutes} min',
+        estimated_minutes=estimated_minutes,
+        reason=source_task.objective or source_task.description or '',
+        ai_generated=False,
+        metadata={
+            'source': MIRROR_SOURCE,
+            'roadmap_id': source_task.roadmap_id,
+            'milestone_id': source_task.milestone_id,
+            'day': source_task.day,
+        },
+        scheduled_for=source_task.due_date,
+        completed_at=completed_at,
+    )
+
+
+def _remove_orphans(user, source_qs, source_total):
+    """
+    Drop mirrors whose source task no longer exists.
+    Completed mirrors are kept so weekly/XP history stays intact.
+    """
+    mirrors = ExecutionTask.objects.filter(
+        user=user, metadata__source=MIRROR_SOURCE)
+    if mirrors.count() <= source_total:
+        return 0
+
+    orphans = mirrors.exclude(
+        id__in=source_qs.values('task_id')).exclude(status='completed')
+    deleted, _ = orphans.delete()
+    return deleted
+
+
+def sync_roadmap_tasks_into_execution(user, full=False):
+    """
+    Mirror roadmap tasks into execution tasks so dashboard and focus mode stay
+    aligned with day-wise roadmap scheduling.
+
+    Returns the number of mirrored rows written.
+    """
+    from tasks.models import Task as RoadmapTask
+
+    source_qs = RoadmapTask.objects.filter(user=user)
+    state, _ = ExecutionMirrorState.objects.get_or_create(user=user)
+    marker = source_qs.aggregate(latest=Max('updated_at'), total=Count('task_id'))
+    latest, total = marker['latest'], int(marker['total'] or 0)
+
+    unchanged = (
+        latest == state.source_updated_at
+        and total == state.source_count
+    )
+    if unchanged and not full:
+        return 0
+
+    changed_qs = source_qs
+    if not full and state.source_updated_at is not None:
+        # >= so rows sharing the watermark timestamp are never skipped.
+        changed_qs = source_qs.filter(updated_at__gte=state.source_updated_at)
+
+    mirrored = [
+        _mirror_for(user, source_task)
+        for source_task in changed_qs.only(
+            'task_id', 'roadmap_id', 'milestone_id', 'title', 'status',
+            'objective', 'description', 'estimated_minutes', 'day',
+            'due_date', 'completed_at',
+        )
+    ]
+
+    with transaction.atomic():
+        if mirrored:
+            ExecutionTask.objects.bulk_create(
+                mirrored,
+                batch_size=BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['id'],
+                update_fields=MIRROR_UPDATE_FIELDS,
+            )
+        _remove_orphans(user, source_qs, total)
+
+        state.source_updated_at = latest
+        state.source_count = total
+        state.save(update_fields=['source_updated_at', 'source_count', 'synced_at'])
+
+    if mirrored:
+        # bulk_create skips post_save, so the snapshot signals never see these rows.
+        invalidate_user_cache(user)
+    return len(mirrored)
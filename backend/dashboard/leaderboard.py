@@ -0,0 +1,174 @@
+"""
+League leaderboard backed by the materialized ``UserStats.league_points`` column.
+
+The score itself is maintained on every ``UserStats.save()``, so the leaderboard
+never has to load the whole table: the top entries come from one ordered LIMIT
+query over ``dashboard_us_league_rank_idx``, and the caller's rank is a count
+of the rows ahead of them. That count needs no join, so it is answered from
+the higher-scoring end of the index alone instead of visiting every
+participant. Inactive users, who are not ranked, are
+few: their sort keys are cached with the participant total and subtracted in
+Python. The cache lives for PARTICIPANTS_CACHE_TTL and is dropped whenever a
+stats row is created or deleted (``dashboard.signals``).
+"""
+
+from django.core.cache import cache
+from django.db.models import F, Q
+
+from .models import UserStats
+
+LEADERBOARD_SIZE = 10
+PARTICIPANTS_CACHE_KEY = 'leaderboard:participants'
+# Also bounds how long a (de)activated user is still counted the old way.
+PARTICIPANTS_CACHE_TTL = 60
+
+# Must match the column order of ``dashboard_us_league_rank_idx``.
+RANK_ORDERING = ('-league_points', '-tasks_completed', '-current_streak', 'updated_at')
+
+
+def league_points_for(stats_obj):
+    """League score for a stats row (or any object exposing the same counters)."""
+    if isinstance(stats_obj, UserStats):
+        return stats_obj.compute_league_points()
+    xp_points = int(getattr(stats_obj, 'xp_points', 0) or 0)
+    streak_bonus = int(getattr(stats_obj, 'current_streak', 0) or 0) * UserStats.LEAGUE_STREAK_WEIGHT
+    completion_bonus = int(getattr(stats_obj, 'tasks_completed', 0) or 0) * UserStats.LEAGUE_COMPLETION_WEIGHT
+    return xp_points + streak_bonus + completion_bonus
+
+
+def _participants():
+    return UserStats.objects.filter(user__is_active=True)
+
+
+def _ranked_ahead_of(stats):
+    """Rows that sort strictly before ``stats`` under RANK_ORDERING."""
+    points = stats.league_points
+    completed = stats.tasks_completed
+    streak = stats.current_streak
+    return (
+        Q(league_points__gt=points)
+        | Q(league_points=points, tasks_completed__gt=completed)
+        | Q(league_points=points, tasks_completed=completed, current_streak__gt=streak)
+        | Q(
+            league_points=points,
+            tasks_completed=completed,
+            current_streak=streak,
+            updated_at__lt=stats.updated_at,
+        )
+    )
+
+
+def _entry(stat_row, rank, user_id, display_name):
+    return {
+        'rank': rank,
+        'user_id': stat_row.user_id,
+        'name': display_name(stat_row.user),
+        'username': stat_row.user.username,
+        'league_points': stat_row.league_points,
+        'xp_points': stat_row.xp_points,
+        'tasks_completed': stat_row.tasks_completed,
+        'current_streak': stat_row.current_streak,
+        'is_me': stat_row.user_id == user_id,
+    }
+
+
+def _rank_key(points, completed, streak, updated_at):
+    """Sort key matching RANK_ORDERING: smaller ranks first."""
+    return (-points, -completed, -streak, updated_at)
+
+
+def _participant_summary():
+    """``{'total': active participants, 'inactive': rank keys of inactive rows}``, cached."""
+    summary = cache.get(PARTICIPANTS_CACHE_KEY)
+    if summary is None:
+        inactive = [
+            _rank_key(*row)
+            for row in UserStats.objects.filter(user__is_active=False).values_list(
+                'league_points', 'tasks_completed', 'current_streak', 'updated_at')
+        ]
+        summary = {'total': UserStats.objects.count() - len(inactive), 'inactive': inactive}
+        cache.set(PARTICIPANTS_CACHE_KEY, summary, PARTICIPANTS_CACHE_TTL)
+    return summary
+
+
+def participant_total():
+    return _participant_summary()['total']
+
+
+def invalidate_participant_total():
+    cache.delete(PARTICIPANTS_CACHE_KEY)
+
+
+def get_standing(stats):
+    """Return ``(rank, total_participants)`` for a stats row."""
+    if stats.pk is None:
+        return 1, participant_total()
+
+    summary = _participant_summary()
+    # Two range counts over the covering index: higher scores, then ties that
+    # sort first. A single OR-ed filter makes the database test every row.
+    ahead = UserStats.objects.filter(league_points__gt=stats.league_points).count()
+    ahead += (
+        UserStats.objects
+        .filter(league_points=stats.league_points)
+        .filter(_ranked_ahead_of(stats))
+        .count()
+    )
+    own_key = _rank_key(stats.league_points, stats.tasks_completed, stats.current_streak, stats.updated_at)
+    ahead -= sum(1 for key in summary['inactive'] if key < own_key)
+    rank = ahead + 1
+    # A cached total may predate a user who has since overtaken the caller.
+    return rank, max(rank, summary['total'])
+
+
+def get_top_entries(user, display_name, limit=LEADERBOARD_SIZE):
+    rows = (
+        _participants()
+        .select_related('user')
+        .order_by(*RANK_ORDERING)[:limit]
+    )
+    return [
+        _entry(row, rank, user.id, display_name)
+        for rank, row in enumerate(rows, start=1)
+    ]
+
+
+def build_leaderboard(user, stats, display_name, limit=LEADERBOARD_SIZE):
+    """
+    Top ``limit`` entries, the caller's rank and the participant count.
+
+    Costs three queries (five when the participant summary is not cached)
+    regardless of how many users are ranked. The caller's
+    own row is appended when it falls outside the top entries.
+    """
+    rank, total_participants = get_standing(stats)
+    leaderboard = get_top_entries(user, display_name, limit=limit)
+
+    if rank > limit and stats.pk is not None:
+        leaderboard.append(_entry(stats, rank, user.id, display_name))
+
+    return {
+        'rank': rank,
+        'total_participants': total_participants,
+        'leaderboard': leaderboard,
+    }
+
+
+def rebuild_league_points():
+    """
+    Recompute every materialized score in a single UPDATE.
+
+    Only rows whose stored score has drifted are touched, so ``updated_at``
+    (the last tie-breaker) is left alone and re-running is cheap.
+    """
+    expected = (
+        F('xp_points')
+        + F('current_streak') * UserStats.LEAGUE_STREAK_WEIGHT
+        + F('tasks_completed') * UserStats.LEAGUE_COMPLETION_WEIGHT
+    )
+    return (
+        UserStats.objects
+        .annotate(expected_points=expected)
+        .exclude(league_points=F('expected_points'))
+        .update(league_points=expected)
+    )
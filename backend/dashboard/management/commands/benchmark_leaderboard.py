@@ -0,0 +1,125 @@
+"""
+Measure leaderboard cost as the participant count grows.
+
+Seeds synthetic users inside a transaction that is always rolled back, so it
+is safe to point at a staging database:
+
+    python manage.py benchmark_leaderboard --sizes 1000 10000 100000
+
+The command fails when the p95 of the caller's rank lookup exceeds
+``--max-rank-ms`` at any size, so it can gate a deploy or a CI job.
+"""
+
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from dashboard.leaderboard import build_leaderboard, get_standing, invalidate_participant_total
+from dashboard.models import UserStats
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _display_name(user):
+    return user.username
+
+
+class Command(BaseCommand):
+    help = 'Benchmark leaderboard queries against synthetic user populations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int,
+                            default=[1000, 10000, 100000])
+        parser.add_argument('--samples', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--max-rank-ms', type=float, default=25.0,
+                            help='Fail if the p95 rank lookup is slower than this')
+
+    def handle(self, *args, **options):
+        sizes = sorted(set(options['sizes']))
+        try:
+            with transaction.atomic():
+                slow = self._run(sizes, options['samples'], options['batch_size'], options['max_rank_ms'])
+                raise _Rollback()
+        except _Rollback:
+            pass
+        # The cached participant summary counted the rolled-back rows.
+        invalidate_participant_total()
+        if slow:
+            raise CommandError(
+                f"rank lookup p95 above {options['max_rank_ms']}ms at users={', '.join(map(str, slow))}")
+
+    def _seed(self, start, stop, batch_size, rng):
+        User = get_user_model()
+        for offset in range(start, stop, batch_size):
+            upper = min(stop, offset + batch_size)
+            users = User.objects.bulk_create([
+                User(
+                    email=f'lb-bench-{idx}@example.invalid',
+                    username=f'lb_bench_{idx}',
+                    is_active=True,
+                )
+                for idx in range(offset, upper)
+            ])
+            stats = []
+            for user in users:
+                row = UserStats(
+                    user=user,
+                    xp_points=rng.randint(0, 4000),
+                    current_streak=rng.randint(0, 60),
+                    tasks_completed=rng.randint(0, 400),
+                )
+                row.league_points = row.compute_league_points()
+                stats.append(row)
+            UserStats.objects.bulk_create(stats)
+
+    @staticmethod
+    def _percentiles(timings):
+        timings = sorted(timings)
+        if not timings:
+            return 0.0, 0.0
+        return timings[len(timings) // 2], timings[max(0, int(len(timings) * 0.95) - 1)]
+
+    def _run(self, sizes, samples, batch_size, max_rank_ms):
+        rng = random.Random(42)
+        seeded = 0
+        slow = []
+        for size in sizes:
+            self._seed(seeded, size, batch_size, rng)
+            seeded = size
+
+            sample_rows = list(
+                UserStats.objects.select_related('user')
+                .filter(user__email__startswith='lb-bench-')
+                .order_by('?')[:samples]
+            )
+            timings = []
+            rank_timings = []
+            query_count = 0
+            for row in sample_rows:
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    build_leaderboard(row.user, row, _display_name)
+                    timings.append((time.perf_counter() - started) * 1000)
+                query_count = max(query_count, len(ctx.captured_queries))
+
+                started = time.perf_counter()
+                get_standing(row)
+                rank_timings.append((time.perf_counter() - started) * 1000)
+
+            p50, p95 = self._percentiles(timings)
+            rank_p50, rank_p95 = self._percentiles(rank_timings)
+            if rank_p95 > max_rank_ms:
+                slow.append(size)
+            self.stdout.write(
+                f'users={size:>7}  queries={query_count}  '
+                f'p50={p50:.2f}ms  p95={p95:.2f}ms  '
+                f'rank_p50={rank_p50:.2f}ms  rank_p95={rank_p95:.2f}ms'
+            )
+        return slow
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.leaderboard import rebuild_league_points
+
+
+class Command(BaseCommand):
+    help = 'Recompute materialized league points for every UserStats row'
+
+    def handle(self, *args, **options):
+        updated = rebuild_league_points()
+        self.stdout.write(
+            self.style.SUCCESS(f'Leaderboard rebuilt ({updated} rows corrected)')
+        )
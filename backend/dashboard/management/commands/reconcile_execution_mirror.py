@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from dashboard.execution_mirror import sync_roadmap_tasks_into_execution
+
+
+class Command(BaseCommand):
+    help = 'Fully re-mirror roadmap tasks into execution tasks to repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user-id', type=int, action='append', dest='user_ids',
+            help='Limit reconciliation to these user ids (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(roadmap_tasks__isnull=False).distinct()
+        if options.get('user_ids'):
+            users = get_user_model().objects.filter(id__in=options['user_ids'])
+
+        reconciled = 0
+        written = 0
+        for user in users.iterator():
+            written += sync_roadmap_tasks_into_execution(user, full=True)
+            reconciled += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Reconciled {reconciled} users ({written} mirrored tasks written)'
+            )
+        )
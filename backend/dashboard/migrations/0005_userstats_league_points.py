@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:05
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_league_points(apps, schema_editor):
+    UserStats = apps.get_model('dashboard', 'UserStats')
+    UserStats.objects.update(
+        league_points=F('xp_points') + F('current_streak') * 5 + F('tasks_completed') * 2
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_rename_dashboard_ex_user_id_cbde44_idx_dashboard_e_user_id_ac1b3a_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstats',
+            name='league_points',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='userstats',
+            index=models.Index(fields=['-league_points', '-tasks_completed', '-current_streak', 'updated_at'], name='dashboard_us_league_rank_idx'),
+        ),
+        migrations.RunPython(backfill_league_points, migrations.RunPython.noop),
+    ]
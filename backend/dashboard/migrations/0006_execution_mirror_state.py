@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_userstats_league_points'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecutionMirrorState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('source_count', models.PositiveIntegerField(default=0)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='execution_mirror_state', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -125,11 +125,59 @@ class UserStats(models.Model):
     focus_minutes = models.PositiveIntegerField(default=0)
     level = models.CharField(max_length=32, default='Beginner')
     last_completed_date = models.DateField(null=True, blank=True)
+    # Denormalized league score so the leaderboard can be ranked in SQL.
+    # Always derived from xp/streak/completions in save(); see dashboard.leaderboard.
+    league_points = models.PositiveIntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
 
+    LEAGUE_STREAK_WEIGHT = 5
+    LEAGUE_COMPLETION_WEIGHT = 2
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-league_points', '-tasks_completed',
+                        '-current_streak', 'updated_at'],
+                name='dashboard_us_league_rank_idx',
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.username} stats"
 
+    def compute_league_points(self):
+        # League score is grounded in backend-tracked progress only.
+        xp_points = int(self.xp_points or 0)
+        streak_bonus = int(self.current_streak or 0) * self.LEAGUE_STREAK_WEIGHT
+        completion_bonus = int(self.tasks_completed or 0) * self.LEAGUE_COMPLETION_WEIGHT
+        return xp_points + streak_bonus + completion_bonus
+
+    def save(self, *args, **kwargs):
+        """Keep the materialized league score in step with the raw counters."""
+        self.league_points = self.compute_league_points()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'league_points' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['league_points']
+        super().save(*args, **kwargs)
+
+
+class ExecutionMirrorState(models.Model):
+    """
+    Watermark for the roadmap task -> ExecutionTask mirror.
+    Lets dashboard reads skip the mirror entirely when no tasks.Task row moved.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='execution_mirror_state'
+    )
+    source_updated_at = models.DateTimeField(null=True, blank=True)
+    source_count = models.PositiveIntegerField(default=0)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} mirror @ {self.source_updated_at}"
+
 
 class Streak(models.Model):
     user = models.ForeignKey(
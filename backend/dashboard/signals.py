@@ -0,0 +1,21 @@
+"""
+Drop the cached leaderboard participant total when a stats row is created
+or deleted, so ``dashboard.leaderboard.get_standing`` counts new users at once.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .leaderboard import invalidate_participant_total
+from .models import UserStats
+
+
+@receiver(post_save, sender=UserStats, dispatch_uid='leaderboard_participants_save')
+def invalidate_participants_on_create(sender, instance, created, **kwargs):
+    if created:
+        invalidate_participant_total()
+
+
+@receiver(post_delete, sender=UserStats, dispatch_uid='leaderboard_participants_delete')
+def invalidate_participants_on_delete(sender, instance, **kwargs):
+    invalidate_participant_total()
@@ -1,3 +1,172 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from dashboard.execution_mirror import sync_roadmap_tasks_into_execution
+from dashboard.leaderboard import RANK_ORDERING, get_standing, rebuild_league_points
+from dashboard.models import ExecutionTask, UserStats
+from roadmap_ai.models import Roadmap
+from tasks.models import Task as RoadmapTask
+from dashboard.views import _apply_completion_rewards, _build_league_payload
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _create_user(self, idx, **stats):
+        user = get_user_model().objects.create_user(
+            email=f'league-{idx}@example.com',
+            username=f'league_{idx}',
+            password='testpass123',
+        )
+        row = UserStats.objects.create(user=user, **stats)
+        return user, row
+
+    def test_league_points_follow_counters_on_save(self):
+        _, row = self._create_user(1, xp_points=100, current_streak=3, tasks_completed=4)
+        self.assertEqual(row.league_points, 100 + 3 * 5 + 4 * 2)
+
+        row.xp_points = 200
+        row.save(update_fields=['xp_points', 'updated_at'])
+        row.refresh_from_db()
+        self.assertEqual(row.league_points, 200 + 3 * 5 + 4 * 2)
+
+    def test_ranking_uses_league_points_not_raw_xp(self):
+        # Higher XP, but the streak/completion bonus puts the second user ahead.
+        user_a, _ = self._create_user(1, xp_points=300)
+        user_b, stats_b = self._create_user(2, xp_points=250, current_streak=10, tasks_completed=10)
+
+        payload = _build_league_payload(user_b, stats_b)
+
+        self.assertEqual(payload['rank'], 1)
+        self.assertEqual(payload['total_participants'], 2)
+        self.assertEqual(
+            [entry['user_id'] for entry in payload['leaderboard']],
+            [user_b.id, user_a.id],
+        )
+        self.assertTrue(payload['leaderboard'][0]['is_me'])
+
+    def test_caller_outside_top_ten_is_appended(self):
+        for idx in range(12):
+            self._create_user(idx, xp_points=1000 - idx)
+        user, stats = self._create_user(99, xp_points=1)
+
+        payload = _build_league_payload(user, stats)
+
+        self.assertEqual(payload['rank'], 13)
+        self.assertEqual(payload['total_participants'], 13)
+        self.assertEqual(len(payload['leaderboard']), 11)
+        self.assertEqual(payload['leaderboard'][-1]['rank'], 13)
+        self.assertTrue(payload['leaderboard'][-1]['is_me'])
+
+    def test_query_count_does_not_grow_with_participants(self):
+        user, stats = self._create_user(0, xp_points=10)
+        with self.assertNumQueries(5):
+            _build_league_payload(user, stats)
+        with self.assertNumQueries(3):
+            _build_league_payload(user, stats)
+
+        for idx in range(1, 40):
+            self._create_user(idx, xp_points=idx * 7)
+        _build_league_payload(user, stats)
+        with self.assertNumQueries(3):
+            self.assertEqual(_build_league_payload(user, stats)['total_participants'], 40)
+
+    def test_new_and_deleted_participants_refresh_the_cached_total(self):
+        user, stats = self._create_user(0, xp_points=10)
+        self.assertEqual(_build_league_payload(user, stats)['total_participants'], 1)
+
+        _, other = self._create_user(1, xp_points=5)
+        self.assertEqual(_build_league_payload(user, stats)['total_participants'], 2)
+
+        other.delete()
+        self.assertEqual(_build_league_payload(user, stats)['total_participants'], 1)
+
+    def test_rank_matches_full_ordering_with_ties_and_inactive_users(self):
+        for idx in range(20):
+            user, _ = self._create_user(idx, xp_points=(idx % 4) * 10, tasks_completed=idx % 3)
+            if idx % 5 == 0:
+                user.is_active = False
+                user.save(update_fields=['is_active'])
+        cache.clear()
+
+        ordered = list(
+            UserStats.objects.filter(user__is_active=True).order_by(*RANK_ORDERING))
+        for expected_rank, row in enumerate(ordered, start=1):
+            self.assertEqual(get_standing(row), (expected_rank, 16))
+
+    def test_completion_reward_moves_rank(self):
+        self._create_user(1, xp_points=20)
+        user, stats = self._create_user(2, xp_points=0)
+        task = ExecutionTask.objects.create(user=user, title='Ship it', status='completed')
+
+        _apply_completion_rewards(user, task)
+        stats.refresh_from_db()
+
+        self.assertEqual(stats.league_points, 25 + 1 * 5 + 1 * 2)
+        self.assertEqual(_build_league_payload(user, stats)['rank'], 1)
+
+    def test_rebuild_repairs_drifted_scores(self):
+        _, row = self._create_user(1, xp_points=50, tasks_completed=5)
+        UserStats.objects.filter(pk=row.pk).update(league_points=0)
+
+        self.assertEqual(rebuild_league_points(), 1)
+        row.refresh_from_db()
+        self.assertEqual(row.league_points, 60)
+        self.assertEqual(rebuild_league_points(), 0)
+
+
+class ExecutionMirrorTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='mirror@example.com',
+            username='mirror_user',
+            password='testpass123',
+        )
+        self.roadmap = Roadmap.objects.create(user=self.user, title='Backend', goal='Ship APIs')
+        self.tasks = [
+            RoadmapTask.objects.create(
+                user=self.user,
+                roadmap=self.roadmap,
+                title=f'Day {day}',
+                day=day,
+                due_date=date(2026, 1, day),
+            )
+            for day in range(1, 6)
+        ]
+
+    def test_initial_sync_mirrors_every_task(self):
+        self.assertEqual(sync_roadmap_tasks_into_execution(self.user), 5)
+        mirrored = ExecutionTask.objects.get(id=self.tasks[0].task_id)
+        self.assertEqual(mirrored.status, 'pending')
+        self.assertEqual(mirrored.metadata['source'], 'roadmap_task')
+        self.assertEqual(mirrored.scheduled_for, date(2026, 1, 1))
+
+    def test_unchanged_sync_is_constant_queries(self):
+        sync_roadmap_tasks_into_execution(self.user)
+        with self.assertNumQueries(2):
+            self.assertEqual(sync_roadmap_tasks_into_execution(self.user), 0)
+
+    def test_only_changed_rows_are_rewritten(self):
+        sync_roadmap_tasks_into_execution(self.user)
+        changed = self.tasks[2]
+        changed.status = 'completed'
+        changed.save()
+
+        written = sync_roadmap_tasks_into_execution(self.user)
+
+        self.assertLess(written, len(self.tasks))
+        self.assertEqual(ExecutionTask.objects.get(id=changed.task_id).status, 'completed')
+
+    def test_deleted_source_removes_pending_mirror(self):
+        sync_roadmap_tasks_into_execution(self.user)
+        removed_id = self.tasks[0].task_id
+        self.tasks[0].delete()
+
+        sync_roadmap_tasks_into_execution(self.user)
+
+        self.assertFalse(ExecutionTask.objects.filter(id=removed_id).exists())
+        self.assertEqual(ExecutionTask.objects.filter(user=self.user).count(), 4)
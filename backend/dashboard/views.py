@@ -2,10 +2,9 @@ import json
 import os
 from datetime import datetime, timezone, timedelta
 
-import requests
 from django.conf import settings
-from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Count, Q
 from dotenv import load_dotenv
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -14,10 +13,15 @@ from rest_framework.response import Response
 from django.utils import timezone as dj_timezone
 
 from ats.models import ATSAnalysis
+from backend import gemini_client
 from resume.models import Resume
 from users.models import UserProfile
+from users.progress_summary import UserProgressSummary
+from users.user_cache import get_or_compute, invalidate_user_cache
 
 from .ai_service import generate_coach_recommendation, generate_exam_plan
+from .execution_mirror import sync_roadmap_tasks_into_execution
+from .leaderboard import build_leaderboard, league_points_for
 from .models import DailySummary, Task, ExecutionTask, FocusSession, UserStats, XPLog, Streak, ExamPlan
 from .serializers import (
     DailySummarySerializer,
@@ -287,11 +291,6 @@ def _call_gemini_for_onboarding(snapshot):
     if not GEMINI_API_KEY:
         raise ValueError("GEMINI_API_KEY is missing")
 
-    url = (
-        "https://generativelanguage.googleapis.com/v1beta/models/"
-        f"{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}"
-    )
-
     prompt = f"""
 You are Planorah's elite learning strategist. You deeply understand students, their stage, goals, risks and execution gaps.
 Analyse the user's onboarding profile below and return a RICH, evolving, personalised intelligence report.
@@ -335,10 +334,9 @@ Critical rules:
 - Be the mentor they never had, not a chatbot.
 """.strip()
 
-    response = requests.post(
-        url,
-        headers={"Content-Type": "application/json"},
-        json={
+    response_payload = gemini_client.generate_content(
+        GEMINI_MODEL,
+        {
             "contents": [{"parts": [{"text": prompt}]}],
             "generationConfig": {
                 "temperature": 0.6,
@@ -347,10 +345,10 @@ Critical rules:
             },
         },
         timeout=30,
+        api_key=GEMINI_API_KEY,
     )
-    response.raise_for_status()
 
-    model_text = _extract_text_from_gemini_response(response.json())
+    model_text = _extract_text_from_gemini_response(response_payload)
     if not model_text:
         raise ValueError("Empty response from Gemini")
 
@@ -422,77 +420,11 @@ def create_task(request):
 def get_dashboard_stats(request):
     """Get summary statistics for the dashboard"""
     try:
-        from roadmap_ai.models import Roadmap
-
-        user = request.user
-
-        cache_key = f"dashboard_stats:{user.id}"
-        cached = cache.get(cache_key)
-        if cached:
-            return Response(cached)
-
-        # User Profile Data
-        try:
-            profile = user.profile
-            streak = profile.streak_count
-            xp = profile.xp_points
-            level = profile.experience_level
-            role = profile.target_role
-            avatar = profile.avatar.url if profile.avatar else None
-            bio = profile.bio
-        except Exception:
-            streak = 0
-            xp = 0
-            level = "N/A"
-            role = "N/A"
-            avatar = None
-            bio = None
-
-        # Roadmap counts
-        total_roadmaps = Roadmap.objects.filter(user=user).count()
-        latest_roadmap = Roadmap.objects.filter(
-            user=user).order_by('-created_at').first()
-
-        # Task counts
-        total_tasks = Task.objects.filter(user=user).count()
-        completed_tasks = Task.objects.filter(
-            user=user, status='completed').count()
-        pending_tasks = total_tasks - completed_tasks
-
-        # Resume & ATS counts
-        resume_count = Resume.objects.filter(user=user).count()
-        ats_scans = ATSAnalysis.objects.filter(user=user).count()
-        latest_ats = ATSAnalysis.objects.filter(
-            user=user).order_by('-created_at').first()
-        ats_score = latest_ats.match_score if latest_ats else 0
-
-        response_data = {
-            "profile": {
-                "streak": streak,
-                "xp": xp,
-                "level": level,
-                "role": role,
-                "username": user.username,
-                "avatar": avatar,
-                "bio": bio
-            },
-            "roadmaps": {
-                "total": total_roadmaps,
-                "latest_title": latest_roadmap.title if latest_roadmap else None
-            },
-            "tasks": {
-                "total": total_tasks,
-                "completed": completed_tasks,
-                "pending": pending_tasks
-            },
-            "tools": {
-                "resumes_created": resume_count,
-                "ats_scans": ats_scans,
-                "latest_ats_score": ats_score
-            }
-        }
-
-        cache.set(cache_key, response_data, 60)
+        response_data = get_or_compute(
+            "dashboard_stats",
+            request.user,
+            lambda: _compute_dashboard_stats(request.user),
+        )
         return Response(response_data)
     except Exception as e:
         return Response({
@@ -501,6 +433,74 @@ def get_dashboard_stats(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _compute_dashboard_stats(user):
+    from roadmap_ai.models import Roadmap
+
+    # User Profile Data
+    try:
+        profile = user.profile
+        streak = profile.streak_count
+        xp = profile.xp_points
+        level = profile.experience_level
+        role = profile.target_role
+        avatar = profile.avatar.url if profile.avatar else None
+        bio = profile.bio
+    except Exception:
+        streak = 0
+        xp = 0
+        level = "N/A"
+        role = "N/A"
+        avatar = None
+        bio = None
+
+    # Roadmap counts
+    total_roadmaps = UserProgressSummary(user).total_roadmaps
+    latest_roadmap = Roadmap.objects.filter(
+        user=user).order_by('-created_at').first()
+
+    # Task counts (legacy quick tasks, one conditional aggregate)
+    task_totals = Task.objects.filter(user=user).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='completed')),
+    )
+    total_tasks = task_totals['total']
+    completed_tasks = task_totals['completed']
+    pending_tasks = total_tasks - completed_tasks
+
+    # Resume & ATS counts
+    resume_count = Resume.objects.filter(user=user).count()
+    ats_scans = ATSAnalysis.objects.filter(user=user).count()
+    latest_ats = ATSAnalysis.objects.filter(
+        user=user).order_by('-created_at').first()
+    ats_score = latest_ats.match_score if latest_ats else 0
+
+    return {
+        "profile": {
+            "streak": streak,
+            "xp": xp,
+            "level": level,
+            "role": role,
+            "username": user.username,
+            "avatar": avatar,
+            "bio": bio
+        },
+        "roadmaps": {
+            "total": total_roadmaps,
+            "latest_title": latest_roadmap.title if latest_roadmap else None
+        },
+        "tasks": {
+            "total": total_tasks,
+            "completed": completed_tasks,
+            "pending": pending_tasks
+        },
+        "tools": {
+            "resumes_created": resume_count,
+            "ats_scans": ats_scans,
+            "latest_ats_score": ats_score
+        }
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_onboarding_insights(request):
@@ -571,11 +571,7 @@ def _display_name_for_user(user):
 
 
 def _league_points_from_stats(stats_obj):
-    # League score is grounded in backend-tracked progress only.
-    xp_points = int(getattr(stats_obj, 'xp_points', 0) or 0)
-    streak_bonus = int(getattr(stats_obj, 'current_streak', 0) or 0) * 5
-    completion_bonus = int(getattr(stats_obj, 'tasks_completed', 0) or 0) * 2
-    return xp_points + streak_bonus + completion_bonus
+    return league_points_for(stats_obj)
 
 
 def _build_league_payload(user, stats):
@@ -595,37 +591,7 @@ def _build_league_payload(user, stats):
     points_to_next_tier = max(
         0, (next_tier['min'] - league_points)) if next_tier else 0
 
-    ranked_stats = list(
-        UserStats.objects.select_related('user')
-        .filter(user__is_active=True)
-        .order_by('-xp_points', '-tasks_completed', '-current_streak', 'updated_at')
-    )
-
-    total_participants = len(ranked_stats)
-    leaderboard = []
-    current_user_rank = None
-
-    for idx, stat_row in enumerate(ranked_stats, start=1):
-        row_points = _league_points_from_stats(stat_row)
-        is_me = stat_row.user_id == user.id
-        if is_me:
-            current_user_rank = idx
-
-        if idx <= 10 or is_me:
-            leaderboard.append({
-                'rank': idx,
-                'user_id': stat_row.user_id,
-                'name': _display_name_for_user(stat_row.user),
-                'username': stat_row.user.username,
-                'league_points': row_points,
-                'xp_points': stat_row.xp_points,
-                'tasks_completed': stat_row.tasks_completed,
-                'current_streak': stat_row.current_streak,
-                'is_me': is_me,
-            })
-
-    if current_user_rank is None:
-        current_user_rank = 1
+    standings = build_leaderboard(user, stats, _display_name_for_user)
 
     return {
         'league_points': league_points,
@@ -633,9 +599,9 @@ def _build_league_payload(user, stats):
         'progress_percent': progress_percent,
         'points_to_next_tier': points_to_next_tier,
         'next_tier': next_tier['name'] if next_tier else None,
-        'rank': current_user_rank,
-        'total_participants': total_participants,
-        'leaderboard': leaderboard,
+        'rank': standings['rank'],
+        'total_participants': standings['total_participants'],
+        'leaderboard': standings['leaderboard'],
     }
 
 
@@ -700,6 +666,7 @@ def _apply_completion_rewards(user, task):
         points=xp_gain,
         reason='TASK_COMPLETION_REWARD',
     )
+    invalidate_user_cache(user)
 
     return {
         'applied': True,
@@ -776,18 +743,6 @@ def _build_execution_task_guidance(task):
     }
 
 
-def _roadmap_status_to_execution_status(status_value):
-    status_value = str(status_value or '').strip().lower()
-    mapping = {
-        'not_started': 'pending',
-        'in_progress': 'in_progress',
-        'pending_validation': 'in_progress',
-        'needs_revision': 'pending',
-        'completed': 'completed',
-    }
-    return mapping.get(status_value, 'pending')
-
-
 def _execution_status_to_roadmap_status(status_value):
     status_value = str(status_value or '').strip().lower()
     mapping = {
@@ -802,44 +757,14 @@ def _execution_status_to_roadmap_status(status_value):
 def _sync_roadmap_tasks_into_execution(user):
     """
     Mirror roadmap tasks (tasks.Task) into execution tasks so dashboard and focus mode
-    stay aligned with day-wise roadmap scheduling.
+    stay aligned with day-wise roadmap scheduling. Only rows changed since the last
+    sync are written; see dashboard.execution_mirror.
     """
     try:
-        from tasks.models import Task as RoadmapTask
-    except Exception:
+        sync_roadmap_tasks_into_execution(user)
+    except ImportError:
         return
 
-    roadmap_tasks = RoadmapTask.objects.filter(
-        user=user).select_related('roadmap', 'milestone')
-    for source_task in roadmap_tasks:
-        estimated_minutes = max(1, int(source_task.estimated_minutes or 25))
-        status = _roadmap_status_to_execution_status(source_task.status)
-        completed_at = source_task.completed_at if status == 'completed' else None
-
-        ExecutionTask.objects.update_or_create(
-            id=source_task.task_id,
-            user=user,
-            defaults={
-                'title': source_task.title,
-                'task_type': 'learning',
-                'status': status,
-                'priority': 'medium',
-                'difficulty': 'medium',
-                'estimated_time': f'{estimated_minutes} min',
-                'estimated_minutes': estimated_minutes,
-                'reason': source_task.objective or source_task.description or '',
-                'ai_generated': False,
-                'metadata': {
-                    'source': 'roadmap_task',
-                    'roadmap_id': source_task.roadmap_id,
-                    'milestone_id': source_task.milestone_id,
-                    'day': source_task.day,
-                },
-                'scheduled_for': source_task.due_date,
-                'completed_at': completed_at,
-            },
-        )
-
 
 def _sync_execution_status_to_roadmap_task(user, execution_task):
     """
@@ -867,6 +792,7 @@ def _sync_execution_status_to_roadmap_task(user, execution_task):
 
     if update_fields:
         source_task.save(update_fields=update_fields + ['updated_at'])
+        invalidate_user_cache(user)
 
 
 @api_view(['GET'])
@@ -0,0 +1,258 @@
+"""
+Background sync of GitHubRepository stats.
+
+``sync_stats`` used to fetch every repository of the user (repo + latest
+commit, one after the other) inside the HTTP request. It now answers with the
+stored stats and queues ``github_integration.tasks.sync_repository_stats``,
+which runs ``sync_repositories``:
+
+* repositories are synced concurrently, at most GITHUB_STATS_SYNC_CONCURRENCY
+  at a time, on one pooled session;
+* every request is conditional (``If-None-Match`` / ``If-Modified-Since``
+  from the previous response). A 304 does not count against GitHub's rate
+  limit, and an unchanged repository (its metadata includes ``pushed_at``)
+  skips the commits request entirely;
+* refreshes of the same repositories are throttled per user to one per
+  GITHUB_STATS_SYNC_MIN_INTERVAL_SEC.
+
+With GITHUB_WEBHOOK_SECRET set, publishing a repository registers a ``push``
+hook on it (``register_push_webhook``) signed with that secret, and the hook
+updates the latest commit as it happens (``apply_push_event``), so polling
+only has to catch up on stars, forks and watchers.
+"""
+
+import hashlib
+import hmac
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from requests.adapters import HTTPAdapter
+
+from .models import GitHubCredential, GitHubPublishLog, GitHubRepository
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = 'https://api.github.com'
+COMMIT_MESSAGE_MAX_LENGTH = 200
+
+_state_lock = threading.Lock()
+_session = None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def get_session():
+    global _session
+    with _state_lock:
+        if _session is None:
+            pool_size = _setting('GITHUB_STATS_SYNC_CONCURRENCY', 8)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def _reset_state():
+    global _session
+    with _state_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def _validators_key(repo_id: int, resource: str) -> str:
+    return f'github_stats_validators:{repo_id}:{resource}'
+
+
+def _refresh_lock_key(user_id: int, repo_ids: Optional[Iterable[int]]) -> str:
+    if repo_ids is None:
+        return f'github_stats_sync:{user_id}:all'
+    ids = ','.join(str(repo_id) for repo_id in sorted(set(repo_ids)))
+    return f'github_stats_sync:{user_id}:{hashlib.sha256(ids.encode()).hexdigest()[:16]}'
+
+
+def conditional_get(repo_id: int, resource: str, url: str, token: str,
+                    params: Optional[Dict[str, Any]] = None) -> Tuple[int, Any, Dict[str, Tuple]]:
+    """
+    GET ``url`` with the ETag/Last-Modified of the previous 200 for this
+    repo's ``resource``; returns (status code, JSON body or None on 304,
+    ``{cache key: validators}`` of a 200).
+
+    The new validators are not cached here: the caller stores them once the
+    response has been saved, or a later 304 would hide data never written.
+    """
+    key = _validators_key(repo_id, resource)
+    headers = {'Authorization': f'Bearer {token}', 'Accept': 'application/json'}
+    etag, last_modified = cache.get(key) or (None, None)
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    response = get_session().get(url, headers=headers, params=params,
+                                 timeout=_setting('GITHUB_API_TIMEOUT_SEC', 10))
+    if response.status_code != 200:
+        return response.status_code, None, {}
+    validators = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return 200, response.json(), {key: validators} if any(validators) else {}
+
+
+def _commit_fields(date: Optional[str], message: Optional[str]) -> Dict[str, Any]:
+    fields = {'last_commit_message': (message or '')[:COMMIT_MESSAGE_MAX_LENGTH]}
+    commit_date = parse_datetime(date or '')
+    if commit_date:
+        fields['last_commit_date'] = commit_date
+    return fields
+
+
+def fetch_repository_stats(repo: GitHubRepository, token: str) -> Tuple[str, Dict[str, Any], Dict[str, Tuple]]:
+    """
+    GitHub requests for one repository (no database access, safe to run in a
+    worker thread); returns ('updated' | 'unchanged' | 'failed', field changes,
+    validators to cache once the changes are saved).
+    """
+    url = f'{API_BASE_URL}/repos/{repo.repo_full_name}'
+    try:
+        status, repo_data, validators = conditional_get(repo.id, 'repo', url, token)
+        if status == 304:
+            return 'unchanged', {}, {}
+        if status != 200:
+            return 'failed', {'sync_error': f"Failed to fetch {repo.repo_name}: {status}"}, {}
+
+        changes = {
+            'stars_count': repo_data.get('stargazers_count', 0),
+            'forks_count': repo_data.get('forks_count', 0),
+            'watchers_count': repo_data.get('watchers_count', 0),
+        }
+        status, commits, commit_validators = conditional_get(
+            repo.id, 'commits', url + '/commits', token, {'per_page': 1})
+        if status == 200 and commits:
+            commit = commits[0].get('commit', {})
+            changes.update(_commit_fields(commit.get('author', {}).get('date'), commit.get('message')))
+        if status not in (200, 304):
+            # A 304 on the repo would skip the commits request next time.
+            validators = {}
+        validators.update(commit_validators)
+        return 'updated', changes, validators
+    except Exception as e:
+        return 'failed', {'sync_error': f"Error syncing {repo.repo_name}: {str(e)}"}, {}
+
+
+def sync_repositories(user_id: int, repo_ids: Optional[Iterable[int]] = None) -> Dict[str, int]:
+    """Sync the user's repositories (or ``repo_ids`` among them) concurrently."""
+    counts = {'updated': 0, 'unchanged': 0, 'failed': 0}
+    credential = GitHubCredential.objects.filter(user_id=user_id).first()
+    token = credential.access_token if credential else None
+    if not token:
+        return counts
+
+    repos = GitHubRepository.objects.filter(user_id=user_id)
+    if repo_ids is not None:
+        repos = repos.filter(id__in=list(repo_ids))
+    repos = list(repos)
+    if not repos:
+        return counts
+
+    workers = min(len(repos), _setting('GITHUB_STATS_SYNC_CONCURRENCY', 8))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(fetch_repository_stats, repos, [token] * len(repos)))
+
+    now = timezone.now()
+    for repo, (outcome, changes, validators) in zip(repos, results):
+        counts[outcome] += 1
+        if outcome != 'failed':
+            changes.update(last_synced_at=now, sync_error='')
+        GitHubRepository.objects.filter(pk=repo.pk).update(updated_at=now, **changes)
+        if validators:
+            cache.set_many(validators, _setting('GITHUB_ETAG_CACHE_TTL_SEC', 60 * 60 * 24))
+    logger.info('github stats sync user_id=%s %s', user_id, counts)
+    return counts
+
+
+def request_refresh(user_id: int, repo_ids: Optional[Iterable[int]] = None) -> bool:
+    """
+    Queue a background sync unless one of the same repositories was queued
+    within the throttle window. False if throttled or the queue is unreachable.
+    """
+    repo_ids = list(repo_ids) if repo_ids is not None else None
+    if not cache.add(_refresh_lock_key(user_id, repo_ids), True,
+                     _setting('GITHUB_STATS_SYNC_MIN_INTERVAL_SEC', 60)):
+        return False
+    from .tasks import sync_repository_stats
+    try:
+        sync_repository_stats.delay(user_id, repo_ids)
+    except Exception:
+        # Broker down: release the throttle so the next request can queue it.
+        logger.exception('Could not queue github stats sync user_id=%s', user_id)
+        cache.delete(_refresh_lock_key(user_id, repo_ids))
+        return False
+    return True
+
+
+def register_push_webhook(repo: GitHubRepository, token: str, callback_url: str) -> bool:
+    """
+    Subscribe ``callback_url`` to the repository's push events, signed with
+    GITHUB_WEBHOOK_SECRET. The outcome is recorded as a publish log entry;
+    a failure only means the repository keeps being polled.
+    """
+    secret = _setting('GITHUB_WEBHOOK_SECRET', '')
+    if not secret:
+        return False
+    error = ''
+    try:
+        response = get_session().post(
+            f'{API_BASE_URL}/repos/{repo.repo_full_name}/hooks',
+            headers={'Authorization': f'Bearer {token}', 'Accept': 'application/json'},
+            json={
+                'name': 'web',
+                'active': True,
+                'events': ['push'],
+                'config': {'url': callback_url, 'content_type': 'json', 'secret': secret, 'insecure_ssl': '0'},
+            },
+            timeout=_setting('GITHUB_API_TIMEOUT_SEC', 10))
+        if response.status_code != 201:
+            error = f"Failed to register webhook: {response.status_code}"
+    except requests.RequestException as e:
+        error = f"Error registering webhook: {str(e)}"
+
+    GitHubPublishLog.objects.create(
+        repository=repo, action='webhook', status='failed' if error else 'success', error_message=error)
+    if error:
+        logger.warning('github webhook %s: %s', repo.repo_full_name, error)
+    return not error
+
+
+def verify_webhook_signature(body: bytes, signature: str) -> bool:
+    """Check GitHub's ``X-Hub-Signature-256`` header against GITHUB_WEBHOOK_SECRET."""
+    secret = _setting('GITHUB_WEBHOOK_SECRET', '')
+    if not secret or not signature:
+        return False
+    expected = 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def apply_push_event(payload: Dict[str, Any]) -> int:
+    """Store a push webhook's head commit on every matching repository; returns rows updated."""
+    full_name = (payload.get('repository') or {}).get('full_name')
+    head_commit = payload.get('head_commit')
+    if not full_name or not head_commit:
+        return 0
+
+    # Only pushes to the default branch change what the commits request would return.
+    default_branch = (payload.get('repository') or {}).get('default_branch')
+    if default_branch and payload.get('ref') != f'refs/heads/{default_branch}':
+        return 0
+
+    changes = _commit_fields(head_commit.get('timestamp'), head_commit.get('message'))
+    return GitHubRepository.objects.filter(repo_full_name__iexact=full_name).update(
+        updated_at=timezone.now(), **changes)
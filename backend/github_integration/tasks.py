@@ -0,0 +1,10 @@
+from typing import List, Optional
+
+from celery import shared_task
+
+from github_integration.stats_sync import sync_repositories
+
+
+@shared_task
+def sync_repository_stats(user_id: int, repo_ids: Optional[List[int]] = None):
+    return sync_repositories(user_id, repo_ids)
@@ -1,3 +1,219 @@
-from django.test import TestCase
+import hashlib
+import hmac
+import json
+from unittest.mock import MagicMock, patch
 
-# Create your tests here.
+import requests
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from github_integration.models import GitHubCredential, GitHubPublishLog, GitHubRepository
+from projects.models import ProjectFile, UserProject
+from github_integration.stats_sync import sync_repositories
+
+
+class FakeGitHubStats:
+    """Answers repo and commits requests, honouring If-None-Match; records every request."""
+
+    def __init__(self):
+        self.stars = 3
+        self.calls = []
+        self.commits_error = None
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        path = url.replace('https://api.github.com/repos/', '')
+        self.calls.append((path, dict(headers or {})))
+        if path.endswith('/commits') and self.commits_error:
+            raise self.commits_error
+        if path.endswith('/commits'):
+            body = [{'commit': {'message': 'Add tests', 'author': {'date': '2026-03-01T10:00:00Z'}}}]
+        else:
+            body = {'stargazers_count': self.stars, 'forks_count': 1, 'watchers_count': 2}
+        etag = f'"{path}-{self.stars}"'
+        if (headers or {}).get('If-None-Match') == etag:
+            return MagicMock(status_code=304, headers={})
+        response = MagicMock(status_code=200, headers={'ETag': etag})
+        response.json.return_value = body
+        return response
+
+
+class GitHubStatsSyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='octo@example.com', username='octo', password='testpass123')
+        GitHubCredential.objects.create(user=self.user, access_token='gho_token')
+        self.repos = [
+            GitHubRepository.objects.create(
+                user=self.user, repo_name=name, repo_full_name=f'octo/{name}',
+                repo_url=f'https://github.com/octo/{name}')
+            for name in ('alpha', 'beta')
+        ]
+        self.github = FakeGitHubStats()
+        patcher = patch('github_integration.stats_sync.get_session', return_value=self.github)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_sync_stats_returns_stored_stats_and_queues_one_refresh(self):
+        with patch('github_integration.tasks.sync_repository_stats.delay') as delay:
+            response = self.client.post('/api/github/sync_stats/', {}, format='json')
+            again = self.client.post('/api/github/sync_stats/', {}, format='json')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.data['refresh_queued'])
+        self.assertEqual(len(response.data['repositories']), 2)
+        self.assertEqual(again.status_code, 200)
+        self.assertFalse(again.data['refresh_queued'])
+        delay.assert_called_once_with(self.user.id, None)
+        self.assertEqual(self.github.calls, [])
+
+    def test_refresh_throttle_is_per_repository_set(self):
+        alpha, beta = self.repos
+        with patch('github_integration.tasks.sync_repository_stats.delay') as delay:
+            first = self.client.post('/api/github/sync_stats/', {'repo_id': alpha.pk}, format='json')
+            other = self.client.post('/api/github/sync_stats/', {'repo_id': beta.pk}, format='json')
+            repeat = self.client.post('/api/github/sync_stats/', {'repo_id': alpha.pk}, format='json')
+
+        self.assertEqual([first.status_code, other.status_code, repeat.status_code], [202, 202, 200])
+        self.assertEqual([call.args for call in delay.call_args_list],
+                         [(self.user.id, [alpha.pk]), (self.user.id, [beta.pk])])
+
+    def test_refresh_is_not_throttled_when_the_queue_is_down(self):
+        with patch('github_integration.tasks.sync_repository_stats.delay',
+                   side_effect=[ConnectionError('broker down'), None]) as delay:
+            failed = self.client.post('/api/github/sync_stats/', {}, format='json')
+            retried = self.client.post('/api/github/sync_stats/', {}, format='json')
+
+        self.assertEqual(failed.status_code, 200)
+        self.assertFalse(failed.data['refresh_queued'])
+        self.assertEqual(retried.status_code, 202)
+        self.assertEqual(delay.call_count, 2)
+
+    def test_failed_sync_does_not_cache_validators_of_unsaved_data(self):
+        self.github.commits_error = requests.ConnectionError('reset')
+        self.assertEqual(sync_repositories(self.user.id, [self.repos[0].pk])['failed'], 1)
+        self.assertEqual(GitHubRepository.objects.get(pk=self.repos[0].pk).stars_count, 0)
+
+        self.github.commits_error = None
+        self.github.calls.clear()
+        self.assertEqual(sync_repositories(self.user.id, [self.repos[0].pk])['updated'], 1)
+
+        self.assertNotIn('If-None-Match', self.github.calls[0][1])
+        self.assertEqual(GitHubRepository.objects.get(pk=self.repos[0].pk).stars_count, 3)
+
+    def test_unchanged_repos_are_revalidated_without_commit_requests(self):
+        self.assertEqual(sync_repositories(self.user.id)['updated'], 2)
+        repo = GitHubRepository.objects.get(pk=self.repos[0].pk)
+        self.assertEqual(repo.stars_count, 3)
+        self.assertEqual(repo.last_commit_message, 'Add tests')
+        self.assertEqual(len(self.github.calls), 4)
+
+        self.github.calls.clear()
+        counts = sync_repositories(self.user.id)
+
+        self.assertEqual(counts, {'updated': 0, 'unchanged': 2, 'failed': 0})
+        self.assertEqual(sorted(path for path, _ in self.github.calls), ['octo/alpha', 'octo/beta'])
+        self.assertTrue(all('If-None-Match' in headers for _, headers in self.github.calls))
+
+        self.github.stars = 5
+        self.assertEqual(sync_repositories(self.user.id, [self.repos[1].pk])['updated'], 1)
+        self.assertEqual(GitHubRepository.objects.get(pk=self.repos[1].pk).stars_count, 5)
+
+
+@override_settings(GITHUB_WEBHOOK_SECRET='hook-secret')
+class GitHubPushWebhookTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email='hook@example.com', username='hook', password='testpass123')
+        self.repo = GitHubRepository.objects.create(
+            user=user, repo_name='alpha', repo_full_name='octo/alpha', repo_url='https://github.com/octo/alpha')
+        self.client = APIClient()
+
+    def _post(self, payload, secret='hook-secret', event='push'):
+        body = json.dumps(payload).encode()
+        signature = 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return self.client.post('/api/github/webhook/', body, content_type='application/json',
+                                HTTP_X_HUB_SIGNATURE_256=signature, HTTP_X_GITHUB_EVENT=event)
+
+    def _push(self, ref='refs/heads/main'):
+        return {
+            'ref': ref,
+            'repository': {'full_name': 'Octo/Alpha', 'default_branch': 'main'},
+            'head_commit': {'message': 'Ship it', 'timestamp': '2026-03-02T09:30:00+01:00'},
+        }
+
+    def test_signed_push_updates_latest_commit(self):
+        response = self._post(self._push())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 1)
+        self.repo.refresh_from_db()
+        self.assertEqual(self.repo.last_commit_message, 'Ship it')
+        self.assertEqual(self.repo.last_commit_date.isoformat(), '2026-03-02T08:30:00+00:00')
+
+    def test_bad_signature_other_branches_and_disabled_hook_change_nothing(self):
+        self.assertEqual(self._post(self._push(), secret='wrong').status_code, 403)
+        self.assertEqual(self._post(self._push(ref='refs/heads/feature')).data['updated'], 0)
+        self.assertEqual(self._post({'zen': 'hi'}, event='ping').data['updated'], 0)
+        with self.settings(GITHUB_WEBHOOK_SECRET=''):
+            self.assertEqual(self._post(self._push()).status_code, 404)
+
+        self.repo.refresh_from_db()
+        self.assertEqual(self.repo.last_commit_message, '')
+
+
+@override_settings(GITHUB_WEBHOOK_SECRET='hook-secret', GITHUB_WEBHOOK_URL='')
+class GitHubWebhookRegistrationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='pub@example.com', username='pub', password='testpass123')
+        GitHubCredential.objects.create(user=self.user, access_token='gho_token')
+        self.project = UserProject.objects.create(user=self.user, title='Demo App')
+        ProjectFile.objects.create(project=self.project, path='main.py', content='print(1)')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _publish(self, hook_status=201):
+        created = MagicMock(status_code=201)
+        created.json.return_value = {
+            'full_name': 'pub/demo-app', 'html_url': 'https://github.com/pub/demo-app',
+            'clone_url': 'https://github.com/pub/demo-app.git'}
+        session = MagicMock()
+        session.post.return_value = MagicMock(status_code=hook_status)
+        with patch('github_integration.views.requests.post', return_value=created), \
+                patch('github_integration.views.requests.put', return_value=MagicMock(status_code=201)), \
+                patch('github_integration.stats_sync.get_session', return_value=session):
+            response = self.client.post(
+                '/api/github/publish_user_project/', {'project_id': self.project.pk}, format='json')
+        return response, session
+
+    def test_publishing_registers_a_signed_push_hook(self):
+        response, session = self._publish()
+
+        self.assertEqual(response.status_code, 201)
+        url = session.post.call_args.args[0]
+        hook = session.post.call_args.kwargs['json']
+        self.assertEqual(url, 'https://api.github.com/repos/pub/demo-app/hooks')
+        self.assertEqual(hook['events'], ['push'])
+        self.assertEqual(hook['config']['url'], 'http://testserver/api/github/webhook/')
+        self.assertEqual(hook['config']['secret'], 'hook-secret')
+        self.assertTrue(GitHubPublishLog.objects.filter(action='webhook', status='success').exists())
+
+    def test_failed_hook_registration_does_not_fail_the_publish(self):
+        response, _ = self._publish(hook_status=403)
+
+        self.assertEqual(response.status_code, 201)
+        log = GitHubPublishLog.objects.get(action='webhook')
+        self.assertEqual(log.status, 'failed')
+        self.assertIn('403', log.error_message)
+
+    def test_no_hook_without_a_secret(self):
+        with self.settings(GITHUB_WEBHOOK_SECRET=''):
+            response, session = self._publish()
+
+        self.assertEqual(response.status_code, 201)
+        session.post.assert_not_called()
@@ -1,8 +1,9 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.conf import settings
+from django.urls import reverse
 from django.utils import timezone
 import requests
 
@@ -14,10 +15,20 @@ from .serializers import (
     GitHubPublishRequestSerializer,
     GitHubConnectSerializer
 )
+from .stats_sync import apply_push_event, register_push_webhook, request_refresh, verify_webhook_signature
 from subscriptions.models import Subscription
 from subscriptions.permissions import HasActiveSubscription
 
 
+def _register_push_webhook(request, github_repo, credential):
+    """Point the published repository's push events at our webhook endpoint."""
+    if not getattr(settings, 'GITHUB_WEBHOOK_SECRET', ''):
+        return
+    callback_url = (getattr(settings, 'GITHUB_WEBHOOK_URL', '')
+                    or request.build_absolute_uri(reverse('github-webhook')))
+    register_push_webhook(github_repo, credential.access_token, callback_url)
+
+
 class GitHubIntegrationViewSet(viewsets.ViewSet):
     """
     ViewSet for GitHub integration.
@@ -292,6 +303,7 @@ MIT License
             status='success',
             commit_message=commit_message
         )
+        _register_push_webhook(request, github_repo, credential)
         
         # Update project with GitHub URL
         project.github_url = repo_data.get('html_url')
@@ -330,87 +342,53 @@ MIT License
     
     @action(detail=False, methods=['post'])
     def sync_stats(self, request):
-        """Sync GitHub stats for user's repositories."""
+        """Return stored GitHub stats and queue a background refresh (see stats_sync)."""
         repo_id = request.data.get('repo_id')
         
-        try:
-            credential = GitHubCredential.objects.get(user=request.user)
-        except GitHubCredential.DoesNotExist:
+        if not GitHubCredential.objects.filter(user=request.user).exists():
             return Response({
                 'error': 'GitHub not connected'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        repos = GitHubRepository.objects.filter(user=request.user)
         if repo_id:
-            repos = GitHubRepository.objects.filter(id=repo_id, user=request.user)
-        else:
-            repos = GitHubRepository.objects.filter(user=request.user)
-        
-        synced_count = 0
-        errors = []
+            repos = repos.filter(id=repo_id)
+            if not repos.exists():
+                return Response({
+                    'error': 'Repository not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+        repos = list(repos)
         
-        for repo in repos:
-            try:
-                # Fetch repository data from GitHub
-                repo_response = requests.get(
-                    f'https://api.github.com/repos/{repo.repo_full_name}',
-                    headers={
-                        'Authorization': f'Bearer {credential.access_token}',
-                        'Accept': 'application/json'
-                    },
-                    timeout=30
-                )
-                
-                if repo_response.status_code == 200:
-                    repo_data = repo_response.json()
-                    
-                    # Update stats
-                    repo.stars_count = repo_data.get('stargazers_count', 0)
-                    repo.forks_count = repo_data.get('forks_count', 0)
-                    repo.watchers_count = repo_data.get('watchers_count', 0)
-                    
-                    # Fetch latest commit
-                    commits_response = requests.get(
-                        f'https://api.github.com/repos/{repo.repo_full_name}/commits',
-                        headers={
-                            'Authorization': f'Bearer {credential.access_token}',
-                            'Accept': 'application/json'
-                        },
-                        params={'per_page': 1},
-                        timeout=30
-                    )
-                    
-                    if commits_response.status_code == 200:
-                        commits = commits_response.json()
-                        if commits:
-                            latest_commit = commits[0]
-                            from django.utils.dateparse import parse_datetime
-                            commit_date_str = latest_commit.get('commit', {}).get('author', {}).get('date')
-                            if commit_date_str:
-                                repo.last_commit_date = parse_datetime(commit_date_str)
-                            repo.last_commit_message = latest_commit.get('commit', {}).get('message', '')[:200]
-                    
-                    repo.last_synced_at = timezone.now()
-                    repo.sync_error = ''
-                    repo.save()
-                    synced_count += 1
-                else:
-                    error_msg = f"Failed to fetch {repo.repo_name}: {repo_response.status_code}"
-                    repo.sync_error = error_msg
-                    repo.save()
-                    errors.append(error_msg)
-                    
-            except Exception as e:
-                error_msg = f"Error syncing {repo.repo_name}: {str(e)}"
-                repo.sync_error = error_msg
-                repo.save()
-                errors.append(error_msg)
+        refresh_queued = request_refresh(
+            request.user.id, [repo.id for repo in repos] if repo_id else None)
         
         return Response({
-            'message': f'Synced {synced_count} repositories',
-            'synced_count': synced_count,
-            'total_repos': repos.count(),
-            'errors': errors
-        })
+            'message': 'Refresh queued' if refresh_queued else 'Stats were refreshed recently',
+            'refresh_queued': refresh_queued,
+            'total_repos': len(repos),
+            'repositories': GitHubRepositorySerializer(repos, many=True).data,
+            'errors': [repo.sync_error for repo in repos if repo.sync_error]
+        }, status=status.HTTP_202_ACCEPTED if refresh_queued else status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], permission_classes=[AllowAny], authentication_classes=[])
+    def webhook(self, request):
+        """GitHub push webhook: record the latest commit of published repos without polling."""
+        if not getattr(settings, 'GITHUB_WEBHOOK_SECRET', ''):
+            return Response({
+                'error': 'GitHub webhooks are not enabled'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        # The signature covers the raw body, so check it before DRF parses it.
+        if not verify_webhook_signature(request.body, request.headers.get('X-Hub-Signature-256', '')):
+            return Response({
+                'error': 'Invalid signature'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        event = request.headers.get('X-GitHub-Event', '')
+        if event != 'push':
+            return Response({'event': event, 'updated': 0})
+        
+        return Response({'event': event, 'updated': apply_push_event(request.data)})
 
     @action(detail=False, methods=['post'])
     def publish_user_project(self, request):
@@ -580,6 +558,7 @@ MIT License
             status='success' if not push_errors else 'partial',
             commit_message=f'Published {pushed_count} files from Planorah'
         )
+        _register_push_webhook(request, github_repo, credential)
         
         return Response({
             'message': 'Project published to GitHub successfully!',
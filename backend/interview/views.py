@@ -1,14 +1,17 @@
-import os
 import logging
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from backend import gemini_client
 from .models import InterviewSession, InterviewMessage
 from .serializers import InterviewSessionSerializer, InterviewMessageSerializer
 
 logger = logging.getLogger(__name__)
 
+# The opening question depends only on the role, so candidates share it.
+OPENING_QUESTION_CACHE_TTL = 60 * 60 * 24 * 7
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def start_interview(request):
@@ -27,16 +30,12 @@ def start_interview(request):
     
     # Check if we want AI to generate the first question customized?
     # For now, let's stick to a solid default or quick gen.
-    # Lazy load Gemini for first question customization
     try:
-        import google.generativeai as genai
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if api_key:
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel('gemini-2.5-flash')
+        if gemini_client.get_api_key():
             prompt = f"Generate an opening interview question for a {job_role} candidate. Keep it professional and concise."
-            response = model.generate_content(prompt)
-            initial_question = response.text.strip()
+            initial_question = gemini_client.generate_text(
+                prompt, model='gemini-2.5-flash', cache_ttl=OPENING_QUESTION_CACHE_TTL,
+            ) or initial_question
     except:
         pass # Fallback to default
             
@@ -64,14 +63,8 @@ def send_message(request, session_id):
     ai_response_text = "Thank you. Let's move on."
     feedback_text = ""
     
-    # Lazy load Gemini for AI response
     try:
-        import google.generativeai as genai
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if api_key:
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            
+        if gemini_client.get_api_key():
             # Context building (simple: last few messages)
             history = session.messages.order_by('-created_at')[:5]
             history_text = "\n".join([f"{msg.sender.upper()}: {msg.content}" for msg in reversed(history)])
@@ -91,8 +84,7 @@ def send_message(request, session_id):
             QUESTION: [Next Question]
             """
             
-            response = model.generate_content(prompt)
-            raw_text = response.text.strip()
+            raw_text = gemini_client.generate_text(prompt, model='gemini-2.5-flash')
             
             # Naive parsing
             if "FEEDBACK:" in raw_text and "QUESTION:" in raw_text:
@@ -3,23 +3,38 @@ planora/services.py
 AI-powered services for Planora study platform.
 Uses Gemini AI (consistent with the rest of the platform).
 """
-import os
 import json
 import logging
 import re
 from datetime import date, timedelta
 
+from backend import gemini_client
+
 logger = logging.getLogger(__name__)
 
 
-def _get_gemini_model():
-    """Lazy-load and configure the Gemini model."""
-    import google.generativeai as genai  # noqa: PLC0415
-    api_key = os.environ.get('GEMINI_API_KEY')
-    if not api_key:
+# Notes and study guides depend only on the topic, so they are shared across
+# students through the LLM response cache.
+TOPIC_CONTENT_CACHE_TTL = 60 * 60 * 24 * 30
+
+
+def _generate(prompt: str, cache_ttl: int | None = None, force_refresh: bool = False,
+              validate_text=None) -> str:
+    """Send a single-turn prompt to Gemini through the shared client."""
+    if not gemini_client.get_api_key():
         raise EnvironmentError('GEMINI_API_KEY environment variable is not set.')
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel('gemini-2.5-flash-lite')
+    return gemini_client.generate_text(
+        prompt,
+        model='gemini-2.5-flash-lite',
+        cache_ttl=cache_ttl,
+        force_refresh=force_refresh,
+        validate_text=validate_text,
+    )
+
+
+def _normalize_name(value: str) -> str:
+    """Collapse whitespace so trivially different spellings share a cache entry."""
+    return ' '.join(str(value or '').split())
 
 
 def _parse_json_response(text: str) -> dict | list:
@@ -148,20 +163,27 @@ Output format:
   }}
 ]
 """
-    model = _get_gemini_model()
-    response = model.generate_content(prompt)
-    return _parse_json_response(response.text)
+    return _parse_json_response(_generate(prompt))
 
 
 # ---------------------------------------------------------------------------
 # Notes Generator
 # ---------------------------------------------------------------------------
 
-def generate_notes_for_topic(topic_name: str, subject_name: str, importance: str, depth: str) -> dict:
+def generate_notes_for_topic(
+    topic_name: str,
+    subject_name: str,
+    importance: str,
+    depth: str,
+    force_refresh: bool = False,
+) -> dict:
     """
     Generate structured exam-ready notes for a topic.
     Returns a dict with keys: definition, explanation, key_points, examples, conclusion.
+    Identical inputs are served from the shared LLM cache unless ``force_refresh``.
     """
+    topic_name = _normalize_name(topic_name)
+    subject_name = _normalize_name(subject_name)
     depth_map = {'short': '2–3 sentences', 'medium': '1 paragraph', 'long': '2–3 paragraphs'}
     depth_guidance = depth_map.get(depth, '1 paragraph')
 
@@ -191,20 +213,28 @@ Return ONLY valid JSON. No markdown outside the JSON.
   "conclusion": "Concise summary paragraph suitable for ending an exam answer."
 }}
 """
-    model = _get_gemini_model()
-    response = model.generate_content(prompt)
-    return _parse_json_response(response.text)
+    return _parse_json_response(
+        _generate(prompt, cache_ttl=TOPIC_CONTENT_CACHE_TTL, force_refresh=force_refresh,
+                  validate_text=_parse_json_response))
 
 
 # ---------------------------------------------------------------------------
 # Study Guide Generator
 # ---------------------------------------------------------------------------
 
-def generate_study_guide_for_topic(topic_name: str, subject_name: str, importance: str) -> dict:
+def generate_study_guide_for_topic(
+    topic_name: str,
+    subject_name: str,
+    importance: str,
+    force_refresh: bool = False,
+) -> dict:
     """
     Generate a step-by-step study guide for a topic.
     Returns a dict with order_of_learning, key_focus_areas, common_mistakes, revision_strategy.
+    Identical inputs are served from the shared LLM cache unless ``force_refresh``.
     """
+    topic_name = _normalize_name(topic_name)
+    subject_name = _normalize_name(subject_name)
     prompt = f"""
 You are an expert study coach helping a student master: "{topic_name}" in {subject_name}.
 This topic has {importance} importance for the exam.
@@ -228,9 +258,9 @@ Return ONLY valid JSON. No markdown outside the JSON.
   "time_estimate": "Total recommended study time, e.g. '90 minutes'"
 }}
 """
-    model = _get_gemini_model()
-    response = model.generate_content(prompt)
-    return _parse_json_response(response.text)
+    return _parse_json_response(
+        _generate(prompt, cache_ttl=TOPIC_CONTENT_CACHE_TTL, force_refresh=force_refresh,
+                  validate_text=_parse_json_response))
 
 
 # ---------------------------------------------------------------------------
@@ -294,6 +324,4 @@ Output format (array of days):
 
 Generate plan for all {days_remaining} days starting from today.
 """
-    model = _get_gemini_model()
-    response = model.generate_content(prompt)
-    return _parse_json_response(response.text)
+    return _parse_json_response(_generate(prompt))
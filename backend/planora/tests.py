@@ -1,6 +1,13 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import caches
 from django.test import TestCase
 from django.urls import resolve, reverse, NoReverseMatch
 
+from backend import gemini_client, llm_cache
+from planora import services
+
 
 class PlanoraUrlsTest(TestCase):
     """Verify all Planora URL patterns resolve correctly."""
@@ -52,3 +59,75 @@ class PlanoraUrlsTest(TestCase):
         url = reverse('planora-subject-detail', kwargs={'subject_id': 42})
         self.assertEqual(url, '/api/planora/subjects/42/')
         self._assert_resolves(url, 'planora-subject-detail')
+
+
+
+class TopicContentCacheTests(TestCase):
+    NOTES = {'definition': 'A BST keeps smaller keys left.', 'key_points': []}
+
+    def setUp(self):
+        caches[llm_cache.CACHE_ALIAS].clear()
+        self.addCleanup(caches[llm_cache.CACHE_ALIAS].clear)
+        gemini_client._reset_state()
+        self.addCleanup(gemini_client._reset_state)
+
+        self.session = MagicMock()
+        self.session.post.return_value = self._response(json.dumps(self.NOTES))
+        for patcher in (
+            patch('backend.gemini_client.get_session', return_value=self.session),
+            patch('backend.gemini_client.get_api_key', return_value='test-key'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _response(self, text, finish_reason='STOP'):
+        response = MagicMock(status_code=200, ok=True, headers={})
+        response.json.return_value = {
+            'candidates': [{'content': {'parts': [{'text': text}]}, 'finishReason': finish_reason}],
+        }
+        return response
+
+    def test_same_topic_is_generated_once(self):
+        first = services.generate_notes_for_topic('Binary Search Trees', 'Data Structures', 'high', 'medium')
+        second = services.generate_notes_for_topic(' Binary  Search Trees', 'Data Structures ', 'high', 'medium')
+
+        self.assertEqual(first, self.NOTES)
+        self.assertEqual(second, self.NOTES)
+        self.assertEqual(self.session.post.call_count, 1)
+        self.assertEqual(llm_cache.cache_metrics()['hits'], 1)
+
+    def test_different_inputs_and_force_refresh_call_the_model(self):
+        services.generate_notes_for_topic('Binary Search Trees', 'Data Structures', 'high', 'medium')
+        services.generate_notes_for_topic('Binary Search Trees', 'Data Structures', 'high', 'long')
+        services.generate_notes_for_topic(
+            'Binary Search Trees', 'Data Structures', 'high', 'medium', force_refresh=True)
+
+        self.assertEqual(self.session.post.call_count, 3)
+
+    def test_truncated_or_unparseable_replies_are_not_cached(self):
+        good = self.session.post.return_value
+        self.session.post.side_effect = [
+            self._response(json.dumps(self.NOTES)[:20], finish_reason='MAX_TOKENS'),
+            self._response('Sure! Here are your notes: {"definition": '),
+            good,
+            good,
+        ]
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                services.generate_notes_for_topic('Heaps', 'Data Structures', 'high', 'medium')
+
+        self.assertEqual(services.generate_notes_for_topic('Heaps', 'Data Structures', 'high', 'medium'), self.NOTES)
+        self.assertEqual(services.generate_notes_for_topic('Heaps', 'Data Structures', 'high', 'medium'), self.NOTES)
+        self.assertEqual(self.session.post.call_count, 3)
+
+    def test_uncached_call_sites_always_call_the_model(self):
+        for _ in range(2):
+            gemini_client.generate_text('same prompt')
+        self.assertEqual(self.session.post.call_count, 2)
+
+    def test_key_ignores_dict_ordering(self):
+        self.assertEqual(
+            llm_cache.cache_key('m', {'a': 1, 'b': {'c': 2, 'd': 3}}),
+            llm_cache.cache_key('m', {'b': {'d': 3, 'c': 2}, 'a': 1}),
+        )
+        self.assertNotEqual(llm_cache.cache_key('m', {'a': 1}), llm_cache.cache_key('n', {'a': 1}))
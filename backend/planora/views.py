@@ -27,6 +27,12 @@ from . import services
 logger = logging.getLogger(__name__)
 
 
+def _force_refresh(request) -> bool:
+    """``force_refresh`` in the body or ``?refresh=true`` skips the shared AI content cache."""
+    value = request.data.get('force_refresh', request.query_params.get('refresh', 'false'))
+    return str(value).lower() == 'true'
+
+
 # ---------------------------------------------------------------------------
 # Subjects
 # ---------------------------------------------------------------------------
@@ -338,6 +344,7 @@ def topic_notes(request, topic_id):
             subject_name=topic.subject.name,
             importance=topic.importance,
             depth=topic.depth,
+            force_refresh=_force_refresh(request),
         )
     except EnvironmentError as exc:
         return Response({'error': str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -380,6 +387,7 @@ def topic_study_guide(request, topic_id):
             topic_name=topic.name,
             subject_name=topic.subject.name,
             importance=topic.importance,
+            force_refresh=_force_refresh(request),
         )
     except EnvironmentError as exc:
         return Response({'error': str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
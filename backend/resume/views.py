@@ -1,9 +1,9 @@
-import os
 import json
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from backend import gemini_client
 from .models import Resume
 from .serializers import ResumeSerializer
 
@@ -14,12 +14,6 @@ def generate_resume(request):
     """
     Generate a resume content using Gemini based on provided data.
     """
-    # Lazy import - only load when function is called
-    try:
-        import google.generativeai as genai
-    except (ImportError, TypeError):
-        return Response({"error": "AI Service unavailable"}, status=503)
-
     user = request.user
     data = request.data
 
@@ -91,15 +85,11 @@ def generate_resume(request):
     """
 
     try:
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if not api_key:
+        if not gemini_client.get_api_key():
             return Response({"error": "API Key missing"}, status=500)
 
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-
-        response = model.generate_content(prompt)
-        content = response.text.replace("```html", "").replace("```", "")
+        content = gemini_client.generate_text(prompt, model='gemini-2.5-flash')
+        content = content.replace("```html", "").replace("```", "")
 
         # Save to DB
         resume = Resume.objects.create(
@@ -194,12 +184,6 @@ def import_resume(request):
     """
     Import a resume file (PDF/DOCX) and parse it using AI.
     """
-    # Lazy import - only load when function is called
-    try:
-        import google.generativeai as genai
-    except (ImportError, TypeError):
-        return Response({"error": "AI Service unavailable"}, status=503)
-
     if 'file' not in request.FILES:
         return Response({"error": "No file uploaded"}, status=400)
 
@@ -238,9 +222,6 @@ def import_resume(request):
         return Response({"error": f"Failed to read file: {str(e)}"}, status=400)
 
     # Use Gemini to parse the resume text into structured data
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    model = genai.GenerativeModel("gemini-2.5-flash")
-
     parse_prompt = f"""
     Parse the following resume text and extract structured data.
     Return ONLY valid JSON in the exact format below, no markdown, no explanation:
@@ -295,8 +276,7 @@ def import_resume(request):
     """
 
     try:
-        response = model.generate_content(parse_prompt)
-        response_text = response.text.strip()
+        response_text = gemini_client.generate_text(parse_prompt, model="gemini-2.5-flash")
 
         # Clean up JSON if wrapped in markdown
         if response_text.startswith("```"):
@@ -339,12 +319,6 @@ def analyze_ats(request):
     """
     Analyze a resume for ATS compatibility and provide a score.
     """
-    # Lazy import - only load when function is called
-    try:
-        import google.generativeai as genai
-    except (ImportError, TypeError):
-        return Response({"error": "AI Service unavailable"}, status=503)
-
     resume_id = request.data.get('resume_id')
     job_description = request.data.get('job_description', '')
 
@@ -415,20 +389,17 @@ def analyze_ats(request):
                     mime_type = 'image/jpeg'
 
                 # Use Gemini Vision to extract text from image
-                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-                vision_model = genai.GenerativeModel("gemini-2.5-flash")
-
                 ocr_prompt = """
                 Extract ALL text from this resume image. 
                 Return the complete text content preserving the structure.
                 Include every section: name, contact info, summary, experience, education, skills, projects, certifications.
                 """
 
-                response = vision_model.generate_content([
+                resume_content = gemini_client.generate_text(
                     ocr_prompt,
-                    {"mime_type": mime_type, "data": image_base64}
-                ])
-                resume_content = response.text.strip()
+                    model="gemini-2.5-flash",
+                    extra_parts=[{"inlineData": {"mimeType": mime_type, "data": image_base64}}],
+                )
 
             # Handle plain text files
             else:
@@ -444,9 +415,6 @@ def analyze_ats(request):
         return Response({"error": "No resume provided"}, status=400)
 
     # Use Gemini for ATS analysis
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    model = genai.GenerativeModel("gemini-2.5-flash")
-
     ats_prompt = f"""
     You are an ATS (Applicant Tracking System) expert. Analyze this resume and provide:
     
@@ -488,8 +456,7 @@ def analyze_ats(request):
     """
 
     try:
-        response = model.generate_content(ats_prompt)
-        response_text = response.text.strip()
+        response_text = gemini_client.generate_text(ats_prompt, model="gemini-2.5-flash")
 
         # Clean up JSON
         if response_text.startswith("```"):
@@ -1,27 +1,13 @@
 import requests
-from django.conf import settings
+
+from backend import gemini_client
 
 
 def generate_roadmap(prompt: str):
     """
     Sends a roadmap generation request to Google Gemini API.
     """
-    API_KEY = settings.GEMINI_API_KEY
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={API_KEY}"
-
-    payload = {
-        "contents": [
-            {"parts": [{"text": prompt}]}
-        ]
-    }
-
-    response = requests.post(url, json=payload)
-
-    if response.status_code == 200:
-        data = response.json()
-        try:
-            return data["candidates"][0]["content"]["parts"][0]["text"]
-        except KeyError:
-            return "Unexpected response format from Gemini."
-    else:
-        return f"Error: {response.status_code}, {response.text}"
+    try:
+        return gemini_client.generate_text(prompt) or "Unexpected response format from Gemini."
+    except requests.exceptions.HTTPError as exc:
+        return f"Error: {exc.response.status_code}, {exc.response.text}"
@@ -0,0 +1,655 @@
+"""
+AI roadmap generation pipeline.
+
+``generate_roadmap_payload`` builds the category prompt, calls Gemini, parses
+the JSON, persists the roadmap with its milestones/projects and generates the
+daily tasks, reporting each step through ``on_stage``. It backs the
+``run_roadmap_generation_job`` Celery task behind ``POST /api/roadmap/generate/``
+and the assistant's ``roadmap.generate`` action, which already runs in a worker.
+
+When Gemini is not configured, fails, or returns malformed JSON a starter
+roadmap is created instead (``create_basic_roadmap``).
+"""
+
+import json
+import logging
+
+from django.db import transaction
+
+from backend import gemini_client
+from users.user_cache import invalidate_user_cache
+
+from .models import Milestone, Project, Roadmap, RoadmapGenerationJob
+from .serializers import RoadmapDetailSerializer
+
+logger = logging.getLogger(__name__)
+
+ROADMAP_MODEL = 'gemini-2.5-flash-lite'
+ROADMAP_TIMEOUT_SEC = 120
+
+PARAM_DEFAULTS = {
+    'goal': '',
+    'duration': '6 months',
+    'current_level': 'beginner',
+    'interests': [],
+    'category': 'career',
+    'tech_stack': '',
+    'output_format': 'Milestone-based',
+    'learning_constraints': '',
+    'motivation_style': 'Milestones',
+    'success_definition': '',
+}
+
+
+class RoadmapGenerationError(Exception):
+    """Gemini answered without usable content; no fallback roadmap is created."""
+
+    def __init__(self, error, details=''):
+        super().__init__(error)
+        self.error = error
+        self.details = details
+
+
+def roadmap_params(data):
+    """Pick the generation inputs out of request data, applying defaults."""
+    return {key: data.get(key, default) for key, default in PARAM_DEFAULTS.items()}
+
+
+def build_prompt(params):
+    goal = params['goal']
+    duration = params['duration']
+    current_level = params['current_level']
+    interests = params['interests']
+    category = params['category']
+    tech_stack = params['tech_stack']
+    output_format = params['output_format']
+    learning_constraints = params['learning_constraints']
+    motivation_style = params['motivation_style']
+    success_definition = params['success_definition']
+
+    # Define distinct, full-length prompts for each category
+    prompts = {
+        'project': f"""
+You are an elite Technical Project Manager and Senior Architect.
+Your goal is to create a "Blessing-Level" project execution roadmap for a student building: "{goal}".
+This roadmap must be so precise and perfect that it feels like a cheat code for success.
+
+**Student Profile:**
+- **Goal:** {goal}
+- **Tech Stack:** {tech_stack}
+- **Level:** {current_level}
+- **Timeline:** {duration}
+- **Constraints:** {learning_constraints}
+- **Success Definition:** {success_definition}
+
+**CRITICAL INSTRUCTIONS FOR PROJECT ROADMAP:**
+1.  **NO GENERIC ADVICE:** Do not say "Learn State Management". Say "Implement Redux Toolkit with Thunk for async actions".
+2.  **Structure:** Break this down into the Software Development Life Cycle (SDLC):
+    - Phase 1: Setup & Architecture (Environment, DB Design, API planning)
+    - Phase 2: MVP Core Features (The absolute essentials)
+    - Phase 3: Advanced Features (The "Wow" factors)
+    - Phase 4: Polish, Testing & Deployment (CI/CD, Hosting, UI Polish)
+3.  **Milestones:** Each milestone MUST be a functional deliverable.
+4.  **Topics:** Technical concepts required. Be specific (e.g., "JWT vs Session", "Optimistic UI Updates").
+5.  **Projects:** The "Project" field for each milestone should be the specific component being built.
+6.  **Format:** Use the "{output_format}" structure.
+
+**ELITE EXTRAS (MUST INCLUDE):**
+- **Insider Tips:** Secrets only seniors know (e.g., "Use a UUID for PKs to avoid enumeration attacks").
+- **Common Pitfalls:** What usually kills this project? (e.g., "N+1 Query problems in Django").
+- **Production Grade:** How to make it real-world ready (e.g., "Add Sentry for error tracking").
+- **FAQs:** 5-7 burning questions students usually have (e.g., "Hosting options?", "Scalability?").
+
+**Response Format (Strict JSON):**
+{{
+  "title": "Project Name: {goal}",
+  "overview": "Technical overview of the architecture and stack.",
+  "estimated_duration": "{duration}",
+  "daily_commitment": "e.g. '3 hours/day'",
+  "difficulty_level": "{current_level}",
+  "category": "project",
+  "milestones": [
+    {{
+      "title": "Phase 1: [Phase Name]",
+      "description": "Technical specs for this phase.",
+      "order": 1,
+      "duration": "e.g., 1 week",
+      "topics": [
+        {{"title": "Specific Concept 1", "description": "Technical concept explanation"}}
+      ],
+      "resources": [
+        {{"title": "Gold Standard Resource", "url": "https://...", "type": "Documentation/Tutorial"}}
+      ],
+      "projects": [
+        {{
+          "title": "Component Name",
+          "description": "Implementation details.",
+          "difficulty": "medium",
+          "estimated_hours": 10,
+          "tech_stack": ["{tech_stack}"], 
+          "learning_outcomes": ["Functional Feature X"],
+          "insider_tip": "Pro tip for this specific component."
+        }}
+      ]
+    }}
+  ],
+  "prerequisites": ["Req 1"],
+  "career_outcomes": ["Portfolio Item"],
+  "tips": ["Deployment tip", "Production Standard Tip"],
+  "faqs": [
+    {{
+      "question": "Common question about this path?",
+      "answer": "Detailed answer."
+    }}
+  ]
+}}
+""",
+        'career': f"""
+You are a Senior Career Coach and Hiring Manager at a FAANG company.
+Your goal is to create a "Blessing-Level" job-ready roadmap for a student aiming to become: "{goal}".
+This roadmap must be so precise and perfect that it feels like a cheat code for getting hired.
+
+**Student Profile:**
+- **Target Role:** {goal}
+- **Current Level:** {current_level}
+- **Timeline:** {duration}
+- **Interests:** {', '.join(interests) if interests else 'General'}
+- **Motivation:** {motivation_style}
+
+**CRITICAL INSTRUCTIONS FOR CAREER ROADMAP:**
+1.  **NO GENERIC ADVICE:** Do not say "Learn React". Say "Master React Hooks (useMemo, useCallback) and Context API".
+2.  **Structure:** Break this down into "Job Ready" stages:
+    - Phase 1: Foundations (The basics everyone needs)
+    - Phase 2: Core Competencies (The skills that get you hired)
+    - Phase 3: Advanced Specialization (What makes you stand out)
+    - Phase 4: Job Hunt Prep (Resume, Portfolio, LeetCode/Interview prep)
+3.  **Milestones:** Competency levels.
+4.  **Projects:** Portfolio pieces that demonstrate the specific skills learned.
+5.  **Format:** Use the "{output_format}" structure.
+
+- **Interview Killers:** Specific, tough interview questions for each stage.
+- **Resume Power Phrases:** How to describe this skill on a resume.
+- **Hidden Gems:** Resources that aren't mainstream but are amazing.
+- **Major Project:** A final "Capstone Project" that combines all skills into a portfolio-worthy application.
+- **FAQs:** 5-7 burning questions students usually have (e.g., "Degree needed?", "Salary expectations?").
+
+**Response Format (Strict JSON):**
+{{
+  "title": "Career Path: {goal}",
+  "overview": "Market-aligned career strategy.",
+  "estimated_duration": "{duration}",
+  "daily_commitment": "e.g. '2 hours/day'",
+  "difficulty_level": "{current_level}",
+  "category": "career",
+  "milestones": [
+    {{
+      "title": "Level 1: [Skill Group]",
+      "description": "Why this skill gets you hired.",
+      "order": 1,
+      "duration": "e.g., 2 weeks",
+      "topics": [
+        {{"title": "Specific Skill 1", "description": "Theory and practice"}}
+      ],
+      "resources": [
+        {{"title": "Hidden Gem Resource", "url": "https://...", "type": "Course"}}
+      ],
+      "projects": [
+        {{
+          "title": "Portfolio Project",
+          "description": "What to build to show this skill.",
+          "difficulty": "medium",
+          "estimated_hours": 20,
+          "tech_stack": ["Tool 1"], 
+          "learning_outcomes": ["Resume Point 1"],
+          "interview_question": "A tough interview question related to this project."
+        }}
+      ]
+    }},
+    {{
+      "title": "Capstone: [Major Project Name]",
+      "description": "Final major project to showcase mastery.",
+      "order": 99,
+      "duration": "e.g., 4 weeks",
+      "topics": [],
+      "resources": [],
+      "projects": [
+        {{
+          "title": "Capstone Project",
+          "description": "Comprehensive project details.",
+          "difficulty": "hard",
+          "estimated_hours": 40,
+          "tech_stack": ["Full Stack"],
+          "learning_outcomes": ["Full System Architecture"],
+          "interview_question": "Walk me through your Capstone architecture."
+        }}
+      ]
+    }}
+  ],
+  "prerequisites": ["Basic Computer Skills"],
+  "career_outcomes": ["Junior Developer", "Freelancer"],
+  "tips": ["Networking tip", "Resume Tip"],
+  "faqs": [
+    {{
+      "question": "Common career question?",
+      "answer": "Detailed answer."
+    }}
+  ]
+}}
+""",
+        'research': f"""
+You are a PhD Research Supervisor and Professor.
+Your goal is to guide a student through a rigorous research process on: "{goal}".
+This roadmap must be so precise and perfect that it feels like a cheat code for publishing a paper.
+
+**Student Profile:**
+- **Research Topic:** {goal}
+- **Domain:** {tech_stack}
+- **Level:** {current_level}
+- **Timeline:** {duration}
+- **Output Format:** {output_format}
+
+**CRITICAL INSTRUCTIONS FOR RESEARCH ROADMAP:**
+1.  **NO GENERIC ADVICE:** Cite specific papers, theories, or methodologies relevant to {goal}.
+2.  **Structure:** Follow the Scientific Method/Academic Process:
+    - Phase 1: Literature Review (Reading key papers, understanding state-of-the-art)
+    - Phase 2: Hypothesis & Methodology (Formulating the problem)
+    - Phase 3: Experimentation/Implementation (Data collection, coding models)
+    - Phase 4: Analysis & Writing (Results, Paper drafting)
+3.  **Milestones:** Research stages.
+4.  **Topics:** Key papers, theories, mathematical concepts.
+5.  **Projects:** Experiments, mini-papers, or presentations.
+
+**ELITE EXTRAS (MUST INCLUDE):**
+- **Seminal Papers:** The "Must-Reads" that defined the field.
+- **SOTA:** The current State-of-the-Art approaches.
+- **Methodology Pitfalls:** Common mistakes in experimental design.
+- **FAQs:** 5-7 common research questions (e.g., "How to find datasets?", "Where to publish?").
+
+**Response Format (Strict JSON):**
+{{
+  "title": "Research Plan: {goal}",
+  "overview": "Academic abstract of the research path.",
+  "estimated_duration": "{duration}",
+  "daily_commitment": "e.g. '4 hours/day'",
+  "difficulty_level": "{current_level}",
+  "category": "research",
+  "milestones": [
+    {{
+      "title": "Stage 1: [Research Stage]",
+      "description": "Academic guidance.",
+      "order": 1,
+      "duration": "e.g., 3 weeks",
+      "topics": [
+        {{"title": "Specific Paper/Theory", "description": "Summary of key concept"}}
+      ],
+      "resources": [
+        {{"title": "Seminal Paper Title", "url": "https://arxiv.org/...", "type": "Paper"}}
+      ],
+      "projects": [
+        {{
+          "title": "Experiment/Review",
+          "description": "Methodology details.",
+          "difficulty": "hard",
+          "estimated_hours": 30,
+          "tech_stack": ["Python", "LaTeX"], 
+          "learning_outcomes": ["Research Finding"],
+          "methodology_tip": "Avoid this common error in analysis."
+        }}
+      ]
+    }}
+  ],
+  "prerequisites": ["Statistics", "Basic Coding"],
+  "career_outcomes": ["Researcher", "PhD Candidate"],
+  "tips": ["Publication tip"],
+  "faqs": [
+    {{
+      "question": "Common research question?",
+      "answer": "Detailed answer."
+    }}
+  ]
+}}
+""",
+        'skill_mastery': f"""
+You are a Master Coach in Deliberate Practice.
+Your goal is to help a student achieve absolute mastery in: "{goal}".
+This roadmap must be so precise and perfect that it feels like a cheat code for mastery.
+
+**Student Profile:**
+- **Skill:** {goal}
+- **Current Level:** {current_level}
+- **Timeline:** {duration}
+- **Motivation:** {motivation_style}
+- **Constraints:** {learning_constraints}
+
+**CRITICAL INSTRUCTIONS FOR SKILL MASTERY ROADMAP:**
+1.  **NO GENERIC ADVICE:** Focus on specific techniques, drills, and nuanced understanding.
+2.  **Structure:** Focus on Depth and Repetition:
+    - Phase 1: Deconstruction (Breaking the skill into smallest parts)
+    - Phase 2: Drill & Repetition (Isolated practice of sub-skills)
+    - Phase 3: Integration (Combining sub-skills)
+    - Phase 4: Mastery & Flow (High-level performance/challenges)
+3.  **Milestones:** Proficiency levels (Novice, Competent, Proficient, Expert).
+4.  **Topics:** Deep dives into nuance and technique.
+5.  **Projects:** "Drills" or "Challenges" rather than traditional projects.
+
+**ELITE EXTRAS (MUST INCLUDE):**
+- **Mental Models:** How experts visualize this concept.
+- **Feedback Loops:** How to self-correct without a teacher.
+- **Drill Sequences:** Specific practice routines.
+- **Major Challenge:** A final "Mastery Challenge" or "Major Project" to prove expertise.
+- **FAQs:** 5-7 common learning questions (e.g., "How long to practice?", "Plateaus?").
+
+**Response Format (Strict JSON):**
+{{
+  "title": "Mastery Path: {goal}",
+  "overview": "Strategy for deep skill acquisition.",
+  "estimated_duration": "{duration}",
+  "daily_commitment": "e.g. '1 hour/day'",
+  "difficulty_level": "{current_level}",
+  "category": "skill_mastery",
+  "milestones": [
+    {{
+      "title": "Level 1: [Sub-skill]",
+      "description": "Technique focus.",
+      "order": 1,
+      "duration": "e.g., 1 week",
+      "topics": [
+        {{"title": "Technique 1", "description": "How to practice"}}
+      ],
+      "resources": [
+        {{"title": "Guide/Video", "url": "https://...", "type": "Tutorial"}}
+      ],
+      "projects": [
+        {{
+          "title": "Drill/Challenge",
+          "description": "Specific exercise instructions.",
+          "difficulty": "hard",
+          "estimated_hours": 5,
+          "tech_stack": ["N/A"], 
+          "learning_outcomes": ["Muscle Memory/Intuition"]
+        }}
+      ]
+    }}
+  ],
+  "prerequisites": ["Discipline"],
+  "career_outcomes": ["Expert", "Specialist"],
+  "tips": ["Focus tip"],
+  "faqs": [
+    {{
+      "question": "Common mastery question?",
+      "answer": "Detailed answer."
+    }}
+  ]
+}}
+"""
+    }
+
+    # Select the specific prompt based on category
+    return prompts.get(category, prompts['career'])
+
+
+def create_basic_roadmap(user, params, fallback_reason):
+    """
+    Create a valid starter roadmap when AI generation is unavailable or fails.
+    Returns the same payload shape as a generated roadmap, flagged ``ai_fallback``.
+    """
+    goal = params['goal']
+    duration = params['duration']
+    current_level = params['current_level']
+    category = params['category']
+    tech_stack = params['tech_stack']
+    output_format = params['output_format']
+    learning_constraints = params['learning_constraints']
+    motivation_style = params['motivation_style']
+    success_definition = params['success_definition']
+
+    safe_goal = (goal or 'Your Goal').strip() or 'Your Goal'
+    safe_level = current_level if current_level in {
+        'beginner', 'intermediate', 'advanced'} else 'beginner'
+    safe_category = category if category in {
+        'project', 'career', 'research', 'skill_mastery', 'exam_prep'} else 'career'
+
+    roadmap = Roadmap.objects.create(
+        user=user,
+        title=f"Roadmap: {safe_goal}",
+        goal=safe_goal,
+        overview=f"Starter roadmap generated with fallback mode for {safe_goal}.",
+        estimated_duration=duration or '6 months',
+        difficulty_level=safe_level,
+        category=safe_category,
+        tech_stack=tech_stack or '',
+        output_format=output_format or 'Milestone-based',
+        learning_constraints=learning_constraints or '',
+        motivation_style=motivation_style or 'Milestones',
+        success_definition=success_definition or '',
+        prerequisites=['Define your weekly schedule',
+                       'Set a measurable first milestone'],
+        career_outcomes=['Consistent execution', 'Visible progress portfolio'],
+        tips=['Work in focused 25-minute sessions',
+              'Review progress every 7 days'],
+        faqs=[
+            {
+                'question': 'Why is this a starter roadmap?',
+                'answer': 'AI generation was temporarily unavailable, so we created a safe baseline you can start with immediately.'
+            }
+        ],
+    )
+
+    milestone = Milestone.objects.create(
+        roadmap=roadmap,
+        title='Phase 1: Foundation Sprint',
+        description='Establish baseline skills, plan your week, and complete first deliverable.',
+        order=1,
+        duration='1 week',
+        topics=[
+            {'title': 'Goal Breakdown',
+                'description': 'Convert your goal into weekly outcomes.'},
+            {'title': 'Focused Execution',
+                'description': 'Use distraction-free deep work blocks.'},
+        ],
+        resources=[
+            {'title': 'Official Documentation',
+                'url': 'https://developer.mozilla.org/', 'type': 'Documentation'},
+        ],
+    )
+
+    Project.objects.create(
+        milestone=milestone,
+        title='Starter Deliverable',
+        description='Build and submit one tangible output aligned to your roadmap goal.',
+        difficulty='medium',
+        estimated_hours=8,
+        tech_stack=[tech_stack] if tech_stack else [],
+        learning_outcomes=['Clarity on scope', 'First measurable output'],
+    )
+
+    created_tasks_count = 0
+    try:
+        from tasks.task_generator import auto_create_tasks_from_roadmap
+        created_tasks = auto_create_tasks_from_roadmap(roadmap)
+        created_tasks_count = len(created_tasks)
+    except Exception:
+        # Keep fallback generation successful even if task generation fails.
+        created_tasks_count = 0
+
+    invalidate_user_cache(user)
+    serializer = RoadmapDetailSerializer(roadmap)
+    return {
+        **serializer.data,
+        'tasks_created': created_tasks_count > 0,
+        'tasks_count': created_tasks_count,
+        'ai_fallback': True,
+        'fallback_reason': str(fallback_reason or 'AI unavailable'),
+    }
+
+
+def bulk_create_milestones(roadmap, milestones_data):
+    """
+    Materialize AI milestone/project payloads with one INSERT per table.
+
+    Returns the created milestones in payload order.
+    """
+    milestones = [
+        Milestone(
+            roadmap=roadmap,
+            title=milestone_data.get('title', f'Milestone {idx + 1}'),
+            description=milestone_data.get('description', ''),
+            order=milestone_data.get('order', idx + 1),
+            duration=milestone_data.get('duration', ''),
+            topics=milestone_data.get('topics', []),
+            resources=milestone_data.get('resources', [])
+        )
+        for idx, milestone_data in enumerate(milestones_data)
+    ]
+    milestones = Milestone.objects.bulk_create(milestones)
+
+    valid_project_diff = ['easy', 'medium', 'hard']
+    projects = []
+    for milestone, milestone_data in zip(milestones, milestones_data):
+        for pidx, project_data in enumerate(milestone_data.get('projects', [])):
+            # Validate project difficulty
+            proj_difficulty = project_data.get('difficulty', 'medium')
+            if proj_difficulty not in valid_project_diff:
+                proj_difficulty = 'medium'
+
+            projects.append(Project(
+                milestone=milestone,
+                title=project_data.get('title', f'Project {pidx + 1}'),
+                description=project_data.get('description', ''),
+                difficulty=proj_difficulty,
+                estimated_hours=project_data.get('estimated_hours', 0),
+                tech_stack=project_data.get('tech_stack', []),
+                learning_outcomes=project_data.get('learning_outcomes', [])
+            ))
+    if projects:
+        Project.objects.bulk_create(projects)
+
+    return milestones
+
+
+def _parse_roadmap_json(response_text):
+    response_text = response_text.strip()
+
+    # Remove markdown code blocks if present
+    if "```json" in response_text:
+        response_text = response_text.split("```json")[1].split("```")[0]
+    elif "```" in response_text:
+        response_text = response_text.split("```")[1].split("```")[0]
+
+    return json.loads(response_text.strip())
+
+
+def generate_roadmap_payload(user, params, on_stage=None):
+    """
+    Run the full pipeline and return the roadmap detail payload.
+
+    ``on_stage(stage)`` is called with ``RoadmapGenerationJob.STAGE_*`` values as
+    work progresses. Raises ``RoadmapGenerationError`` only when Gemini returns
+    an empty response; every other failure falls back to a starter roadmap.
+    """
+    def report(stage):
+        if on_stage:
+            on_stage(stage)
+
+    goal = params['goal']
+    duration = params['duration']
+    current_level = params['current_level']
+    category = params['category']
+
+    if not gemini_client.get_api_key():
+        return create_basic_roadmap(
+            user, params, "GEMINI_API_KEY environment variable is not set")
+
+    prompt = build_prompt(params)
+    try:
+        logger.info("Generating roadmap for user_id=%s category=%s",
+                    user.id, category)
+        report(RoadmapGenerationJob.STAGE_PROMPT_SENT)
+        response_text = gemini_client.generate_text(
+            prompt,
+            model=ROADMAP_MODEL,
+            generation_config={
+                'temperature': 0.7,
+                'topP': 0.95,
+                'maxOutputTokens': 8192,
+            },
+            timeout=ROADMAP_TIMEOUT_SEC,
+        )
+
+        # Safety check: Ensure valid response from AI
+        if not response_text:
+            raise RoadmapGenerationError(
+                "AI did not return a valid response",
+                "The Gemini API returned an empty or invalid response. Please try again.",
+            )
+
+        roadmap_data = _parse_roadmap_json(response_text)
+        report(RoadmapGenerationJob.STAGE_JSON_PARSED)
+
+        # Validate difficulty_level
+        valid_difficulty = ['beginner', 'intermediate', 'advanced']
+        difficulty = roadmap_data.get('difficulty_level', current_level)
+        if difficulty not in valid_difficulty:
+            difficulty = current_level
+
+        # Commit roadmap, milestones and projects first, so the stage reported
+        # below is visible to pollers while tasks are generated.
+        with transaction.atomic():
+            roadmap = Roadmap.objects.create(
+                user=user,
+                title=roadmap_data.get('title', goal),
+                goal=goal,
+                overview=roadmap_data.get('overview', ''),
+                estimated_duration=roadmap_data.get(
+                    'estimated_duration', duration),
+                difficulty_level=difficulty,
+                category=roadmap_data.get('category', category),
+                tech_stack=roadmap_data.get('tech_stack', params['tech_stack']),
+                output_format=roadmap_data.get('output_format', params['output_format']),
+                learning_constraints=roadmap_data.get(
+                    'learning_constraints', params['learning_constraints']),
+                motivation_style=roadmap_data.get(
+                    'motivation_style', params['motivation_style']),
+                success_definition=roadmap_data.get(
+                    'success_definition', params['success_definition']),
+                prerequisites=roadmap_data.get('prerequisites', []),
+                career_outcomes=roadmap_data.get('career_outcomes', []),
+                tips=roadmap_data.get('tips', []),
+                faqs=roadmap_data.get('faqs', [])
+            )
+
+            bulk_create_milestones(roadmap, roadmap_data.get('milestones', []))
+        report(RoadmapGenerationJob.STAGE_MILESTONES_SAVED)
+
+        # Auto-generate tasks from roadmap (save_tasks has its own transaction)
+        created_tasks = []
+        try:
+            from tasks.task_generator import auto_create_tasks_from_roadmap
+            created_tasks = auto_create_tasks_from_roadmap(roadmap)
+            logger.info("Auto-generated %s tasks for roadmap_id=%s",
+                        len(created_tasks), roadmap.id)
+        except Exception:
+            logger.exception(
+                "Task generation failed for roadmap %s", roadmap.id)
+            # Don't fail the whole generation if task generation fails
+        report(RoadmapGenerationJob.STAGE_TASKS_GENERATED)
+
+        invalidate_user_cache(user)
+        serializer = RoadmapDetailSerializer(roadmap)
+        return {
+            **serializer.data,
+            'tasks_created': bool(created_tasks),
+            'tasks_count': len(created_tasks)
+        }
+
+    except RoadmapGenerationError:
+        raise
+
+    except json.JSONDecodeError as e:
+        logger.warning("JSON parse error while generating roadmap: %s", e)
+        return create_basic_roadmap(user, params, f"JSON parsing failed: {str(e)}")
+
+    except Exception as e:
+        logger.exception("Unexpected error during roadmap generation")
+        return create_basic_roadmap(
+            user, params, f"Unexpected generation error: {type(e).__name__}")
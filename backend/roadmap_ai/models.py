@@ -268,3 +268,60 @@ class Task(models.Model):
         attempt_count = self.attempts.filter(
             user=user).count()  # type: ignore[attr-defined]
         return attempt_count < self.max_attempts
+
+
+class RoadmapGenerationJob(models.Model):
+    """Background AI roadmap generation, polled (or streamed) by the UI."""
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    STAGE_QUEUED = 'queued'
+    STAGE_PROMPT_SENT = 'prompt_sent'
+    STAGE_JSON_PARSED = 'json_parsed'
+    STAGE_MILESTONES_SAVED = 'milestones_saved'
+    STAGE_TASKS_GENERATED = 'tasks_generated'
+    STAGE_CHOICES = [
+        (STAGE_QUEUED, 'Queued'),
+        (STAGE_PROMPT_SENT, 'Prompt sent'),
+        (STAGE_JSON_PARSED, 'JSON parsed'),
+        (STAGE_MILESTONES_SAVED, 'Milestones saved'),
+        (STAGE_TASKS_GENERATED, 'Tasks generated'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE, related_name='roadmap_generation_jobs')
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    stage = models.CharField(max_length=32, choices=STAGE_CHOICES, default=STAGE_QUEUED)
+    roadmap = models.ForeignKey(Roadmap, on_delete=models.SET_NULL,
+                                null=True, blank=True, related_name='generation_jobs')
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default='')
+    celery_task_id = models.CharField(max_length=128, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"RoadmapGenerationJob({self.id}, status={self.status}, stage={self.stage})"
+
+    @property
+    def progress(self):
+        """Rough completion percentage derived from the stage."""
+        if self.status == self.STATUS_SUCCEEDED:
+            return 100
+        stages = [value for value, _ in self.STAGE_CHOICES]
+        return int(stages.index(self.stage) * 100 / len(stages))
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Roadmap, Milestone, Project, StudentProject, Task
+from .models import Roadmap, Milestone, Project, StudentProject, Task, RoadmapGenerationJob
 
 
 class ProjectSerializer(serializers.ModelSerializer):
@@ -94,3 +94,15 @@ class RoadmapDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Roadmap
         fields = '__all__'
+
+
+class RoadmapGenerationJobSerializer(serializers.ModelSerializer):
+    progress = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = RoadmapGenerationJob
+        fields = [
+            'id', 'status', 'stage', 'progress', 'roadmap', 'result', 'error',
+            'created_at', 'updated_at', 'completed_at',
+        ]
+        read_only_fields = fields
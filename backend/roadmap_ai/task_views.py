@@ -7,7 +7,6 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.utils import timezone
 from django.db.models import Q
 
 from .models import Task
@@ -18,7 +17,7 @@ from tasks.serializers import (
     TaskAttemptListSerializer,
     TaskAttemptDetailSerializer,
 )
-from tasks.validators import run_validation
+from tasks.validation_queue import queue_attempt_validation
 
 
 class TaskViewSet(viewsets.ReadOnlyModelViewSet):
@@ -107,23 +106,14 @@ class TaskViewSet(viewsets.ReadOnlyModelViewSet):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # Save attempt (initially PENDING)
-        attempt = serializer.save(task=task)
-
-        # Run validation asynchronously (or sync for MVP)
-        validation_result = run_validation(
-            task, attempt.proof_payload, task.acceptance_rules)
-
-        # Update attempt with validation results
-        attempt.validator_output = validation_result
-        attempt.validation_status = validation_result.get('status', 'PENDING')
-        attempt.score = validation_result.get('score')
-        attempt.validated_at = timezone.now()
-        attempt.save()
+        # Save attempt (initially PENDING); GitHub proofs are validated by a worker
+        attempt = queue_attempt_validation(serializer.save(task=task))
 
         # Return result
         response_serializer = TaskAttemptDetailSerializer(attempt)
-        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+        response_status = (status.HTTP_202_ACCEPTED if attempt.validation_status == 'PENDING'
+                           else status.HTTP_201_CREATED)
+        return Response(response_serializer.data, status=response_status)
 
 
 class TaskAttemptViewSet(viewsets.ReadOnlyModelViewSet):
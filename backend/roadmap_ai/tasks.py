@@ -0,0 +1,49 @@
+from celery import shared_task
+from django.utils import timezone
+
+from roadmap_ai.generation import RoadmapGenerationError, generate_roadmap_payload
+from roadmap_ai.models import RoadmapGenerationJob
+
+
+def enqueue_roadmap_generation(user, params):
+    """Create a generation job for ``params`` and hand it to the worker."""
+    job = RoadmapGenerationJob.objects.create(user=user, params=params)
+    celery_result = run_roadmap_generation_job.delay(str(job.id))
+    job.celery_task_id = celery_result.id or ''
+    job.save(update_fields=['celery_task_id', 'updated_at'])
+    return job
+
+
+# Not auto-retried: a retry after the roadmap was saved would create a duplicate.
+# Gemini/transient failures are retried by the client and otherwise fall back to
+# a starter roadmap inside generate_roadmap_payload.
+@shared_task(bind=True)
+def run_roadmap_generation_job(self, job_id: str):
+    job = RoadmapGenerationJob.objects.select_related('user').get(id=job_id)
+    if job.status != RoadmapGenerationJob.STATUS_QUEUED:
+        return {'status': job.status}
+    job.status = RoadmapGenerationJob.STATUS_RUNNING
+    job.save(update_fields=['status', 'updated_at'])
+
+    def _report(stage):
+        job.stage = stage
+        RoadmapGenerationJob.objects.filter(id=job.id).update(stage=stage, updated_at=timezone.now())
+
+    try:
+        payload = generate_roadmap_payload(job.user, job.params, on_stage=_report)
+    except RoadmapGenerationError as exc:
+        job.status = RoadmapGenerationJob.STATUS_FAILED
+        job.error = exc.error
+        job.result = {'error': exc.error, 'details': exc.details}
+    except Exception as exc:
+        job.status = RoadmapGenerationJob.STATUS_FAILED
+        job.error = str(exc) or type(exc).__name__
+    else:
+        job.status = RoadmapGenerationJob.STATUS_SUCCEEDED
+        job.result = payload
+        job.roadmap_id = payload.get('id')
+        job.stage = RoadmapGenerationJob.STAGE_TASKS_GENERATED
+
+    job.completed_at = timezone.now()
+    job.save(update_fields=['status', 'stage', 'result', 'roadmap', 'error', 'completed_at', 'updated_at'])
+    return {'status': job.status, 'roadmap_id': job.roadmap_id}
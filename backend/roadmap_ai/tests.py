@@ -1,3 +1,271 @@
+import json
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from roadmap_ai.models import Milestone, Project, Roadmap, RoadmapGenerationJob
+from roadmap_ai.tasks import run_roadmap_generation_job
+from roadmap_ai.generation import bulk_create_milestones, generate_roadmap_payload
+from tasks.models import Task
+from tasks.task_generator import auto_create_tasks_from_roadmap
+
+
+class RoadmapProgressEndpointTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='progress@example.com',
+            username='progress_user',
+            password='testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _build_roadmap(self, milestones=2, projects=2, tasks=3):
+        roadmap = Roadmap.objects.create(user=self.user, title='Backend', goal='Ship APIs')
+        for order in range(milestones):
+            milestone = Milestone.objects.create(
+                roadmap=roadmap, title=f'M{order}', order=order, is_completed=order == 0)
+            for idx in range(projects):
+                Project.objects.create(milestone=milestone, title=f'P{order}-{idx}', description='')
+            for day in range(1, tasks + 1):
+                Task.objects.create(
+                    user=self.user,
+                    roadmap=roadmap,
+                    milestone=milestone,
+                    title=f'Task {day}',
+                    day=day,
+                    due_date=date(2026, 1, day),
+                    status='completed' if day == 1 else 'not_started',
+                    tags=['project'] if day <= 2 else [],
+                )
+        return roadmap
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data, len(ctx)
+
+    def test_project_tag_is_denormalized(self):
+        roadmap = self._build_roadmap(milestones=1, projects=0, tasks=3)
+        self.assertEqual(Task.objects.filter(roadmap=roadmap, is_project=True).count(), 2)
+
+        task = Task.objects.filter(roadmap=roadmap, is_project=True).first()
+        task.tags = []
+        task.save(update_fields=['tags'])
+        task.refresh_from_db()
+        self.assertFalse(task.is_project)
+
+    def test_projects_report_tagged_task_progress(self):
+        self._build_roadmap(milestones=1, projects=2, tasks=3)
+
+        data, _ = self._get('/api/roadmap/projects/')
+
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data[0]['total_tasks'], 2)
+        self.assertEqual(data[0]['completed_tasks'], 1)
+        self.assertEqual(data[0]['progress'], 50)
+        self.assertEqual(data[0]['status'], 'in_progress')
+
+    def test_progress_reports_task_and_milestone_totals(self):
+        roadmap = self._build_roadmap(milestones=2, projects=0, tasks=4)
+
+        data, _ = self._get('/api/roadmap/progress/')
+
+        self.assertEqual(data[0]['id'], roadmap.id)
+        self.assertEqual(data[0]['total_tasks'], 8)
+        self.assertEqual(data[0]['completed_tasks'], 2)
+        self.assertEqual(data[0]['progress'], 25)
+        self.assertEqual(data[0]['total_milestones'], 2)
+        self.assertEqual(data[0]['completed_milestones'], 1)
+
+    def test_query_count_does_not_grow_with_roadmap_size(self):
+        self._build_roadmap(milestones=1, projects=1, tasks=2)
+        _, projects_baseline = self._get('/api/roadmap/projects/')
+        _, progress_baseline = self._get('/api/roadmap/progress/')
+
+        for _ in range(3):
+            self._build_roadmap(milestones=4, projects=3, tasks=5)
+        projects, projects_queries = self._get('/api/roadmap/projects/')
+        _, progress_queries = self._get('/api/roadmap/progress/')
+
+        self.assertEqual(len(projects), 1 + 3 * 4 * 3)
+        self.assertEqual(projects_queries, projects_baseline)
+        self.assertEqual(progress_queries, progress_baseline)
+
+
+class BulkRoadmapPersistenceTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='bulk@example.com',
+            username='bulk_user',
+            password='testpass123',
+        )
+        self.roadmap = Roadmap.objects.create(user=self.user, title='Backend', goal='Ship APIs')
+
+    def _payload(self, months=6):
+        return [
+            {
+                'title': f'Month {idx + 1}',
+                'duration': '1 month',
+                'topics': [{'title': f'Topic {idx}-{n}'} for n in range(3)],
+                'projects': [
+                    {'title': f'Build {idx}', 'difficulty': 'extreme', 'estimated_hours': 8},
+                ],
+            }
+            for idx in range(months)
+        ]
+
+    def test_six_month_roadmap_uses_a_handful_of_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            milestones = bulk_create_milestones(self.roadmap, self._payload())
+            tasks = auto_create_tasks_from_roadmap(self.roadmap)
+
+        task_inserts = [
+            q for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "tasks_task"')]
+        # One INSERT per table; sqlite may split the task INSERT on its bind-parameter limit.
+        self.assertEqual(len(ctx) - len(task_inserts), 6)
+        self.assertLess(len(task_inserts), 10)
+        self.assertEqual(len(milestones), 6)
+        self.assertEqual(Project.objects.filter(milestone__roadmap=self.roadmap).count(), 6)
+        self.assertEqual(Project.objects.filter(difficulty='medium').count(), 6)
+        self.assertEqual(len(tasks), 180)
+        self.assertEqual(Task.objects.filter(roadmap=self.roadmap).count(), 180)
+
+    def test_generated_tasks_keep_day_order_and_project_flag(self):
+        bulk_create_milestones(self.roadmap, self._payload(months=2))
+        auto_create_tasks_from_roadmap(self.roadmap)
+
+        tasks = list(Task.objects.filter(roadmap=self.roadmap).order_by('day'))
+        self.assertEqual([task.day for task in tasks], list(range(1, 61)))
+        self.assertTrue(all(task.order_in_day == 0 for task in tasks))
+        self.assertTrue(tasks[0].title.startswith('📚 Day 1:'))
+        self.assertTrue(tasks[30].title.startswith('📚 Day 31:'))
+        self.assertEqual(
+            sum(task.is_project for task in tasks),
+            sum('project' in task.tags for task in tasks),
+        )
+
+
+class RoadmapGenerationJobTests(TestCase):
+    AI_ROADMAP = {
+        'title': 'Backend Engineer',
+        'overview': 'APIs first.',
+        'difficulty_level': 'beginner',
+        'milestones': [
+            {
+                'title': 'Phase 1',
+                'duration': '1 week',
+                'topics': [{'title': 'HTTP'}],
+                'projects': [{'title': 'Echo API', 'difficulty': 'easy'}],
+            },
+        ],
+    }
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='genjob@example.com',
+            username='genjob_user',
+            password='testpass123',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        patcher = patch('roadmap_ai.generation.gemini_client.get_api_key', return_value='test-key')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _queue(self):
+        with patch('roadmap_ai.tasks.run_roadmap_generation_job.delay') as delay:
+            delay.return_value.id = 'celery-1'
+            response = self.client.post(
+                '/api/roadmap/generate/', {'goal': 'Backend Engineer'}, format='json')
+        self.assertEqual(response.status_code, 202)
+        delay.assert_called_once_with(response.data['job_id'])
+        return RoadmapGenerationJob.objects.get(id=response.data['job_id'])
+
+    def _run(self, job, **generate_text):
+        with patch('roadmap_ai.generation.gemini_client.generate_text', **generate_text):
+            run_roadmap_generation_job.run(str(job.id))
+        job.refresh_from_db()
+        return job
+
+    def test_post_returns_job_without_calling_gemini(self):
+        with patch('roadmap_ai.generation.gemini_client.generate_text') as generate_text:
+            job = self._queue()
+
+        generate_text.assert_not_called()
+        self.assertEqual(job.status, RoadmapGenerationJob.STATUS_QUEUED)
+        self.assertEqual(job.params['goal'], 'Backend Engineer')
+        self.assertEqual(job.celery_task_id, 'celery-1')
+        self.assertFalse(Roadmap.objects.filter(user=self.user).exists())
+
+    def test_job_persists_roadmap_and_reports_completion(self):
+        job = self._run(self._queue(), return_value=json.dumps(self.AI_ROADMAP))
+
+        self.assertEqual(job.status, RoadmapGenerationJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.stage, RoadmapGenerationJob.STAGE_TASKS_GENERATED)
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(job.roadmap.title, 'Backend Engineer')
+        self.assertEqual(job.result['id'], job.roadmap_id)
+        self.assertEqual(Project.objects.filter(milestone__roadmap=job.roadmap).count(), 1)
+
+        response = self.client.get(f'/api/roadmap/generate/jobs/{job.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], RoadmapGenerationJob.STATUS_SUCCEEDED)
+        self.assertEqual(response.data['result']['id'], job.roadmap_id)
+
+    def test_milestones_stage_is_reported_outside_the_roadmap_transaction(self):
+        depth_at_stage = {}
+
+        def on_stage(stage):
+            depth_at_stage[stage] = len(connection.atomic_blocks)
+
+        params = self._queue().params
+        with patch('roadmap_ai.generation.gemini_client.generate_text',
+                   return_value=json.dumps(self.AI_ROADMAP)), \
+                patch('tasks.task_generator.auto_create_tasks_from_roadmap', side_effect=RuntimeError('boom')):
+            payload = generate_roadmap_payload(self.user, params, on_stage=on_stage)
+
+        self.assertEqual(depth_at_stage[RoadmapGenerationJob.STAGE_MILESTONES_SAVED],
+                         depth_at_stage[RoadmapGenerationJob.STAGE_PROMPT_SENT])
+        self.assertFalse(payload['tasks_created'])
+        self.assertEqual(payload['tasks_count'], 0)
+        self.assertTrue(Roadmap.objects.filter(id=payload['id']).exists())
+
+    def test_gemini_failure_falls_back_to_starter_roadmap(self):
+        job = self._run(self._queue(), side_effect=TimeoutError('slow'))
+
+        self.assertEqual(job.status, RoadmapGenerationJob.STATUS_SUCCEEDED)
+        self.assertTrue(job.result['ai_fallback'])
+        self.assertEqual(job.roadmap.milestones.count(), 1)
+
+    def test_empty_response_fails_the_job(self):
+        job = self._run(self._queue(), return_value='')
+
+        self.assertEqual(job.status, RoadmapGenerationJob.STATUS_FAILED)
+        self.assertEqual(job.error, 'AI did not return a valid response')
+        self.assertEqual(job.stage, RoadmapGenerationJob.STAGE_PROMPT_SENT)
+        self.assertIsNone(job.roadmap)
+
+    def test_status_suggests_poll_interval_until_job_finishes(self):
+        job = self._queue()
+        response = self.client.get(f'/api/roadmap/generate/jobs/{job.id}/')
+        self.assertEqual(response['Retry-After'], '2')
+
+        job = self._run(job, return_value=json.dumps(self.AI_ROADMAP))
+        response = self.client.get(f'/api/roadmap/generate/jobs/{job.id}/')
+        self.assertEqual(response.data['status'], 'succeeded')
+        self.assertFalse(response.has_header('Retry-After'))
+
+    def test_other_users_cannot_read_job(self):
+        job = self._queue()
+        other = get_user_model().objects.create_user(
+            email='other@example.com', username='other_user', password='testpass123')
+        self.client.force_authenticate(other)
 
-# Create your tests here.
+        self.assertEqual(self.client.get(f'/api/roadmap/generate/jobs/{job.id}/').status_code, 404)
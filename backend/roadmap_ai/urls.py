@@ -24,6 +24,8 @@ def check_output_eligibility(request):
 urlpatterns = [
     # Generate AI roadmap
     path('generate/', views.generate_roadmap, name='generate_roadmap'),
+    path('generate/jobs/<uuid:job_id>/', views.roadmap_generation_job_status,
+         name='roadmap_generation_job_status'),
 
     # Get all roadmaps for authenticated user
     path('list/', views.get_user_roadmaps, name='get_user_roadmaps'),
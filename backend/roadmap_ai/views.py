@@ -2,641 +2,60 @@ from .serializers import StudentProjectSerializer, StudentProjectCreateSerialize
 from .models import StudentProject
 from rest_framework.decorators import action
 from rest_framework import viewsets
-import os
-import json
 import logging
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import Count, Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Roadmap, Milestone, Project
-from .serializers import RoadmapSerializer, RoadmapDetailSerializer
+from .generation import roadmap_params
+from .models import Roadmap, Milestone, Project, RoadmapGenerationJob
+from .serializers import RoadmapSerializer, RoadmapDetailSerializer, RoadmapGenerationJobSerializer
+from .tasks import enqueue_roadmap_generation
+from users.user_cache import invalidate_user_cache
 
 logger = logging.getLogger(__name__)
 
+SCHEDULE_BATCH_SIZE = 500
 
-def _create_basic_roadmap_response(
-    user,
-    goal,
-    duration,
-    current_level,
-    category,
-    tech_stack,
-    output_format,
-    learning_constraints,
-    motivation_style,
-    success_definition,
-    fallback_reason,
-):
-    """Create a valid starter roadmap when AI generation is unavailable or fails."""
-    safe_goal = (goal or 'Your Goal').strip() or 'Your Goal'
-    safe_level = current_level if current_level in {
-        'beginner', 'intermediate', 'advanced'} else 'beginner'
-    safe_category = category if category in {
-        'project', 'career', 'research', 'skill_mastery', 'exam_prep'} else 'career'
-
-    roadmap = Roadmap.objects.create(
-        user=user,
-        title=f"Roadmap: {safe_goal}",
-        goal=safe_goal,
-        overview=f"Starter roadmap generated with fallback mode for {safe_goal}.",
-        estimated_duration=duration or '6 months',
-        difficulty_level=safe_level,
-        category=safe_category,
-        tech_stack=tech_stack or '',
-        output_format=output_format or 'Milestone-based',
-        learning_constraints=learning_constraints or '',
-        motivation_style=motivation_style or 'Milestones',
-        success_definition=success_definition or '',
-        prerequisites=['Define your weekly schedule',
-                       'Set a measurable first milestone'],
-        career_outcomes=['Consistent execution', 'Visible progress portfolio'],
-        tips=['Work in focused 25-minute sessions',
-              'Review progress every 7 days'],
-        faqs=[
-            {
-                'question': 'Why is this a starter roadmap?',
-                'answer': 'AI generation was temporarily unavailable, so we created a safe baseline you can start with immediately.'
-            }
-        ],
-    )
-
-    milestone = Milestone.objects.create(
-        roadmap=roadmap,
-        title='Phase 1: Foundation Sprint',
-        description='Establish baseline skills, plan your week, and complete first deliverable.',
-        order=1,
-        duration='1 week',
-        topics=[
-            {'title': 'Goal Breakdown',
-                'description': 'Convert your goal into weekly outcomes.'},
-            {'title': 'Focused Execution',
-                'description': 'Use distraction-free deep work blocks.'},
-        ],
-        resources=[
-            {'title': 'Official Documentation',
-                'url': 'https://developer.mozilla.org/', 'type': 'Documentation'},
-        ],
-    )
-
-    Project.objects.create(
-        milestone=milestone,
-        title='Starter Deliverable',
-        description='Build and submit one tangible output aligned to your roadmap goal.',
-        difficulty='medium',
-        estimated_hours=8,
-        tech_stack=[tech_stack] if tech_stack else [],
-        learning_outcomes=['Clarity on scope', 'First measurable output'],
-    )
-
-    created_tasks_count = 0
-    try:
-        from tasks.task_generator import auto_create_tasks_from_roadmap
-        created_tasks = auto_create_tasks_from_roadmap(roadmap)
-        created_tasks_count = len(created_tasks)
-    except Exception:
-        # Keep fallback generation successful even if task generation fails.
-        created_tasks_count = 0
-
-    serializer = RoadmapDetailSerializer(roadmap)
-    return Response({
-        **serializer.data,
-        'tasks_created': created_tasks_count > 0,
-        'tasks_count': created_tasks_count,
-        'ai_fallback': True,
-        'fallback_reason': str(fallback_reason or 'AI unavailable'),
-    }, status=status.HTTP_201_CREATED)
+# Suggested poll interval (Retry-After) while a generation job is running.
+GENERATION_STATUS_RETRY_AFTER_SEC = 2
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def generate_roadmap(request):
-    """Generate AI-powered roadmap using Gemini"""
+    """
+    Queue AI roadmap generation and return the job immediately.
 
-    # Lazy import - only load when function is called
-    ai_unavailable_reason = None
-    try:
-        import google.generativeai as genai
-        from google.generativeai.types import GenerationConfig
-    except (ImportError, TypeError):
-        genai = None
-        GenerationConfig = None
-        ai_unavailable_reason = "Gemini AI SDK is not available"
-
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        ai_unavailable_reason = "GEMINI_API_KEY environment variable is not set"
-
-    if genai and api_key:
-        # Configure Gemini with API key
-        genai.configure(api_key=api_key)
-        logger.info("Gemini configured for roadmap generation")
-
-    user = request.user
-    goal = request.data.get('goal', '')
-    duration = request.data.get('duration', '6 months')
-    current_level = request.data.get('current_level', 'beginner')
-    interests = request.data.get('interests', [])
-
-    category = request.data.get('category', 'career')
-    tech_stack = request.data.get('tech_stack', '')
-    output_format = request.data.get('output_format', 'Milestone-based')
-    learning_constraints = request.data.get('learning_constraints', '')
-    motivation_style = request.data.get('motivation_style', 'Milestones')
-    success_definition = request.data.get('success_definition', '')
-
-    # Define distinct, full-length prompts for each category
-    prompts = {
-        'project': f"""
-You are an elite Technical Project Manager and Senior Architect.
-Your goal is to create a "Blessing-Level" project execution roadmap for a student building: "{goal}".
-This roadmap must be so precise and perfect that it feels like a cheat code for success.
-
-**Student Profile:**
-- **Goal:** {goal}
-- **Tech Stack:** {tech_stack}
-- **Level:** {current_level}
-- **Timeline:** {duration}
-- **Constraints:** {learning_constraints}
-- **Success Definition:** {success_definition}
-
-**CRITICAL INSTRUCTIONS FOR PROJECT ROADMAP:**
-1.  **NO GENERIC ADVICE:** Do not say "Learn State Management". Say "Implement Redux Toolkit with Thunk for async actions".
-2.  **Structure:** Break this down into the Software Development Life Cycle (SDLC):
-    - Phase 1: Setup & Architecture (Environment, DB Design, API planning)
-    - Phase 2: MVP Core Features (The absolute essentials)
-    - Phase 3: Advanced Features (The "Wow" factors)
-    - Phase 4: Polish, Testing & Deployment (CI/CD, Hosting, UI Polish)
-3.  **Milestones:** Each milestone MUST be a functional deliverable.
-4.  **Topics:** Technical concepts required. Be specific (e.g., "JWT vs Session", "Optimistic UI Updates").
-5.  **Projects:** The "Project" field for each milestone should be the specific component being built.
-6.  **Format:** Use the "{output_format}" structure.
-
-**ELITE EXTRAS (MUST INCLUDE):**
-- **Insider Tips:** Secrets only seniors know (e.g., "Use a UUID for PKs to avoid enumeration attacks").
-- **Common Pitfalls:** What usually kills this project? (e.g., "N+1 Query problems in Django").
-- **Production Grade:** How to make it real-world ready (e.g., "Add Sentry for error tracking").
-- **FAQs:** 5-7 burning questions students usually have (e.g., "Hosting options?", "Scalability?").
-
-**Response Format (Strict JSON):**
-{{
-  "title": "Project Name: {goal}",
-  "overview": "Technical overview of the architecture and stack.",
-  "estimated_duration": "{duration}",
-  "daily_commitment": "e.g. '3 hours/day'",
-  "difficulty_level": "{current_level}",
-  "category": "project",
-  "milestones": [
-    {{
-      "title": "Phase 1: [Phase Name]",
-      "description": "Technical specs for this phase.",
-      "order": 1,
-      "duration": "e.g., 1 week",
-      "topics": [
-        {{"title": "Specific Concept 1", "description": "Technical concept explanation"}}
-      ],
-      "resources": [
-        {{"title": "Gold Standard Resource", "url": "https://...", "type": "Documentation/Tutorial"}}
-      ],
-      "projects": [
-        {{
-          "title": "Component Name",
-          "description": "Implementation details.",
-          "difficulty": "medium",
-          "estimated_hours": 10,
-          "tech_stack": ["{tech_stack}"], 
-          "learning_outcomes": ["Functional Feature X"],
-          "insider_tip": "Pro tip for this specific component."
-        }}
-      ]
-    }}
-  ],
-  "prerequisites": ["Req 1"],
-  "career_outcomes": ["Portfolio Item"],
-  "tips": ["Deployment tip", "Production Standard Tip"],
-  "faqs": [
-    {{
-      "question": "Common question about this path?",
-      "answer": "Detailed answer."
-    }}
-  ]
-}}
-""",
-        'career': f"""
-You are a Senior Career Coach and Hiring Manager at a FAANG company.
-Your goal is to create a "Blessing-Level" job-ready roadmap for a student aiming to become: "{goal}".
-This roadmap must be so precise and perfect that it feels like a cheat code for getting hired.
-
-**Student Profile:**
-- **Target Role:** {goal}
-- **Current Level:** {current_level}
-- **Timeline:** {duration}
-- **Interests:** {', '.join(interests) if interests else 'General'}
-- **Motivation:** {motivation_style}
-
-**CRITICAL INSTRUCTIONS FOR CAREER ROADMAP:**
-1.  **NO GENERIC ADVICE:** Do not say "Learn React". Say "Master React Hooks (useMemo, useCallback) and Context API".
-2.  **Structure:** Break this down into "Job Ready" stages:
-    - Phase 1: Foundations (The basics everyone needs)
-    - Phase 2: Core Competencies (The skills that get you hired)
-    - Phase 3: Advanced Specialization (What makes you stand out)
-    - Phase 4: Job Hunt Prep (Resume, Portfolio, LeetCode/Interview prep)
-3.  **Milestones:** Competency levels.
-4.  **Projects:** Portfolio pieces that demonstrate the specific skills learned.
-5.  **Format:** Use the "{output_format}" structure.
-
-- **Interview Killers:** Specific, tough interview questions for each stage.
-- **Resume Power Phrases:** How to describe this skill on a resume.
-- **Hidden Gems:** Resources that aren't mainstream but are amazing.
-- **Major Project:** A final "Capstone Project" that combines all skills into a portfolio-worthy application.
-- **FAQs:** 5-7 burning questions students usually have (e.g., "Degree needed?", "Salary expectations?").
-
-**Response Format (Strict JSON):**
-{{
-  "title": "Career Path: {goal}",
-  "overview": "Market-aligned career strategy.",
-  "estimated_duration": "{duration}",
-  "daily_commitment": "e.g. '2 hours/day'",
-  "difficulty_level": "{current_level}",
-  "category": "career",
-  "milestones": [
-    {{
-      "title": "Level 1: [Skill Group]",
-      "description": "Why this skill gets you hired.",
-      "order": 1,
-      "duration": "e.g., 2 weeks",
-      "topics": [
-        {{"title": "Specific Skill 1", "description": "Theory and practice"}}
-      ],
-      "resources": [
-        {{"title": "Hidden Gem Resource", "url": "https://...", "type": "Course"}}
-      ],
-      "projects": [
-        {{
-          "title": "Portfolio Project",
-          "description": "What to build to show this skill.",
-          "difficulty": "medium",
-          "estimated_hours": 20,
-          "tech_stack": ["Tool 1"], 
-          "learning_outcomes": ["Resume Point 1"],
-          "interview_question": "A tough interview question related to this project."
-        }}
-      ]
-    }},
-    {{
-      "title": "Capstone: [Major Project Name]",
-      "description": "Final major project to showcase mastery.",
-      "order": 99,
-      "duration": "e.g., 4 weeks",
-      "topics": [],
-      "resources": [],
-      "projects": [
-        {{
-          "title": "Capstone Project",
-          "description": "Comprehensive project details.",
-          "difficulty": "hard",
-          "estimated_hours": 40,
-          "tech_stack": ["Full Stack"],
-          "learning_outcomes": ["Full System Architecture"],
-          "interview_question": "Walk me through your Capstone architecture."
-        }}
-      ]
-    }}
-  ],
-  "prerequisites": ["Basic Computer Skills"],
-  "career_outcomes": ["Junior Developer", "Freelancer"],
-  "tips": ["Networking tip", "Resume Tip"],
-  "faqs": [
-    {{
-      "question": "Common career question?",
-      "answer": "Detailed answer."
-    }}
-  ]
-}}
-""",
-        'research': f"""
-You are a PhD Research Supervisor and Professor.
-Your goal is to guide a student through a rigorous research process on: "{goal}".
-This roadmap must be so precise and perfect that it feels like a cheat code for publishing a paper.
-
-**Student Profile:**
-- **Research Topic:** {goal}
-- **Domain:** {tech_stack}
-- **Level:** {current_level}
-- **Timeline:** {duration}
-- **Output Format:** {output_format}
-
-**CRITICAL INSTRUCTIONS FOR RESEARCH ROADMAP:**
-1.  **NO GENERIC ADVICE:** Cite specific papers, theories, or methodologies relevant to {goal}.
-2.  **Structure:** Follow the Scientific Method/Academic Process:
-    - Phase 1: Literature Review (Reading key papers, understanding state-of-the-art)
-    - Phase 2: Hypothesis & Methodology (Formulating the problem)
-    - Phase 3: Experimentation/Implementation (Data collection, coding models)
-    - Phase 4: Analysis & Writing (Results, Paper drafting)
-3.  **Milestones:** Research stages.
-4.  **Topics:** Key papers, theories, mathematical concepts.
-5.  **Projects:** Experiments, mini-papers, or presentations.
-
-**ELITE EXTRAS (MUST INCLUDE):**
-- **Seminal Papers:** The "Must-Reads" that defined the field.
-- **SOTA:** The current State-of-the-Art approaches.
-- **Methodology Pitfalls:** Common mistakes in experimental design.
-- **FAQs:** 5-7 common research questions (e.g., "How to find datasets?", "Where to publish?").
-
-**Response Format (Strict JSON):**
-{{
-  "title": "Research Plan: {goal}",
-  "overview": "Academic abstract of the research path.",
-  "estimated_duration": "{duration}",
-  "daily_commitment": "e.g. '4 hours/day'",
-  "difficulty_level": "{current_level}",
-  "category": "research",
-  "milestones": [
-    {{
-      "title": "Stage 1: [Research Stage]",
-      "description": "Academic guidance.",
-      "order": 1,
-      "duration": "e.g., 3 weeks",
-      "topics": [
-        {{"title": "Specific Paper/Theory", "description": "Summary of key concept"}}
-      ],
-      "resources": [
-        {{"title": "Seminal Paper Title", "url": "https://arxiv.org/...", "type": "Paper"}}
-      ],
-      "projects": [
-        {{
-          "title": "Experiment/Review",
-          "description": "Methodology details.",
-          "difficulty": "hard",
-          "estimated_hours": 30,
-          "tech_stack": ["Python", "LaTeX"], 
-          "learning_outcomes": ["Research Finding"],
-          "methodology_tip": "Avoid this common error in analysis."
-        }}
-      ]
-    }}
-  ],
-  "prerequisites": ["Statistics", "Basic Coding"],
-  "career_outcomes": ["Researcher", "PhD Candidate"],
-  "tips": ["Publication tip"],
-  "faqs": [
-    {{
-      "question": "Common research question?",
-      "answer": "Detailed answer."
-    }}
-  ]
-}}
-""",
-        'skill_mastery': f"""
-You are a Master Coach in Deliberate Practice.
-Your goal is to help a student achieve absolute mastery in: "{goal}".
-This roadmap must be so precise and perfect that it feels like a cheat code for mastery.
-
-**Student Profile:**
-- **Skill:** {goal}
-- **Current Level:** {current_level}
-- **Timeline:** {duration}
-- **Motivation:** {motivation_style}
-- **Constraints:** {learning_constraints}
-
-**CRITICAL INSTRUCTIONS FOR SKILL MASTERY ROADMAP:**
-1.  **NO GENERIC ADVICE:** Focus on specific techniques, drills, and nuanced understanding.
-2.  **Structure:** Focus on Depth and Repetition:
-    - Phase 1: Deconstruction (Breaking the skill into smallest parts)
-    - Phase 2: Drill & Repetition (Isolated practice of sub-skills)
-    - Phase 3: Integration (Combining sub-skills)
-    - Phase 4: Mastery & Flow (High-level performance/challenges)
-3.  **Milestones:** Proficiency levels (Novice, Competent, Proficient, Expert).
-4.  **Topics:** Deep dives into nuance and technique.
-5.  **Projects:** "Drills" or "Challenges" rather than traditional projects.
-
-**ELITE EXTRAS (MUST INCLUDE):**
-- **Mental Models:** How experts visualize this concept.
-- **Feedback Loops:** How to self-correct without a teacher.
-- **Drill Sequences:** Specific practice routines.
-- **Major Challenge:** A final "Mastery Challenge" or "Major Project" to prove expertise.
-- **FAQs:** 5-7 common learning questions (e.g., "How long to practice?", "Plateaus?").
-
-**Response Format (Strict JSON):**
-{{
-  "title": "Mastery Path: {goal}",
-  "overview": "Strategy for deep skill acquisition.",
-  "estimated_duration": "{duration}",
-  "daily_commitment": "e.g. '1 hour/day'",
-  "difficulty_level": "{current_level}",
-  "category": "skill_mastery",
-  "milestones": [
-    {{
-      "title": "Level 1: [Sub-skill]",
-      "description": "Technique focus.",
-      "order": 1,
-      "duration": "e.g., 1 week",
-      "topics": [
-        {{"title": "Technique 1", "description": "How to practice"}}
-      ],
-      "resources": [
-        {{"title": "Guide/Video", "url": "https://...", "type": "Tutorial"}}
-      ],
-      "projects": [
-        {{
-          "title": "Drill/Challenge",
-          "description": "Specific exercise instructions.",
-          "difficulty": "hard",
-          "estimated_hours": 5,
-          "tech_stack": ["N/A"], 
-          "learning_outcomes": ["Muscle Memory/Intuition"]
-        }}
-      ]
-    }}
-  ],
-  "prerequisites": ["Discipline"],
-  "career_outcomes": ["Expert", "Specialist"],
-  "tips": ["Focus tip"],
-  "faqs": [
-    {{
-      "question": "Common mastery question?",
-      "answer": "Detailed answer."
-    }}
-  ]
-}}
-"""
-    }
+    Poll ``generate/jobs/<job_id>/`` until the job succeeds; its ``result`` is
+    the roadmap detail payload.
+    """
+    params = roadmap_params(request.data)
+    job = enqueue_roadmap_generation(request.user, params)
+    logger.info("Queued roadmap generation job_id=%s user_id=%s",
+                job.id, request.user.id)
+    return Response({
+        'job_id': str(job.id),
+        'status': job.status,
+        'stage': job.stage,
+        'status_url': f'/api/roadmap/generate/jobs/{job.id}/',
+    }, status=status.HTTP_202_ACCEPTED)
 
-    # Select the specific prompt based on category
-    prompt = prompts.get(category, prompts['career'])
-
-    if not genai or not GenerationConfig or not api_key:
-        return _create_basic_roadmap_response(
-            user=user,
-            goal=goal,
-            duration=duration,
-            current_level=current_level,
-            category=category,
-            tech_stack=tech_stack,
-            output_format=output_format,
-            learning_constraints=learning_constraints,
-            motivation_style=motivation_style,
-            success_definition=success_definition,
-            fallback_reason=ai_unavailable_reason,
-        )
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def roadmap_generation_job_status(request, job_id):
     try:
-        # Call Gemini API with proper error handling
-        # Using Gemini 2.5 Flash Lite - lightweight and cost-effective
-        model = genai.GenerativeModel(
-            'gemini-2.5-flash-lite')  # type: ignore
-        logger.info("Using Gemini model gemini-2.5-flash-lite")
-
-        # Use proper GenerationConfig
-        generation_config = GenerationConfig(
-            temperature=0.7,
-            top_p=0.95,
-            max_output_tokens=8192
-        )
-
-        # Generate content and assign to response variable
-        logger.info("Generating roadmap for user_id=%s category=%s",
-                    user.id, category)
-        response = model.generate_content(
-            prompt, generation_config=generation_config)
-
-        # Safety check: Ensure valid response from AI
-        if not response or not hasattr(response, "text") or not response.text:
-            return Response({
-                "error": "AI did not return a valid response",
-                "details": "The Gemini API returned an empty or invalid response. Please try again."
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # Parse JSON response
-        response_text = response.text.strip()
-
-        # Remove markdown code blocks if present
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0]
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0]
-
-        response_text = response_text.strip()
-
-        # Parse JSON
-        roadmap_data = json.loads(response_text)
-
-        # Validate difficulty_level
-        valid_difficulty = ['beginner', 'intermediate', 'advanced']
-        difficulty = roadmap_data.get('difficulty_level', current_level)
-        if difficulty not in valid_difficulty:
-            difficulty = current_level
-
-        # Create Roadmap in database
-        roadmap = Roadmap.objects.create(
-            user=user,
-            title=roadmap_data.get('title', goal),
-            goal=goal,
-            overview=roadmap_data.get('overview', ''),
-            estimated_duration=roadmap_data.get(
-                'estimated_duration', duration),
-            difficulty_level=difficulty,
-            category=roadmap_data.get('category', category),
-            tech_stack=roadmap_data.get('tech_stack', tech_stack),
-            output_format=roadmap_data.get('output_format', output_format),
-            learning_constraints=roadmap_data.get(
-                'learning_constraints', learning_constraints),
-            motivation_style=roadmap_data.get(
-                'motivation_style', motivation_style),
-            success_definition=roadmap_data.get(
-                'success_definition', success_definition),
-            prerequisites=roadmap_data.get('prerequisites', []),
-            career_outcomes=roadmap_data.get('career_outcomes', []),
-            tips=roadmap_data.get('tips', []),
-            faqs=roadmap_data.get('faqs', [])
-        )
-
-        # type: ignore[attr-defined]
-        # type: ignore[attr-defined]
-
-        # Create Milestones and Projects
-        milestones_data = roadmap_data.get('milestones', [])
-        for idx, milestone_data in enumerate(milestones_data):
-            milestone = Milestone.objects.create(
-                roadmap=roadmap,
-                title=milestone_data.get('title', f'Milestone {idx + 1}'),
-                description=milestone_data.get('description', ''),
-                order=milestone_data.get('order', idx + 1),
-                duration=milestone_data.get('duration', ''),
-                topics=milestone_data.get('topics', []),
-                resources=milestone_data.get('resources', [])
-            )
-
-            # Create projects for this milestone
-            projects_data = milestone_data.get('projects', [])
-            for pidx, project_data in enumerate(projects_data):
-                # Validate project difficulty
-                valid_project_diff = ['easy', 'medium', 'hard']
-                proj_difficulty = project_data.get('difficulty', 'medium')
-                if proj_difficulty not in valid_project_diff:
-                    proj_difficulty = 'medium'
-
-                Project.objects.create(
-                    milestone=milestone,
-                    title=project_data.get('title', f'Project {pidx + 1}'),
-                    description=project_data.get('description', ''),
-                    difficulty=proj_difficulty,
-                    estimated_hours=project_data.get('estimated_hours', 0),
-                    tech_stack=project_data.get('tech_stack', []),
-                    learning_outcomes=project_data.get('learning_outcomes', [])
-                )
-
-        # Auto-generate tasks from roadmap
-        try:
-            from tasks.task_generator import auto_create_tasks_from_roadmap
-            created_tasks = auto_create_tasks_from_roadmap(roadmap)
-            logger.info("Auto-generated %s tasks for roadmap_id=%s",
-                        len(created_tasks), roadmap.id)
-        except Exception as task_error:
-            logger.warning(
-                "Task auto-generation failed for roadmap_id=%s: %s", roadmap.id, task_error)
-            logger.exception(
-                "Task generation failed for roadmap %s", roadmap.id)
-            # Don't fail the whole request if task generation fails
-
-        serializer = RoadmapDetailSerializer(roadmap)
-        return Response({
-            **serializer.data,
-            'tasks_created': True,
-            'tasks_count': len(created_tasks) if 'created_tasks' in locals() else 0
-        }, status=status.HTTP_201_CREATED)
-
-    except json.JSONDecodeError as e:
-        logger.warning("JSON parse error while generating roadmap: %s", e)
-        return _create_basic_roadmap_response(
-            user=user,
-            goal=goal,
-            duration=duration,
-            current_level=current_level,
-            category=category,
-            tech_stack=tech_stack,
-            output_format=output_format,
-            learning_constraints=learning_constraints,
-            motivation_style=motivation_style,
-            success_definition=success_definition,
-            fallback_reason=f"JSON parsing failed: {str(e)}",
-        )
-
-    except Exception as e:
-        logger.exception("Unexpected error during roadmap generation")
-        return _create_basic_roadmap_response(
-            user=user,
-            goal=goal,
-            duration=duration,
-            current_level=current_level,
-            category=category,
-            tech_stack=tech_stack,
-            output_format=output_format,
-            learning_constraints=learning_constraints,
-            motivation_style=motivation_style,
-            success_definition=success_definition,
-            fallback_reason=f"Unexpected generation error: {type(e).__name__}",
-        )
+        job = RoadmapGenerationJob.objects.get(id=job_id, user=request.user)
+    except RoadmapGenerationJob.DoesNotExist:
+        return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+    response = Response(RoadmapGenerationJobSerializer(job).data)
+    if job.status not in (RoadmapGenerationJob.STATUS_SUCCEEDED, RoadmapGenerationJob.STATUS_FAILED):
+        response['Retry-After'] = str(GENERATION_STATUS_RETRY_AFTER_SEC)
+    return response
 
 
 @api_view(['GET'])
@@ -683,6 +102,7 @@ def delete_roadmap(request, roadmap_id):
     try:
         roadmap = Roadmap.objects.get(id=roadmap_id, user=request.user)
         roadmap.delete()
+        invalidate_user_cache(request.user)
         logger.info("Roadmap deleted roadmap_id=%s user_id=%s",
                     roadmap_id, request.user.id)
         return Response({"message": "Roadmap deleted successfully"}, status=status.HTTP_200_OK)
@@ -817,7 +237,7 @@ def schedule_roadmap(request, roadmap_id):
     """
     from datetime import datetime, timedelta
     from django.utils import timezone
-    from scheduler.models import Event
+    from scheduler.models import Event, GoogleCredential
     from tasks.models import Task
 
     try:
@@ -846,19 +266,20 @@ def schedule_roadmap(request, roadmap_id):
             base_minute = 0
 
         # Get all tasks for this roadmap
-        tasks = Task.objects.filter(
-            roadmap=roadmap).order_by('day', 'order_in_day')
+        tasks = list(Task.objects.filter(
+            roadmap=roadmap).order_by('day', 'order_in_day'))
 
-        if not tasks.exists():
+        if not tasks:
             return Response({
                 "error": "No tasks found for this roadmap. Please generate tasks first.",
                 "tasks_found": 0
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        created_events = []
-        scheduled_tasks = []
+        events = []
+        # bulk_update skips auto_now, so stamp updated_at explicitly.
+        now = timezone.now()
 
-        # Schedule each task
+        # Build due dates and calendar events in memory
         for task in tasks:
             # Calculate the actual date for this task based on its day number
             task_day = task.day if isinstance(
@@ -867,7 +288,7 @@ def schedule_roadmap(request, roadmap_id):
 
             # Update task's due_date
             task.due_date = task_date
-            task.save()
+            task.updated_at = now
 
             # Calculate time slots based on order_in_day
             # Start at user-specified time, each task gets a slot based on its estimated minutes
@@ -898,46 +319,18 @@ def schedule_roadmap(request, roadmap_id):
                 start_datetime = naive_start
                 end_datetime = naive_end
 
-            # Create calendar Event for this task
-            event = Event.objects.create(
+            # Calendar Event for this task
+            events.append(Event(
                 user=request.user,
                 title=task.title,
                 description=task.description or f"Task from roadmap: {roadmap.title}",
                 start_time=start_datetime,
                 end_time=end_datetime,
                 linked_task=task,  # Link to navigate from calendar to task
-            )
-
-            created_events.append(event.id)
-
-            scheduled_tasks.append({
-                "id": str(task.task_id),
-                "title": task.title,
-                "due_date": str(task_date),
-                "event_id": event.id
-            })
-
-        # Auto-push to Google Calendar if the user has connected their account
-        google_calendar_synced = False
-        google_calendar_error = None
-        try:
-            from scheduler.google_calendar import GoogleCalendarService
-            gc_service = GoogleCalendarService(request.user)
-            if gc_service.get_service():
-                for ev in Event.objects.filter(id__in=created_events):
-                    gc_service.create_event(
-                        title=ev.title,
-                        start_time=ev.start_time,
-                        end_time=ev.end_time,
-                        description=ev.description or '',
-                    )
-                google_calendar_synced = True
-        except Exception as gc_err:
-            logger.warning("Google Calendar auto-sync failed: %s", gc_err)
-            google_calendar_error = str(gc_err)
+            ))
 
         # Also update milestone dates for reference
-        milestones = roadmap.milestones.all().order_by('order')
+        milestones = list(roadmap.milestones.all().order_by('order'))
         current_date = start_date
 
         for milestone in milestones:
@@ -962,19 +355,51 @@ def schedule_roadmap(request, roadmap_id):
 
             milestone.start_date = current_date
             milestone.end_date = current_date + timedelta(days=days_to_add)
-            milestone.save()
             current_date = milestone.end_date + timedelta(days=1)
 
+        with transaction.atomic():
+            Task.objects.bulk_update(
+                tasks, ['due_date', 'updated_at'], batch_size=SCHEDULE_BATCH_SIZE)
+            events = Event.objects.bulk_create(events, batch_size=SCHEDULE_BATCH_SIZE)
+            Milestone.objects.bulk_update(milestones, ['start_date', 'end_date'])
+        invalidate_user_cache(request.user)
+
+        created_events = [event.id for event in events]
+        scheduled_tasks = [
+            {
+                "id": str(event.linked_task.task_id),
+                "title": event.linked_task.title,
+                "due_date": str(event.linked_task.due_date),
+                "event_id": event.id
+            }
+            for event in events[:10]
+        ]
+
+        # Push to Google Calendar in the background if the user has connected their account
+        google_calendar_synced = False
+        google_calendar_error = None
+        google_calendar_job_id = None
+        if GoogleCredential.objects.filter(user=request.user).exists():
+            try:
+                from scheduler.tasks import enqueue_google_push
+                job = enqueue_google_push(request.user, created_events)
+                google_calendar_job_id = str(job.id)
+            except Exception as gc_err:
+                logger.warning("Google Calendar sync could not be queued: %s", gc_err)
+                google_calendar_error = str(gc_err)
+
         logger.info("Scheduled roadmap roadmap_id=%s user_id=%s events=%s",
                     roadmap_id, request.user.id, len(created_events))
 
         return Response({
             "message": f"Roadmap scheduled successfully! {len(created_events)} tasks added to calendar.",
-            "tasks_scheduled": len(scheduled_tasks),
+            "tasks_scheduled": len(tasks),
             "events_created": len(created_events),
             "google_calendar_synced": google_calendar_synced,
             "google_calendar_error": google_calendar_error,
-            "tasks": scheduled_tasks[:10]  # Return first 10 for confirmation
+            # Poll /api/scheduler/google/sync-jobs/<id>/ for push progress
+            "google_calendar_job_id": google_calendar_job_id,
+            "tasks": scheduled_tasks  # Return first 10 for confirmation
         }, status=status.HTTP_200_OK)
 
     except Roadmap.DoesNotExist:
@@ -987,6 +412,33 @@ def schedule_roadmap(request, roadmap_id):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _roadmap_task_counts(user):
+    """
+    Task counts for all of a user's roadmaps in one grouped query.
+
+    Returns ``{(roadmap_id, milestone_id, status): {'total': n, 'project': m}}``
+    where ``project`` counts only project-tagged tasks.
+    """
+    from tasks.models import Task
+
+    rows = (
+        Task.objects.filter(roadmap__user=user)
+        .order_by()
+        .values('roadmap_id', 'milestone_id', 'status')
+        .annotate(
+            total=Count('task_id'),
+            project=Count('task_id', filter=Q(is_project=True)),
+        )
+    )
+    return {
+        (row['roadmap_id'], row['milestone_id'], row['status']): {
+            'total': row['total'],
+            'project': row['project'],
+        }
+        for row in rows
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_roadmap_projects(request):
@@ -995,42 +447,38 @@ def get_roadmap_projects(request):
     Projects are auto-pulled from roadmap milestones with progress tracking.
     """
     try:
-        from tasks.models import Task
+        user_roadmaps = Roadmap.objects.filter(
+            user=request.user).prefetch_related('milestones__projects')
+        task_counts = _roadmap_task_counts(request.user)
+
+        project_counts = defaultdict(lambda: defaultdict(int))
+        for (roadmap_id, milestone_id, task_status), counts in task_counts.items():
+            project_counts[(roadmap_id, milestone_id)][task_status] += counts['project']
 
-        user_roadmaps = Roadmap.objects.filter(user=request.user)
         all_projects = []
 
         for roadmap in user_roadmaps:
-            milestones = roadmap.milestones.all()
+            for milestone in roadmap.milestones.all():
+                # Progress comes from the milestone's project-tagged tasks.
+                by_status = project_counts.get((roadmap.id, milestone.id), {})
+                total_tasks = sum(by_status.values())
+                completed_tasks = by_status.get('completed', 0)
+                in_progress_tasks = by_status.get('in_progress', 0)
+
+                # Calculate progress percentage
+                progress = 0
+                if total_tasks > 0:
+                    progress = int((completed_tasks / total_tasks) * 100)
+
+                # Determine status
+                if progress == 100:
+                    status_val = 'completed'
+                elif progress > 0 or in_progress_tasks > 0:
+                    status_val = 'in_progress'
+                else:
+                    status_val = 'not_started'
 
-            for milestone in milestones:
                 for project in milestone.projects.all():
-                    # Calculate project progress based on related tasks
-                    project_tasks = Task.objects.filter(
-                        roadmap=roadmap,
-                        milestone=milestone,
-                        tags__contains=['project']
-                    )
-
-                    total_tasks = project_tasks.count()
-                    completed_tasks = project_tasks.filter(
-                        status='completed').count()
-                    in_progress_tasks = project_tasks.filter(
-                        status='in_progress').count()
-
-                    # Calculate progress percentage
-                    progress = 0
-                    if total_tasks > 0:
-                        progress = int((completed_tasks / total_tasks) * 100)
-
-                    # Determine status
-                    if progress == 100:
-                        status_val = 'completed'
-                    elif progress > 0 or in_progress_tasks > 0:
-                        status_val = 'in_progress'
-                    else:
-                        status_val = 'not_started'
-
                     all_projects.append({
                         'id': project.id,
                         'title': project.title,
@@ -1068,19 +516,27 @@ def get_roadmap_progress(request):
     Get progress summary for all user roadmaps.
     """
     try:
-        from tasks.models import Task
+        user_roadmaps = Roadmap.objects.filter(
+            user=request.user).prefetch_related('milestones')
+        task_counts = _roadmap_task_counts(request.user)
+
+        roadmap_totals = defaultdict(lambda: {'total': 0, 'completed': 0})
+        for (roadmap_id, _milestone_id, task_status), counts in task_counts.items():
+            roadmap_totals[roadmap_id]['total'] += counts['total']
+            if task_status == 'completed':
+                roadmap_totals[roadmap_id]['completed'] += counts['total']
 
-        user_roadmaps = Roadmap.objects.filter(user=request.user)
         progress_data = []
 
         for roadmap in user_roadmaps:
-            tasks = Task.objects.filter(roadmap=roadmap)
-            total_tasks = tasks.count()
-            completed_tasks = tasks.filter(status='completed').count()
+            totals = roadmap_totals.get(roadmap.id, {'total': 0, 'completed': 0})
+            total_tasks = totals['total']
+            completed_tasks = totals['completed']
 
             milestones = roadmap.milestones.all()
-            total_milestones = milestones.count()
-            completed_milestones = milestones.filter(is_completed=True).count()
+            total_milestones = len(milestones)
+            completed_milestones = sum(
+                1 for milestone in milestones if milestone.is_completed)
 
             progress = 0
             if total_tasks > 0:
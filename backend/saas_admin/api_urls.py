@@ -8,6 +8,7 @@ urlpatterns = [
     # Dashboard stats
     path('stats/', api_views.stats, name='admin_api_stats'),
     path('analytics/', api_views.analytics, name='admin_api_analytics'),
+    path('cache-metrics/', api_views.cache_metrics, name='admin_api_cache_metrics'),
 
     # Users
     path('users/', api_views.users_list, name='admin_api_users'),
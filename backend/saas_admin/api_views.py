@@ -17,6 +17,8 @@ from users.models import CustomUser
 from subscriptions.models import Subscription
 from billing.models import Payment
 from plans.models import Plan
+from backend import llm_cache
+from users import user_cache
 
 
 def staff_required(fn):
@@ -70,6 +72,18 @@ def stats(request):
     return Response(metrics)
 
 
+@api_view(['GET'])
+@authentication_classes([JWTAuthentication])
+@permission_classes([IsAuthenticated])
+def cache_metrics(request):
+    """Shared-cache hit/miss counters per payload namespace."""
+    if not request.user.is_staff:
+        return Response({'detail': 'Staff access required.'}, status=status.HTTP_403_FORBIDDEN)
+    metrics = user_cache.cache_metrics()
+    metrics['llm_responses'] = llm_cache.cache_metrics()
+    return Response(metrics)
+
+
 @api_view(['GET'])
 @authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
@@ -33,6 +33,8 @@ REDIRECT_URI = (
 )
 PKCE_STATE_SALT = "scheduler.google.pkce"
 PKCE_STATE_MAX_AGE = 600
+# Calendar API batch requests are capped at 50 calls each.
+BATCH_SIZE = 50
 
 
 class GoogleCalendarService:
@@ -193,13 +195,9 @@ class GoogleCalendarService:
         ).execute()
         return events_result.get('items', [])
 
-    def create_event(self, title, start_time, end_time, description=''):
-        """Create a new event"""
-        service = self.get_service()
-        if not service:
-            return None
-
-        event = {
+    @staticmethod
+    def event_body(title, start_time, end_time, description=''):
+        return {
             'summary': title,
             'description': description,
             'start': {
@@ -212,5 +210,56 @@ class GoogleCalendarService:
             },
         }
 
+    def create_event(self, title, start_time, end_time, description=''):
+        """Create a new event"""
+        service = self.get_service()
+        if not service:
+            return None
+
+        event = self.event_body(title, start_time, end_time, description)
         event = service.events().insert(calendarId='primary', body=event).execute()
         return event
+
+    def batch_create_events(self, events, service=None, on_chunk=None):
+        """
+        Insert local ``Event`` rows via the Calendar batch HTTP API.
+
+        The discovery client is built once and requests are sent
+        ``BATCH_SIZE`` at a time. ``on_chunk(results)`` is called after each
+        round trip with ``{event_id: google_event_id or None}`` for that chunk.
+        Returns the merged results for all events.
+        """
+        service = service or self.get_service()
+        if not service:
+            return None
+
+        results = {}
+        events = list(events)
+        for start in range(0, len(events), BATCH_SIZE):
+            chunk = events[start:start + BATCH_SIZE]
+            chunk_results = {}
+
+            def _collect(request_id, response, exception, chunk_results=chunk_results):
+                if exception is not None:
+                    logger.warning(
+                        "Google Calendar insert failed for event=%s user=%s: %s",
+                        request_id, self.user.id, exception,
+                    )
+                    chunk_results[int(request_id)] = None
+                else:
+                    chunk_results[int(request_id)] = response.get('id')
+
+            batch = service.new_batch_http_request(callback=_collect)
+            for event in chunk:
+                body = self.event_body(
+                    event.title, event.start_time, event.end_time, event.description or '')
+                batch.add(
+                    service.events().insert(calendarId='primary', body=body),
+                    request_id=str(event.id),
+                )
+            batch.execute()
+
+            results.update(chunk_results)
+            if on_chunk:
+                on_chunk(chunk_results)
+        return results
@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from .encryption import TokenEncryption
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +17,48 @@ class Event(models.Model):
     is_completed = models.BooleanField(default=False)
     linked_task = models.ForeignKey(
         'tasks.Task', on_delete=models.SET_NULL, null=True, blank=True, related_name='calendar_events')
+    # Set once the event has been pushed to the user's Google Calendar.
+    google_event_id = models.CharField(max_length=255, blank=True, default='')
 
     def __str__(self):
         return f"{self.title} ({self.start_time.strftime('%Y-%m-%d %H:%M')})"
 
 
+class CalendarSyncJob(models.Model):
+    """Background push of local events to Google Calendar, polled by the UI."""
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE, related_name='calendar_sync_jobs')
+    event_ids = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    total_events = models.PositiveIntegerField(default=0)
+    pushed_events = models.PositiveIntegerField(default=0)
+    failed_events = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    celery_task_id = models.CharField(max_length=128, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"CalendarSyncJob({self.id}, status={self.status})"
+
+
 class GoogleCredential(models.Model):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='google_credential')
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Event, GoogleCredential, SpotifyCredential
+from .models import CalendarSyncJob, Event, GoogleCredential, SpotifyCredential
 
 
 class EventSerializer(serializers.ModelSerializer):
@@ -8,6 +8,16 @@ class EventSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class CalendarSyncJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CalendarSyncJob
+        fields = [
+            'id', 'status', 'total_events', 'pushed_events', 'failed_events',
+            'error', 'created_at', 'updated_at', 'completed_at',
+        ]
+        read_only_fields = fields
+
+
 class GoogleCredentialStatusSerializer(serializers.ModelSerializer):
     """
     Safe serializer for Google credential status.
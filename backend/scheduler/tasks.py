@@ -0,0 +1,79 @@
+from celery import shared_task
+from django.db.models import F
+from django.utils import timezone
+
+from scheduler.google_calendar import GoogleCalendarService
+from scheduler.models import CalendarSyncJob, Event
+
+
+def enqueue_google_push(user, event_ids):
+    """Create a sync job for ``event_ids`` and hand it to the worker."""
+    job = CalendarSyncJob.objects.create(
+        user=user,
+        event_ids=list(event_ids),
+        total_events=len(event_ids),
+    )
+    celery_result = push_events_to_google.delay(str(job.id))
+    job.celery_task_id = celery_result.id or ''
+    job.save(update_fields=['celery_task_id', 'updated_at'])
+    return job
+
+
+@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={"max_retries": 2})
+def push_events_to_google(self, job_id: str):
+    job = CalendarSyncJob.objects.select_related('user').get(id=job_id)
+    job.status = CalendarSyncJob.STATUS_RUNNING
+    # Failures are re-counted on retry; successful pushes are kept.
+    job.failed_events = 0
+    job.save(update_fields=['status', 'failed_events', 'updated_at'])
+
+    gc_service = GoogleCalendarService(job.user)
+    service = gc_service.get_service()
+    if not service:
+        job.status = CalendarSyncJob.STATUS_FAILED
+        job.error = 'Google Calendar not connected'
+        job.completed_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'completed_at', 'updated_at'])
+        return {'pushed': 0, 'failed': 0}
+
+    # Events pushed by an earlier (retried) run already carry their Google id.
+    pending = list(
+        Event.objects.filter(id__in=job.event_ids, user=job.user, google_event_id='')
+        .order_by('start_time')
+    )
+    by_id = {event.id: event for event in pending}
+
+    def _record_chunk(chunk_results):
+        pushed = []
+        for event_id, google_id in chunk_results.items():
+            if google_id and event_id in by_id:
+                by_id[event_id].google_event_id = google_id
+                pushed.append(by_id[event_id])
+        if pushed:
+            Event.objects.bulk_update(pushed, ['google_event_id'])
+        CalendarSyncJob.objects.filter(id=job.id).update(
+            pushed_events=F('pushed_events') + len(pushed),
+            failed_events=F('failed_events') + len(chunk_results) - len(pushed),
+            updated_at=timezone.now(),
+        )
+
+    try:
+        gc_service.batch_create_events(pending, service=service, on_chunk=_record_chunk)
+    except Exception as exc:
+        CalendarSyncJob.objects.filter(id=job.id).update(
+            status=CalendarSyncJob.STATUS_FAILED,
+            error=str(exc),
+            updated_at=timezone.now(),
+        )
+        raise
+
+    job.refresh_from_db()
+    if job.failed_events and not job.pushed_events:
+        job.status = CalendarSyncJob.STATUS_FAILED
+        job.error = 'Google Calendar rejected every event'
+    else:
+        job.status = CalendarSyncJob.STATUS_SUCCEEDED
+        job.error = ''
+    job.completed_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'completed_at', 'updated_at'])
+    return {'pushed': job.pushed_events, 'failed': job.failed_events}
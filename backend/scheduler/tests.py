@@ -1,3 +1,157 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from roadmap_ai.models import Milestone, Roadmap
+from scheduler.models import CalendarSyncJob, Event, GoogleCredential
+from scheduler.tasks import push_events_to_google
+from tasks.models import Task
+
+
+class FakeBatch:
+    def __init__(self, callback, fail_ids=()):
+        self.callback = callback
+        self.fail_ids = set(fail_ids)
+        self.request_ids = []
+
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+
+    def execute(self):
+        for request_id in self.request_ids:
+            if request_id in self.fail_ids:
+                self.callback(request_id, None, Exception('rejected'))
+            else:
+                self.callback(request_id, {'id': f'g-{request_id}'}, None)
+
+
+def fake_service(batches, fail_ids=()):
+    service = MagicMock()
+
+    def new_batch(callback):
+        batch = FakeBatch(callback, fail_ids)
+        batches.append(batch)
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch
+    return service
+
+
+class ScheduleRoadmapTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='schedule@example.com',
+            username='schedule_user',
+            password='testpass123',
+        )
+        self.roadmap = Roadmap.objects.create(user=self.user, title='Backend', goal='Ship APIs')
+        Milestone.objects.create(roadmap=self.roadmap, title='M1', order=1, duration='2 weeks')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _create_tasks(self, count):
+        Task.objects.bulk_create([
+            Task(
+                user=self.user,
+                roadmap=self.roadmap,
+                title=f'Day {day}',
+                day=day,
+                due_date=date(2026, 1, 1),
+            )
+            for day in range(1, count + 1)
+        ])
+
+    def _schedule(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                f'/api/roadmap/{self.roadmap.id}/schedule/',
+                {'start_date': '2026-03-01'},
+                format='json',
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.data, len(ctx)
+
+    def test_query_count_does_not_grow_with_task_count(self):
+        self._create_tasks(5)
+        _, baseline = self._schedule()
+
+        Event.objects.all().delete()
+        self._create_tasks(200)
+        data, queries = self._schedule()
+
+        self.assertEqual(data['events_created'], 205)
+        self.assertEqual(Event.objects.filter(user=self.user).count(), 205)
+        self.assertLessEqual(queries, baseline + 2)
+        self.assertEqual(
+            Task.objects.get(roadmap=self.roadmap, title='Day 10', day=10).due_date,
+            date(2026, 3, 10),
+        )
+
+    def test_google_push_is_queued_not_run_inline(self):
+        self._create_tasks(3)
+        GoogleCredential.objects.create(
+            user=self.user, access_token='token', token_uri='uri',
+            client_id='id', client_secret='secret', scopes='calendar')
+
+        with patch('scheduler.tasks.push_events_to_google.delay') as delay:
+            delay.return_value.id = 'celery-1'
+            data, _ = self._schedule()
+
+        job = CalendarSyncJob.objects.get(id=data['google_calendar_job_id'])
+        delay.assert_called_once_with(str(job.id))
+        self.assertEqual(job.total_events, 3)
+        self.assertEqual(job.status, CalendarSyncJob.STATUS_QUEUED)
+
+        response = self.client.get(f'/api/scheduler/google/sync-jobs/{job.id}/')
+        self.assertEqual(response.data['status'], CalendarSyncJob.STATUS_QUEUED)
+
+
+class GooglePushJobTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='push@example.com',
+            username='push_user',
+            password='testpass123',
+        )
+        start = date(2026, 3, 1)
+        self.events = [
+            Event.objects.create(
+                user=self.user, title=f'Event {idx}', start_time=f'{start} 09:00Z',
+                end_time=f'{start} 10:00Z')
+            for idx in range(120)
+        ]
+        self.job = CalendarSyncJob.objects.create(
+            user=self.user,
+            event_ids=[event.id for event in self.events],
+            total_events=len(self.events),
+        )
+
+    def test_push_builds_service_once_and_batches_inserts(self):
+        batches = []
+        failed = str(self.events[0].id)
+        with patch('scheduler.tasks.GoogleCalendarService.get_service',
+                   return_value=fake_service(batches, fail_ids=[failed])) as get_service:
+            push_events_to_google.run(str(self.job.id))
+
+        get_service.assert_called_once()
+        self.assertEqual([len(batch.request_ids) for batch in batches], [50, 50, 20])
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, CalendarSyncJob.STATUS_SUCCEEDED)
+        self.assertEqual(self.job.pushed_events, 119)
+        self.assertEqual(self.job.failed_events, 1)
+        self.assertEqual(Event.objects.exclude(google_event_id='').count(), 119)
+
+    def test_retry_skips_already_pushed_events(self):
+        Event.objects.filter(id__in=self.job.event_ids[:100]).update(google_event_id='done')
+        batches = []
+        with patch('scheduler.tasks.GoogleCalendarService.get_service',
+                   return_value=fake_service(batches)):
+            push_events_to_google.run(str(self.job.id))
 
-# Create your tests here.
+        self.assertEqual(sum(len(batch.request_ids) for batch in batches), 20)
@@ -11,6 +11,7 @@ urlpatterns = [
     path('google/callback/', views.google_callback, name='google_callback'),
     path('google/sync/', views.sync_calendar, name='sync_calendar'),
     path('google/status/', views.google_status, name='google_status'),
+    path('google/sync-jobs/<uuid:job_id>/', views.google_sync_job_status, name='google_sync_job_status'),
 
     # Spotify
     path('spotify/auth-url/', views.spotify_auth_url, name='spotify_auth_url'),
@@ -12,7 +12,7 @@ from rest_framework import status
 from django.core import signing
 import requests
 import logging
-from .models import Event, GoogleCredential
+from .models import CalendarSyncJob, Event, GoogleCredential
 from .google_calendar import GoogleCalendarService, PKCE_STATE_MAX_AGE, PKCE_STATE_SALT
 from .serializers import EventSerializer  # Assuming you have one, or we'll make a simple one inline if needed
 
@@ -199,6 +199,17 @@ def sync_calendar(request):
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def google_sync_job_status(request, job_id):
+    """Progress of a background Google Calendar push."""
+    from .serializers import CalendarSyncJobSerializer
+    try:
+        job = CalendarSyncJob.objects.get(id=job_id, user=request.user)
+    except CalendarSyncJob.DoesNotExist:
+        return Response({"error": "Sync job not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(CalendarSyncJobSerializer(job).data)
+
 # --- Spotify Endpoints ---
 
 from . import spotify
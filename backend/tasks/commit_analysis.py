@@ -0,0 +1,88 @@
+"""
+Commit timing analysis for GitHub proof validation.
+
+``analyze_commit_times`` replaces the old per-timestamp rescan (O(n^2)) with
+one sort and a two-pointer sweep: ``end`` only ever moves forward, so the
+densest 1-hour window of n commits costs O(n log n) in total. The same pass
+over sorted timestamps gives reviewers a few distribution metrics:
+
+* ``commits_per_day``   - sparse per-day histogram (most recent active days)
+* ``longest_gap_hours`` - longest stretch without a commit
+* ``burst_score``       - Gini coefficient of daily commit counts over the
+                          whole span: 0 = the same number of commits every
+                          day, close to 1 = everything landed on one day
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Sequence, Tuple
+
+CONCENTRATION_WINDOW = timedelta(hours=1)
+# Days kept in ``commits_per_day``; older active days are only counted.
+HISTOGRAM_MAX_DAYS = 90
+
+
+def densest_window(timestamps: Sequence[datetime], window: timedelta = CONCENTRATION_WINDOW) -> Tuple[int, int]:
+    """
+    Most commits in any closed interval [t, t + window] over sorted
+    ``timestamps``; returns (count, index of the window's first commit).
+    """
+    best_count, best_start = 0, 0
+    end = 0
+    for start, start_time in enumerate(timestamps):
+        window_end = start_time + window
+        end = max(end, start)
+        while end < len(timestamps) and timestamps[end] <= window_end:
+            end += 1
+        if end - start > best_count:
+            best_count, best_start = end - start, start
+    return best_count, best_start
+
+
+def gini(values: Sequence[int]) -> float:
+    """Gini coefficient of non-negative counts (0 = perfectly even)."""
+    total = sum(values)
+    if not values or total == 0:
+        return 0.0
+    ordered = sorted(values)
+    weighted = sum((index + 1) * value for index, value in enumerate(ordered))
+    count = len(ordered)
+    return (2 * weighted) / (count * total) - (count + 1) / count
+
+
+def analyze_commit_times(timestamps: List[datetime], window: timedelta = CONCENTRATION_WINDOW) -> Dict[str, Any]:
+    """Concentration and distribution metrics for commit ``timestamps`` (any order)."""
+    ordered = sorted(timestamps)
+    total = len(ordered)
+    if not total:
+        return {'total_commits': 0, 'max_in_one_hour': 0, 'concentration': 0.0}
+
+    max_in_window, window_start = densest_window(ordered, window)
+
+    longest_gap, gap_index = timedelta(0), 0
+    for index in range(1, total):
+        gap = ordered[index] - ordered[index - 1]
+        if gap > longest_gap:
+            longest_gap, gap_index = gap, index
+
+    per_day = Counter(timestamp.date() for timestamp in ordered)
+    span_days = (ordered[-1].date() - ordered[0].date()).days + 1
+    daily_counts = list(per_day.values()) + [0] * (span_days - len(per_day))
+    recent_days = sorted(per_day)[-HISTOGRAM_MAX_DAYS:]
+
+    metrics = {
+        'total_commits': total,
+        'max_in_one_hour': max_in_window,
+        'concentration': max_in_window / total,
+        'densest_window_start': ordered[window_start].isoformat(),
+        'first_commit_at': ordered[0].isoformat(),
+        'last_commit_at': ordered[-1].isoformat(),
+        'active_days': len(per_day),
+        'span_days': span_days,
+        'commits_per_day': {day.isoformat(): per_day[day] for day in recent_days},
+        'longest_gap_hours': round(longest_gap.total_seconds() / 3600, 2),
+        'burst_score': round(gini(daily_counts), 3),
+    }
+    if gap_index:
+        metrics['longest_gap_after'] = ordered[gap_index - 1].isoformat()
+    return metrics
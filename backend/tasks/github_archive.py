@@ -0,0 +1,129 @@
+"""
+Keyword search over a repository's source archive.
+
+``required_keywords`` used to be looked up in the README only. Keywords not
+found there are now searched in the files of the commit under validation by
+streaming its tarball (``/repos/{owner}/{repo}/tarball/{sha}``) through
+``tarfile`` in stream mode: nothing is written to disk, at most
+GITHUB_ARCHIVE_MAX_BYTES of compressed data are read, files larger than
+GITHUB_ARCHIVE_MAX_FILE_BYTES or that look binary are skipped, and the
+download is closed as soon as every keyword has been seen.
+
+Results are cached per commit SHA and keyword set, so re-validating the same
+commit costs no request at all.
+"""
+
+import hashlib
+import logging
+import tarfile
+import time
+from typing import Dict, Iterable, Optional, Set
+
+import requests
+from django.core.cache import cache
+
+from .github_snapshot import API_BASE_URL, GitHubRateLimited, _rate_limit_delay, _setting, _token_key, get_session
+
+logger = logging.getLogger(__name__)
+
+BINARY_SNIFF_BYTES = 1024
+# Paths with these components are dependencies or build output, not the user's work.
+SKIPPED_DIRS = {'node_modules', 'vendor', 'dist', 'build', '.git', '__pycache__', '.venv', 'venv'}
+
+
+class ArchiveTooLarge(Exception):
+    pass
+
+
+class _CappedReader:
+    """File-like wrapper that stops a download after ``limit`` bytes."""
+
+    def __init__(self, raw, limit: int):
+        self.raw = raw
+        self.limit = limit
+        self.read_bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size)
+        self.read_bytes += len(chunk)
+        if self.read_bytes > self.limit:
+            raise ArchiveTooLarge(f'archive larger than {self.limit} bytes')
+        return chunk
+
+
+def _skipped(member: tarfile.TarInfo, max_file_bytes: int) -> bool:
+    if not member.isfile() or member.size > max_file_bytes:
+        return True
+    # The first component is GitHub's "<owner>-<repo>-<sha>/" prefix.
+    return any(part in SKIPPED_DIRS for part in member.name.split('/')[1:-1])
+
+
+def _scan_stream(fileobj, keywords: Set[str], max_file_bytes: int, deadline: float) -> Dict[str, object]:
+    remaining = {keyword.lower(): keyword for keyword in keywords}
+    found = set()
+    files_scanned = 0
+    with tarfile.open(fileobj=fileobj, mode='r|gz') as archive:
+        for member in archive:
+            if not remaining or time.monotonic() > deadline:
+                break
+            if _skipped(member, max_file_bytes):
+                continue
+            handle = archive.extractfile(member)
+            data = handle.read() if handle else b''
+            if b'\0' in data[:BINARY_SNIFF_BYTES]:
+                continue
+            files_scanned += 1
+            text = data.decode('utf-8', errors='ignore').lower()
+            for lowered in [k for k in remaining if k in text]:
+                found.add(remaining.pop(lowered))
+    return {'found': found, 'complete': not remaining or time.monotonic() <= deadline,
+            'files_scanned': files_scanned}
+
+
+def _cache_key(owner: str, repo_name: str, sha: str, keywords: Iterable[str], token: Optional[str]) -> str:
+    digest = hashlib.sha256('\n'.join(sorted(k.lower() for k in keywords)).encode()).hexdigest()[:16]
+    return f'github_keywords:{owner.lower()}/{repo_name.lower()}:{sha}:{digest}:{_token_key(token)}'
+
+
+def find_keywords_in_archive(owner: str, repo_name: str, sha: str, keywords: Iterable[str],
+                             token: Optional[str] = None) -> Dict[str, object]:
+    """
+    Which of ``keywords`` (case-insensitive) occur in the files of commit ``sha``.
+
+    Returns ``{'found': [...], 'complete': bool, 'files_scanned': int}``;
+    ``complete`` is False when a size or time cap stopped the scan early.
+    Raises ``GitHubRateLimited`` on a rate limit and ``requests.RequestException``
+    if the archive cannot be downloaded.
+    """
+    keywords = set(keywords)
+    key = _cache_key(owner, repo_name, sha, keywords, token)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    headers = {'Authorization': f'token {token}'} if token else {}
+    max_bytes = _setting('GITHUB_ARCHIVE_MAX_BYTES', 20 * 1024 * 1024)
+    deadline = time.monotonic() + _setting('GITHUB_ARCHIVE_TIMEOUT_SEC', 20)
+    url = f'{API_BASE_URL}/repos/{owner}/{repo_name}/tarball/{sha}'
+    with get_session().get(url, headers=headers, stream=True,
+                           timeout=_setting('GITHUB_API_TIMEOUT_SEC', 10)) as response:
+        retry_after = _rate_limit_delay(response)
+        if retry_after:
+            raise GitHubRateLimited(retry_after)
+        response.raise_for_status()
+        reader = _CappedReader(response.raw, max_bytes)
+        try:
+            result = _scan_stream(reader, keywords, _setting('GITHUB_ARCHIVE_MAX_FILE_BYTES', 1024 * 1024),
+                                  deadline)
+        except ArchiveTooLarge:
+            result = {'found': set(), 'complete': False, 'files_scanned': 0}
+        except (tarfile.TarError, EOFError, OSError) as exc:
+            raise requests.RequestException(f'Unreadable archive: {exc}') from exc
+
+    result['found'] = sorted(result['found'])
+    logger.info('github archive scan %s/%s@%s read=%sB files=%s found=%s/%s complete=%s',
+                owner, repo_name, sha[:7], reader.read_bytes, result['files_scanned'],
+                len(result['found']), len(keywords), result['complete'])
+    if result['complete']:
+        cache.set(key, result, _setting('GITHUB_ETAG_CACHE_TTL_SEC', 60 * 60 * 24))
+    return result
@@ -0,0 +1,389 @@
+"""
+Shared GitHub repository snapshot for task validators.
+
+``GitHubValidator`` used to call the GitHub API once per check, and two checks
+downloaded the same commits page. ``fetch_repo_snapshot`` instead fetches
+what the checks need up front, concurrently, on one keep-alive session:
+
+* ``repo``    - repository metadata
+* ``commits`` - the first page (100) of commits
+* ``tree``    - the recursive git tree of HEAD (every path in the repo), so
+                any number of required files is checked with one request
+* ``readme``  - raw README text, only when keywords are checked
+
+Keywords missing from the README are searched in the repository tarball
+(``tasks.github_archive``).
+
+``fetch_commit_history`` extends the first commits page with the rest of the
+history (up to GITHUB_COMMIT_HISTORY_MAX) when a check needs all of it.
+
+The snapshot is cached for GITHUB_SNAPSHOT_TTL_SEC, so a re-submission of the
+same repo costs nothing. Each response body is also kept with its ETag for
+GITHUB_ETAG_CACHE_TTL_SEC; later fetches send ``If-None-Match``, and GitHub
+answers an unchanged resource with a 304 that does not count against the
+rate limit.
+
+Failures are recorded per resource (HTTP status and error text) rather than
+raised, so each check can report its own error as before. The exception is a
+rate limit: ``GitHubRateLimited`` carries GitHub's reset delay so the caller
+can retry later instead of failing the submission. ``reserve_request_budget``
+keeps the validation workers under a per-token request budget in the first
+place.
+"""
+
+import fnmatch
+import hashlib
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = 'https://api.github.com'
+COMMITS_PER_PAGE = 100
+RAW_MEDIA_TYPE = 'application/vnd.github.v3.raw'
+
+# name -> (path below /repos/{owner}/{repo}, query params, Accept header)
+RESOURCES: Dict[str, Tuple[str, Optional[Dict[str, Any]], Optional[str]]] = {
+    'repo': ('', None, None),
+    'commits': ('/commits', {'per_page': COMMITS_PER_PAGE}, None),
+    'tree': ('/git/trees/HEAD', {'recursive': '1'}, None),
+    'readme': ('/readme', None, RAW_MEDIA_TYPE),
+}
+DEFAULT_RESOURCES = ('repo', 'commits', 'tree')
+
+_LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+_GLOB_CHARS = set('*?[')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class GitHubRateLimited(Exception):
+    """GitHub refused a request for rate-limit reasons; retry after ``retry_after`` seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f'GitHub rate limit, retry in {retry_after}s')
+        self.retry_after = retry_after
+
+
+@dataclass
+class GitHubResource:
+    """One API response: ``status`` is None when the request never completed."""
+    status: Optional[int] = None
+    data: Any = None
+    link: str = ''
+    error: Optional[str] = None
+    retry_after: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 300
+
+
+@dataclass
+class RepoSnapshot:
+    owner: str
+    repo_name: str
+    resources: Dict[str, GitHubResource] = field(default_factory=dict)
+
+    def get(self, name: str) -> GitHubResource:
+        return self.resources.get(name) or GitHubResource(error=f'{name} was not fetched')
+
+    def paths(self) -> set:
+        """Every file and directory path in the repo's HEAD tree."""
+        tree = self.get('tree')
+        if not tree.ok or not isinstance(tree.data, dict):
+            return set()
+        return {item['path'] for item in tree.data.get('tree', []) if item.get('path')}
+
+    def missing_paths(self, required: Iterable[str], token: Optional[str] = None) -> List[str]:
+        """
+        Entries of ``required`` absent from the tree. Glob patterns (``*.py``,
+        ``tests/*``) match any path. GitHub truncates trees beyond 100,000
+        entries; then plain paths not in the partial tree are confirmed with
+        one contents request each, reserved from the request budget first.
+        """
+        available = self.paths()
+        missing = []
+        for pattern in required:
+            path = pattern.strip('/')
+            if _GLOB_CHARS & set(path):
+                found = any(fnmatch.fnmatchcase(candidate, path) for candidate in available)
+            else:
+                found = path in available
+            if not found:
+                missing.append(pattern)
+
+        tree = self.get('tree')
+        if not (missing and tree.ok and isinstance(tree.data, dict) and tree.data.get('truncated')):
+            return missing
+        base_url = f'{API_BASE_URL}/repos/{self.owner}/{self.repo_name}/contents/'
+        specs = {
+            pattern: (base_url + pattern.strip('/'), None, None)
+            for pattern in missing if not _GLOB_CHARS & set(pattern)
+        }
+        found = {}
+        if specs:
+            _reserve_or_raise(token, len(specs))
+            found = _fetch_many(specs, token)
+            _raise_if_rate_limited(found.values())
+        return [pattern for pattern in missing if not (pattern in found and found[pattern].ok)]
+
+    def commit_count_lower_bound(self) -> int:
+        """Commits known to exist from the first page and its ``rel="last"`` link."""
+        commits = self.get('commits')
+        match = _LAST_PAGE_RE.search(commits.link)
+        if match:
+            return (int(match.group(1)) - 1) * COMMITS_PER_PAGE + 1
+        return len(commits.data) if commits.ok and isinstance(commits.data, list) else 0
+
+    def count_commits(self, at_least: int, token: Optional[str] = None) -> int:
+        """
+        Total commits, or a lower bound once it reaches ``at_least``. Only when the
+        first page cannot settle that is there one extra ``per_page=1`` request,
+        whose last page number is the exact count.
+        """
+        count = self.commit_count_lower_bound()
+        if count >= at_least or not _LAST_PAGE_RE.search(self.get('commits').link):
+            return count
+        url = f'{API_BASE_URL}/repos/{self.owner}/{self.repo_name}/commits'
+        _reserve_or_raise(token, 1)
+        resource, _ = fetch(url, {'per_page': 1}, token=token)
+        _raise_if_rate_limited([resource])
+        match = _LAST_PAGE_RE.search(resource.link) if resource.ok else None
+        return int(match.group(1)) if match else count
+
+
+_state_lock = threading.Lock()
+_session = None
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _state_lock:
+            if _session is None:
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(
+                    pool_connections=4, pool_maxsize=_setting('GITHUB_CLIENT_POOL_SIZE', 10)))
+                _session = session
+    return _session
+
+
+def _reset_state():
+    """Drop pooled connections (tests, settings changes)."""
+    global _session
+    with _state_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def _token_key(token: Optional[str]) -> str:
+    # Private repos: responses fetched with one token must not be served to another.
+    return hashlib.sha256(token.encode()).hexdigest()[:16] if token else 'anon'
+
+
+def _snapshot_key(owner: str, repo_name: str, token: Optional[str]) -> str:
+    return f'github_snapshot:{owner.lower()}/{repo_name.lower()}:{_token_key(token)}'
+
+
+def _etag_key(url: str, params, accept, token) -> str:
+    raw = f'{url}|{sorted((params or {}).items())}|{accept}|{_token_key(token)}'
+    return 'github_etag:' + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _rate_limit_delay(response) -> Optional[int]:
+    """Seconds until GitHub accepts requests again, or None if this is not a rate limit."""
+    if response.status_code not in (403, 429):
+        return None
+    headers = response.headers
+    if headers.get('Retry-After', '').isdigit():
+        return max(1, int(headers['Retry-After']))
+    if headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset', '').isdigit():
+        return max(1, int(headers['X-RateLimit-Reset']) - int(time.time()))
+    return None
+
+
+def reserve_request_budget(token: Optional[str], cost: int) -> int:
+    """
+    Take ``cost`` requests from this token's hourly budget (shared by all
+    workers through the cache). Returns 0 if granted, otherwise the seconds
+    until the budget window resets.
+    """
+    if token:
+        limit = _setting('GITHUB_TOKEN_REQUESTS_PER_HOUR', 4000)
+    else:
+        limit = _setting('GITHUB_ANON_REQUESTS_PER_HOUR', 50)
+    now = time.time()
+    window = int(now // 3600)
+    key = f'github_budget:{_token_key(token)}:{window}'
+    cache.add(key, 0, 2 * 3600)
+    try:
+        used = cache.incr(key, cost)
+    except ValueError:  # evicted between add and incr
+        cache.add(key, cost, 2 * 3600)
+        used = cost
+    if used <= limit:
+        return 0
+    return max(1, int((window + 1) * 3600 - now))
+
+
+def _reserve_or_raise(token: Optional[str], cost: int) -> None:
+    """Charge requests only known to be needed mid-validation against the budget."""
+    wait = reserve_request_budget(token, cost)
+    if wait:
+        raise GitHubRateLimited(wait)
+
+
+def _raise_if_rate_limited(resources: Iterable[GitHubResource]) -> None:
+    delays = [resource.retry_after for resource in resources if resource.retry_after]
+    if delays:
+        raise GitHubRateLimited(max(delays))
+
+
+def fetch(url: str, params=None, accept=None, token=None, cached=None) -> Tuple[GitHubResource, Optional[str]]:
+    """
+    GET one API URL, revalidating ``cached`` (an ``(etag, resource)`` pair) if given.
+
+    Returns the resource and the ETag to store for it (None if nothing to store).
+    """
+    headers = {'Accept': accept or 'application/vnd.github+json'}
+    if token:
+        headers['Authorization'] = f'token {token}'
+    if cached:
+        headers['If-None-Match'] = cached[0]
+
+    response = None
+    try:
+        response = get_session().get(
+            url, headers=headers, params=params, timeout=_setting('GITHUB_API_TIMEOUT_SEC', 10))
+        if response.status_code == 304 and cached:
+            return cached[1], None
+        response.raise_for_status()
+        data = response.text if accept == RAW_MEDIA_TYPE else response.json()
+    except (requests.RequestException, ValueError) as exc:
+        if response is None:
+            return GitHubResource(error=str(exc)), None
+        return GitHubResource(
+            status=response.status_code, error=str(exc),
+            retry_after=_rate_limit_delay(response)), None
+
+    resource = GitHubResource(
+        status=response.status_code, data=data, link=response.headers.get('Link', ''))
+    return resource, response.headers.get('ETag')
+
+
+def _fetch_many(specs: Dict[Any, Tuple[str, Optional[Dict[str, Any]], Optional[str]]], token) -> Dict[Any, GitHubResource]:
+    """Fetch ``{name: (url, params, accept)}`` concurrently, revalidating cached ETags."""
+    etag_keys = {name: _etag_key(url, params, accept, token) for name, (url, params, accept) in specs.items()}
+    etags = cache.get_many(list(etag_keys.values()))
+
+    with ThreadPoolExecutor(max_workers=min(len(specs), _setting('GITHUB_CLIENT_POOL_SIZE', 10))) as pool:
+        futures = {
+            name: pool.submit(fetch, url, params, accept, token, etags.get(etag_keys[name]))
+            for name, (url, params, accept) in specs.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+    new_etags = {etag_keys[name]: (etag, resource) for name, (resource, etag) in results.items() if etag}
+    if new_etags:
+        cache.set_many(new_etags, _setting('GITHUB_ETAG_CACHE_TTL_SEC', 60 * 60 * 24))
+    logger.info(
+        'github fetch requests=%s revalidated=%s',
+        len(specs), sum(1 for key in etag_keys.values() if key in etags),
+    )
+    return {name: resource for name, (resource, _) in results.items()}
+
+
+def _store_snapshot(snapshot: RepoSnapshot, token: Optional[str]) -> None:
+    # Failures (rate limits, timeouts) are retried on the next call, not cached.
+    cached_snapshot = RepoSnapshot(snapshot.owner, snapshot.repo_name, {
+        name: resource for name, resource in snapshot.resources.items() if resource.ok})
+    cache.set(
+        _snapshot_key(snapshot.owner, snapshot.repo_name, token),
+        cached_snapshot, _setting('GITHUB_SNAPSHOT_TTL_SEC', 60))
+
+
+def fetch_repo_snapshot(
+    owner: str,
+    repo_name: str,
+    token: Optional[str] = None,
+    resources: Iterable[str] = DEFAULT_RESOURCES,
+) -> RepoSnapshot:
+    """Return a (possibly cached) snapshot holding at least ``resources``."""
+    snapshot = cache.get(_snapshot_key(owner, repo_name, token)) or RepoSnapshot(owner, repo_name)
+    missing = [name for name in resources if name not in snapshot.resources]
+    if not missing:
+        return snapshot
+
+    base_url = f'{API_BASE_URL}/repos/{owner}/{repo_name}'
+    specs = {}
+    for name in missing:
+        path, params, accept = RESOURCES[name]
+        specs[name] = (base_url + path, params, accept)
+    results = _fetch_many(specs, token)
+    snapshot.resources.update(results)
+    _store_snapshot(snapshot, token)
+    _raise_if_rate_limited(results.values())
+    return snapshot
+
+
+def fetch_commit_history(snapshot: RepoSnapshot, token: Optional[str] = None,
+                         max_commits: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Commits newest first, up to ``max_commits`` (GITHUB_COMMIT_HISTORY_MAX),
+    and whether older history was left out.
+
+    Builds on the snapshot's first commits page; the remaining page numbers
+    are known from its ``rel="last"`` link, so they are fetched concurrently,
+    after reserving one budget request per page. A failed page ends the
+    history there; a rate-limited one raises ``GitHubRateLimited``. The result
+    is cached on the snapshot.
+    """
+    max_commits = max_commits or _setting('GITHUB_COMMIT_HISTORY_MAX', 1000)
+    cached = snapshot.resources.get('commit_history')
+    if cached is not None and cached.data['max_commits'] >= max_commits:
+        history = cached.data
+        return history['commits'][:max_commits], history['truncated'] or len(history['commits']) > max_commits
+
+    first = snapshot.get('commits')
+    commits = list(first.data or []) if first.ok else []
+    match = _LAST_PAGE_RE.search(first.link) if first.ok else None
+    last_page = int(match.group(1)) if match else 1
+    wanted_pages = min(last_page, -(-max_commits // COMMITS_PER_PAGE))
+
+    url = f'{API_BASE_URL}/repos/{snapshot.owner}/{snapshot.repo_name}/commits'
+    specs = {
+        page: (url, {'per_page': COMMITS_PER_PAGE, 'page': page}, None)
+        for page in range(2, wanted_pages + 1)
+    }
+    complete = True
+    if specs:
+        _reserve_or_raise(token, len(specs))
+        pages = _fetch_many(specs, token)
+        _raise_if_rate_limited(pages.values())
+        for page in range(2, wanted_pages + 1):
+            if not pages[page].ok:
+                complete = False
+                break
+            commits.extend(pages[page].data or [])
+
+    truncated = not complete or last_page > wanted_pages or len(commits) > max_commits
+    commits = commits[:max_commits]
+    if first.ok and complete:
+        snapshot.resources['commit_history'] = GitHubResource(
+            status=200, data={'commits': commits, 'truncated': truncated, 'max_commits': max_commits})
+        _store_snapshot(snapshot, token)
+    return commits, truncated
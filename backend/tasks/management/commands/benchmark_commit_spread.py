@@ -0,0 +1,73 @@
+"""
+Time the commit spread analysis on synthetic commit histories.
+
+No network or database: timestamps are generated as a few months of steady
+work plus one batch-commit burst, then analysed by the quadratic scan the
+validator used before and by ``analyze_commit_times``:
+
+    python manage.py benchmark_commit_spread --commits 100 1000 10000
+
+The quadratic scan is skipped above ``--legacy-limit`` commits (it takes
+minutes at 10k); pass a larger limit to measure it anyway.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+
+from tasks.commit_analysis import analyze_commit_times
+
+
+def synthetic_timestamps(rng, count, burst_share=0.2):
+    start = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+    burst = int(count * burst_share)
+    steady = [start + timedelta(seconds=rng.uniform(0, 120 * 86400)) for _ in range(count - burst)]
+    burst_at = start + timedelta(days=60)
+    return steady + [burst_at + timedelta(seconds=rng.uniform(0, 3600)) for _ in range(burst)]
+
+
+def legacy_max_in_window(timestamps):
+    """The nested loop GitHubValidator._check_commit_spread used to run."""
+    timestamps = sorted(timestamps)
+    max_in_window = 0
+    for start_time in timestamps:
+        window_end = start_time + timedelta(hours=1)
+        count_in_window = sum(1 for t in timestamps if start_time <= t <= window_end)
+        max_in_window = max(max_in_window, count_in_window)
+    return max_in_window
+
+
+class Command(BaseCommand):
+    help = 'Benchmark commit concentration analysis on synthetic commit histories'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--commits', nargs='+', type=int, default=[100, 1000, 10000])
+        parser.add_argument('--legacy-limit', type=int, default=3000,
+                            help='Largest history to also run the old quadratic scan on')
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        for count in sorted(set(options['commits'])):
+            timestamps = synthetic_timestamps(rng, count)
+
+            started = time.perf_counter()
+            metrics = analyze_commit_times(timestamps)
+            fast_ms = (time.perf_counter() - started) * 1000
+
+            legacy = 'skipped'
+            if count <= options['legacy_limit']:
+                started = time.perf_counter()
+                legacy_max = legacy_max_in_window(timestamps)
+                legacy = f'{(time.perf_counter() - started) * 1000:.1f}ms'
+                if legacy_max != metrics['max_in_one_hour']:
+                    self.stderr.write(f'mismatch: legacy={legacy_max} new={metrics["max_in_one_hour"]}')
+
+            self.stdout.write(
+                f'commits={count:>6}  analyze={fast_ms:.1f}ms  legacy={legacy}  '
+                f'max_in_one_hour={metrics["max_in_one_hour"]}  '
+                f'concentration={metrics["concentration"]:.2f}  '
+                f'burst_score={metrics["burst_score"]:.2f}  '
+                f'longest_gap={metrics["longest_gap_hours"]}h'
+            )
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_is_project(apps, schema_editor):
+    # Filter in Python: JSON containment lookups are not portable across backends.
+    Task = apps.get_model('tasks', 'Task')
+    project_ids = [
+        task_id
+        for task_id, tags in Task.objects.values_list('task_id', 'tags').iterator()
+        if isinstance(tags, list) and 'project' in tags
+    ]
+    for start in range(0, len(project_ids), 500):
+        Task.objects.filter(task_id__in=project_ids[start:start + 500]).update(is_project=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('roadmap_ai', '0012_task'),
+        ('tasks', '0010_rename_tasks_eligi_user_id_8f7e5c_idx_tasks_eligi_user_id_d3624b_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='is_project',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['roadmap', 'is_project', 'milestone'], name='tasks_task_roadmap_209077_idx'),
+        ),
+        migrations.RunPython(backfill_is_project, migrations.RunPython.noop),
+    ]
@@ -6,6 +6,9 @@ from django.utils import timezone
 import uuid
 import hashlib
 
+# Tag that marks a task as part of a milestone project.
+PROJECT_TAG = 'project'
+
 
 class Task(models.Model):
     """
@@ -127,6 +130,9 @@ class Task(models.Model):
     # ============ NOTES & METADATA ============
     notes = models.TextField(blank=True)
     tags = models.JSONField(default=list, blank=True)
+    # Denormalized from ``tags`` on save so project progress can be
+    # aggregated without a JSON containment scan.
+    is_project = models.BooleanField(default=False, editable=False)
     is_revision = models.BooleanField(default=False)
     original_task = models.ForeignKey(
         'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='revision_tasks')
@@ -163,11 +169,24 @@ class Task(models.Model):
             models.Index(fields=['user', 'day']),
             models.Index(fields=['user', 'status']),
             models.Index(fields=['is_core_task']),
+            models.Index(fields=['roadmap', 'is_project', 'milestone']),
         ]
 
     def __str__(self):
         return f"{self.title} (Day {self.day})"
 
+    @staticmethod
+    def tags_mark_project(tags):
+        return isinstance(tags, list) and PROJECT_TAG in tags
+
+    def save(self, *args, **kwargs):
+        """Keep ``is_project`` in step with ``tags``."""
+        self.is_project = self.tags_mark_project(self.tags)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'tags' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'is_project'}
+        super().save(*args, **kwargs)
+
     def mark_complete(self):
         """Mark task as complete and create revision tasks."""
         self.status = 'completed'
@@ -3,7 +3,9 @@ Task serializers with strict validation.
 """
 from rest_framework import serializers
 from django.utils import timezone
-from django.db import DatabaseError
+from django.db import DatabaseError, models
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
 from .models import Task, TaskAttempt, TaskValidator, Note
 from .validators import run_validation
 import hashlib
@@ -102,10 +104,77 @@ class TaskSubmitSerializer(serializers.Serializer):
         return attempt
 
 
+def _fallback_user_status(task):
+    """Status-only derivation used when attempt rows cannot be read."""
+    if task.first_passed_at or task.status == 'completed':
+        return 'COMPLETED'
+    if task.status in {'in_progress', 'pending_validation', 'needs_revision'}:
+        return 'IN_PROGRESS'
+    return 'NOT_STARTED'
+
+
+def prefetch_attempt_stats(tasks, user):
+    """
+    Latest attempt and attempt count per task for ``user`` in one query.
+
+    Returns ``{task_id: (latest_attempt, attempt_count)}``; tasks without
+    attempts are absent. Returns ``None`` if attempts cannot be read (legacy
+    FK type drift), so callers can fall back to status-based values.
+    """
+    task_ids = [task.task_id for task in tasks]
+    if not task_ids:
+        return {}
+
+    rows = (
+        TaskAttempt.objects
+        .filter(user=user, task_id__in=task_ids)
+        .only('attempt_id', 'task_id', 'attempt_number',
+              'validation_status', 'score', 'submitted_at')
+        .annotate(
+            user_attempt_count=Window(
+                expression=Count('attempt_id'),
+                partition_by=[F('task_id')],
+            ),
+            recency_rank=Window(
+                expression=RowNumber(),
+                partition_by=[F('task_id')],
+                order_by=F('submitted_at').desc(),
+            ),
+        )
+        .filter(recency_rank=1)
+    )
+    try:
+        return {row.task_id: (row, row.user_attempt_count) for row in rows}
+    except DatabaseError:
+        return None
+
+
+class TaskListSerializer(serializers.ListSerializer):
+    """
+    Loads attempt stats for the whole page up front so each row's
+    attempt fields are served from memory instead of per-task queries.
+    """
+
+    attempt_stats = None
+
+    def to_representation(self, data):
+        tasks = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            self.attempt_stats = prefetch_attempt_stats(tasks, user)
+
+        return super().to_representation(tasks)
+
+
 class TaskSerializer(serializers.ModelSerializer):
     """
     Complete task serializer with derived status and latest attempt.
     Read-only fields for validation data.
+
+    With ``many=True`` attempt data is batch-loaded by ``TaskListSerializer``;
+    single-object serialization queries the attempts of that one task.
     """
 
     id = serializers.UUIDField(source='task_id', read_only=True)
@@ -117,6 +186,7 @@ class TaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
+        list_serializer_class = TaskListSerializer
         fields = [
             'id', 'task_id', 'title', 'description', 'objective',
             'status', 'user_status', 'day', 'due_date',
@@ -133,38 +203,61 @@ class TaskSerializer(serializers.ModelSerializer):
             'can_attempt', 'can_mark_complete', 'created_at', 'updated_at'
         ]
 
+    def _request_user(self):
+        request = self.context.get('request')
+        if not request or not request.user:
+            return None
+        return request.user
+
+    def _batched_stats(self, obj):
+        """
+        ``(latest_attempt, attempt_count)`` from the list prefetch, ``False``
+        when attempts are unreadable, or ``None`` outside a batched list.
+        """
+        stats = getattr(self.parent, 'attempt_stats', None)
+        if stats is None:
+            if isinstance(self.parent, TaskListSerializer):
+                # Prefetch was skipped or hit a DatabaseError.
+                return False
+            return None
+        return stats.get(obj.task_id, (None, 0))
+
     def get_user_status(self, obj):
         """
         Derive current status from latest attempt.
         Returns: 'COMPLETED', 'IN_PROGRESS', or 'NOT_STARTED'
         """
-        request = self.context.get('request')
-        if not request or not request.user:
+        user = self._request_user()
+        if not user:
             return 'NOT_STARTED'
 
-        if self.context.get('skip_attempt_stats'):
-            if obj.first_passed_at or obj.status == 'completed':
+        stats = self._batched_stats(obj)
+        if stats is False:
+            return _fallback_user_status(obj)
+        if stats is not None:
+            if obj.first_passed_at:
                 return 'COMPLETED'
-            if obj.status in {'in_progress', 'pending_validation', 'needs_revision'}:
-                return 'IN_PROGRESS'
-            return 'NOT_STARTED'
+            return 'IN_PROGRESS' if stats[1] else 'NOT_STARTED'
 
-        return obj.get_user_status(request.user)
+        return obj.get_user_status(user)
 
     def get_latest_attempt(self, obj):
         """Get most recent attempt details."""
-        if self.context.get('skip_attempt_stats'):
-            return None
-
-        request = self.context.get('request')
-        if not request or not request.user:
+        user = self._request_user()
+        if not user:
             return None
 
-        try:
-            attempt = obj.attempts.filter(
-                user=request.user).order_by('-submitted_at').first()
-        except DatabaseError:
+        stats = self._batched_stats(obj)
+        if stats is False:
             return None
+        if stats is not None:
+            attempt = stats[0]
+        else:
+            try:
+                attempt = obj.attempts.filter(
+                    user=user).order_by('-submitted_at').first()
+            except DatabaseError:
+                return None
 
         if attempt:
             return TaskAttemptListSerializer(attempt).data
@@ -172,28 +265,34 @@ class TaskSerializer(serializers.ModelSerializer):
 
     def get_attempt_count(self, obj):
         """Get total attempts by current user."""
-        if self.context.get('skip_attempt_stats'):
+        user = self._request_user()
+        if not user:
             return 0
 
-        request = self.context.get('request')
-        if not request or not request.user:
+        stats = self._batched_stats(obj)
+        if stats is False:
             return 0
+        if stats is not None:
+            return stats[1]
 
         try:
-            return obj.attempts.filter(user=request.user).count()
+            return obj.attempts.filter(user=user).count()
         except DatabaseError:
             return 0
 
     def get_can_attempt(self, obj):
         """Check if user can make another attempt."""
-        if self.context.get('skip_attempt_stats'):
-            return True
-
-        request = self.context.get('request')
-        if not request or not request.user:
+        user = self._request_user()
+        if not user:
             return False
 
-        return obj.can_attempt(request.user)
+        stats = self._batched_stats(obj)
+        if stats is False:
+            return True
+        if stats is not None:
+            return obj.max_attempts is None or stats[1] < obj.max_attempts
+
+        return obj.can_attempt(user)
 
     def get_can_mark_complete(self, obj):
         """True if task can be completed without validation."""
@@ -3,8 +3,11 @@ Task auto-generation logic for roadmaps.
 This module handles creating tasks from roadmap milestones with proper daily breakdown.
 Each multi-day task is split into individual daily tasks with clear objectives.
 """
+from collections import Counter
 from datetime import timedelta
+from django.db import transaction
 from django.utils import timezone
+from users.user_cache import invalidate_user_cache
 from .models import Task
 import re
 
@@ -12,6 +15,8 @@ import re
 # Daily commitment in minutes (configurable)
 DEFAULT_DAILY_COMMITMENT_MINUTES = 60
 
+BULK_BATCH_SIZE = 500
+
 
 def auto_create_tasks_from_roadmap(roadmap):
     """
@@ -21,15 +26,19 @@ def auto_create_tasks_from_roadmap(roadmap):
     CRITICAL: Multi-day tasks are split into individual daily tasks,
     each with its own clear objective and independent completion tracking.
     
+    All tasks are built in memory first and written with a single
+    bulk INSERT, so a long roadmap costs a handful of queries.
+    
     Args:
         roadmap: Roadmap instance
     
     Returns:
         List of created Task instances
     """
-    milestones = roadmap.milestones.all().order_by('order')
+    milestones = roadmap.milestones.all().order_by('order').prefetch_related('projects')
     
-    all_created_tasks = []
+    all_tasks = []
+    day_counters = Counter()
     current_day = 1
     
     # Parse daily commitment from roadmap (e.g., "2 hours/day" -> 120 minutes)
@@ -50,19 +59,34 @@ def auto_create_tasks_from_roadmap(roadmap):
             daily_minutes
         )
         
-        # Create tasks with proper day assignments
-        created_tasks = create_daily_tasks(
+        # Build tasks with proper day assignments
+        all_tasks.extend(build_daily_tasks(
             daily_tasks_data,
             start_day=current_day,
-            roadmap=roadmap
-        )
-        
-        all_created_tasks.extend(created_tasks)
+            roadmap=roadmap,
+            day_counters=day_counters,
+        ))
         
         # Update offset for next milestone
         current_day += milestone_days
     
-    return all_created_tasks
+    return save_tasks(all_tasks)
+
+
+def save_tasks(tasks):
+    """
+    Insert unsaved Task instances in batches inside one transaction.
+
+    bulk_create skips the post_save signals that keep the owners' cached
+    snapshots fresh, so their caches are invalidated here.
+    """
+    if not tasks:
+        return []
+    with transaction.atomic():
+        created = Task.objects.bulk_create(tasks, batch_size=BULK_BATCH_SIZE)
+    for user_id in {task.user_id for task in created}:
+        invalidate_user_cache(user_id)
+    return created
 
 
 def parse_daily_commitment(commitment_str):
@@ -98,39 +122,42 @@ def parse_daily_commitment(commitment_str):
     return DEFAULT_DAILY_COMMITMENT_MINUTES
 
 
-def create_daily_tasks(daily_tasks_data, start_day, roadmap):
+def normalize_title_day(title, actual_day):
+    raw_title = str(title or "").strip()
+    if not raw_title:
+        return raw_title
+
+    # Convert local "Day X:" prefix to absolute day number for consistency in UI.
+    if re.search(r'\bDay\s+\d+\s*:', raw_title, flags=re.IGNORECASE):
+        return re.sub(r'(^.*?\bDay)\s+\d+\s*:', rf'\1 {actual_day}:', raw_title, count=1, flags=re.IGNORECASE)
+
+    return raw_title
+
+
+def build_daily_tasks(daily_tasks_data, start_day, roadmap, day_counters=None):
     """
-    Create individual daily tasks from the generated task data.
+    Build unsaved daily Task instances from the generated task data.
     
     Args:
         daily_tasks_data: List of task dictionaries with day assignments
         start_day: The day number to start from (e.g., Day 1, Day 8)
         roadmap: Roadmap instance
+        day_counters: Optional Counter of tasks already placed per day, shared
+            across milestones so ``order_in_day`` keeps increasing
     
     Returns:
-        List of created Task instances
+        List of unsaved Task instances
     """
-    created_tasks = []
+    if day_counters is None:
+        day_counters = Counter()
     start_date = timezone.now().date()
-    
-    def normalize_title_day(title, actual_day):
-        raw_title = str(title or "").strip()
-        if not raw_title:
-            return raw_title
-
-        # Convert local "Day X:" prefix to absolute day number for consistency in UI.
-        if re.search(r'\bDay\s+\d+\s*:', raw_title, flags=re.IGNORECASE):
-            return re.sub(r'(^.*?\bDay)\s+\d+\s*:', rf'\1 {actual_day}:', raw_title, count=1, flags=re.IGNORECASE)
-
-        return raw_title
+    tasks = []
 
     for task_data in daily_tasks_data:
         actual_day = start_day + task_data.get('day_offset', 0)
-        
-        # Count existing tasks on this day for ordering
-        existing_count = len([t for t in created_tasks if t.day == actual_day])
-        
-        task = Task.objects.create(
+        tags = task_data.get('tags', [])
+
+        tasks.append(Task(
             user=roadmap.user,
             roadmap=roadmap,
             milestone=task_data.get('milestone'),
@@ -138,14 +165,30 @@ def create_daily_tasks(daily_tasks_data, start_day, roadmap):
             description=task_data['description'],
             day=actual_day,
             due_date=start_date + timedelta(days=actual_day - 1),
-            order_in_day=existing_count,
+            order_in_day=day_counters[actual_day],
             estimated_minutes=task_data.get('estimated_minutes', 60),
-            tags=task_data.get('tags', [])
-        )
-        
-        created_tasks.append(task)
+            tags=tags,
+            # bulk_create skips Task.save(), so set the denormalized flag here.
+            is_project=Task.tags_mark_project(tags),
+        ))
+        day_counters[actual_day] += 1
+
+    return tasks
+
+
+def create_daily_tasks(daily_tasks_data, start_day, roadmap):
+    """
+    Create individual daily tasks from the generated task data.
+    
+    Args:
+        daily_tasks_data: List of task dictionaries with day assignments
+        start_day: The day number to start from (e.g., Day 1, Day 8)
+        roadmap: Roadmap instance
     
-    return created_tasks
+    Returns:
+        List of created Task instances
+    """
+    return save_tasks(build_daily_tasks(daily_tasks_data, start_day, roadmap))
 
 
 def calculate_roadmap_days(duration_str):
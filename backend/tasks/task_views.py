@@ -5,18 +5,19 @@ from rest_framework import viewsets, status, views
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.utils import timezone
 from django.utils.dateparse import parse_date
 from django.db.models import Q
 from .models import Task, TaskAttempt, TaskValidator
 from .serializers import (
     TaskSerializer, TaskAttemptDetailSerializer, TaskSubmitSerializer,
-    TaskAttemptListSerializer, OutputEligibilitySerializer
+    TaskAttemptListSerializer, OutputEligibilitySerializer,
+    prefetch_attempt_stats,
 )
-from .validators import run_validation
 from .prevalidation import PreValidator
 from .stagnation import StagnationDetector, apply_difficulty_downgrade, suggest_scope_reduction
-from .explainability import generate_clear_feedback
+from .validation_queue import (
+    ASYNC_VALIDATOR_TYPES, attempt_status_payload, queue_attempt_validation, status_retry_after,
+)
 
 
 class TaskViewSet(viewsets.ReadOnlyModelViewSet):
@@ -76,11 +77,7 @@ class TaskViewSet(viewsets.ReadOnlyModelViewSet):
     def list(self, request, *args, **kwargs):
         """List tasks with lightweight meta for better frontend empty states."""
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(
-            queryset,
-            many=True,
-            context={**self.get_serializer_context(), 'skip_attempt_stats': True}
-        )
+        serializer = self.get_serializer(queryset, many=True)
         tasks_data = serializer.data
 
         selected_status = request.query_params.get('status') or 'all'
@@ -130,6 +127,11 @@ class TaskViewSet(viewsets.ReadOnlyModelViewSet):
         """
         Submit proof for a task.
 
+        GitHub proofs are validated by a worker: the response is 202 with the
+        attempt still PENDING; poll ``status_url`` (honouring ``Retry-After``)
+        until it settles. Other proof types are validated inline and answered
+        with 201.
+
         POST /tasks/{task_id}/submit_attempt/
         Body: {
             "proof_payload": {
@@ -181,51 +183,18 @@ class TaskViewSet(viewsets.ReadOnlyModelViewSet):
             # Store pre-validation result for reviewer
             serializer.validated_data['proof_payload']['_prevalidation'] = prevalidation_result
 
-        # Create attempt
-        attempt = serializer.save()
-
-        # Run validation
-        validation_result = run_validation(
-            task,
-            attempt.proof_payload,
-            task.acceptance_rules,
-            user=request.user,  # Pass user for GitHub username
-            task_started_at=task.created_at  # Pass task creation time
-        )
-
-        # Update attempt with validation results
-        attempt.validator_output = validation_result
-        attempt.validation_status = validation_result.get('status', 'PENDING')
-        attempt.score = validation_result.get('score')
-
-        if attempt.validation_status in ['PASS', 'FAIL']:
-            attempt.validated_at = timezone.now()
-
-        attempt.save()
-
-        # CRITICAL: Update task completion if PASS
-        if attempt.validation_status == 'PASS' and attempt.score >= task.minimum_pass_score:
-            task.update_completion_status(attempt)
+        # Create attempt, then validate it (inline or on the validation queue).
+        # Completion and the explanation are recorded when it settles.
+        attempt = queue_attempt_validation(serializer.save())
 
-        # EXPLAINABILITY LAYER - Generate clear feedback
-        explanation = generate_clear_feedback(
-            validation_status=attempt.validation_status,
-            validator_output=validation_result,
-            proof_type=task.proof_type,
-            prevalidation_result=serializer.validated_data.get(
-                'proof_payload', {}).get('_prevalidation')
+        # Still PENDING unless the queue was unavailable and it ran inline.
+        queued = task.validator_type in ASYNC_VALIDATOR_TYPES and attempt.validation_status == 'PENDING'
+        return Response(
+            attempt_status_payload(attempt),
+            status=status.HTTP_202_ACCEPTED if queued else status.HTTP_201_CREATED,
+            headers=status_retry_after(attempt) if queued else None,
         )
 
-        # Return full attempt details WITH clear explanation
-        response_data = {
-            'attempt': TaskAttemptDetailSerializer(attempt).data,
-            'explanation': explanation,
-            'can_retry': task.can_attempt(request.user),
-            'attempts_remaining': None if task.max_attempts is None else max(0, task.max_attempts - attempt.attempt_number)
-        }
-
-        return Response(response_data, status=status.HTTP_201_CREATED)
-
     @action(detail=True, methods=['patch'])
     def reschedule(self, request, pk=None):
         """
@@ -379,15 +348,13 @@ class TaskViewSet(viewsets.ReadOnlyModelViewSet):
     def failed(self, request):
         """Get all tasks with recent failures (no pass yet)."""
         # Get tasks where user has attempts but no pass yet
-        failed_tasks = []
-        for task in self.get_queryset().filter(first_passed_at__isnull=True):
-            latest_attempt = TaskAttempt.objects.filter(
-                user=request.user,
-                task=task
-            ).order_by('-submitted_at').first()
-
-            if latest_attempt and latest_attempt.validation_status == 'FAIL':
-                failed_tasks.append(task)
+        candidates = list(self.get_queryset().filter(first_passed_at__isnull=True))
+        attempt_stats = prefetch_attempt_stats(candidates, request.user) or {}
+        failed_tasks = [
+            task for task in candidates
+            if task.task_id in attempt_stats
+            and attempt_stats[task.task_id][0].validation_status == 'FAIL'
+        ]
 
         serializer = TaskSerializer(
             failed_tasks, many=True, context={'request': request})
@@ -427,6 +394,15 @@ class TaskAttemptViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = TaskAttemptDetailSerializer(attempts, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'], url_path='status')
+    def validation_status(self, request, pk=None):
+        """
+        Validation state of one attempt with its explanation. Answers at once;
+        while the attempt is PENDING, ``Retry-After`` says when to poll again.
+        """
+        attempt = self.get_object()
+        return Response(attempt_status_payload(attempt), headers=status_retry_after(attempt))
+
     @action(detail=False, methods=['get'])
     def pending(self, request):
         """Get all pending attempts for current user."""
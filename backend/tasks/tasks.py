@@ -0,0 +1,45 @@
+import random
+
+from celery import shared_task
+from django.conf import settings
+
+from tasks.github_snapshot import GitHubRateLimited
+from tasks.models import TaskAttempt
+from tasks.validation_queue import (
+    rate_limited_result,
+    record_validation_result,
+    reserve_github_budget,
+    validate_attempt,
+)
+
+# Spread retries that wait for the same rate-limit reset.
+RETRY_JITTER_SEC = 30
+
+
+def retry_countdown(retry_after: int) -> float:
+    """
+    Delay before retrying a rate-limited validation. Capped so the countdown
+    stays well inside the Redis broker's visibility timeout: an ETA task held
+    past it is redelivered to another worker.
+    """
+    cap = getattr(settings, 'VALIDATION_RETRY_MAX_DELAY_SEC', 900)
+    return min(retry_after, cap) + random.uniform(0, RETRY_JITTER_SEC)
+
+
+# Only GitHub rate limits are retried: any other outcome is a verdict, and
+# record_validation_result settles an attempt once, so a duplicate run is harmless.
+@shared_task(bind=True, max_retries=getattr(settings, 'VALIDATION_MAX_RETRIES', 5))
+def run_attempt_validation(self, attempt_id: str):
+    attempt = TaskAttempt.objects.select_related('task', 'user').filter(pk=attempt_id).first()
+    if attempt is None or attempt.validation_status != 'PENDING':
+        return {'status': attempt.validation_status if attempt else 'MISSING'}
+
+    try:
+        reserve_github_budget(attempt)
+        attempt = validate_attempt(attempt)
+    except GitHubRateLimited as exc:
+        if self.request.retries >= self.max_retries:
+            attempt = record_validation_result(attempt, rate_limited_result(exc.retry_after))
+        else:
+            raise self.retry(exc=exc, countdown=retry_countdown(exc.retry_after))
+    return {'status': attempt.validation_status, 'score': attempt.score}
@@ -1,3 +1,525 @@
-from django.test import TestCase
+import io
+import random
+import tarfile
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest.mock import MagicMock, patch
 
-# Create your tests here.
+import requests
+
+from django.contrib.auth import get_user_model
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from roadmap_ai.models import Roadmap
+from tasks import github_snapshot
+from tasks.commit_analysis import analyze_commit_times, densest_window
+from tasks.github_snapshot import GitHubRateLimited
+from tasks.models import Task, TaskAttempt
+from tasks.tasks import RETRY_JITTER_SEC, run_attempt_validation
+from tasks.validators import GitHubValidator
+
+
+class TaskListAttemptStatsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='attempts@example.com',
+            username='attempts_user',
+            password='testpass123',
+        )
+        self.roadmap = Roadmap.objects.create(user=self.user, title='Backend', goal='Ship APIs')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _create_tasks(self, count, start=1):
+        return [
+            Task.objects.create(
+                user=self.user,
+                roadmap=self.roadmap,
+                title=f'Day {day}',
+                day=day,
+                due_date=date(2026, 1, 1) + timedelta(days=day),
+                max_attempts=2,
+            )
+            for day in range(start, start + count)
+        ]
+
+    def _attempt(self, task, number, status='FAIL'):
+        return TaskAttempt.objects.create(
+            user=self.user,
+            task=task,
+            attempt_number=number,
+            validation_status=status,
+            proof_payload={'repo_url': f'https://github.com/u/r{number}'},
+        )
+
+    def _list(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, 200)
+        return {row['id']: row for row in response.data['tasks']}, len(ctx)
+
+    def test_list_returns_attempt_stats(self):
+        fresh, retried = self._create_tasks(2)
+        self._attempt(retried, 1)
+        latest = self._attempt(retried, 2)
+
+        rows, _ = self._list()
+
+        self.assertEqual(rows[str(fresh.task_id)]['attempt_count'], 0)
+        self.assertIsNone(rows[str(fresh.task_id)]['latest_attempt'])
+        self.assertEqual(rows[str(fresh.task_id)]['user_status'], 'NOT_STARTED')
+        self.assertTrue(rows[str(fresh.task_id)]['can_attempt'])
+
+        retried_row = rows[str(retried.task_id)]
+        self.assertEqual(retried_row['attempt_count'], 2)
+        self.assertEqual(retried_row['latest_attempt']['attempt_id'], str(latest.attempt_id))
+        self.assertEqual(retried_row['user_status'], 'IN_PROGRESS')
+        self.assertFalse(retried_row['can_attempt'])
+
+    def test_list_query_count_is_constant(self):
+        for task in self._create_tasks(3):
+            self._attempt(task, 1)
+        _, baseline = self._list()
+
+        for task in self._create_tasks(20, start=4):
+            self._attempt(task, 1)
+        rows, queries = self._list()
+
+        self.assertEqual(len(rows), 23)
+        self.assertEqual(queries, baseline)
+
+
+class FakeGitHub:
+    """Canned GitHub API responses keyed by URL path; records every request."""
+
+    BASE = 'https://api.github.com/repos/octo/demo'
+
+    def __init__(self, commits=12):
+        start = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+        self.routes = {
+            '': {'private': False, 'fork': False, 'created_at': '2025-01-01T00:00:00Z'},
+            '/commits': [
+                {
+                    'sha': f'{commits - n:040x}',
+                    'author': {'login': 'octo'},
+                    'commit': {'author': {'date': (start + timedelta(days=n)).isoformat()}},
+                }
+                for n in range(commits)
+            ],
+            '/git/trees/HEAD': {'tree': [
+                {'path': 'README.md'}, {'path': 'src'}, {'path': 'src/main.py'}]},
+            '/readme': '# Demo\nA tested function.',
+        }
+        self.etags = {}
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, timeout=None, stream=False):
+        path = url[len(self.BASE):]
+        self.calls.append((path, dict(params or {}), dict(headers or {})))
+        response = MagicMock(headers={'ETag': f'"{path}"'})
+        response.__enter__.return_value = response
+        if path not in self.routes:
+            response.status_code = 404
+            response.raise_for_status.side_effect = requests.HTTPError('404 Not Found')
+            return response
+        if headers and headers.get('If-None-Match') == f'"{path}"':
+            response.status_code = 304
+            return response
+        response.status_code = 200
+        body = self.routes[path]
+        if path == '/commits':
+            per_page = int((params or {}).get('per_page', 30))
+            page = int((params or {}).get('page', 1))
+            last = max(1, -(-len(body) // per_page))
+            body = body[(page - 1) * per_page:page * per_page]
+            if last > 1:
+                response.headers['Link'] = f'<{url}?per_page={per_page}&page={last}>; rel="last"'
+        response.json.return_value = body
+        response.text = body if isinstance(body, str) else ''
+        response.raw = io.BytesIO(body) if isinstance(body, bytes) else None
+        self.last_response = response
+        return response
+
+
+def _tarball(files):
+    """Gzipped tar laid out like GitHub's, under an "<owner>-<repo>-<sha>/" prefix."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as archive:
+        for name, content in files.items():
+            info = tarfile.TarInfo(f'octo-demo-0c/{name}')
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class GitHubSnapshotValidatorTests(TestCase):
+    RULES = {
+        'min_commits': 10,
+        'required_files': ['README.md', 'src/main.py'],
+        'required_keywords': ['function'],
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.github = FakeGitHub()
+        patcher = patch('tasks.github_snapshot.get_session', return_value=self.github)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _validate(self, rules=None, url='https://github.com/octo/demo'):
+        return GitHubValidator(url, 1, rules or self.RULES, authenticated_username='octo').validate()
+
+    def test_all_checks_share_one_fetch_of_each_resource(self):
+        result = self._validate()
+
+        self.assertEqual(result['status'], 'PASS', result)
+        self.assertEqual(result['score'], 100)
+        self.assertEqual(
+            sorted(path for path, _, _ in self.github.calls),
+            ['', '/commits', '/git/trees/HEAD', '/readme'])
+
+    def test_resubmission_within_ttl_makes_no_requests(self):
+        self._validate()
+        self.github.calls.clear()
+
+        self.assertEqual(self._validate()['status'], 'PASS')
+        self.assertEqual(self.github.calls, [])
+
+    def test_expired_snapshot_is_revalidated_with_etags(self):
+        self._validate()
+        cache.delete(github_snapshot._snapshot_key('octo', 'demo', None))
+        self.github.calls.clear()
+
+        result = self._validate()
+
+        self.assertEqual(result['status'], 'PASS')
+        self.assertEqual(len(self.github.calls), 4)
+        self.assertTrue(all('If-None-Match' in headers for _, _, headers in self.github.calls))
+
+    def test_missing_repo_and_files_are_reported(self):
+        result = self._validate(url='https://github.com/octo/missing')
+        self.assertEqual(result['reason'], 'Cannot access repository')
+        self.assertIn('Repository not found', result['errors'])
+
+        result = self._validate(dict(self.RULES, required_files=['main.py']))
+        self.assertFalse(result['checks_performed']['required_files'])
+        self.assertIn('Missing files: main.py', result['errors'])
+
+    def test_rate_limited_response_is_raised_instead_of_failing(self):
+        def limited(url, headers=None, params=None, timeout=None):
+            response = MagicMock(status_code=403, headers={
+                'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(int(time.time()) + 90)})
+            response.raise_for_status.side_effect = requests.HTTPError('403 Forbidden')
+            return response
+
+        self.github.get = limited
+        with self.assertRaises(GitHubRateLimited) as raised:
+            self._validate()
+        self.assertTrue(60 <= raised.exception.retry_after <= 90)
+
+    def test_commit_count_needs_one_extra_request_only_beyond_first_page(self):
+        link = '<{0}/commits?per_page=100&page=2>; rel="next", <{0}/commits?per_page=100&page=3>; rel="last"'
+        original_get = self.github.get
+
+        def paged_get(url, headers=None, params=None, timeout=None):
+            response = original_get(url, headers=headers, params=params, timeout=timeout)
+            if url.endswith('/commits'):
+                last = 250 if (params or {}).get('per_page') == 1 else 3
+                response.headers['Link'] = link.format(self.github.BASE).replace('page=3', f'page={last}')
+            return response
+
+        def count_calls():
+            return [call for call in self.github.calls if call[1].get('per_page') == 1]
+
+        self.github.get = paged_get
+        self.assertTrue(self._validate(dict(self.RULES, min_commits=150))['checks_performed']['min_commits'])
+        self.assertEqual(count_calls(), [])
+
+        cache.clear()
+        self.github.calls.clear()
+        result = self._validate(dict(self.RULES, min_commits=300))
+        self.assertFalse(result['checks_performed']['min_commits'])
+        self.assertIn('Need 300 commits, found 250', result['errors'])
+        self.assertEqual(len(count_calls()), 1)
+
+
+class RepoContentChecksTests(TestCase):
+    HEAD_TARBALL = '/tarball/' + f'{12:040x}'
+
+    def setUp(self):
+        cache.clear()
+        self.github = FakeGitHub()
+        self.github.routes[self.HEAD_TARBALL] = _tarball({
+            'README.md': b'# Demo',
+            'node_modules/lib/index.js': b'pagination',
+            'assets/logo.png': b'\x89PNG\0pagination',
+            'src/main.py': b'def paginate():\n    return Pagination()\n',
+            'src/noise.bin': random.Random(1).randbytes(256 * 1024),
+            'tests/test_main.py': b'assert fixtures',
+        })
+        for target in ('tasks.github_snapshot.get_session', 'tasks.github_archive.get_session'):
+            patcher = patch(target, return_value=self.github)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _validate(self, **rules):
+        return GitHubValidator('https://github.com/octo/demo', 1, rules, authenticated_username='octo').validate()
+
+    def _calls(self, prefix):
+        return [path for path, _, _ in self.github.calls if path.startswith(prefix)]
+
+    def test_file_checks_use_one_tree_request_and_accept_globs(self):
+        result = self._validate(required_files=['README.md', 'src/', '*.py', 'docs/*'])
+
+        self.assertFalse(result['checks_performed']['required_files'])
+        self.assertIn('Missing files: docs/*', result['errors'])
+        self.assertEqual(self._calls('/git/trees'), ['/git/trees/HEAD'])
+        self.assertEqual(self._calls('/contents'), [])
+
+    def test_truncated_tree_falls_back_to_contents_for_absent_paths(self):
+        self.github.routes['/git/trees/HEAD']['truncated'] = True
+        self.github.routes['/contents/docs/guide.md'] = {'type': 'file'}
+
+        with patch('tasks.github_snapshot.reserve_request_budget', return_value=0) as reserve:
+            result = self._validate(required_files=['README.md', 'docs/guide.md', 'docs/api.md'])
+
+        self.assertIn('Missing files: docs/api.md', result['errors'])
+        self.assertEqual(sorted(self._calls('/contents')), ['/contents/docs/api.md', '/contents/docs/guide.md'])
+        reserve.assert_called_once_with(None, 2)
+
+        cache.clear()
+        self.github.calls.clear()
+        with patch('tasks.github_snapshot.reserve_request_budget', return_value=300), \
+                self.assertRaises(GitHubRateLimited):
+            self._validate(required_files=['docs/guide.md'])
+        self.assertEqual(self._calls('/contents'), [])
+
+    def test_keywords_missing_from_readme_are_found_in_source_files(self):
+        result = self._validate(required_keywords=['function', 'Pagination', 'fixtures'])
+
+        self.assertTrue(result['checks_performed']['keywords'], result['errors'])
+        self.assertEqual(self._calls('/tarball'), [self.HEAD_TARBALL])
+
+        cache.delete(github_snapshot._snapshot_key('octo', 'demo', None))
+        self.github.calls.clear()
+        self.assertTrue(self._validate(required_keywords=['fixtures', 'Pagination'])['checks_performed']['keywords'])
+        self.assertEqual(self._calls('/tarball'), [])
+
+    def test_scan_skips_dependencies_and_binaries_and_stops_early(self):
+        result = self._validate(required_keywords=['pagination'])
+        self.assertTrue(result['checks_performed']['keywords'])
+        # Found in src/main.py: the incompressible file after it is never downloaded.
+        self.assertLess(self.github.last_response.raw.tell(), 128 * 1024)
+
+        cache.clear()
+        self.github.routes[self.HEAD_TARBALL] = _tarball({
+            'node_modules/lib/index.js': b'needle', 'logo.png': b'\0needle'})
+        result = self._validate(required_keywords=['needle'])
+        self.assertIn('Missing keywords: needle', result['errors'])
+
+    def test_archive_size_cap_stops_the_scan_with_a_warning(self):
+        with self.settings(GITHUB_ARCHIVE_MAX_BYTES=64 * 1024):
+            result = self._validate(required_keywords=['fixtures'])
+
+        self.assertFalse(result['checks_performed']['keywords'])
+        self.assertIn('Repository too large to search completely for keywords', result['warnings'])
+
+
+class AttemptValidationQueueTests(TestCase):
+    PASS_RESULT = {'status': 'PASS', 'score': 90, 'checks_performed': {}, 'errors': [], 'warnings': []}
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='queue@example.com', username='queue_user', password='testpass123')
+        roadmap = Roadmap.objects.create(user=self.user, title='Backend', goal='Ship APIs')
+        self.task = Task.objects.create(
+            user=self.user, roadmap=roadmap, title='Build an API', day=1,
+            due_date=date(2026, 1, 2), proof_type='GITHUB_REPO', validator_type='AUTO_GITHUB',
+            acceptance_rules={'min_commits': 3},
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _submit(self, task=None, payload=None):
+        task = task or self.task
+        with patch('tasks.tasks.run_attempt_validation.delay') as delay, \
+                patch('tasks.validation_queue.run_validation') as run_validation:
+            response = self.client.post(
+                f'/api/tasks/{task.task_id}/submit_attempt/',
+                {'proof_payload': payload or {'repo_url': 'https://github.com/octo/demo'}},
+                format='json')
+        return response, delay, run_validation
+
+    def _run_worker(self, attempt_id, retries=0, **run_validation):
+        run_attempt_validation.push_request(retries=retries)
+        try:
+            with patch('tasks.validation_queue.run_validation', **run_validation):
+                return run_attempt_validation.run(attempt_id)
+        finally:
+            run_attempt_validation.pop_request()
+
+    def test_github_attempt_is_accepted_pending_and_queued(self):
+        response, delay, run_validation = self._submit()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['attempt']['validation_status'], 'PENDING')
+        attempt_id = response.data['attempt']['attempt_id']
+        delay.assert_called_once_with(str(attempt_id))
+        run_validation.assert_not_called()
+        self.assertEqual(response.data['status_url'], f'/api/attempts/{attempt_id}/status/')
+        self.assertEqual(response['Retry-After'], '2')
+
+        status_response = self.client.get(response.data['status_url'])
+        self.assertEqual(status_response.data['attempt']['validation_status'], 'PENDING')
+        self.assertEqual(status_response['Retry-After'], '2')
+
+    def test_attempt_is_validated_inline_when_the_queue_is_down(self):
+        with patch('tasks.tasks.run_attempt_validation.delay', side_effect=ConnectionError('broker down')), \
+                patch('tasks.validation_queue.run_validation', return_value=self.PASS_RESULT):
+            response = self.client.post(
+                f'/api/tasks/{self.task.task_id}/submit_attempt/',
+                {'proof_payload': {'repo_url': 'https://github.com/octo/demo'}}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['attempt']['validation_status'], 'PASS')
+        self.assertFalse(response.has_header('Retry-After'))
+
+    def test_worker_settles_attempt_once_and_completes_task(self):
+        response, _, _ = self._submit()
+        attempt_id = str(response.data['attempt']['attempt_id'])
+
+        self.assertEqual(self._run_worker(attempt_id, return_value=self.PASS_RESULT)['status'], 'PASS')
+        self._run_worker(attempt_id, return_value=dict(self.PASS_RESULT, status='FAIL', score=0))
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'completed')
+        status_response = self.client.get(f'/api/attempts/{attempt_id}/status/')
+        self.assertEqual(status_response.data['attempt']['validation_status'], 'PASS')
+        self.assertEqual(status_response.data['attempt']['score'], 90)
+        self.assertIn('passed', status_response.data['explanation']['summary'])
+
+    def test_rate_limit_is_retried_and_only_fails_when_retries_run_out(self):
+        response, _, _ = self._submit()
+        attempt_id = str(response.data['attempt']['attempt_id'])
+
+        with patch.object(run_attempt_validation, 'retry', side_effect=Retry()) as retry:
+            with self.assertRaises(Retry):
+                self._run_worker(attempt_id, side_effect=GitHubRateLimited(120))
+        self.assertGreaterEqual(retry.call_args.kwargs['countdown'], 120)
+        self.assertEqual(TaskAttempt.objects.get(pk=attempt_id).validation_status, 'PENDING')
+
+        # A reset an hour away is retried early rather than outliving the broker's visibility timeout.
+        with patch.object(run_attempt_validation, 'retry', side_effect=Retry()) as retry:
+            with self.assertRaises(Retry):
+                self._run_worker(attempt_id, side_effect=GitHubRateLimited(3600))
+        self.assertLessEqual(retry.call_args.kwargs['countdown'], 900 + RETRY_JITTER_SEC)
+
+        result = self._run_worker(
+            attempt_id, retries=run_attempt_validation.max_retries, side_effect=GitHubRateLimited(120))
+        self.assertEqual(result['status'], 'FAIL')
+        self.assertIn('rate limit', TaskAttempt.objects.get(pk=attempt_id).validator_output['reason'])
+
+    @override_settings(GITHUB_ANON_REQUESTS_PER_HOUR=4)
+    def test_request_budget_is_shared_per_token(self):
+        self.assertEqual(github_snapshot.reserve_request_budget(None, 3), 0)
+        self.assertEqual(github_snapshot.reserve_request_budget('token', 3), 0)
+        self.assertGreater(github_snapshot.reserve_request_budget(None, 3), 0)
+
+    def test_quiz_attempt_is_still_graded_inline(self):
+        quiz = Task.objects.create(
+            user=self.user, roadmap=self.task.roadmap, title='Quiz', day=2,
+            due_date=date(2026, 1, 3), proof_type='QUIZ', validator_type='AUTO_QUIZ',
+            acceptance_rules={'answer_key': {'q1': 'yes'}},
+        )
+
+        with patch('tasks.tasks.run_attempt_validation.delay') as delay:
+            response = self.client.post(
+                f'/api/tasks/{quiz.task_id}/submit_attempt/',
+                {'proof_payload': {'answers': {'q1': 'Yes'}}}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['attempt']['validation_status'], 'PASS')
+        delay.assert_not_called()
+
+
+class CommitSpreadTests(TestCase):
+    START = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+
+    def test_sweep_matches_brute_force_and_counts_window_edges(self):
+        rng = random.Random(3)
+        timestamps = sorted(self.START + timedelta(minutes=rng.randint(0, 600)) for _ in range(300))
+        brute = max(
+            sum(1 for other in timestamps if start <= other <= start + timedelta(hours=1))
+            for start in timestamps)
+
+        self.assertEqual(densest_window(timestamps)[0], brute)
+        edge = [self.START, self.START + timedelta(hours=1), self.START + timedelta(hours=1, seconds=1)]
+        self.assertEqual(densest_window(edge), (2, 0))
+
+    def test_distribution_metrics(self):
+        steady = [self.START + timedelta(days=day, hours=10) for day in range(10)]
+        burst = [self.START + timedelta(days=3, minutes=minute) for minute in range(10)]
+
+        even = analyze_commit_times(steady)
+        bursty = analyze_commit_times(steady + burst)
+
+        self.assertEqual(even['burst_score'], 0.0)
+        self.assertEqual(even['longest_gap_hours'], 24.0)
+        self.assertEqual(even['span_days'], 10)
+        self.assertGreater(bursty['burst_score'], 0.3)
+        self.assertEqual(bursty['max_in_one_hour'], 10)
+        self.assertEqual(bursty['commits_per_day']['2026-03-04'], 11)
+        self.assertEqual(analyze_commit_times([])['total_commits'], 0)
+
+    def _validate_spread(self, commits):
+        cache.clear()
+        github = FakeGitHub(commits=commits)
+        with patch('tasks.github_snapshot.get_session', return_value=github):
+            result = GitHubValidator('https://github.com/octo/demo', 1, {}, 'octo').validate()
+        return result['checks_performed']['commit_spread'], github
+
+    def test_spread_check_pages_through_history_up_to_the_cap(self):
+        spread, github = self._validate_spread(250)
+
+        self.assertTrue(spread['passed'])
+        self.assertEqual(spread['total_commits'], 250)
+        self.assertFalse(spread['history_truncated'])
+        self.assertEqual(
+            sorted(params.get('page', 1) for path, params, _ in github.calls if path == '/commits'),
+            [1, 2, 3])
+
+        with self.settings(GITHUB_COMMIT_HISTORY_MAX=200):
+            spread, _ = self._validate_spread(250)
+        self.assertEqual(spread['total_commits'], 200)
+        self.assertTrue(spread['history_truncated'])
+
+    def test_history_pages_are_charged_to_the_budget_and_rate_limits_propagate(self):
+        cache.clear()
+        github = FakeGitHub(commits=250)
+        validator = GitHubValidator('https://github.com/octo/demo', 1, {}, 'octo')
+        with patch('tasks.github_snapshot.get_session', return_value=github), \
+                self.settings(GITHUB_ANON_REQUESTS_PER_HOUR=1), self.assertRaises(GitHubRateLimited):
+            validator.validate()
+        self.assertEqual([params.get('page', 1) for path, params, _ in github.calls if path == '/commits'], [1])
+
+        cache.clear()
+        fake_get = github.get
+
+        def rate_limited_page_3(url, headers=None, params=None, **kwargs):
+            if (params or {}).get('page') == 3:
+                return MagicMock(status_code=403, headers={'Retry-After': '120'}, raise_for_status=MagicMock(
+                    side_effect=requests.HTTPError('403 Forbidden')))
+            return fake_get(url, headers=headers, params=params, **kwargs)
+
+        github.get = rate_limited_page_3
+        validator = GitHubValidator('https://github.com/octo/demo', 1, {}, 'octo')
+        with patch('tasks.github_snapshot.get_session', return_value=github), \
+                self.assertRaises(GitHubRateLimited) as raised:
+            validator.validate()
+        self.assertEqual(raised.exception.retry_after, 120)
@@ -6,6 +6,7 @@ Provides auto-validators and validation logic for task attempts.
 from django.utils import timezone
 from .models import TaskAttempt
 from user_lifecycle.models import LifecycleEvent, EventType
+from users.user_cache import invalidate_user_cache
 import requests
 
 
@@ -226,6 +227,7 @@ def submit_task_attempt(task, user, proof_data):
         task.status = 'completed'
         task.completed_at = timezone.now()
         task.save()
+        invalidate_user_cache(user)
         
         # Create event
         LifecycleEvent.objects.create(
@@ -0,0 +1,136 @@
+"""
+Asynchronous validation of task attempts.
+
+``submit_attempt`` stores the attempt as PENDING and hands it to
+``queue_attempt_validation``. GitHub proofs take several GitHub API calls, so
+they go to the ``validation`` Celery queue and the API answers 202 right away;
+quiz, manual and no-proof attempts are cheap and are settled inline, so their
+response already carries the verdict. If the broker cannot take the job, the
+attempt is validated inline too rather than left PENDING with no worker.
+Clients poll ``status_url`` while the attempt is PENDING; the answer returns
+at once with ``Retry-After`` instead of holding a web worker.
+
+The worker (``tasks.tasks.run_attempt_validation``) first takes the request
+cost from the per-token GitHub budget. When the budget is spent, or GitHub
+answers with a rate limit, the job is retried after the reported reset delay
+instead of failing the user's attempt. ``record_validation_result`` settles an
+attempt exactly once and then runs the completion and explainability steps
+that used to run inside the request.
+"""
+
+import logging
+from typing import Any, Dict
+
+from django.conf import settings
+from django.utils import timezone
+
+from .explainability import generate_clear_feedback
+from .github_snapshot import GitHubRateLimited, reserve_request_budget
+from .models import TaskAttempt
+from .serializers import TaskAttemptDetailSerializer
+from .validators import GitHubValidator, run_validation
+
+logger = logging.getLogger(__name__)
+
+ASYNC_VALIDATOR_TYPES = {'AUTO_GITHUB'}
+
+
+def queue_attempt_validation(attempt: TaskAttempt) -> TaskAttempt:
+    """Validate inline if cheap, otherwise enqueue; returns the attempt as it stands."""
+    if attempt.task.validator_type not in ASYNC_VALIDATOR_TYPES:
+        return validate_attempt(attempt)
+
+    from .tasks import run_attempt_validation
+    try:
+        run_attempt_validation.delay(str(attempt.attempt_id))
+    except Exception:
+        logger.exception("Could not queue validation attempt_id=%s; validating inline",
+                         attempt.attempt_id)
+        try:
+            return validate_attempt(attempt)
+        except GitHubRateLimited as exc:
+            return record_validation_result(attempt, rate_limited_result(exc.retry_after))
+    logger.info("Queued validation attempt_id=%s task_id=%s",
+                attempt.attempt_id, attempt.task.task_id)
+    return attempt
+
+
+def reserve_github_budget(attempt: TaskAttempt) -> None:
+    """Raise ``GitHubRateLimited`` if this attempt's token has no requests left this hour."""
+    rules = attempt.task.acceptance_rules or {}
+    cost = GitHubValidator.request_cost(rules)
+    wait = reserve_request_budget(rules.get('github_token'), cost)
+    if wait:
+        raise GitHubRateLimited(wait)
+
+
+def validate_attempt(attempt: TaskAttempt) -> TaskAttempt:
+    task = attempt.task
+    result = run_validation(
+        task,
+        attempt.proof_payload,
+        task.acceptance_rules,
+        user=attempt.user,  # Pass user for GitHub username
+        task_started_at=task.created_at,  # Pass task creation time
+    )
+    return record_validation_result(attempt, result)
+
+
+def rate_limited_result(retry_after: int) -> Dict[str, Any]:
+    """Verdict for an attempt whose retries all hit GitHub's rate limit."""
+    return {
+        'status': 'FAIL',
+        'score': 0,
+        'reason': 'GitHub rate limit reached while validating',
+        'errors': [f'GitHub is rate limiting validation; try again in {retry_after // 60 + 1} minutes'],
+        'checks_performed': {},
+    }
+
+
+def record_validation_result(attempt: TaskAttempt, result: Dict[str, Any]) -> TaskAttempt:
+    """Store ``result`` on a PENDING attempt, then update completion. No-op if already settled."""
+    task = attempt.task
+    validation_status = result.get('status', 'PENDING')
+    explanation = generate_clear_feedback(
+        validation_status=validation_status,
+        validator_output=result,
+        proof_type=task.proof_type,
+        prevalidation_result=(attempt.proof_payload or {}).get('_prevalidation'),
+    )
+
+    # TaskAttempt.save() refuses to touch validation fields once created; the
+    # PENDING filter makes settling a one-time transition even with duplicate jobs.
+    settled = TaskAttempt.objects.filter(
+        pk=attempt.pk, validation_status='PENDING',
+    ).update(
+        validator_output=dict(result, explanation=explanation),
+        validation_status=validation_status,
+        score=result.get('score'),
+        validated_at=timezone.now() if validation_status in ('PASS', 'FAIL') else None,
+    )
+    attempt.refresh_from_db()
+
+    # CRITICAL: Update task completion if PASS
+    if (settled and attempt.validation_status == 'PASS'
+            and attempt.score is not None and attempt.score >= task.minimum_pass_score):
+        task.update_completion_status(attempt)
+    return attempt
+
+
+def attempt_status_payload(attempt: TaskAttempt) -> Dict[str, Any]:
+    """Response body shared by submit_attempt and the attempt status endpoint."""
+    task = attempt.task
+    return {
+        'attempt': TaskAttemptDetailSerializer(attempt).data,
+        'explanation': (attempt.validator_output or {}).get('explanation'),
+        'can_retry': task.can_attempt(attempt.user),
+        'attempts_remaining': None if task.max_attempts is None else max(0, task.max_attempts - attempt.attempt_number),
+        'status_url': f'/api/attempts/{attempt.attempt_id}/status/',
+    }
+
+
+def status_retry_after(attempt: TaskAttempt) -> Dict[str, str]:
+    """``Retry-After`` header for a still-PENDING attempt, else no headers."""
+    if attempt.validation_status != 'PENDING':
+        return {}
+    return {'Retry-After': str(getattr(settings, 'VALIDATION_STATUS_RETRY_AFTER_SEC', 2))}
@@ -4,11 +4,14 @@ Server-side only validation for strict correctness.
 """
 import re
 import hashlib
-import requests
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timezone as dt_timezone, timedelta
+from datetime import datetime
 from collections import Counter
 
+from .commit_analysis import analyze_commit_times
+from .github_archive import find_keywords_in_archive
+from .github_snapshot import GitHubRateLimited, RepoSnapshot, fetch_commit_history, fetch_repo_snapshot
+
 
 class GitHubValidator:
     """
@@ -18,6 +21,9 @@ class GitHubValidator:
     - Minimum commit count (30% weight)
     - Required files exist (20% weight)
     - Keyword matches in repo (10% weight)
+
+    All checks read one ``RepoSnapshot`` (see ``tasks.github_snapshot``), so a
+    validation costs 2-4 concurrent GitHub requests however many checks run.
     """
 
     def __init__(self, repo_url: str, user_id: int, rules: Dict[str, Any], authenticated_username: Optional[str] = None, task_started_at: Optional[datetime] = None):
@@ -47,6 +53,7 @@ class GitHubValidator:
         self.warnings = []
         self.checks_performed = {}
         self.score = 0
+        self.snapshot: Optional[RepoSnapshot] = None
 
     def validate(self) -> Dict[str, Any]:
         """Run validation and return result."""
@@ -62,6 +69,7 @@ class GitHubValidator:
                 }
 
             # Get repo data
+            self.snapshot = self._fetch_snapshot()
             repo_data = self._get_repo_data()
             if not repo_data or self.errors:
                 return {
@@ -160,6 +168,8 @@ class GitHubValidator:
                 'warnings': self.warnings
             }
 
+        except GitHubRateLimited:
+            raise  # not a verdict on the proof; the caller retries later
         except Exception as e:
             self.errors.append(str(e))
             return {
@@ -182,27 +192,53 @@ class GitHubValidator:
         self.owner, self.repo_name = match.groups()
         return True
 
-    def _get_repo_data(self) -> Dict[str, Any]:
-        """Fetch repository metadata from GitHub API."""
-        url = f"https://api.github.com/repos/{self.owner}/{self.repo_name}"
-        headers = {}
-
-        if self.rules.get('github_token'):
-            headers['Authorization'] = f"token {self.rules['github_token']}"
+    @staticmethod
+    def snapshot_resources(rules: Dict[str, Any]) -> List[str]:
+        """GitHub resources the checks enabled by ``rules`` read (one request each)."""
+        resources = ['repo', 'commits']
+        if rules.get('required_files'):
+            resources.append('tree')
+        if rules.get('required_keywords'):
+            resources.append('readme')
+        return resources
+
+    @classmethod
+    def request_cost(cls, rules: Dict[str, Any]) -> int:
+        """
+        GitHub API requests a fresh validation under ``rules`` makes up front.
+        Requests whose number is only known mid-validation (commit history
+        pages, the exact commit count, contents lookups in a truncated tree)
+        are reserved when they are made.
+        """
+        # Keywords not in the README add one tarball request.
+        return len(cls.snapshot_resources(rules)) + (1 if rules.get('required_keywords') else 0)
+
+    def _fetch_snapshot(self) -> RepoSnapshot:
+        """Fetch everything the enabled checks need in one concurrent round."""
+        return fetch_repo_snapshot(
+            self.owner, self.repo_name, self.rules.get('github_token'),
+            self.snapshot_resources(self.rules))
+
+    def _commits(self) -> List[Dict[str, Any]]:
+        """First page of commits from the snapshot; raises if it could not be fetched."""
+        commits = self.snapshot.get('commits')
+        if not commits.ok:
+            raise ValueError(commits.error)
+        return commits.data or []
 
-        try:
-            response = requests.get(url, headers=headers, timeout=5)
-            if response.status_code == 404:
-                self.errors.append("Repository not found")
-                return {}
-            if response.status_code == 403:
-                self.errors.append("Rate limited or forbidden")
-                return {}
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            self.errors.append(f"GitHub API error: {str(e)}")
+    def _get_repo_data(self) -> Dict[str, Any]:
+        """Repository metadata from the snapshot."""
+        repo = self.snapshot.get('repo')
+        if repo.status == 404:
+            self.errors.append("Repository not found")
+            return {}
+        if repo.status == 403:
+            self.errors.append("Rate limited or forbidden")
             return {}
+        if not repo.ok:
+            self.errors.append(f"GitHub API error: {repo.error}")
+            return {}
+        return repo.data
 
     def _check_public(self, repo_data: Dict[str, Any]) -> bool:
         """Verify repository is public."""
@@ -215,25 +251,10 @@ class GitHubValidator:
         """Check if repo has minimum commits."""
         min_commits = self.rules.get('min_commits', 1)
 
-        # Get commit count
-        url = f"https://api.github.com/repos/{self.owner}/{self.repo_name}/commits"
-        headers = {}
-
-        if self.rules.get('github_token'):
-            headers['Authorization'] = f"token {self.rules['github_token']}"
-
         try:
-            response = requests.get(url, headers=headers, params={
-                                    'per_page': 1}, timeout=5)
-            response.raise_for_status()
-
-            # Get total count from Link header
-            link_header = response.headers.get('Link', '')
-            if 'last' in link_header:
-                match = re.search(r'page=(\d+)[^0-9]', link_header)
-                commit_count = int(match.group(1)) if match else 1
-            else:
-                commit_count = len(response.json()) if response.json() else 0
+            self._commits()  # surfaces a failed commits fetch
+            commit_count = self.snapshot.count_commits(
+                min_commits, self.rules.get('github_token'))
 
             has_commits = commit_count >= min_commits
             if not has_commits:
@@ -241,6 +262,8 @@ class GitHubValidator:
                     f"Need {min_commits} commits, found {commit_count}")
             return has_commits
 
+        except GitHubRateLimited:
+            raise
         except Exception as e:
             self.errors.append(f"Cannot check commits: {str(e)}")
             return False
@@ -251,65 +274,52 @@ class GitHubValidator:
         if not required_files:
             return True
 
-        url = f"https://api.github.com/repos/{self.owner}/{self.repo_name}/contents"
-        headers = {}
-
-        if self.rules.get('github_token'):
-            headers['Authorization'] = f"token {self.rules['github_token']}"
-
         try:
-            response = requests.get(url, headers=headers, timeout=5)
-            response.raise_for_status()
-
-            repo_contents = response.json()
-            available_files = {
-                item['name'] for item in repo_contents if isinstance(repo_contents, list)}
-
-            missing = []
-            for required_file in required_files:
-                if required_file not in available_files:
-                    missing.append(required_file)
+            tree = self.snapshot.get('tree')
+            if not tree.ok:
+                raise ValueError(tree.error)
+            missing = self.snapshot.missing_paths(required_files, self.rules.get('github_token'))
 
             if missing:
                 self.errors.append(f"Missing files: {', '.join(missing)}")
                 return False
             return True
 
+        except GitHubRateLimited:
+            raise
         except Exception as e:
             self.errors.append(f"Cannot check files: {str(e)}")
             return False
 
     def _check_keywords(self) -> bool:
-        """Check if repo description/README contains keywords."""
+        """Check if the README, or failing that any file of the latest commit, contains keywords."""
         required_keywords = self.rules.get('required_keywords', [])
         if not required_keywords:
             return True
 
-        # Check repo description
-        url = f"https://api.github.com/repos/{self.owner}/{self.repo_name}/readme"
-        headers = {'Accept': 'application/vnd.github.v3.raw'}
-
-        if self.rules.get('github_token'):
-            headers['Authorization'] = f"token {self.rules['github_token']}"
-
         try:
-            response = requests.get(url, headers=headers, timeout=5)
-            readme_content = response.text if response.status_code == 200 else ""
+            readme = self.snapshot.get('readme')
+            readme_content = readme.data if readme.ok and isinstance(readme.data, str) else ""
 
             content_to_search = readme_content.lower()
+            missing = [k for k in required_keywords if k.lower() not in content_to_search]
+
+            commits = self._commits() if missing else []
+            if commits and commits[0].get('sha'):
+                scan = find_keywords_in_archive(
+                    self.owner, self.repo_name, commits[0]['sha'], missing,
+                    self.rules.get('github_token'))
+                found = {k.lower() for k in scan['found']}
+                missing = [k for k in missing if k.lower() not in found]
+                if missing and not scan['complete']:
+                    self.warnings.append("Repository too large to search completely for keywords")
 
-            found_keywords = []
-            for keyword in required_keywords:
-                if keyword.lower() in content_to_search:
-                    found_keywords.append(keyword)
-
-            has_keywords = len(found_keywords) >= len(required_keywords)
-            if not has_keywords:
-                missing = [
-                    k for k in required_keywords if k not in found_keywords]
+            if missing:
                 self.errors.append(f"Missing keywords: {', '.join(missing)}")
-            return has_keywords
+            return not missing
 
+        except GitHubRateLimited:
+            raise
         except Exception as e:
             self.errors.append(f"Cannot check keywords: {str(e)}")
             return False
@@ -395,17 +405,8 @@ class GitHubValidator:
         if not require_match:
             return {'passed': True, 'reason': 'Author matching not required'}
 
-        # Fetch commits with author info
-        url = f"https://api.github.com/repos/{self.owner}/{self.repo_name}/commits"
-        headers = {}
-        if self.rules.get('github_token'):
-            headers['Authorization'] = f"token {self.rules['github_token']}"
-
         try:
-            response = requests.get(url, headers=headers, params={
-                                    'per_page': 100}, timeout=10)
-            response.raise_for_status()
-            commits = response.json()
+            commits = self._commits()
 
             if not commits:
                 return {'passed': True, 'reason': 'No commits to check'}
@@ -451,17 +452,10 @@ class GitHubValidator:
         """Check commit time distribution to detect gaming (batch commits)."""
         max_concentration = self.rules.get('max_commit_concentration', 0.7)
 
-        # Fetch commits with timestamps
-        url = f"https://api.github.com/repos/{self.owner}/{self.repo_name}/commits"
-        headers = {}
-        if self.rules.get('github_token'):
-            headers['Authorization'] = f"token {self.rules['github_token']}"
-
         try:
-            response = requests.get(url, headers=headers, params={
-                                    'per_page': 100}, timeout=10)
-            response.raise_for_status()
-            commits = response.json()
+            self._commits()  # surfaces a failed commits fetch
+            commits, truncated = fetch_commit_history(
+                self.snapshot, self.rules.get('github_token'))
 
             if len(commits) < 5:
                 # Too few commits to meaningfully analyze spread
@@ -480,20 +474,10 @@ class GitHubValidator:
             if len(timestamps) < 5:
                 return {'passed': True, 'reason': 'Insufficient timestamp data'}
 
-            # Check for suspicious concentration
-            timestamps.sort()
-            total_commits = len(timestamps)
-
-            # Sliding 1-hour window
-            max_in_window = 0
-            for i, start_time in enumerate(timestamps):
-                window_end = start_time.replace(
-                    tzinfo=dt_timezone.utc) + timedelta(hours=1)
-                count_in_window = sum(
-                    1 for t in timestamps if start_time <= t <= window_end)
-                max_in_window = max(max_in_window, count_in_window)
-
-            concentration = max_in_window / total_commits
+            # Check for suspicious concentration (densest 1-hour window)
+            metrics = analyze_commit_times(timestamps)
+            metrics['history_truncated'] = truncated
+            concentration = metrics['concentration']
 
             if concentration > max_concentration:
                 self.warnings.append(
@@ -503,16 +487,13 @@ class GitHubValidator:
                 return {
                     'passed': False,
                     'reason': f'Suspicious commit concentration: {concentration*100:.1f}%',
-                    'max_in_one_hour': max_in_window,
-                    'total_commits': total_commits
+                    **metrics,
                 }
 
-            return {
-                'passed': True,
-                'concentration': concentration,
-                'max_in_one_hour': max_in_window
-            }
+            return {'passed': True, **metrics}
 
+        except GitHubRateLimited:
+            raise
         except Exception as e:
             # Don't fail validation if we can't check spread - just warn
             self.warnings.append(f"Cannot analyze commit spread: {str(e)}")
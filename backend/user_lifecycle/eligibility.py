@@ -3,7 +3,8 @@ Eligibility evaluation logic for OUTPUT_ELIGIBLE gate.
 """
 
 from django.utils import timezone
-from tasks.models import Task, TaskAttempt
+from tasks.models import TaskAttempt
+from users.progress_summary import UserProgressSummary
 
 
 def evaluate_eligibility(user):
@@ -23,9 +24,9 @@ def evaluate_eligibility(user):
             'details': dict
         }
     """
-    # Get user's tasks
-    tasks = Task.objects.filter(user=user, roadmap__isnull=False)
-    total_tasks = tasks.count()
+    # Get user's tasks (every roadmap task carries a roadmap FK)
+    task_counts = UserProgressSummary(user).tasks
+    total_tasks = task_counts.total
     
     if total_tasks == 0:
         return {
@@ -39,8 +40,8 @@ def evaluate_eligibility(user):
         }
     
     # Check completed tasks
-    completed_tasks = tasks.filter(status='completed').count()
-    completion_rate = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
+    completed_tasks = task_counts.completed
+    completion_rate = task_counts.completion_rate
     
     # Check pending validations
     pending_attempts = TaskAttempt.objects.filter(
@@ -1,5 +1,6 @@
 import logging
 
+from .user_cache import invalidate_user_cache
 from .utils import update_streak
 
 logger = logging.getLogger(__name__)
@@ -9,6 +10,8 @@ def record_activity(user, activity_type="generic"):
     """
     Central activity pipeline.
     Use this instead of calling update_streak directly.
+    Also drops the user's cached dashboard payloads, since every recorded
+    activity (task completion, ATS scan, ...) moves streak/XP counters.
     """
     try:
         update_streak(user, activity_type)
@@ -16,3 +19,4 @@ def record_activity(user, activity_type="generic"):
         logger.exception(
             "Failed to record activity for user %s", getattr(user, "id", None)
         )
+    invalidate_user_cache(user)
@@ -0,0 +1,159 @@
+"""
+Shared per-user progress counters.
+
+Dashboard stats, profile statistics, the assistant backend context and the
+eligibility gate all need the same task / roadmap / milestone / execution
+numbers. ``UserProgressSummary`` computes them with conditional aggregation
+(one grouped query per table) and caches each section on first access, so a
+caller only pays for the sections it reads and never for per-roadmap loops.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import cached_property
+from typing import Dict
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from dashboard.models import ExecutionTask
+from roadmap_ai.models import Roadmap
+from tasks.models import Task
+
+
+@dataclass(frozen=True)
+class TaskCounts:
+    total: int = 0
+    completed: int = 0
+    in_progress: int = 0
+    not_started: int = 0
+    pending_validation: int = 0
+    needs_revision: int = 0
+    completed_minutes: int = 0
+    weekly_completed: int = 0
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.completed
+
+    @property
+    def completion_rate(self) -> float:
+        return (self.completed / self.total * 100) if self.total > 0 else 0
+
+    @property
+    def avg_completed_minutes(self) -> float:
+        return (self.completed_minutes / self.completed) if self.completed > 0 else 0
+
+    def __add__(self, other: "TaskCounts") -> "TaskCounts":
+        return TaskCounts(**{
+            name: getattr(self, name) + getattr(other, name)
+            for name in self.__dataclass_fields__
+        })
+
+
+@dataclass(frozen=True)
+class RoadmapCounts:
+    roadmap_id: int
+    total_milestones: int = 0
+    completed_milestones: int = 0
+
+
+@dataclass(frozen=True)
+class ExecutionCounts:
+    total: int = 0
+    completed: int = 0
+    pending: int = 0
+    weekly_completed: int = 0
+
+
+class UserProgressSummary:
+    """Lazily aggregated counters for one user; each section costs one query."""
+
+    def __init__(self, user, now=None):
+        self.user = user
+        self.now = now or timezone.now()
+
+    @cached_property
+    def tasks_by_roadmap(self) -> Dict[int, TaskCounts]:
+        week_ago = self.now - timedelta(days=7)
+        completed = Q(status='completed')
+        rows = (
+            Task.objects.filter(user=self.user)
+            .order_by()
+            .values('roadmap_id')
+            .annotate(
+                total=Count('task_id'),
+                completed=Count('task_id', filter=completed),
+                in_progress=Count('task_id', filter=Q(status='in_progress')),
+                not_started=Count('task_id', filter=Q(status='not_started')),
+                pending_validation=Count('task_id', filter=Q(status='pending_validation')),
+                needs_revision=Count('task_id', filter=Q(status='needs_revision')),
+                completed_minutes=Sum('actual_minutes', filter=completed),
+                weekly_completed=Count(
+                    'task_id', filter=completed & Q(completed_at__gte=week_ago)),
+            )
+        )
+        return {
+            row.pop('roadmap_id'): TaskCounts(**{
+                key: int(value or 0) for key, value in row.items()
+            })
+            for row in rows
+        }
+
+    @cached_property
+    def tasks(self) -> TaskCounts:
+        return sum(self.tasks_by_roadmap.values(), TaskCounts())
+
+    @cached_property
+    def roadmaps(self) -> Dict[int, RoadmapCounts]:
+        rows = (
+            Roadmap.objects.filter(user=self.user)
+            .order_by()
+            .values('id')
+            .annotate(
+                total_milestones=Count('milestones'),
+                completed_milestones=Count(
+                    'milestones', filter=Q(milestones__is_completed=True)),
+            )
+        )
+        return {
+            row['id']: RoadmapCounts(
+                roadmap_id=row['id'],
+                total_milestones=int(row['total_milestones'] or 0),
+                completed_milestones=int(row['completed_milestones'] or 0),
+            )
+            for row in rows
+        }
+
+    def roadmap(self, roadmap_id) -> RoadmapCounts:
+        return self.roadmaps.get(roadmap_id) or RoadmapCounts(roadmap_id=roadmap_id)
+
+    def roadmap_tasks(self, roadmap_id) -> TaskCounts:
+        return self.tasks_by_roadmap.get(roadmap_id) or TaskCounts()
+
+    @property
+    def total_roadmaps(self) -> int:
+        return len(self.roadmaps)
+
+    @property
+    def total_milestones(self) -> int:
+        return sum(item.total_milestones for item in self.roadmaps.values())
+
+    @property
+    def completed_milestones(self) -> int:
+        return sum(item.completed_milestones for item in self.roadmaps.values())
+
+    @cached_property
+    def execution(self) -> ExecutionCounts:
+        week_start = timezone.localdate(self.now) - timedelta(days=6)
+        completed = Q(status='completed')
+        totals = ExecutionTask.objects.filter(user=self.user).aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=completed),
+            pending=Count('id', filter=Q(status__in=['pending', 'in_progress'])),
+            weekly_completed=Count(
+                'id', filter=completed & Q(completed_at__date__gte=week_start)),
+        )
+        return ExecutionCounts(**{
+            key: int(value or 0) for key, value in totals.items()
+        })
@@ -1,15 +1,16 @@
-from django.db.models import Count, Q, Avg, Sum
+from django.db.models import Count
 from datetime import datetime, timedelta
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.core.cache import cache
 
 from .models import CustomUser
 from tasks.models import Task
-from roadmap_ai.models import Roadmap, Milestone
+from roadmap_ai.models import Roadmap
+from .progress_summary import UserProgressSummary
+from .user_cache import get_or_compute
 
 
 @api_view(['GET'])
@@ -19,46 +20,48 @@ def get_user_statistics(request):
     Get comprehensive user statistics for profile dashboard.
     Returns task completion metrics, roadmap progress, streaks, skills, and activity data.
     """
-    user = request.user
+    response_data = get_or_compute(
+        "user_statistics",
+        request.user,
+        lambda: _compute_user_statistics(request.user),
+    )
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
+def _compute_user_statistics(user):
+    summary = UserProgressSummary(user)
 
-    cache_key = f"user_statistics:{user.id}"
-    cached = cache.get(cache_key)
-    if cached:
-        return Response(cached, status=status.HTTP_200_OK)
-    
     # Task Statistics
-    total_tasks = Task.objects.filter(user=user).count()
-    completed_tasks = Task.objects.filter(user=user, status='completed').count()
-    in_progress_tasks = Task.objects.filter(user=user, status='in_progress').count()
-    pending_tasks = Task.objects.filter(user=user, status='not_started').count()
+    task_counts = summary.tasks
+    total_tasks = task_counts.total
+    completed_tasks = task_counts.completed
+    in_progress_tasks = task_counts.in_progress
+    pending_tasks = task_counts.not_started
     
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    completion_rate = task_counts.completion_rate
     
     # Roadmap Statistics
-    roadmaps = Roadmap.objects.filter(user=user)
-    total_roadmaps = roadmaps.count()
+    roadmaps = list(Roadmap.objects.filter(user=user))
+    total_roadmaps = len(roadmaps)
     
     roadmap_stats = []
     for roadmap in roadmaps:
-        roadmap_tasks = Task.objects.filter(user=user, roadmap=roadmap)
-        total = roadmap_tasks.count()
-        completed = roadmap_tasks.filter(status='completed').count()
-        progress = (completed / total * 100) if total > 0 else 0
+        roadmap_tasks = summary.roadmap_tasks(roadmap.id)
         
         roadmap_stats.append({
             'id': roadmap.id,
             'title': roadmap.title,
             'category': roadmap.category,
             'difficulty': roadmap.difficulty_level,
-            'progress': round(progress, 1),
-            'total_tasks': total,
-            'completed_tasks': completed,
+            'progress': round(roadmap_tasks.completion_rate, 1),
+            'total_tasks': roadmap_tasks.total,
+            'completed_tasks': roadmap_tasks.completed,
             'created_at': roadmap.created_at.isoformat()
         })
     
     # Milestone Statistics
-    total_milestones = Milestone.objects.filter(roadmap__user=user).count()
-    completed_milestones = Milestone.objects.filter(roadmap__user=user, is_completed=True).count()
+    total_milestones = summary.total_milestones
+    completed_milestones = summary.completed_milestones
     
     # Streak Data
     profile = getattr(user, 'profile', None)
@@ -67,13 +70,8 @@ def get_user_statistics(request):
     last_activity = profile.last_study_date if profile else None
     
     # Time Statistics
-    total_minutes = Task.objects.filter(user=user, status='completed').aggregate(
-        total=Sum('actual_minutes')
-    )['total'] or 0
-    
-    avg_task_time = Task.objects.filter(user=user, status='completed').aggregate(
-        avg=Avg('actual_minutes')
-    )['avg'] or 0
+    total_minutes = task_counts.completed_minutes
+    avg_task_time = task_counts.avg_completed_minutes
     
     # Skills from Roadmaps
     skills = set()
@@ -86,7 +84,7 @@ def get_user_statistics(request):
     recent_tasks = Task.objects.filter(
         user=user, 
         updated_at__gte=thirty_days_ago
-    ).order_by('-updated_at')[:10]
+    ).select_related('roadmap').order_by('-updated_at')[:10]
     
     recent_activity = []
     for task in recent_tasks:
@@ -116,12 +114,7 @@ def get_user_statistics(request):
         activity_heatmap = {}
     
     # Weekly Stats (last 7 days)
-    seven_days_ago = timezone.now() - timedelta(days=7)
-    weekly_completed = Task.objects.filter(
-        user=user,
-        status='completed',
-        completed_at__gte=seven_days_ago
-    ).count()
+    weekly_completed = task_counts.weekly_completed
     
     # Category Distribution
     category_distribution = {}
@@ -131,7 +124,7 @@ def get_user_statistics(request):
             category_distribution[cat] = 0
         category_distribution[cat] += 1
     
-    response_data = {
+    return {
         'overview': {
             'total_tasks': total_tasks,
             'completed_tasks': completed_tasks,
@@ -159,6 +152,3 @@ def get_user_statistics(request):
         'activity_heatmap': activity_heatmap,
         'category_distribution': category_distribution,
     }
-
-    cache.set(cache_key, response_data, 60)
-    return Response(response_data, status=status.HTTP_200_OK)
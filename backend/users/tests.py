@@ -1,10 +1,20 @@
+from datetime import date
 from unittest.mock import MagicMock, patch
 
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.test import APIClient
 
+from dashboard.models import ExecutionTask
+from roadmap_ai.models import Milestone, Roadmap
+from tasks.models import Task
 from users.models import CustomUser, DeletedUser, OTPVerification, TrustedDevice
+from users import user_cache
+from users.activity import record_activity
+from users.progress_summary import UserProgressSummary
 
 
 class AuthLifecycleFlowTests(TestCase):
@@ -421,3 +431,145 @@ class TrustedDeviceGitHubTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTrue(response.data.get('two_factor_required'))
         mock_send_otp.assert_called_once()
+
+
+class UserProgressSummaryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create(
+            email='summary@example.com',
+            username='summary_user',
+            status=CustomUser.STATUS_ACTIVE,
+            is_active=True,
+            is_verified=True,
+        )
+        cache.clear()
+
+    def _add_roadmap(self, idx, completed=1, open_tasks=2):
+        roadmap = Roadmap.objects.create(user=self.user, title=f'Roadmap {idx}', goal='Learn')
+        Milestone.objects.create(roadmap=roadmap, title='M1', order=1, is_completed=True)
+        Milestone.objects.create(roadmap=roadmap, title='M2', order=2)
+        for day in range(completed + open_tasks):
+            Task.objects.create(
+                user=self.user,
+                roadmap=roadmap,
+                title=f'Task {day}',
+                day=day + 1,
+                due_date=date(2026, 1, day + 1),
+                status='completed' if day < completed else 'not_started',
+                completed_at=timezone.now() if day < completed else None,
+                actual_minutes=30 if day < completed else 0,
+            )
+        return roadmap
+
+    def test_counters_match_rows(self):
+        first = self._add_roadmap(1, completed=1, open_tasks=3)
+        self._add_roadmap(2, completed=2, open_tasks=0)
+        ExecutionTask.objects.create(user=self.user, title='Sprint', status='pending')
+
+        summary = UserProgressSummary(self.user)
+
+        self.assertEqual(summary.tasks.total, 6)
+        self.assertEqual(summary.tasks.completed, 3)
+        self.assertEqual(summary.tasks.not_started, 3)
+        self.assertEqual(summary.tasks.completed_minutes, 90)
+        self.assertEqual(summary.tasks.weekly_completed, 3)
+        self.assertEqual(summary.roadmap_tasks(first.id).total, 4)
+        self.assertEqual(summary.total_roadmaps, 2)
+        self.assertEqual(summary.total_milestones, 4)
+        self.assertEqual(summary.completed_milestones, 2)
+        self.assertEqual(summary.execution.pending, 1)
+
+    def test_each_section_is_a_single_query(self):
+        for idx in range(4):
+            self._add_roadmap(idx)
+
+        summary = UserProgressSummary(self.user)
+        with self.assertNumQueries(3):
+            summary.tasks
+            summary.roadmaps
+            summary.execution
+        with self.assertNumQueries(0):
+            summary.roadmap_tasks(1)
+            summary.total_milestones
+
+    def _statistics_query_count(self):
+        cache.clear()
+        self.client.force_authenticate(user=CustomUser.objects.get(pk=self.user.pk))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/users/statistics/')
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_statistics_query_count_is_independent_of_roadmap_count(self):
+        self._add_roadmap(1)
+        baseline = self._statistics_query_count()
+
+        for idx in range(2, 6):
+            self._add_roadmap(idx)
+
+        self.assertEqual(self._statistics_query_count(), baseline)
+
+    def test_backend_context_query_count_is_independent_of_roadmap_count(self):
+        from assistant.services.context_aggregator import build_backend_context
+
+        self._add_roadmap(1)
+        with CaptureQueriesContext(connection) as ctx:
+            build_backend_context(self.user, context_source='assistant')
+        baseline = len(ctx.captured_queries)
+
+        for idx in range(2, 6):
+            self._add_roadmap(idx)
+
+        with self.assertNumQueries(baseline):
+            build_backend_context(self.user, context_source='assistant')
+
+
+class UserCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create(
+            email='cache@example.com',
+            username='cache_user',
+            status=CustomUser.STATUS_ACTIVE,
+            is_active=True,
+            is_verified=True,
+        )
+
+    def test_payload_is_reused_until_invalidated(self):
+        compute = MagicMock(side_effect=[{'n': 1}, {'n': 2}])
+
+        self.assertEqual(user_cache.get_or_compute('dashboard_stats', self.user, compute), {'n': 1})
+        self.assertEqual(user_cache.get_or_compute('dashboard_stats', self.user, compute), {'n': 1})
+        self.assertEqual(compute.call_count, 1)
+
+        user_cache.invalidate_user_cache(self.user)
+
+        self.assertEqual(user_cache.get_or_compute('dashboard_stats', self.user, compute), {'n': 2})
+        self.assertEqual(compute.call_count, 2)
+
+    def test_record_activity_invalidates_user_payloads(self):
+        before = user_cache.user_cache_key('user_statistics', self.user)
+        record_activity(self.user, 'task_completed')
+        self.assertNotEqual(user_cache.user_cache_key('user_statistics', self.user), before)
+
+    def test_metrics_count_hits_and_misses(self):
+        user_cache.get_or_compute('user_statistics', self.user, lambda: {'ok': True})
+        user_cache.get_or_compute('user_statistics', self.user, lambda: {'ok': True})
+
+        metrics = user_cache.cache_metrics()['user_statistics']
+        self.assertEqual(metrics['hits'], 1)
+        self.assertEqual(metrics['misses'], 1)
+        self.assertEqual(metrics['hit_rate'], 0.5)
+
+    @patch('users.user_cache.LOCK_WAIT_SECONDS', 0.2)
+    def test_waiter_reuses_value_computed_by_lock_holder(self):
+        key = user_cache.user_cache_key('dashboard_stats', self.user)
+        cache.add(key + user_cache.LOCK_SUFFIX, 1, 10)
+        compute = MagicMock(return_value={'fresh': True})
+
+        with patch('users.user_cache.time.sleep', side_effect=lambda _s: cache.set(key, {'from': 'holder'})):
+            value = user_cache.get_or_compute('dashboard_stats', self.user, compute)
+
+        self.assertEqual(value, {'from': 'holder'})
+        compute.assert_not_called()
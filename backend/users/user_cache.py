@@ -0,0 +1,150 @@
+"""
+Shared per-user cache for expensive dashboard payloads.
+
+Keys are versioned per user (``<namespace>:<user_id>:v<version>``). Writers never
+delete entries; they bump the user's version via ``invalidate_user_cache`` and
+every existing key for that user becomes unreachable at once, which keeps
+invalidation O(1) regardless of how many payloads are cached.
+
+``get_or_compute`` adds stampede protection: on a miss only the worker that wins
+a short ``cache.add`` lock recomputes, the others wait briefly for the fresh
+value. Hit/miss counters live in the cache too so they aggregate across
+workers; see ``cache_metrics``.
+
+Cache errors (e.g. Redis down) never fail a request — the payload is computed
+directly instead.
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "user_cache_version:{user_id}"
+METRIC_KEY = "cache_metrics:{namespace}:{kind}"
+LOCK_SUFFIX = ":lock"
+
+# Namespaces we report metrics for; callers may still use others.
+KNOWN_NAMESPACES = ("dashboard_stats", "user_statistics", "assistant_context", "voice_config")
+
+DEFAULT_TIMEOUT = 60
+LOCK_TIMEOUT = 10
+LOCK_WAIT_SECONDS = 2.0
+LOCK_POLL_SECONDS = 0.05
+# Version keys outlive any payload so a bump is never forgotten early.
+VERSION_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def _user_id(user_or_id):
+    return getattr(user_or_id, "id", user_or_id)
+
+
+def get_user_cache_version(user_or_id):
+    try:
+        version = cache.get(VERSION_KEY.format(user_id=_user_id(user_or_id)))
+    except Exception:
+        logger.warning("Cache unavailable while reading version", exc_info=True)
+        return 1
+    return int(version or 1)
+
+
+def user_cache_key(namespace, user_or_id, version=None):
+    if version is None:
+        version = get_user_cache_version(user_or_id)
+    return f"{namespace}:{_user_id(user_or_id)}:v{version}"
+
+
+def invalidate_user_cache(user_or_id):
+    """Drop every cached payload for a user by bumping their key version."""
+    user_id = _user_id(user_or_id)
+    if user_id is None:
+        return
+    key = VERSION_KEY.format(user_id=user_id)
+    try:
+        # add() seeds the key at 1 so the incr below always moves past it.
+        cache.add(key, 1, VERSION_TIMEOUT)
+        cache.incr(key)
+    except ValueError:
+        # Key expired between add() and incr(); start from a fresh version.
+        cache.set(key, 2, VERSION_TIMEOUT)
+    except Exception:
+        logger.warning("Failed to invalidate cache for user %s", user_id, exc_info=True)
+
+
+def _record(namespace, kind):
+    key = METRIC_KEY.format(namespace=namespace, kind=kind)
+    try:
+        if cache.add(key, 1, None):
+            return
+        cache.incr(key)
+    except Exception:
+        pass
+
+
+def get_or_compute(namespace, user_or_id, compute, timeout=DEFAULT_TIMEOUT):
+    """
+    Return the cached payload for ``namespace`` or compute, store and return it.
+    ``compute`` is a zero-argument callable; ``None`` results are not cached.
+    """
+    try:
+        key = user_cache_key(namespace, user_or_id)
+        cached = cache.get(key)
+    except Exception:
+        logger.warning("Cache unavailable for %s", namespace, exc_info=True)
+        return compute()
+
+    if cached is not None:
+        _record(namespace, "hits")
+        return cached
+
+    _record(namespace, "misses")
+    lock_key = key + LOCK_SUFFIX
+    try:
+        have_lock = cache.add(lock_key, 1, LOCK_TIMEOUT)
+    except Exception:
+        have_lock = True
+
+    if not have_lock:
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_SECONDS)
+            cached = cache.get(key)
+            if cached is not None:
+                _record(namespace, "coalesced")
+                return cached
+        # The lock holder is slow or died; fall through and compute ourselves.
+
+    try:
+        value = compute()
+        if value is not None:
+            cache.set(key, value, timeout)
+        return value
+    finally:
+        if have_lock:
+            try:
+                cache.delete(lock_key)
+            except Exception:
+                pass
+
+
+def cache_metrics(namespaces=KNOWN_NAMESPACES):
+    """Hit/miss counters per namespace, aggregated across workers."""
+    keys = {
+        (namespace, kind): METRIC_KEY.format(namespace=namespace, kind=kind)
+        for namespace in namespaces
+        for kind in ("hits", "misses", "coalesced")
+    }
+    try:
+        raw = cache.get_many(list(keys.values()))
+    except Exception:
+        raw = {}
+
+    metrics = {}
+    for (namespace, kind), key in keys.items():
+        metrics.setdefault(namespace, {})[kind] = int(raw.get(key) or 0)
+    for counters in metrics.values():
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+    return metrics
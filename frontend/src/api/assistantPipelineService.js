@@ -1,4 +1,6 @@
 import api from '../api';
+import env from '../config/env';
+import { getAccessToken } from '../utils/auth';
 
 const toJson = (value, fallback = {}) => {
   if (!value || typeof value !== 'object') {
@@ -7,6 +9,81 @@ const toJson = (value, fallback = {}) => {
   return value;
 };
 
+const textTurnPayload = ({ message, contextSource, frontendContext, conversationId, languagePreference }) => {
+  const payload = {
+    channel: 'text',
+    message: String(message || '').trim(),
+    context_source: contextSource,
+    frontend_context: toJson(frontendContext),
+    language_preference: languagePreference,
+  };
+  if (conversationId) payload.conversation_id = conversationId;
+  return payload;
+};
+
+// Splits an SSE buffer into complete events; returns [events, remainder].
+const parseSseEvents = (buffer) => {
+  const blocks = buffer.split('\n\n');
+  const remainder = blocks.pop();
+  const events = blocks.map((block) => {
+    let event = 'message';
+    const data = [];
+    block.split('\n').forEach((line) => {
+      if (line.startsWith('event:')) event = line.slice(6).trim();
+      else if (line.startsWith('data:')) data.push(line.slice(5).trim());
+    });
+    return { event, data: data.length ? JSON.parse(data.join('\n')) : null };
+  });
+  return [events, remainder];
+};
+
+const postTurnStream = (body) => {
+  const token = getAccessToken();
+  const headers = token ? { Authorization: `Bearer ${token}` } : {};
+  if (!(body instanceof FormData)) headers['Content-Type'] = 'application/json';
+  return fetch(`${env.API_BASE_URL}assistant/v2/turn/stream/`, {
+    method: 'POST',
+    headers,
+    body: body instanceof FormData ? body : JSON.stringify(body),
+  });
+};
+
+// Reads turn events until 'final' (text) or 'done' (voice). Returns the final
+// payload, or null when the server reported an error before any text arrived.
+const readTurnStream = async (response, { onStart, onDelta, onAudio, untilDone = false }) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let received = false;
+  let final = null;
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const [events, remainder] = parseSseEvents(buffer);
+    buffer = remainder;
+    for (const { event, data } of events) {
+      if (event === 'start') {
+        onStart?.(data);
+      } else if (event === 'delta' && data?.text) {
+        received = true;
+        onDelta?.(data.text);
+      } else if (event === 'audio') {
+        onAudio?.(data);
+      } else if (event === 'final') {
+        final = data;
+        if (!untilDone) return final;
+      } else if (event === 'done') {
+        return final ? { ...final, latency: data?.latency || final.latency } : final;
+      } else if (event === 'error') {
+        return received ? data : null;
+      }
+    }
+  }
+  if (final) return final;
+  throw new Error('Assistant stream ended before the turn completed.');
+};
+
 export const assistantPipelineService = {
   getConfig: async () => {
     const response = await api.get('assistant/v2/config/');
@@ -20,18 +97,36 @@ export const assistantPipelineService = {
     conversationId = null,
     languagePreference = 'hinglish',
   }) => {
-    const payload = {
-      channel: 'text',
-      message: String(message || '').trim(),
-      context_source: contextSource,
-      frontend_context: toJson(frontendContext),
-      language_preference: languagePreference,
-    };
-    if (conversationId) payload.conversation_id = conversationId;
+    const payload = textTurnPayload({ message, contextSource, frontendContext, conversationId, languagePreference });
     const response = await api.post('assistant/v2/turn/', payload);
     return response.data;
   },
 
+  // Streams assistant_text through onDelta as it is generated and resolves with
+  // the same payload as sendTextTurn. Falls back to sendTextTurn when streaming
+  // is unavailable (older backend, proxy buffering, no ReadableStream).
+  streamTextTurn: async ({
+    message,
+    contextSource = 'assistant',
+    frontendContext = {},
+    conversationId = null,
+    languagePreference = 'hinglish',
+    onDelta = () => {},
+  }) => {
+    const args = { message, contextSource, frontendContext, conversationId, languagePreference };
+    let response;
+    try {
+      response = await postTurnStream(textTurnPayload(args));
+    } catch (err) {
+      return assistantPipelineService.sendTextTurn(args);
+    }
+    if (!response.ok || !response.body) {
+      return assistantPipelineService.sendTextTurn(args);
+    }
+    const result = await readTurnStream(response, { onDelta });
+    return result || assistantPipelineService.sendTextTurn(args);
+  },
+
   sendVoiceTurn: async ({
     audioBlob,
     contextSource = 'assistant',
@@ -58,6 +153,42 @@ export const assistantPipelineService = {
     return response.data;
   },
 
+  // Pipelined voice turn: onStart receives the transcript, onDelta the reply
+  // text and onAudio one TTS chunk per sentence, in order. Resolves with the
+  // sendVoiceTurn payload (without `tts`) plus the per-stage latency.
+  streamVoiceTurn: async ({
+    audioBlob,
+    contextSource = 'assistant',
+    frontendContext = {},
+    conversationId = null,
+    languagePreference = 'hinglish',
+    voiceName = '',
+    onStart = () => {},
+    onDelta = () => {},
+    onAudio = () => {},
+  }) => {
+    const args = { audioBlob, contextSource, frontendContext, conversationId, languagePreference, voiceName };
+    const formData = new FormData();
+    formData.append('context_source', contextSource);
+    formData.append('frontend_context', JSON.stringify(toJson(frontendContext)));
+    formData.append('language_preference', languagePreference);
+    if (conversationId) formData.append('conversation_id', conversationId);
+    if (voiceName) formData.append('voice_name', voiceName);
+    formData.append('audio', audioBlob, 'turn.webm');
+
+    let response;
+    try {
+      response = await postTurnStream(formData);
+    } catch (err) {
+      return assistantPipelineService.sendVoiceTurn(args);
+    }
+    if (!response.ok || !response.body) {
+      return assistantPipelineService.sendVoiceTurn(args);
+    }
+    const result = await readTurnStream(response, { onStart, onDelta, onAudio, untilDone: true });
+    return result || assistantPipelineService.sendVoiceTurn(args);
+  },
+
   confirmAction: async ({ conversationId, proposalId, confirmed, idempotencyKey = '' }) => {
     const payload = {
       conversation_id: conversationId,
@@ -1,6 +1,9 @@
 import api from "../api";
 
-const ROADMAP_GENERATION_TIMEOUT_MS = 120000;
+const ROADMAP_GENERATION_TIMEOUT_MS = 180000;
+const ROADMAP_JOB_POLL_MS = 2000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
 
 const normalizeArrayPayload = (payload, keys = []) => {
     if (Array.isArray(payload)) return payload;
@@ -12,11 +15,31 @@ const normalizeArrayPayload = (payload, keys = []) => {
 };
 
 export const roadmapService = {
-    // Generate a new roadmap
-    generateRoadmap: async (data) => {
-        const response = await api.post("roadmap/generate/", data, {
-            timeout: ROADMAP_GENERATION_TIMEOUT_MS,
-        });
+    // Generate a new roadmap. Generation runs as a background job; this polls
+    // it and resolves with the roadmap detail once it finishes.
+    generateRoadmap: async (data, { onProgress } = {}) => {
+        const response = await api.post("roadmap/generate/", data);
+        const jobId = response.data?.job_id;
+        if (!jobId) return response.data;
+
+        const deadline = Date.now() + ROADMAP_GENERATION_TIMEOUT_MS;
+        while (Date.now() < deadline) {
+            await sleep(ROADMAP_JOB_POLL_MS);
+            const { data: job } = await api.get(`roadmap/generate/jobs/${jobId}/`);
+            if (onProgress) onProgress(job);
+            if (job.status === "succeeded") return job.result;
+            if (job.status === "failed") {
+                throw new Error(job.result?.details || job.error || "Failed to generate roadmap");
+            }
+        }
+        const timeoutError = new Error("Roadmap generation timeout");
+        timeoutError.code = "ECONNABORTED";
+        throw timeoutError;
+    },
+
+    // Poll a roadmap generation job
+    getGenerationJob: async (jobId) => {
+        const response = await api.get(`roadmap/generate/jobs/${jobId}/`);
         return response.data;
     },
 
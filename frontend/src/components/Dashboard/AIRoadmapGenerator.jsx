@@ -1,7 +1,6 @@
 import React, { useState, useEffect } from "react";
 import axiosInstance from "../../api/axios";
-
-const ROADMAP_GENERATION_TIMEOUT_MS = 120000;
+import { roadmapService } from "../../api/roadmapService";
 
 export default function AIRoadmapGenerator() {
     const [step, setStep] = useState(1);
@@ -62,11 +61,9 @@ export default function AIRoadmapGenerator() {
         setMessage("🔄 Generating your personalized roadmap...");
 
         try {
-            const res = await axiosInstance.post("/api/roadmap/generate/", formData, {
-                timeout: ROADMAP_GENERATION_TIMEOUT_MS,
-            });
+            const roadmap = await roadmapService.generateRoadmap(formData);
             setMessage("✅ Roadmap generated successfully!");
-            setSelectedRoadmap(res.data);
+            setSelectedRoadmap(roadmap);
             fetchRoadmaps();
             setStep(1);
             setFormData({ goal: "", duration: "6 months", current_level: "beginner", interests: [] });
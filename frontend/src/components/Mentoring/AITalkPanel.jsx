@@ -82,7 +82,9 @@ export default function AITalkPanel({
         try {
             if (pipelineEnabled) {
                 const pathname = typeof window !== "undefined" ? window.location.pathname : "/dashboard";
-                const response = await assistantPipelineService.sendTextTurn({
+                const streamingMessage = makeMessage("assistant", "");
+                let streamed = "";
+                const response = await assistantPipelineService.streamTextTurn({
                     message: text,
                     contextSource,
                     frontendContext: buildFrontendAssistantContext({
@@ -95,6 +97,13 @@ export default function AITalkPanel({
                     }),
                     conversationId,
                     languagePreference: "hinglish",
+                    onDelta: (chunk) => {
+                        streamed += chunk;
+                        setMessages((prev) => [
+                            ...prev.filter((item) => item.id !== streamingMessage.id),
+                            { ...streamingMessage, content: streamed },
+                        ]);
+                    },
                 });
 
                 if (response?.conversation_id) {
@@ -103,7 +112,7 @@ export default function AITalkPanel({
                 }
 
                 setMessages((prev) => [
-                    ...prev,
+                    ...prev.filter((item) => item.id !== streamingMessage.id),
                     makeMessage(
                         "assistant",
                         response?.assistant_text || "I could not generate a response right now.",
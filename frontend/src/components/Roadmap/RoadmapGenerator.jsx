@@ -3,6 +3,13 @@ import { useNavigate } from "react-router-dom";
 import { roadmapService } from "../../api/roadmapService";
 import { motion } from "framer-motion";
 
+const GENERATION_STAGE_LABELS = {
+    prompt_sent: "Asking the AI for your roadmap...",
+    json_parsed: "Structuring milestones...",
+    milestones_saved: "Saving milestones...",
+    tasks_generated: "Creating your daily tasks...",
+};
+
 export default function RoadmapGenerator() {
     const navigate = useNavigate();
     const [formData, setFormData] = useState({
@@ -19,6 +26,7 @@ export default function RoadmapGenerator() {
     });
     const [loading, setLoading] = useState(false);
     const [error, setError] = useState("");
+    const [stage, setStage] = useState("");
     const [mousePosition, setMousePosition] = useState({ x: 50, y: 50 });
 
     useEffect(() => {
@@ -40,13 +48,16 @@ export default function RoadmapGenerator() {
         e.preventDefault();
         setLoading(true);
         setError("");
+        setStage("");
 
         try {
             const payload = {
                 ...formData,
                 interests: formData.interests.split(",").map((i) => i.trim()),
             };
-            const data = await roadmapService.generateRoadmap(payload);
+            const data = await roadmapService.generateRoadmap(payload, {
+                onProgress: (job) => setStage(GENERATION_STAGE_LABELS[job.stage] || ""),
+            });
             navigate(`/roadmap/${data.id}`);
         } catch (err) {
             console.error(err);
@@ -280,7 +291,7 @@ export default function RoadmapGenerator() {
                             {loading ? (
                                 <span className="flex items-center justify-center gap-2">
                                     <span className="animate-spin text-lg">◌</span>
-                                    Crafting your path...
+                                    {stage || "Crafting your path..."}
                                 </span>
                             ) : (
                                 "Generate Roadmap"
@@ -157,9 +157,11 @@ export default function Scheduler() {
             setCalendarKey(prev => prev + 1);
             const gcMsg = result.google_calendar_synced
                 ? ' Events also added to Google Calendar!'
-                : result.google_calendar_error
-                    ? ' (Google Calendar sync skipped: not connected)' :
-                    '';
+                : result.google_calendar_job_id
+                    ? ' Google Calendar sync is running in the background.'
+                    : result.google_calendar_error
+                        ? ' (Google Calendar sync skipped: not connected)' :
+                        '';
             alert(`Roadmap scheduled! ${result.events_created} tasks added to your calendar.${gcMsg}`);
         } catch (err) {
             console.error('Schedule error:', err);
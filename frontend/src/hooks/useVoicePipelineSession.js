@@ -31,6 +31,7 @@ export function useVoicePipelineSession(contextSource = 'general') {
   const analyserRef = useRef(null);
   const audioCtxRef = useRef(null);
   const playbackRef = useRef(null);
+  const audioQueueRef = useRef([]);
 
   const stopLevelMonitor = useCallback(() => {
     if (animationFrameRef.current) {
@@ -87,6 +88,38 @@ export function useVoicePipelineSession(contextSource = 'general') {
     }
   }, []);
 
+  // Plays streamed TTS chunks back to back, in the order they arrive.
+  const enqueueTtsChunk = useCallback((chunk) => {
+    if (!chunk?.audio_base64) return;
+    audioQueueRef.current.push(chunk);
+    const playNext = () => {
+      const next = audioQueueRef.current.shift();
+      if (!next) {
+        playbackRef.current = null;
+        setIsSpeaking(false);
+        return;
+      }
+      const objectUrl = URL.createObjectURL(base64ToBlob(next.audio_base64, next.mime_type || 'audio/wav'));
+      const audio = new Audio(objectUrl);
+      playbackRef.current = audio;
+      setIsSpeaking(true);
+      const advance = () => {
+        URL.revokeObjectURL(objectUrl);
+        playNext();
+      };
+      audio.onended = advance;
+      audio.onerror = advance;
+      audio.play().catch((playErr) => {
+        console.error('Pipeline TTS playback failed', playErr);
+        advance();
+      });
+    };
+    const current = playbackRef.current;
+    if (!current || current.paused || current.ended) {
+      playNext();
+    }
+  }, []);
+
   const handleTurnResponse = useCallback(async (response) => {
     setLatestResult(response);
     setActionProposals(Array.isArray(response?.action_proposals) ? response.action_proposals : []);
@@ -227,13 +260,23 @@ export function useVoicePipelineSession(contextSource = 'general') {
         },
       });
 
-      const response = await assistantPipelineService.sendVoiceTurn({
+      let streamedText = '';
+      audioQueueRef.current = [];
+      const response = await assistantPipelineService.streamVoiceTurn({
         audioBlob,
         contextSource: configRef.current?.contextSource || frontendContext.context_source || 'general',
         frontendContext,
         conversationId,
         languagePreference: configRef.current?.languagePreference || 'hinglish',
         voiceName: configRef.current?.voiceName || '',
+        onStart: (start) => {
+          if (start?.transcript) setTranscript(start.transcript);
+        },
+        onDelta: (chunk) => {
+          streamedText += chunk;
+          setLatestResult((prev) => ({ ...(prev || {}), assistant_text: streamedText }));
+        },
+        onAudio: enqueueTtsChunk,
       });
       await handleTurnResponse(response);
       setStatus('active');
@@ -242,7 +285,7 @@ export function useVoicePipelineSession(contextSource = 'general') {
       setError(turnErr?.response?.data?.error || 'Failed to process voice turn.');
       setStatus('error');
     }
-  }, [cleanupMedia, conversationId, handleTurnResponse]);
+  }, [cleanupMedia, conversationId, enqueueTtsChunk, handleTurnResponse]);
 
   const confirmProposal = useCallback(async (proposalId, confirmed) => {
     if (!conversationId || !proposalId) return null;
@@ -187,6 +187,20 @@ export function useVoiceSession() {
         }
     }, []);
 
+    // Mic audio goes out as raw PCM16 binary frames; the proxy base64-encodes
+    // it straight into the Gemini envelope, so no JSON/base64 work on either side.
+    const sendWsBinary = useCallback((buffer) => {
+        const ws = wsRef.current;
+        if (!ws || ws.readyState !== WebSocket.OPEN) return false;
+        try {
+            ws.send(buffer);
+            return true;
+        } catch (err) {
+            console.warn('WebSocket send failed:', err);
+            return false;
+        }
+    }, []);
+
     const interruptPlayback = useCallback(() => {
         activeSourcesRef.current.forEach((source) => {
             try {
@@ -470,10 +484,7 @@ export function useVoiceSession() {
             workletNodeRef.current = workletNode;
 
             workletNode.port.onmessage = (evt) => {
-                const bytes = new Uint8Array(evt.data.pcm);
-                let binary = '';
-                for (let i = 0; i < bytes.length; i++) binary += String.fromCharCode(bytes[i]);
-                sendWsMessage({ type: 'audio', data: btoa(binary) });
+                sendWsBinary(evt.data.pcm);
             };
 
             source.connect(workletNode);
@@ -586,7 +597,7 @@ export function useVoiceSession() {
             setStatus('error');
             cleanup();
         }
-    }, [cleanup, scheduleAudioPlayback, sendWsMessage, startLevelMonitor, startAppCapture]);
+    }, [cleanup, scheduleAudioPlayback, sendWsBinary, sendWsMessage, startLevelMonitor, startAppCapture]);
 
 
 